@@ -34,6 +34,7 @@ from PyQt6.QtWidgets import (
 from win32con import HWND_BOTTOM, HWND_NOTOPMOST, HWND_TOPMOST, SWP_NOACTIVATE, SWP_NOMOVE, SWP_NOSIZE
 
 from core.utils.controller import exit_application, reload_application
+from core.utils.tick_scheduler import TickScheduler
 from core.utils.utilities import refresh_widget_style
 from core.utils.win32.app_bar import APPBAR_CALLBACK_MESSAGE, AppBarNotify
 from core.utils.win32.bindings import SetWindowPos
@@ -665,10 +666,11 @@ class MaximizedWindowWatcher(QObject):
         self._is_autohide_active = False
         self._had_autohide_before = False
 
-        self._poll_timer = QTimer(self)
-        self._poll_timer.setInterval(500)
-        self._poll_timer.timeout.connect(self._check_maximized_windows)
-        self._poll_timer.start()
+        # No owner: the watcher has to keep running while autohide keeps the bar hidden
+        self._poll_subscription = TickScheduler.shared().subscribe(
+            500, self._check_maximized_windows, name="MaximizedWindowWatcher._check_maximized_windows"
+        )
+        self.destroyed.connect(lambda *_, s=self._poll_subscription: TickScheduler.shared().unsubscribe(s))
 
     def _check_maximized_windows(self):
         """Check if any top-level window is maximized on the bar's monitor."""
@@ -749,7 +751,8 @@ class MaximizedWindowWatcher(QObject):
 
     def cleanup(self):
         """Clean up resources."""
-        self._poll_timer.stop()
+        TickScheduler.shared().unsubscribe(self._poll_subscription)
+        self._poll_subscription = None
         if self._is_autohide_active:
             self._disable_autohide()
 
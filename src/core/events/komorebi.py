@@ -4,6 +4,7 @@ from core.events.base import Event
 class KomorebiEvent(Event):
     KomorebiConnect = "KomorebiConnect"
     KomorebiUpdate = "KomorebiUpdate"
+    KomorebiChange = "KomorebiChange"
     KomorebiDisconnect = "KomorebiDisconnect"
     FocusWorkspaceNumber = "FocusWorkspaceNumber"
     FocusMonitorWorkspaceNumber = "FocusMonitorWorkspaceNumber"
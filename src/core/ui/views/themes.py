@@ -71,7 +71,7 @@ from core.ui.components.link import Link
 from core.ui.components.loader import Spinner
 from core.ui.theme import FONT_FAMILIES, get_tokens, is_dark
 from core.ui.views.view_base import ViewBase
-from core.utils.markdown import md_to_html, preprocess_readme
+from core.utils.markdown import md_to_html_cached, preprocess_readme
 from core.utils.system import is_windows_10
 from settings import DEFAULT_CONFIG_DIRECTORY
 
@@ -476,7 +476,7 @@ class RemoteImageTextBrowser(QTextBrowser):
 
     def setMarkdown(self, text: str):
         alert_styles = getattr(self, "alert_styles", None)
-        html = md_to_html(preprocess_readme(text), alert_styles=alert_styles)
+        html = md_to_html_cached(preprocess_readme(text), alert_styles=alert_styles)
         self._rev += 1
         self._ready_emitted = False
         self._loading.clear()
@@ -28,7 +28,7 @@ from core.ui.components.text_block import TextBlock
 from core.ui.theme import get_tokens
 from core.ui.views.view_base import ViewBase
 from core.utils.controller import exit_application
-from core.utils.markdown import convert_img_tags, extract_img_srcs, md_to_html, strip_commit_links
+from core.utils.markdown import convert_img_tags, extract_img_srcs, md_to_html_cached, strip_commit_links
 from core.utils.process import is_process_running
 from core.utils.qobject import is_valid_qobject
 from core.utils.system import get_architecture
@@ -436,7 +436,7 @@ class UpdateDialog(ViewBase, QDialog):
         # Display changelog
         changelog = release_info.changelog.strip() or "_No changelog provided._"
         changelog = convert_img_tags(changelog)
-        html = md_to_html(strip_commit_links(changelog, repo_url="https://github.com/amnweb/yasb"))
+        html = md_to_html_cached(strip_commit_links(changelog, repo_url="https://github.com/amnweb/yasb"))
         self._show_spinner(True)
         self.changelog_view.setHtmlAndLoadImages(html)
 
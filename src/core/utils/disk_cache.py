@@ -0,0 +1,94 @@
+"""
+Files derived from other files (scaled icons, thumbnails), kept in the local app data folder.
+
+An entry is named after a digest of the source path, its modification time and size, and whatever
+variant the caller derives (target size, device pixel ratio, ...). A changed source file therefore
+simply misses, and stale entries are pruned once the folder holds more than max_files entries.
+Entries are written through a temporary file and os.replace, so readers never see partial files.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+MAX_CACHE_FILES = 4096
+# Entries written between two checks of the folder size
+PRUNE_INTERVAL = 64
+
+
+class DiskCache:
+    def __init__(self, name: str, suffix: str, max_files: int = MAX_CACHE_FILES, directory: Path | None = None):
+        self._name = name
+        self._suffix = suffix
+        self._max_files = max_files
+        # Resolved on first use, app_data_path creates the folder
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @property
+    def directory(self) -> Path:
+        if self._directory is None:
+            # core.utils.system imports winreg, the rest of this module also works off Windows
+            from core.utils.system import app_data_path
+
+            self._directory = app_data_path(self._name)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        return self._directory
+
+    def entry_path(self, source_path: str, *variant) -> Path | None:
+        """Where the variant of source_path is cached, None if the source file doesn't exist."""
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return None
+        source = os.path.normcase(os.path.abspath(source_path))
+        key = "|".join([source, str(stat.st_mtime_ns), str(stat.st_size), *map(str, variant)])
+        return self.directory / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}{self._suffix}"
+
+    def write(self, entry: Path, save: Callable[[str], object]) -> bool:
+        """
+        Create entry by calling save with a temporary path to write to.
+        save may raise or return False to signal failure.
+        """
+        tmp_path = entry.with_name(f"{entry.stem}.{threading.get_ident()}.tmp")
+        try:
+            if save(str(tmp_path)) is False:
+                raise OSError("nothing was written")
+            os.replace(tmp_path, entry)
+        except Exception as e:
+            logging.debug("Failed to write cache entry %s: %s", entry, e)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return False
+        with self._lock:
+            self._writes += 1
+            due = self._writes % PRUNE_INTERVAL == 0
+        if due:
+            self.prune()
+        return True
+
+    def prune(self) -> int:
+        """Delete the oldest entries beyond max_files. Returns how many were deleted."""
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry) for entry in self.directory.iterdir() if entry.suffix == self._suffix
+            ]
+        except OSError:
+            return 0
+        if len(entries) <= self._max_files:
+            return 0
+        entries.sort()
+        removed = 0
+        for _, entry in entries[: len(entries) - self._max_files]:
+            try:
+                entry.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
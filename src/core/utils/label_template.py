@@ -0,0 +1,126 @@
+"""
+Label format strings compiled once instead of re-parsed on every update.
+
+A widget label such as ``<span class="icon"></span> {%H:%M}`` is split into icon spans and
+text parts by parse_label(). The result is cached per format string, so building the same label
+on every bar, or re-reading it on each tick, costs a dictionary lookup. Text parts that contain a
+datetime field are compiled into a DatetimeTemplate, which keeps the static text around the field
+and only formats the field itself when rendering.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+
+from PyQt6.QtWidgets import QLabel
+
+SPAN_PATTERN = re.compile(r"(<span.*?>.*?</span>)")
+SPAN_CLASS_PATTERN = re.compile(r'class=(["\'])([^"\']+?)\1')
+SPAN_TAG_PATTERN = re.compile(r"<span.*?>|</span>")
+DATETIME_FIELD_PATTERN = re.compile(r"\{(.*)}")
+# strftime directives whose output depends on LC_TIME
+LOCALE_DIRECTIVE_PATTERN = re.compile(r"%[-#]?[aAbBchpxXrEO]")
+
+
+@dataclass(frozen=True)
+class LabelPart:
+    """One QLabel of a widget label: an icon span or a text part, with surrounding whitespace stripped."""
+
+    text: str
+    is_icon: bool
+    class_name: str = "label"
+
+
+@lru_cache(maxsize=512)
+def parse_label(content: str) -> tuple[LabelPart, ...]:
+    """Split a label format string into its icon spans and text parts, in display order."""
+    parts = []
+    for part in SPAN_PATTERN.split(content):
+        part = part.strip()
+        if not part:
+            continue
+        if "<span" in part and "</span>" in part:
+            class_match = SPAN_CLASS_PATTERN.search(part)
+            class_name = class_match.group(2) if class_match else "icon"
+            parts.append(LabelPart(SPAN_TAG_PATTERN.sub("", part).strip(), True, class_name))
+        else:
+            parts.append(LabelPart(part, False))
+    return tuple(parts)
+
+
+def set_label_text(label: QLabel, text: str) -> bool:
+    """Set the text of a label only if it differs, so unchanged labels are not laid out again."""
+    if label.text() == text:
+        return False
+    label.setText(text)
+    return True
+
+
+class DatetimeTemplate:
+    """
+    A text part with one strftime field and optional named placeholders such as ``{icon}``.
+
+    The placeholders are substituted first and the field is the span from the first ``{`` to the
+    last ``}`` of the result, which is how these labels have always been rendered. Compiling finds
+    that span once, with the placeholders standing in as noncharacter code points.
+    """
+
+    def __init__(self, text: str, placeholders: tuple[str, ...] = ()):
+        self.text = text
+        self.placeholders = tuple(name for name in placeholders if f"{{{name}}}" in text)
+        self._sentinels = {name: chr(0xFDD0 + index) for index, name in enumerate(self.placeholders)}
+        compiled = text
+        for name, sentinel in self._sentinels.items():
+            compiled = compiled.replace(f"{{{name}}}", sentinel)
+
+        self._prefix = compiled
+        self._suffix = ""
+        self._format: str | None = None
+        self._field_has_placeholders = False
+        match = DATETIME_FIELD_PATTERN.search(compiled)
+        if match:
+            self._prefix = compiled[: match.start()]
+            self._suffix = compiled[match.end() :]
+            self._format = match.group(1)
+            self._field_has_placeholders = any(sentinel in self._format for sentinel in self._sentinels.values())
+        self.uses_locale = self._format is not None and (
+            self._field_has_placeholders or bool(LOCALE_DIRECTIVE_PATTERN.search(self._format))
+        )
+
+    def render(self, now: datetime, values: dict[str, str] | None = None) -> str:
+        values = values or {}
+        if self._field_has_placeholders or any(
+            ch in values.get(name, "") for name in self.placeholders for ch in "{}\n"
+        ):
+            # Substituted values take part in locating the field, so render it the long way
+            return self._render_substituted(now, values)
+        prefix = self._fill(self._prefix, values)
+        suffix = self._fill(self._suffix, values)
+        if self._format is None:
+            return prefix
+        try:
+            return prefix + now.strftime(self._format) + suffix
+        except Exception:
+            return prefix + "{" + self._format + "}" + suffix
+
+    def _fill(self, text: str, values: dict[str, str]) -> str:
+        for name, sentinel in self._sentinels.items():
+            if sentinel in text:
+                text = text.replace(sentinel, values.get(name, ""))
+        return text
+
+    def _render_substituted(self, now: datetime, values: dict[str, str]) -> str:
+        part = self.text
+        for name in self.placeholders:
+            part = part.replace(f"{{{name}}}", values.get(name, ""))
+        try:
+            match = DATETIME_FIELD_PATTERN.search(part)
+            return part.replace(match.group(), now.strftime(match.group(1)))
+        except Exception:
+            return part
+
+
+@lru_cache(maxsize=256)
+def compile_datetime_template(text: str, placeholders: tuple[str, ...] = ()) -> DatetimeTemplate:
+    return DatetimeTemplate(text, placeholders)
@@ -5,9 +5,15 @@ code fences, links, images, unordered/ordered lists, blockquotes, tables,
 and horizontal rules.
 Produces clean semantic HTML without inline styles
 so that QTextDocument.defaultStyleSheet CSS rules work as expected.
+
+``md_to_html_cached`` splits the input into independent blocks and reuses
+the HTML of blocks that were converted before, so re-rendering a document
+that only changed in a few places converts just those blocks.
 """
 
 import re
+from collections.abc import Iterable
+from functools import lru_cache
 from html import escape as html_escape
 
 _CODE_BLOCK_PLACEHOLDER = "\x00CB{index}\x00"
@@ -66,6 +72,9 @@ _ALERT_STYLES_DEFAULT: dict[str, tuple[str, str]] = {
 # Raw HTML block elements that should be passed through as-is
 _HTML_BLOCK_OPEN = re.compile(r"^<(table|details|figure|fieldset|dl|form)\b", re.IGNORECASE)
 
+# Block splitting
+_BLANK_RUN = re.compile(r"\n(?:[ \t]*\n)+")
+
 # GitHub changelog preprocessing
 _IMG_TAG = re.compile(r"<img\s[^>]*/?>", re.IGNORECASE)
 _IMG_SRC = re.compile(r'<img\s[^>]*src="([^"]+)"', re.IGNORECASE)
@@ -121,7 +130,92 @@ def _md_table(lines: list[str]) -> str:
     return html + "</table>"
 
 
+def _html_block_spans(src: str, masked: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Return the character spans of raw HTML blocks, matched the same way as in ``md_to_html``.
+
+    Text inside the *masked* spans is ignored, like code fences hidden behind placeholders.
+    """
+    if "<" not in src:
+        return []
+    if masked:
+        pieces: list[str] = []
+        last = 0
+        for start, end in masked:
+            pieces.append(src[last:start])
+            pieces.append(re.sub(r"[^\n]", " ", src[start:end]))
+            last = end
+        pieces.append(src[last:])
+        src = "".join(pieces)
+    spans: list[tuple[int, int]] = []
+    lines = src.split("\n")
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line) + 1)
+    n = len(lines)
+    # Every opening line may start a block in md_to_html, even one inside another candidate
+    for start in range(n):
+        m = _HTML_BLOCK_OPEN.match(lines[start].strip())
+        if not m:
+            continue
+        tag = m.group(1).lower()
+        i = start + 1
+        depth = 1
+        while i < n and depth > 0:
+            cur_lower = lines[i].lower()
+            depth += cur_lower.count(f"<{tag}") - cur_lower.count(f"</{tag}")
+            i += 1
+        spans.append((offsets[start], offsets[i] - 1))
+    return spans
+
+
+def _merge_spans(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+@lru_cache(maxsize=512)
+def _md_block_to_html(block: str, alert_styles: tuple[tuple[str, tuple[str, str]], ...] | None) -> str:
+    return md_to_html(block, alert_styles=dict(alert_styles) if alert_styles else None)
+
+
 # Public API
+def split_markdown_blocks(
+    src: str,
+    protected: Iterable[re.Pattern[str]] = (_CODE_FENCE,),
+    *,
+    raw_html: bool = True,
+) -> list[str]:
+    """Split *src* at blank lines into blocks that can be converted independently.
+
+    Blank lines inside a match of any *protected* pattern (code fences by default)
+    or, with *raw_html*, inside a raw HTML block are never used as split points.
+    Blocks keep their trailing blank lines, so ``"".join(blocks) == src``.
+    """
+    merged = _merge_spans([m.span() for pattern in protected for m in pattern.finditer(src)])
+    if raw_html:
+        merged = _merge_spans(merged + _html_block_spans(src, merged))
+
+    blocks: list[str] = []
+    block_start = 0
+    span_index = 0
+    for m in _BLANK_RUN.finditer(src):
+        pos = m.end()
+        while span_index < len(merged) and merged[span_index][1] <= pos:
+            span_index += 1
+        if span_index < len(merged) and merged[span_index][0] < pos:
+            continue
+        blocks.append(src[block_start:pos])
+        block_start = pos
+    if block_start < len(src):
+        blocks.append(src[block_start:])
+    return blocks
+
+
 def preprocess_readme(text: str) -> str:
     """Strip block-level HTML wrappers and rewrite GitHub blob URLs to raw URLs."""
     text = _IMG_GH_BLOB.sub(r"![\1](https://raw.githubusercontent.com/\2/\3/\4)", text)
@@ -311,3 +405,19 @@ def md_to_html(src: str, *, alert_styles: dict[str, tuple[str, str]] | None = No
     html = "\n".join(out)
     html = _replace_placeholders(html, code_blocks, _CODE_BLOCK_PLACEHOLDER)
     return _replace_placeholders(html, inline_codes, _INLINE_CODE_PLACEHOLDER)
+
+
+def md_to_html_cached(src: str, *, alert_styles: dict[str, tuple[str, str]] | None = None) -> str:
+    """Block-cached variant of ``md_to_html`` producing identical output.
+
+    Each block returned by ``split_markdown_blocks`` is converted once and
+    its HTML is reused from an LRU cache while the block text is unchanged.
+    """
+    src = src.replace("\r\n", "\n")
+    styles_key = tuple(sorted(alert_styles.items())) if alert_styles else None
+    parts = []
+    for block in split_markdown_blocks(src):
+        html = _md_block_to_html(block, styles_key)
+        if html:
+            parts.append(html)
+    return "\n".join(parts)
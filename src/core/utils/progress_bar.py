@@ -1,3 +1,5 @@
+import math
+
 from PyQt6.QtCore import QEasingCurve, QPointF, QPropertyAnimation, QRectF, Qt, pyqtProperty
 from PyQt6.QtGui import QColor, QConicalGradient, QLinearGradient, QPainter, QPen
 from PyQt6.QtWidgets import QFrame, QVBoxLayout
@@ -6,6 +8,9 @@ from PyQt6.QtWidgets import QFrame, QVBoxLayout
 class ProgressBar(QFrame):
     """A progress bar widget that supports circular and linear modes."""
 
+    # Value changes that move the drawn progress by less than this many device pixels are not repainted
+    MIN_VISIBLE_CHANGE_PX = 0.5
+
     def __init__(
         self,
         parent=None,
@@ -23,6 +28,8 @@ class ProgressBar(QFrame):
         self._size = size
         self._thickness = thickness
         self._value = value
+        self._target_value = value
+        self._painted_value = None
         self._color_config = color
         self.setContentsMargins(0, 0, 0, 0)
         self._background_color = QColor(background_color)
@@ -53,7 +60,28 @@ class ProgressBar(QFrame):
         self._value = value
         if self._progress_type == "circular":
             self._update_angles()
-        self.update()
+        # Skip animation frames that would not move a pixel, but always draw where the animation ends
+        if (
+            self._painted_value is None
+            or value == self._target_value
+            or self._is_visible_change(self._painted_value, value)
+        ):
+            self.update()
+
+    def _progress_length(self) -> float:
+        """Length in device pixels covered by the progress at 100%."""
+        rect = self.contentsRect()
+        if self._progress_type == "circular":
+            margin = (self._thickness + 1) // 2 + 1
+            length = math.pi * max(0, min(rect.width(), rect.height()) - 2 * margin)
+        elif self._progress_type == "linear_horizontal":
+            length = rect.width()
+        else:
+            length = rect.height()
+        return length * self.devicePixelRatioF()
+
+    def _is_visible_change(self, old_value: float, new_value: float) -> bool:
+        return abs(new_value - old_value) / 100.0 * self._progress_length() >= self.MIN_VISIBLE_CHANGE_PX
 
     def _update_angles(self):
         """Update the angle calculations based on current value."""
@@ -92,6 +120,7 @@ class ProgressBar(QFrame):
         """Paint the progress bar."""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._painted_value = self._value
 
         if self._progress_type == "circular":
             self._paint_circular(painter)
@@ -146,9 +175,10 @@ class ProgressBar(QFrame):
     def set_value(self, value: float):
         """Set the current value and update the display."""
         new_value = max(0, min(value, 100.0))
-        # If value hasn't changed significantly, no need to animate
-        if abs(new_value - self._value) < 0.9:
+        # Changes too small to move a pixel of the bar are neither animated nor repainted
+        if not self._is_visible_change(self._target_value, new_value):
             return
+        self._target_value = new_value
         if self._animation_enabled:
             if self._animation.state() == QPropertyAnimation.State.Running:
                 self._animation.stop()
@@ -0,0 +1,71 @@
+from array import array
+from collections.abc import Iterable, Iterator
+
+
+class RingBuffer:
+    """
+    Fixed-capacity history of floats backed by a preallocated array.
+    Appending to a full buffer overwrites the oldest value, so a steady stream of samples never allocates.
+    """
+
+    __slots__ = ("_data", "_capacity", "_start", "_size")
+
+    def __init__(self, capacity: int, fill: float | None = None):
+        self._capacity = max(0, int(capacity))
+        self._data = array("d", bytes(8 * self._capacity))
+        self._start = 0
+        self._size = 0
+        if fill is not None:
+            for _ in range(self._capacity):
+                self.append(fill)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[float]:
+        data, start, capacity = self._data, self._start, self._capacity
+        for i in range(self._size):
+            yield data[(start + i) % capacity]
+
+    def append(self, value: float) -> None:
+        if not self._capacity:
+            return
+        if self._size < self._capacity:
+            self._data[(self._start + self._size) % self._capacity] = value
+            self._size += 1
+        else:
+            self._data[self._start] = value
+            self._start = (self._start + 1) % self._capacity
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.append(value)
+
+    def last(self, default: float = 0.0) -> float:
+        if not self._size:
+            return default
+        return self._data[(self._start + self._size - 1) % self._capacity]
+
+    def clear(self) -> None:
+        self._start = 0
+        self._size = 0
+
+    def to_list(self) -> list[float]:
+        """Values from oldest to newest."""
+        end = self._start + self._size
+        if end <= self._capacity:
+            return self._data[self._start : end].tolist()
+        return self._data[self._start :].tolist() + self._data[: end - self._capacity].tolist()
+
+    def to_tuple(self) -> tuple[float, ...]:
+        return tuple(self.to_list())
+
+    def resized(self, capacity: int) -> RingBuffer:
+        """A copy with a different capacity that keeps the newest values."""
+        buffer = RingBuffer(capacity)
+        buffer.extend(self.to_list()[-capacity:] if capacity else ())
+        return buffer
@@ -1,5 +1,5 @@
-from PyQt6.QtCore import QEvent, QPointF, Qt
-from PyQt6.QtGui import QBrush, QColor, QLinearGradient, QPainter, QPainterPath, QPen
+from PyQt6.QtCore import QEvent, QPointF, QRectF, Qt
+from PyQt6.QtGui import QBrush, QColor, QLinearGradient, QPainter, QPainterPath, QPen, QPixmap
 from PyQt6.QtWidgets import QFrame, QGridLayout, QHBoxLayout, QLabel, QPushButton, QVBoxLayout
 
 from core.utils.tooltip import set_tooltip
@@ -62,19 +62,31 @@ class PinnablePopup(PopupWidget):
 
 
 class GraphWidget(QFrame):
-    """Rolling area chart for percentage-based history data (0-100)."""
+    """
+    Rolling area chart for percentage-based history data (0-100).
+
+    The fill and stroke are rendered into a cached pixmap. When new data is the previous data
+    shifted by one sample, the pixmap is scrolled and only the newest segments are drawn again.
+    """
 
     STROKE_WIDTH = 2
     FILL_TOP_OPACITY = 100
     FILL_BOTTOM_OPACITY = 10
     SPLINE_TENSION = 0.2
     GRID_CELL_SIZE = 16
+    # Data changes that move no point by at least this many pixels are not repainted
+    MIN_VISIBLE_CHANGE_PX = 0.5
 
     def __init__(self, css_class="graph", show_grid=False, parent=None):
         super().__init__(parent)
         self._data: list[float] = []
+        self._points: list[QPointF] = []
         self._line_path: QPainterPath | None = None
         self._fill_path: QPainterPath | None = None
+        self._chart: QPixmap | None = None
+        self._chart_color: QColor | None = None
+        # Sub-pixel drift between the scrolled pixmap and the exact sample positions, in device pixels
+        self._scroll_error = 0.0
         self._show_grid = show_grid
         self.setMinimumHeight(20)
         self.setProperty("class", css_class)
@@ -85,15 +97,40 @@ class GraphWidget(QFrame):
         self._grid_proxy.setFixedSize(0, 0)
 
     def set_data(self, data: list[float]) -> None:
+        data = list(data)
+        # Compared against the data last drawn, so small changes cannot add up unseen
+        if self._line_path is not None and not self._is_visible_change(data):
+            return
+        shifted = self._is_shifted(data)
         self._data = data
         self._rebuild_paths()
+        if shifted and self._chart is not None:
+            self._scroll_chart()
+        else:
+            self._chart = None
         self.update()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self._rebuild_paths()
+        self._chart = None
+
+    def _is_visible_change(self, data: list[float]) -> bool:
+        if len(data) != len(self._data):
+            return True
+        chart_h = self.height() - self.STROKE_WIDTH
+        threshold = self.MIN_VISIBLE_CHANGE_PX * 100.0 / max(chart_h, 1)
+        return any(
+            abs(max(0.0, min(new, 100.0)) - max(0.0, min(old, 100.0))) >= threshold
+            for new, old in zip(data, self._data)
+        )
+
+    def _is_shifted(self, data: list[float]) -> bool:
+        """Whether data is the current data with the oldest sample dropped and one new sample appended."""
+        return len(data) > 2 and len(data) == len(self._data) and data[:-1] == self._data[1:]
 
     def _rebuild_paths(self) -> None:
+        self._points = []
         self._line_path = None
         self._fill_path = None
         if not self._data:
@@ -118,6 +155,7 @@ class GraphWidget(QFrame):
         fill_path.connectPath(line_path)
         fill_path.lineTo(pts[-1].x(), h)
         fill_path.closeSubpath()
+        self._points = pts
         self._line_path = line_path
         self._fill_path = fill_path
 
@@ -147,19 +185,71 @@ class GraphWidget(QFrame):
             path.cubicTo(cp1_x, cp1_y, cp2_x, cp2_y, p2.x(), p2.y())
         return path
 
+    def _scroll_chart(self) -> None:
+        """Scroll the cached chart left by one sample and redraw the segments that changed."""
+        dpr = self._chart.devicePixelRatio()
+        step = (self._points[1].x() - self._points[0].x()) * dpr
+        dx = round(step)
+        self._scroll_error += step - dx
+        if dx <= 0 or abs(self._scroll_error) >= 0.5:
+            self._chart = None
+            return
+        self._chart.scroll(-dx, 0, self._chart.rect())
+        # The previously last segment was drawn with its end tangent clamped, so it is redrawn too
+        x = max(0.0, self._points[-3].x() - self.STROKE_WIDTH)
+        strip = QRectF(x, 0, self.width() - x, self.height())
+        painter = QPainter(self._chart)
+        painter.setClipRect(strip)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Clear)
+        painter.fillRect(strip, Qt.GlobalColor.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        self._draw_chart(painter, self._chart_color)
+        painter.end()
+
+    def _render_chart(self, line_color: QColor) -> None:
+        dpr = self.devicePixelRatioF()
+        chart = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        chart.setDevicePixelRatio(dpr)
+        chart.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(chart)
+        self._draw_chart(painter, line_color)
+        painter.end()
+        self._chart = chart
+        self._chart_color = QColor(line_color)
+        self._scroll_error = 0.0
+
+    def _draw_chart(self, painter: QPainter, line_color: QColor) -> None:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # Fill gradient
+        gradient = QLinearGradient(0, 0, 0, self.height())
+        fill_top = QColor(line_color)
+        fill_top.setAlpha(self.FILL_TOP_OPACITY)
+        fill_bottom = QColor(line_color)
+        fill_bottom.setAlpha(self.FILL_BOTTOM_OPACITY)
+        gradient.setColorAt(0, fill_top)
+        gradient.setColorAt(1, fill_bottom)
+        painter.setBrush(QBrush(gradient))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawPath(self._fill_path)
+        # Stroke line
+        pen = QPen(line_color, self.STROKE_WIDTH)
+        pen.setCapStyle(Qt.PenCapStyle.FlatCap)
+        pen.setJoinStyle(Qt.PenJoinStyle.BevelJoin)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPath(self._line_path)
+
     def paintEvent(self, event):
         super().paintEvent(event)
         if self._line_path is None:
             return
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         self.ensurePolished()
         line_color = self.palette().color(self.foregroundRole())
         h = self.height()
         w = self.width()
         # Square grid (anchored to bottom-right so edges align cleanly)
         if self._show_grid:
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
             self._grid_proxy.ensurePolished()
             grid_color = self._grid_proxy.palette().color(self._grid_proxy.foregroundRole())
             if not grid_color.isValid() or grid_color == QColor(0, 0, 0):
@@ -183,25 +273,13 @@ class GraphWidget(QFrame):
                 x -= cell
             if int(x + cell) > 0:
                 painter.drawLine(0, 0, 0, last_y)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        # Fill gradient
-        gradient = QLinearGradient(0, 0, 0, h)
-        fill_top = QColor(line_color)
-        fill_top.setAlpha(self.FILL_TOP_OPACITY)
-        fill_bottom = QColor(line_color)
-        fill_bottom.setAlpha(self.FILL_BOTTOM_OPACITY)
-        gradient.setColorAt(0, fill_top)
-        gradient.setColorAt(1, fill_bottom)
-        painter.setBrush(QBrush(gradient))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawPath(self._fill_path)
-        # Stroke line
-        pen = QPen(line_color, self.STROKE_WIDTH)
-        pen.setCapStyle(Qt.PenCapStyle.FlatCap)
-        pen.setJoinStyle(Qt.PenJoinStyle.BevelJoin)
-        painter.setPen(pen)
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawPath(self._line_path)
+        if (
+            self._chart is None
+            or self._chart_color != line_color
+            or self._chart.devicePixelRatio() != self.devicePixelRatioF()
+        ):
+            self._render_chart(line_color)
+        painter.drawPixmap(0, 0, self._chart)
 
 
 def build_stat_popup(
@@ -0,0 +1,254 @@
+"""
+Shared scheduler for periodic widget updates.
+
+Instead of one QTimer per widget, callbacks subscribe with an interval and are grouped into tick
+buckets. Each bucket owns one timer that fires on the interval boundary of the clock, so every
+widget updating once a second runs on the same tick, right after the second changes. Callbacks
+owned by a widget whose bar is hidden or moved off screen are skipped and run once as soon as the
+bar is shown again. A widget that hid itself keeps ticking, since its callback may show it again.
+The time spent in every callback is recorded, so the most expensive ones can be found with
+worst_offenders().
+
+Single-shot delays and debounces (tooltip hover and hide, autohide, systray refresh and sorting) keep their own
+QTimer: they are measured from the event that started them, and aligning them to the clock would
+delay them by up to a whole interval.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from PyQt6 import sip
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt6.QtWidgets import QWidget
+
+# Fire this long after the boundary so a timer waking slightly early never runs before it
+TICK_SLACK_MS = 2
+SLOW_CALLBACK_MS = 50.0
+
+
+@dataclass
+class TickStats:
+    name: str
+    interval_ms: int
+    calls: int = 0
+    skipped: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+def is_bar_shown(widget: QWidget) -> bool:
+    """Whether the bar (top-level window) of a widget is visible and not moved off screen."""
+    if sip.isdeleted(widget):
+        return False
+    window = widget.window()
+    if not window.isVisible():
+        return False
+    screen = window.screen()
+    return screen is None or screen.geometry().intersects(window.frameGeometry())
+
+
+def is_widget_shown(widget: QWidget) -> bool:
+    """Whether a widget is visible and its bar has not been moved off screen."""
+    return not sip.isdeleted(widget) and widget.isVisible() and is_bar_shown(widget)
+
+
+class TickSubscription:
+    """A callback registered with the scheduler. Returned by subscribe() and passed to unsubscribe()."""
+
+    def __init__(self, interval_ms: int, callback: Callable[[], None], owner: QWidget | None, name: str):
+        self.interval_ms = interval_ms
+        self.callback = callback
+        self.owner = owner
+        self.stats = TickStats(name, interval_ms)
+        self.missed = False
+        self.active = True
+
+    def is_paused(self) -> bool:
+        """
+        A subscription is paused while the bar of its owner is hidden or moved off screen. The owner
+        itself may be hidden, e.g. by hide_empty, and only its callback can bring it back.
+        """
+        return self.owner is not None and not is_bar_shown(self.owner)
+
+
+class _TickBucket:
+    def __init__(self, interval_ms: int, scheduler: TickScheduler):
+        self.interval_ms = interval_ms
+        self.subscriptions: list[TickSubscription] = []
+        self.timer = QTimer(scheduler)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(lambda: scheduler.tick(interval_ms))
+
+
+class TickScheduler(QObject):
+    """
+    Runs periodic callbacks on shared, clock-aligned ticks.
+
+    The clock is injectable: it must return the current time in seconds, and it decides where the
+    interval boundaries fall. Costs are measured with cost_clock.
+    """
+
+    _shared: TickScheduler | None = None
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.time,
+        cost_clock: Callable[[], float] = time.perf_counter,
+        parent: QObject | None = None,
+    ):
+        super().__init__(parent)
+        self._clock = clock
+        self._cost_clock = cost_clock
+        self._buckets: dict[int, _TickBucket] = {}
+        self._owners: dict[int, list[TickSubscription]] = {}
+        self._stats: dict[str, TickStats] = {}
+
+    @classmethod
+    def shared(cls) -> TickScheduler:
+        """Return the scheduler used by all widgets."""
+        if cls._shared is None or sip.isdeleted(cls._shared):
+            cls._shared = cls()
+        return cls._shared
+
+    def subscribe(
+        self,
+        interval_ms: int,
+        callback: Callable[[], None],
+        owner: QWidget | None = None,
+        name: str | None = None,
+    ) -> TickSubscription:
+        """
+        Run callback every interval_ms milliseconds. With an owner, ticks are skipped while its bar is
+        not visible and the subscription ends when the owner is destroyed.
+        """
+        if interval_ms <= 0:
+            raise ValueError(f"Tick interval must be positive, got {interval_ms}")
+        if name is None:
+            name = getattr(callback, "__qualname__", repr(callback))
+        subscription = TickSubscription(interval_ms, callback, owner, name)
+        # Widgets created from the same config share one entry, so the report shows totals per callback
+        subscription.stats = self._stats.setdefault(f"{name}@{interval_ms}ms", subscription.stats)
+
+        bucket = self._buckets.get(interval_ms)
+        if bucket is None:
+            bucket = self._buckets[interval_ms] = _TickBucket(interval_ms, self)
+        bucket.subscriptions.append(subscription)
+        if not bucket.timer.isActive():
+            self._arm(bucket)
+
+        if owner is not None:
+            owned = self._owners.get(id(owner))
+            if owned is None:
+                owned = self._owners[id(owner)] = []
+                owner.installEventFilter(self)
+                owner.destroyed.connect(lambda *_, key=id(owner): self._owner_destroyed(key))
+            owned.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TickSubscription | None) -> None:
+        if subscription is None or not subscription.active:
+            return
+        subscription.active = False
+        bucket = self._buckets.get(subscription.interval_ms)
+        if bucket is not None and subscription in bucket.subscriptions:
+            bucket.subscriptions.remove(subscription)
+            if not bucket.subscriptions:
+                bucket.timer.stop()
+                bucket.timer.deleteLater()
+                del self._buckets[subscription.interval_ms]
+
+        owner = subscription.owner
+        if owner is not None:
+            owned = self._owners.get(id(owner), [])
+            if subscription in owned:
+                owned.remove(subscription)
+            if not owned:
+                self._owners.pop(id(owner), None)
+                if not sip.isdeleted(owner):
+                    owner.removeEventFilter(self)
+            subscription.owner = None
+
+    def next_delay_ms(self, interval_ms: int) -> int:
+        """Milliseconds from now until just after the next multiple of interval_ms on the clock."""
+        now_ms = int(self._clock() * 1000)
+        return interval_ms - now_ms % interval_ms + TICK_SLACK_MS
+
+    def tick(self, interval_ms: int) -> None:
+        """Run every subscription of a bucket and re-arm it for the next boundary."""
+        bucket = self._buckets.get(interval_ms)
+        if bucket is None:
+            return
+        for subscription in bucket.subscriptions[:]:
+            if not subscription.active:
+                continue
+            if subscription.is_paused():
+                subscription.missed = True
+                subscription.stats.skipped += 1
+                continue
+            self._run(subscription)
+        if self._buckets.get(interval_ms) is bucket and bucket.subscriptions:
+            self._arm(bucket)
+
+    def stats(self) -> list[TickStats]:
+        return list(self._stats.values())
+
+    def worst_offenders(self, count: int = 5) -> list[TickStats]:
+        """The callbacks that used the most time in total, most expensive first."""
+        return sorted(self._stats.values(), key=lambda stats: stats.total_ms, reverse=True)[:count]
+
+    def log_worst_offenders(self, count: int = 5) -> None:
+        for stats in self.worst_offenders(count):
+            logging.debug(
+                "Tick callback %s: %d calls, %d skipped, %.1f ms total, %.2f ms mean, %.1f ms max",
+                stats.name,
+                stats.calls,
+                stats.skipped,
+                stats.total_ms,
+                stats.mean_ms,
+                stats.max_ms,
+            )
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        # Catch up right away on widgets that skipped ticks while their bar was hidden instead of waiting
+        # for the next one. Showing the bar shows its widgets too, except those that hid themselves.
+        if event.type() == QEvent.Type.Show:
+            for subscription in self._owners.get(id(obj), [])[:]:
+                if subscription.active and subscription.missed:
+                    QTimer.singleShot(0, lambda s=subscription: self._resume(s))
+        return super().eventFilter(obj, event)
+
+    def _resume(self, subscription: TickSubscription) -> None:
+        if subscription.active and subscription.missed and not subscription.is_paused():
+            self._run(subscription)
+
+    def _run(self, subscription: TickSubscription) -> None:
+        subscription.missed = False
+        stats = subscription.stats
+        started = self._cost_clock()
+        try:
+            subscription.callback()
+        except Exception:
+            logging.exception("Tick callback %s failed", stats.name)
+        elapsed_ms = (self._cost_clock() - started) * 1000
+        stats.calls += 1
+        stats.total_ms += elapsed_ms
+        if elapsed_ms > stats.max_ms:
+            stats.max_ms = elapsed_ms
+        if elapsed_ms > SLOW_CALLBACK_MS:
+            logging.debug("Tick callback %s took %.1f ms", stats.name, elapsed_ms)
+
+    def _arm(self, bucket: _TickBucket) -> None:
+        bucket.timer.start(self.next_delay_ms(bucket.interval_ms))
+
+    def _owner_destroyed(self, key: int) -> None:
+        for subscription in self._owners.pop(key, [])[:]:
+            # The owner is already gone, so there is no event filter left to remove
+            subscription.owner = None
+            self.unsubscribe(subscription)
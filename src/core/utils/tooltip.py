@@ -12,6 +12,7 @@ from PyQt6.QtGui import QCursor, QGuiApplication
 from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QWidget
 
 from core.bar_helper import GlobalState
+from core.utils.tick_scheduler import TickScheduler, TickSubscription
 from core.utils.win32.backdrop import enable_blur
 
 
@@ -303,9 +304,7 @@ class TooltipEventFilter(QObject):
         self.hide_timer.timeout.connect(self._hide_tooltip)
         self._app_event_filter_installed = False
         self._mouse_inside = False
-        self.poll_timer = QTimer(self)
-        self.poll_timer.setInterval(50)
-        self.poll_timer.timeout.connect(self._poll_mouse)
+        self._poll_subscription: TickSubscription | None = None
         self.hover_timer = QTimer(self)
         self.hover_timer.setSingleShot(True)
         self.hover_timer.timeout.connect(self._on_hover_timer)
@@ -313,7 +312,7 @@ class TooltipEventFilter(QObject):
     def cleanup(self):
         """Clean up resources when the event filter is no longer needed."""
         self.hide_timer.stop()
-        self.poll_timer.stop()
+        self._stop_polling()
         self.hover_timer.stop()
 
         if self._app_event_filter_installed:
@@ -361,7 +360,10 @@ class TooltipEventFilter(QObject):
             QGuiApplication.instance().installEventFilter(self)
             self._app_event_filter_installed = True
         self._mouse_inside = True
-        self.poll_timer.start()
+        if self._poll_subscription is None:
+            self._poll_subscription = TickScheduler.shared().subscribe(
+                50, self._poll_mouse, owner=self.widget, name="TooltipEventFilter._poll_mouse"
+            )
 
     def update_tooltip_text(self, new_text):
         """Update tooltip text without hiding the tooltip if it's currently shown."""
@@ -377,10 +379,14 @@ class TooltipEventFilter(QObject):
             QGuiApplication.instance().removeEventFilter(self)
             self._app_event_filter_installed = False
         self._mouse_inside = False
-        self.poll_timer.stop()
+        self._stop_polling()
         # Clear reference to tooltip so it can be returned to pool
         self.tooltip = None
 
+    def _stop_polling(self):
+        TickScheduler.shared().unsubscribe(self._poll_subscription)
+        self._poll_subscription = None
+
     def _poll_mouse(self):
         pos = QCursor.pos()
         widget_rect = self.widget.rect()
@@ -0,0 +1,157 @@
+import logging
+from collections import OrderedDict
+
+import win32process
+from PIL import Image
+from PyQt6.QtGui import QImage, QPixmap
+
+from core.utils.singleton import Singleton
+from core.utils.win32.app_icons import get_window_icon
+from core.utils.win32.aumid import get_aumid_for_window
+from core.utils.win32.utils import get_process_info
+
+ICON_CACHE_MAX_ENTRIES = 256
+WINDOW_RECORDS_MAX_ENTRIES = 1024
+
+# Host processes whose windows show different icons, so their icons are cached per window
+PER_WINDOW_ICON_PROCESSES = frozenset(
+    {
+        "explorer.exe",
+        "mmc.exe",
+        "rundll32.exe",
+        "dllhost.exe",
+        "java.exe",
+        "javaw.exe",
+        "python.exe",
+        "pythonw.exe",
+    }
+)
+
+
+def _window_pid(hwnd: int) -> int:
+    try:
+        return win32process.GetWindowThreadProcessId(hwnd)[1]
+    except Exception:
+        return 0
+
+
+class IconCache(metaclass=Singleton):
+    """
+    Process-wide LRU cache of scaled window icons shared by all widgets and screens.
+
+    Icons are keyed by the application (AUMID or executable path), the logical icon size and the
+    device pixel ratio, so windows of the same application on any bar reuse one pixmap. Windows of
+    host processes (explorer, ...) are cached per window instead. A window's icon is re-extracted
+    once when its title changes, because host windows and applications with badges (unread counts,
+    status) change their icon along with the title.
+    """
+
+    def __init__(self, max_entries: int = ICON_CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._pixmaps: OrderedDict[tuple, QPixmap] = OrderedDict()
+        # hwnd -> (pid, title, identity)
+        self._windows: OrderedDict[int, tuple[int, str | None, tuple]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def window_icon(
+        self,
+        hwnd: int,
+        size: int,
+        dpr: float,
+        title: str | None = None,
+        process: dict | None = None,
+        refresh: bool = False,
+    ) -> QPixmap | None:
+        """
+        Return the icon of a window scaled to size logical pixels at the given device pixel ratio.
+        title is compared with the last title passed for the same window; None or "" leaves it untracked.
+        """
+        identity, title_changed = self._window_identity(hwnd, title, process)
+        key = (identity, size, round(dpr, 2))
+        if not refresh and not title_changed:
+            pixmap = self._pixmaps.get(key)
+            if pixmap is not None:
+                self._pixmaps.move_to_end(key)
+                self.hits += 1
+                return pixmap
+
+        self.misses += 1
+        icon_img = get_window_icon(hwnd)
+        if not icon_img:
+            return None
+        pixel_size = int(size * dpr)
+        icon_img = icon_img.resize((pixel_size, pixel_size), Image.LANCZOS).convert("RGBA")
+        qimage = QImage(icon_img.tobytes(), icon_img.width, icon_img.height, QImage.Format.Format_RGBA8888)
+        pixmap = QPixmap.fromImage(qimage)
+        pixmap.setDevicePixelRatio(dpr)
+
+        self._pixmaps[key] = pixmap
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self._max_entries:
+            self._pixmaps.popitem(last=False)
+            self.evictions += 1
+        return pixmap
+
+    def forget_window(self, hwnd: int) -> None:
+        """Forget a destroyed window. Icons cached for it alone are dropped, application icons stay shared."""
+        record = self._windows.pop(hwnd, None)
+        if record is None or record[2][0] != "hwnd":
+            return
+        identity = record[2]
+        for key in [key for key in self._pixmaps if key[0] == identity]:
+            del self._pixmaps[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._pixmaps),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _window_identity(self, hwnd: int, title: str | None, process: dict | None) -> tuple[tuple, bool]:
+        record = self._windows.get(hwnd)
+        if process is not None:
+            pid = process.get("pid", 0)
+        elif record is not None:
+            # Only the owner is checked for known windows, get_process_info also opens the process
+            pid = _window_pid(hwnd)
+        else:
+            process = get_process_info(hwnd)
+            pid = process.get("pid", 0)
+        if record is not None and record[0] == pid:
+            _, known_title, identity = record
+        else:
+            # New window, or the handle was reused by another process
+            if process is None:
+                process = get_process_info(hwnd)
+                pid = process.get("pid", 0)
+            identity = self._resolve_identity(hwnd, process)
+            known_title = None
+        if not title:
+            title = None
+        # Titles are compared per window, so windows of one application never invalidate each other
+        title_changed = title is not None and known_title is not None and known_title != title
+
+        self._windows[hwnd] = (pid, title if title is not None else known_title, identity)
+        self._windows.move_to_end(hwnd)
+        while len(self._windows) > WINDOW_RECORDS_MAX_ENTRIES:
+            self._windows.popitem(last=False)
+        return identity, title_changed
+
+    @staticmethod
+    def _resolve_identity(hwnd: int, process: dict) -> tuple:
+        path = process.get("path")
+        name = (process.get("name") or "").lower()
+        if not path or name in PER_WINDOW_ICON_PROCESSES:
+            return ("hwnd", hwnd, process.get("pid", 0))
+        try:
+            aumid = get_aumid_for_window(hwnd)
+        except Exception:
+            logging.debug("Failed to get AUMID for window with HWND %s", hwnd, exc_info=True)
+            aumid = None
+        if aumid:
+            return ("aumid", aumid)
+        return ("path", path.lower())
@@ -54,6 +54,8 @@ class ModelConfig(CustomBaseModel):
     top_p: float = 0.95
     max_image_size: int = Field(default=0, ge=0)
     max_attachment_size: int = Field(default=256, ge=0)
+    max_context_tokens: int = Field(default=0, ge=0)
+    max_context_images: int = Field(default=0, ge=0)
     instructions: str | None = None
 
 
@@ -72,6 +74,7 @@ class AiChatConfig(CustomBaseModel):
     icons: IconsConfig = IconsConfig()
     notification_dot: NotificationDotConfig = NotificationDotConfig()
     start_floating: bool = True
+    persist_history: bool = False
     callbacks: AiChatCallbacksConfig = AiChatCallbacksConfig()
     keybindings: list[KeybindingConfig] = []
     providers: list[ProviderConfig]
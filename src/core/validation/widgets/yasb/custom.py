@@ -17,6 +17,7 @@ class ExecOptionsConfig(CustomBaseModel):
     hide_empty: bool = False
     use_shell: bool = True
     encoding: str | None = None
+    stream: bool = False
 
 
 class CustomCallbacksConfig(CallbacksConfig):
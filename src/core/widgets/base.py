@@ -5,11 +5,13 @@ from collections.abc import Callable
 from typing import Any
 
 from pydantic import BaseModel
-from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QMouseEvent
 from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QWidget
 
 from core.events.service import EventService
+from core.utils.label_template import parse_label
+from core.utils.tick_scheduler import TickScheduler, TickSubscription
 from core.utils.win32.system_function import function_map
 from core.widgets.registry import register_widget_class
 
@@ -43,7 +45,7 @@ class BaseWidget(QWidget):
         else:
             self._widget_frame.setProperty("class", "widget")
 
-        self.timer = QTimer(self)
+        self._tick_subscription: TickSubscription | None = None
         self.mouseReleaseEvent = self._handle_mouse_events
         self.contextMenuEvent = lambda event: event.accept()
 
@@ -95,11 +97,19 @@ class BaseWidget(QWidget):
         self.callbacks[callback_name] = fn
 
     def start_timer(self):
-        if self.timer_interval and self.timer_interval > 0:
-            self.timer.timeout.connect(self._timer_callback)
-            self.timer.start(self.timer_interval)
+        if self.timer_interval and self.timer_interval > 0 and self._tick_subscription is None:
+            self._tick_subscription = TickScheduler.shared().subscribe(
+                self.timer_interval,
+                self._timer_callback,
+                owner=self,
+                name=f"{type(self).__name__}.{self.callback_timer}",
+            )
         self._timer_callback()
 
+    def stop_timer(self):
+        TickScheduler.shared().unsubscribe(self._tick_subscription)
+        self._tick_subscription = None
+
     def _handle_mouse_events(self, event: QMouseEvent):
         if event.button() == Qt.MouseButton.LeftButton:
             self._run_callback(self.callback_left)
@@ -156,24 +166,15 @@ class BaseWidget(QWidget):
         hide_icons: bool = False,
     ):
         def process_content(content: str, is_alt: bool = False) -> list[QLabel]:
-            label_parts = re.split(r"(<span.*?>.*?</span>)", content)
-            label_parts = [part for part in label_parts if part]
             widgets: list[QLabel] = []
-            for part in label_parts:
-                part = part.strip()
-                if not part:
-                    continue
-                is_icon = "<span" in part and "</span>" in part
-                if is_icon:
-                    class_name = re.search(r'class=(["\'])([^"\']+?)\1', part)
-                    class_result = class_name.group(2) if class_name else "icon"
-                    icon = re.sub(r"<span.*?>|</span>", "", part).strip()
-                    label = QLabel(icon)
-                    label.setProperty("class", class_result)
+            for part in parse_label(content):
+                if part.is_icon:
+                    label = QLabel(part.text)
+                    label.setProperty("class", part.class_name)
                     if hide_icons:
                         label.hide()
                 else:
-                    label = QLabel(part)
+                    label = QLabel(part.text)
                     label.setProperty("class", "label alt" if is_alt else "label")
                     if label_placeholder is not None:
                         label.setText(label_placeholder)
@@ -182,7 +183,7 @@ class BaseWidget(QWidget):
                 widgets.append(label)
                 if is_alt:
                     label.hide()
-                elif not (is_icon and hide_icons):
+                elif not (part.is_icon and hide_icons):
                     label.show()
             return widgets
 
@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import QLabel
 from core.utils.utilities import refresh_widget_style
 from core.validation.widgets.glazewm.binding_mode import GlazewmBindingModeConfig
 from core.widgets.base import BaseWidget
-from core.widgets.services.glazewm.client import BindingMode, GlazewmClient
+from core.widgets.services.glazewm.client import BindingMode, GlazewmClient, QueryType
 
 logger = logging.getLogger("glazewm_binding_mode")
 
@@ -30,15 +30,10 @@ class GlazewmBindingModeWidget(BaseWidget):
         self._init_container()
         self.build_widget_label(self._label_content, self._label_alt_content)
 
-        self.glazewm_client = GlazewmClient(
-            config.glazewm_server_uri,
-            [
-                "sub -e binding_modes_changed",
-                "query binding-modes",
-            ],
-        )
+        self.glazewm_client = GlazewmClient.shared(config.glazewm_server_uri)
         self.glazewm_client.glazewm_connection_status.connect(self._update_connection_status)
         self.glazewm_client.binding_mode_changed.connect(self._update_binding_mode)
+        self.glazewm_client.subscribe(["binding_modes_changed"], [QueryType.BINDING_MODES])
         self.glazewm_client.connect()
 
         self.register_callback("toggle_label", self._toggle_label)
@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import QHBoxLayout, QPushButton
 
 from core.validation.widgets.glazewm.tiling_direction import GlazewmTilingDirectionConfig
 from core.widgets.base import BaseWidget
-from core.widgets.services.glazewm.client import GlazewmClient, TilingDirection
+from core.widgets.services.glazewm.client import GlazewmClient, QueryType, TilingDirection
 
 logger = logging.getLogger("glazewm_tiling_direction")
 
@@ -33,15 +33,13 @@ class GlazewmTilingDirectionWidget(BaseWidget):
 
         self.widget_layout.addWidget(self.tiling_direction_button)
 
-        self.glazewm_client = GlazewmClient(
-            config.glazewm_server_uri,
-            [
-                "sub -e focus_changed tiling_direction_changed focused_container_moved",
-                "query tiling-direction",
-            ],
-        )
+        self.glazewm_client = GlazewmClient.shared(config.glazewm_server_uri)
         self.glazewm_client.glazewm_connection_status.connect(self._update_connection_status)  # type: ignore
         self.glazewm_client.tiling_direction_processed.connect(self._update_tiling_direction)  # type: ignore
+        self.glazewm_client.subscribe(
+            ["focus_changed", "tiling_direction_changed", "focused_container_moved"],
+            [QueryType.TILING_DIRECTION],
+        )
         self.glazewm_client.connect()
 
     @pyqtSlot()
@@ -3,17 +3,16 @@ import re
 from enum import StrEnum, auto
 from typing import override
 
-from PIL import Image
 from PyQt6.QtCore import Qt, pyqtSlot
-from PyQt6.QtGui import QImage, QMouseEvent, QPixmap, QShowEvent, QWheelEvent
+from PyQt6.QtGui import QMouseEvent, QPixmap, QShowEvent, QWheelEvent
 from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QPushButton, QSizePolicy, QWidget
 
 from core.utils.utilities import refresh_widget_style
-from core.utils.win32.app_icons import get_window_icon
+from core.utils.win32.icon_cache import IconCache
 from core.utils.win32.utils import get_monitor_hwnd, get_process_info
 from core.validation.widgets.glazewm.workspaces import GlazewmWorkspacesConfig
 from core.widgets.base import BaseWidget
-from core.widgets.services.glazewm.client import GlazewmClient, Monitor, Window, Workspace
+from core.widgets.services.glazewm.client import GlazewmClient, Monitor, QueryType, Window, Workspace
 
 logger = logging.getLogger("glazewm_workspaces")
 
@@ -269,33 +268,9 @@ class GlazewmWorkspaceButtonWithIcons(QFrame):
                     return None
 
             self.dpi = self.screen().devicePixelRatio()
-            cache_key = (hwnd, pid, self.dpi)
-
-            if cache_key in self.parent_widget.icon_cache and not ignore_cache:
-                return self.parent_widget.icon_cache[cache_key]
-            else:
-                icon_img = get_window_icon(hwnd)
-                if icon_img:
-                    icon_img = icon_img.resize(
-                        (
-                            int(self.config.app_icons.size * self.dpi),
-                            int(self.config.app_icons.size * self.dpi),
-                        ),
-                        Image.LANCZOS,
-                    ).convert("RGBA")
-                    qimage = QImage(
-                        icon_img.tobytes(),
-                        icon_img.width,
-                        icon_img.height,
-                        QImage.Format.Format_RGBA8888,
-                    )
-                    pixmap = QPixmap.fromImage(qimage)
-                    pixmap.setDevicePixelRatio(self.dpi)
-                    pixmap.glazewm_id = window.id
-                    self.parent_widget.icon_cache[cache_key] = pixmap
-                    return pixmap
-                else:
-                    return None
+            return IconCache().window_icon(
+                hwnd, self.config.app_icons.size, self.dpi, title=window.title, process=process, refresh=ignore_cache
+            )
 
         except Exception:
             logging.debug("Failed to get icons for window with HWND %s", hwnd, exc_info=True)
@@ -366,16 +341,19 @@ class GlazewmWorkspacesWidget(BaseWidget):
         self.widget_layout.addWidget(self.offline_text)
         self.widget_layout.addWidget(self.workspace_container)
 
-        self.glazewm_client = GlazewmClient(
-            self.config.glazewm_server_uri,
+        self.glazewm_client = GlazewmClient.shared(self.config.glazewm_server_uri)
+        self.glazewm_client.glazewm_connection_status.connect(self._update_connection_status)  # type: ignore
+        self.glazewm_client.workspaces_data_processed.connect(self._update_workspaces)  # type: ignore
+        self.glazewm_client.subscribe(
             [
-                "sub -e workspace_activated workspace_deactivated workspace_updated focus_changed focused_container_moved",
-                "query monitors",
+                "workspace_activated",
+                "workspace_deactivated",
+                "workspace_updated",
+                "focus_changed",
+                "focused_container_moved",
             ],
+            [QueryType.MONITORS],
         )
-        self.glazewm_client.glazewm_connection_status.connect(self._update_connection_status)  # type: ignore
-        self.glazewm_client.workspaces_data_processed.connect(self._update_workspaces)  # type: ignore
-        self.icon_cache = dict()
         self.workspace_app_icons_enabled = (
             self.config.app_icons.enabled_populated
             or self.config.app_icons.enabled_active
@@ -387,6 +365,9 @@ class GlazewmWorkspacesWidget(BaseWidget):
         super().showEvent(a0)
         self.monitor_handle = get_monitor_hwnd(int(QWidget.winId(self)))
         self.glazewm_client.connect()
+        # The shared client may already know the workspaces if another bar connected first
+        if self.glazewm_client.monitors is not None:
+            self._update_workspaces(self.glazewm_client.monitors)
 
     @pyqtSlot(bool)
     def _update_connection_status(self, status: bool):
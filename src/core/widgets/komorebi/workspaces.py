@@ -2,19 +2,19 @@ import logging
 from contextlib import suppress
 from typing import Literal
 
-from PIL import Image
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QImage, QMouseEvent, QPixmap
+from PyQt6.QtGui import QMouseEvent, QPixmap
 from PyQt6.QtWidgets import QFrame, QHBoxLayout, QLabel, QPushButton, QSizePolicy, QWidget
 
 from core.events.komorebi import KomorebiEvent
 from core.events.service import EventService
 from core.utils.utilities import refresh_widget_style
-from core.utils.win32.app_icons import get_window_icon
+from core.utils.win32.icon_cache import IconCache
 from core.utils.win32.utils import get_monitor_hwnd, get_process_info
 from core.validation.widgets.komorebi.workspaces import KomorebiWorkspacesConfig
 from core.widgets.base import BaseWidget
 from core.widgets.services.komorebi.client import KomorebiClient
+from core.widgets.services.komorebi.state_diff import StateChangeKind, StateChangeSet
 
 try:
     from core.widgets.services.komorebi.event_listener import KomorebiEventListener
@@ -201,7 +201,7 @@ class WorkspaceButtonWithIcons(QFrame):
 
 class WorkspaceWidget(BaseWidget):
     k_signal_connect = pyqtSignal(dict)
-    k_signal_update = pyqtSignal(dict, dict)
+    k_signal_update = pyqtSignal(dict, dict, object)
     k_signal_disconnect = pyqtSignal()
     validation_schema = KomorebiWorkspacesConfig
     event_listener = KomorebiEventListener
@@ -219,8 +219,7 @@ class WorkspaceWidget(BaseWidget):
         self._komorebi_workspaces = []
         self._prev_workspace_index = None
         self._curr_workspace_index = None
-        self._prev_num_windows_in_workspaces = []
-        self._curr_num_windows_in_workspaces = []
+        self._screen_hwnd = None
         self._workspace_buttons: list[WorkspaceButton] = []
         self._workspace_focus_events = [
             KomorebiEvent.CycleFocusWorkspace.value,
@@ -230,19 +229,6 @@ class WorkspaceWidget(BaseWidget):
             KomorebiEvent.FocusWorkspaceNumber.value,
             KomorebiEvent.ToggleWorkspaceLayer.value,
         ]
-        self._update_buttons_event_watchlist = [
-            KomorebiEvent.EnsureWorkspaces.value,
-            KomorebiEvent.Manage.value,
-            KomorebiEvent.MoveContainerToWorkspaceNumber.value,
-            KomorebiEvent.NewWorkspace.value,
-            KomorebiEvent.ReloadConfiguration.value,
-            KomorebiEvent.SendContainerToMonitorNumber.value,
-            KomorebiEvent.SendContainerToWorkspaceNumber.value,
-            KomorebiEvent.Unmanage.value,
-            KomorebiEvent.WatchConfiguration.value,
-            KomorebiEvent.WorkspaceName.value,
-            KomorebiEvent.Cloak.value,
-        ]
         if self.config.hide_if_offline:
             self.hide()
         # Status text shown when komorebi state can't be retrieved
@@ -272,7 +258,6 @@ class WorkspaceWidget(BaseWidget):
             self.workspace_layer_label.setProperty("class", "workspace-layer")
             self.widget_layout.addWidget(self.workspace_layer_label)
 
-        self._icon_cache = dict()
         self.dpi = None
 
         self._register_signals_and_events()
@@ -283,7 +268,7 @@ class WorkspaceWidget(BaseWidget):
         self.k_signal_disconnect.connect(self._on_komorebi_disconnect_event)
         self._event_service.register_event(KomorebiEvent.KomorebiConnect, self.k_signal_connect)
         self._event_service.register_event(KomorebiEvent.KomorebiDisconnect, self.k_signal_disconnect)
-        self._event_service.register_event(KomorebiEvent.KomorebiUpdate, self.k_signal_update)
+        self._event_service.register_event(KomorebiEvent.KomorebiChange, self.k_signal_update)
         try:
             self.destroyed.connect(self._on_destroyed)  # type: ignore[attr-defined]
         except Exception:
@@ -293,7 +278,7 @@ class WorkspaceWidget(BaseWidget):
         try:
             self._event_service.unregister_event(KomorebiEvent.KomorebiConnect, self.k_signal_connect)
             self._event_service.unregister_event(KomorebiEvent.KomorebiDisconnect, self.k_signal_disconnect)
-            self._event_service.unregister_event(KomorebiEvent.KomorebiUpdate, self.k_signal_update)
+            self._event_service.unregister_event(KomorebiEvent.KomorebiChange, self.k_signal_update)
         except Exception:
             pass
 
@@ -311,6 +296,7 @@ class WorkspaceWidget(BaseWidget):
         self._hide_offline_status()
         if self._update_komorebi_state(state):
             self._add_or_update_buttons()
+            self._update_float_override_label(state)
         if self.config.hide_if_offline:
             self.show()
 
@@ -319,78 +305,76 @@ class WorkspaceWidget(BaseWidget):
         if self.config.hide_if_offline:
             self.hide()
 
-    def _on_komorebi_update_event(self, event: dict, state: dict) -> None:
-        if self._update_komorebi_state(state):
-            if self._workspace_app_icons_enabled:
-                try:
-                    if event["type"] in ["ToggleFloat"]:
-                        self._workspace_buttons[self._curr_workspace_index].update_icons()
-                    if self._has_active_workspace_index_changed():
-                        self._workspace_buttons[self._prev_workspace_index].update_icons()
-                        self._workspace_buttons[self._curr_workspace_index].update_icons()
-                    for i in range(len(self._komorebi_workspaces)):
-                        if self._prev_num_windows_in_workspaces[i] != self._curr_num_windows_in_workspaces[i]:
-                            self._workspace_buttons[i].update_icons()
-                        elif event["type"] in [KomorebiEvent.TitleUpdate.value]:
-                            hwnd = event["content"][1]["hwnd"]
-                            self._workspace_buttons[i].update_icon_by_hwnd(hwnd)
-                except IndexError, TypeError:
-                    pass
-
-            if event["type"] == KomorebiEvent.MoveWorkspaceToMonitorNumber.value:
-                if event["content"] != self._komorebi_screen["index"]:
-                    workspaces = self._komorebic.get_workspaces(self._komorebi_screen)
-                    screen_workspace_indexes = list(map(lambda ws: ws["index"], workspaces))
-                    button_workspace_indexes = list(map(lambda ws: ws.workspace_index, self._workspace_buttons))
-                    unknown_indexes = set(button_workspace_indexes) - set(screen_workspace_indexes)
-                    if len(unknown_indexes) >= 0:
-                        for workspace_index in unknown_indexes:
-                            self._try_remove_workspace_button(workspace_index)
-                self._add_or_update_buttons()
-            elif event["type"] in self._workspace_focus_events or self._has_active_workspace_index_changed():
-                # send workspace_update event to active_window widgets
-                self._event_service.emit_event("workspace_update", event["type"])
-                try:
-                    prev_workspace_button = self._workspace_buttons[self._prev_workspace_index]
-                    self._update_button(prev_workspace_button)
-                    new_workspace_button = self._workspace_buttons[self._curr_workspace_index]
-                    self._update_button(new_workspace_button)
-                except IndexError, TypeError:
-                    self._add_or_update_buttons()
-            elif event["type"] in self._update_buttons_event_watchlist:
-                self._add_or_update_buttons()
-
-            # Update workspace button if number of windows in workspace changes
-            for i in range(len(self._komorebi_workspaces)):
-                if (
-                    self._prev_num_windows_in_workspaces[i] != self._curr_num_windows_in_workspaces[i]
-                    and self._curr_num_windows_in_workspaces[i] == 0
-                ):
-                    self._update_button(self._workspace_buttons[i])
-
-            # Remove workspace button if workspace is closed
-            if event["type"] == KomorebiEvent.CloseWorkspace.value:
-                workspaces = self._komorebic.get_workspaces(self._komorebi_screen)
-                screen_workspace_indexes = list(map(lambda ws: ws["index"], workspaces))
-                button_workspace_indexes = list(map(lambda ws: ws.workspace_index, self._workspace_buttons))
-                unknown_indexes = set(button_workspace_indexes) - set(screen_workspace_indexes)
-                if len(unknown_indexes) >= 0:
-                    for workspace_index in unknown_indexes:
-                        self._try_remove_workspace_button(workspace_index)
-                    self._add_or_update_buttons()
-
-            if event["type"] == KomorebiEvent.FocusChange.value:
-                self._get_workspace_layer(self._curr_workspace_index)
-
-            # Show float override label if float override is active
-            if state.get("float_override") and self.config.label_float_override:
-                self.float_override_label.show()
-            else:
-                self.float_override_label.hide()
+    def _on_komorebi_update_event(self, event: dict, state: dict, changes: StateChangeSet) -> None:
+        event_type = event["type"]
+        if self._screen_hwnd is None:
+            # Created after the connect event was emitted, so nothing is known yet to diff against
+            if self._update_komorebi_state(state):
+                self._sync_workspace_buttons()
+                self._update_float_override_label(state)
+        else:
+            # Changes on other monitors never affect the buttons of this one
+            changes = changes.for_monitor(self._screen_hwnd)
+            if (
+                changes or event_type in self._workspace_focus_events or event_type == KomorebiEvent.TitleUpdate.value
+            ) and self._update_komorebi_state(state):
+                self._apply_state_changes(event, state, changes)
 
         # send workspace_update event to active_window widgets
-        if event["type"] in ["MoveWindow", "Show", "Hide", "Destroy"]:
-            self._event_service.emit_event("workspace_update", event["type"])
+        if event_type in ["MoveWindow", "Show", "Hide", "Destroy"]:
+            self._event_service.emit_event("workspace_update", event_type)
+
+    def _apply_state_changes(self, event: dict, state: dict, changes: StateChangeSet) -> None:
+        event_type = event["type"]
+        focused = set()
+        for change in changes.of(StateChangeKind.WORKSPACE_FOCUS_CHANGED):
+            focused.update(index for index in (change.old, change.new) if index is not None)
+
+        if changes.has(StateChangeKind.WORKSPACE_ADDED, StateChangeKind.WORKSPACE_REMOVED):
+            self._sync_workspace_buttons()
+        else:
+            dirty = focused | changes.workspace_indexes(
+                StateChangeKind.WORKSPACE_RENAMED, StateChangeKind.WINDOW_COUNT_CHANGED
+            )
+            for workspace_index in sorted(dirty):
+                if workspace_index < len(self._workspace_buttons):
+                    self._update_button(self._workspace_buttons[workspace_index])
+
+        if event_type in self._workspace_focus_events or focused:
+            # send workspace_update event to active_window widgets
+            self._event_service.emit_event("workspace_update", event_type)
+
+        if self._workspace_app_icons_enabled:
+            try:
+                for workspace_index in sorted(focused | changes.workspace_indexes(StateChangeKind.WINDOWS_CHANGED)):
+                    self._workspace_buttons[workspace_index].update_icons()
+                if event_type == KomorebiEvent.TitleUpdate.value:
+                    hwnd = event["content"][1]["hwnd"]
+                    for workspace_btn in self._workspace_buttons:
+                        workspace_btn.update_icon_by_hwnd(hwnd)
+            except IndexError, TypeError:
+                pass
+
+        if focused or changes.has(StateChangeKind.LAYER_CHANGED):
+            self._get_workspace_layer(self._curr_workspace_index)
+
+        if changes.has(StateChangeKind.FLOAT_OVERRIDE_CHANGED):
+            self._update_float_override_label(state)
+
+    def _sync_workspace_buttons(self) -> None:
+        """Hide buttons of workspaces that no longer exist on this monitor and add buttons for new ones."""
+        screen_workspace_indexes = {ws["index"] for ws in self._komorebi_workspaces}
+        button_workspace_indexes = {ws_btn.workspace_index for ws_btn in self._workspace_buttons}
+        for workspace_index in button_workspace_indexes - screen_workspace_indexes:
+            self._try_remove_workspace_button(workspace_index)
+        self._add_or_update_buttons()
+
+    def _update_float_override_label(self, state: dict) -> None:
+        # Show float override label if float override is active
+        if state.get("float_override") and self.config.label_float_override:
+            self.float_override_label.show()
+        else:
+            self.float_override_label.hide()
 
     def _clear_container_layout(self):
         for i in reversed(range(self._workspace_container_layout.count())):
@@ -409,15 +393,6 @@ class WorkspaceWidget(BaseWidget):
                 if focused_workspace:
                     self._prev_workspace_index = self._curr_workspace_index
                     self._curr_workspace_index = focused_workspace["index"]
-
-                self._curr_num_windows_in_workspaces = self._curr_num_windows_in_workspaces[
-                    : len(self._komorebi_workspaces)
-                ] + [0] * (len(self._komorebi_workspaces) - len(self._curr_num_windows_in_workspaces))
-                self._prev_num_windows_in_workspaces = self._curr_num_windows_in_workspaces.copy()
-                for i in range(len(self._komorebi_workspaces)):
-                    windows = self._get_all_windows_in_workspace(i)
-                    self._curr_num_windows_in_workspaces[i] = len(windows) if windows else 0
-
                 return True
         except TypeError:
             return False
@@ -425,9 +400,6 @@ class WorkspaceWidget(BaseWidget):
     def _get_focused_workspace(self):
         return self._komorebic.get_focused_workspace(self._komorebi_screen)
 
-    def _has_active_workspace_index_changed(self):
-        return self._prev_workspace_index != self._curr_workspace_index
-
     def _get_workspace_new_status(self, workspace) -> WorkspaceStatus:
         if self._curr_workspace_index == workspace["index"]:
             return WORKSPACE_STATUS_ACTIVE
@@ -630,28 +602,9 @@ class WorkspaceWidget(BaseWidget):
                     return None
 
             self.dpi = self.screen().devicePixelRatio()
-            cache_key = (hwnd, self.dpi)
-
-            if cache_key in self._icon_cache and not ignore_cache:
-                icon_img = self._icon_cache[cache_key]
-            else:
-                icon_img = get_window_icon(hwnd)
-
-            if icon_img:
-                icon_img = icon_img.resize(
-                    (
-                        int(self.config.app_icons.size * self.dpi),
-                        int(self.config.app_icons.size * self.dpi),
-                    ),
-                    Image.LANCZOS,
-                ).convert("RGBA")
-                self._icon_cache[cache_key] = icon_img
-                qimage = QImage(icon_img.tobytes(), icon_img.width, icon_img.height, QImage.Format.Format_RGBA8888)
-                pixmap = QPixmap.fromImage(qimage)
-                pixmap.setDevicePixelRatio(self.dpi)
-                return pixmap
-            else:
-                return None
+            return IconCache().window_icon(
+                hwnd, self.config.app_icons.size, self.dpi, process=process, refresh=ignore_cache
+            )
         except Exception:
             logging.debug("Failed to get icons for window with HWND %s", hwnd, exc_info=True)
             return None
@@ -3,9 +3,9 @@ from datetime import datetime
 from PyQt6.QtCore import QPropertyAnimation, Qt, QTimer
 from PyQt6.QtWidgets import QLabel, QVBoxLayout, QWidget
 
+from core.widgets.services.ai_chat.chat_transcript import ChatTranscript, detach_last_row
 from core.widgets.services.ai_chat.constants import (
     BATCH_RENDER_DELAY_MS,
-    BATCH_RENDER_SIZE,
     SCROLL_ANIMATION_MS,
     THINKING_PLACEHOLDER,
 )
@@ -16,13 +16,10 @@ class ChatRender:
         self._owner = owner
         self._history_to_load: list[dict] | None = None
         self._streaming_partial_to_load: str | None = None
-        self._message_batch_index: int | None = None
-        self._batch_size: int = BATCH_RENDER_SIZE
 
     def clear_batch_state(self):
         self._history_to_load = None
         self._streaming_partial_to_load = None
-        self._message_batch_index = None
 
     def render_chat_history(self):
         self.clear_batch_state()
@@ -76,13 +73,11 @@ class ChatRender:
             last_msg = filtered_history[-1]
             if last_msg["role"] == "assistant":
                 filtered_history = filtered_history[:-1]
-        self._message_batch_index = 0
         self._history_to_load = filtered_history
         self._streaming_partial_to_load = streaming_partial
-        self._batch_size = BATCH_RENDER_SIZE
-        self.load_next_message_batch()
+        self.load_transcript()
 
-    def load_next_message_batch(self):
+    def load_transcript(self):
         if not hasattr(self._owner, "chat_layout"):
             return
         chat_layout = self._owner.chat_layout
@@ -95,39 +90,34 @@ class ChatRender:
         if self._history_to_load is None:
             return
 
-        total = len(self._history_to_load)
-        start_idx = self._message_batch_index or 0
-        end_idx = min(start_idx + self._batch_size, total)
-
-        for idx in range(start_idx, end_idx):
-            msg = self._history_to_load[idx]
-            display_text = self._owner._chat_session.history.compute_display_for_history_entry(msg)
-            self._owner._append_message(msg["role"], display_text)
-
-        self._message_batch_index = end_idx
-
-        if self._message_batch_index < total:
-            QTimer.singleShot(BATCH_RENDER_DELAY_MS, self.load_next_message_batch)
-        else:
-            if self._streaming_partial_to_load is not None:
-                partial = self._streaming_partial_to_load or THINKING_PLACEHOLDER
-                self._owner._append_message("assistant", partial)
-                msg_label = self._owner._chat_session.find_last_assistant_label(self._owner.chat_layout)
-                if self._owner._chat_session.stream.in_progress and msg_label is not None:
-                    self._owner._chat_session.stream.msg_label = msg_label
-                    if hasattr(self._owner, "_worker"):
-                        try:
-                            self._owner._worker.chunk_signal.disconnect(
-                                self._owner._stream_worker_manager.streaming_chunk_handler
-                            )
-                        except Exception:
-                            pass
-                        self._owner._worker.chunk_signal.connect(
+        if self._history_to_load:
+            messages = [
+                (msg["role"], self._owner._chat_session.history.compute_display_for_history_entry(msg))
+                for msg in self._history_to_load
+            ]
+            # Restored messages only get widgets near the viewport, so opening a long session
+            # costs about as much as opening a short one
+            transcript = ChatTranscript(self._owner, messages, self._owner.chat_scroll, max(chat_layout.spacing(), 0))
+            chat_layout.insertWidget(chat_layout.count() - 1, transcript)
+            transcript.schedule_update()
+
+        if self._streaming_partial_to_load is not None:
+            partial = self._streaming_partial_to_load or THINKING_PLACEHOLDER
+            self._owner._append_message("assistant", partial)
+            msg_label = self._owner._chat_session.find_last_assistant_label(self._owner.chat_layout)
+            if self._owner._chat_session.stream.in_progress and msg_label is not None:
+                self._owner._chat_session.stream.msg_label = msg_label
+                if hasattr(self._owner, "_worker"):
+                    try:
+                        self._owner._worker.chunk_signal.disconnect(
                             self._owner._stream_worker_manager.streaming_chunk_handler
                         )
-                    if not self._streaming_partial_to_load:
-                        self._owner._stream_ui.start_thinking_animation(msg_label)
-            self.clear_batch_state()
+                    except Exception:
+                        pass
+                    self._owner._worker.chunk_signal.connect(self._owner._stream_worker_manager.streaming_chunk_handler)
+                if not self._streaming_partial_to_load:
+                    self._owner._stream_ui.start_thinking_animation(msg_label)
+        self.clear_batch_state()
 
     def remove_placeholder(self):
         for i in reversed(range(self._owner.chat_layout.count())):
@@ -140,14 +130,11 @@ class ChatRender:
                 break
 
     def remove_last_message(self):
-        if self._owner.chat_layout.count() > 1:
-            item = self._owner.chat_layout.itemAt(self._owner.chat_layout.count() - 2)
-            if item:
-                widget = item.widget()
-                if widget:
-                    self._owner.chat_layout.removeWidget(widget)
-                    widget.setParent(None)
-                    widget.deleteLater()
+        widget = detach_last_row(self._owner.chat_layout)
+        if widget:
+            self._owner.chat_layout.removeWidget(widget)
+            widget.setParent(None)
+            widget.deleteLater()
 
     def scroll_to_bottom(self):
         """Smoothly scroll chat area to bottom."""
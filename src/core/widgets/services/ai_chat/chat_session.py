@@ -3,8 +3,10 @@ from dataclasses import dataclass
 
 from PyQt6.QtWidgets import QTextBrowser, QWidget
 
+from core.widgets.services.ai_chat.chat_transcript import ChatTranscript, detach_last_row, last_chat_item
 from core.widgets.services.ai_chat.constants import THINKING_PLACEHOLDER
-from core.widgets.services.ai_chat.message_composer import format_attachments_for_display
+from core.widgets.services.ai_chat.history_store import ChatHistoryStore
+from core.widgets.services.ai_chat.message_composer import ContextBuilder, format_attachments_for_display
 
 
 @dataclass
@@ -15,19 +17,59 @@ class StreamState:
 
 
 class ChatHistoryManager:
-    def __init__(self, history_store: dict, size_formatter: Callable[[int], str]):
+    def __init__(
+        self,
+        history_store: dict,
+        size_formatter: Callable[[int], str],
+        disk_store: ChatHistoryStore | None = None,
+        session_name: Callable[[tuple], str] | None = None,
+    ):
         self._store = history_store
         self._size_formatter = size_formatter
+        self._disk_store = disk_store
+        self._session_name = session_name
+        self._loaded: set = set()
+
+    def _session(self, key) -> str | None:
+        if self._disk_store is None or self._session_name is None:
+            return None
+        return self._session_name(key)
+
+    def _ensure_loaded(self, key):
+        """Restore a history from disk the first time its key is used."""
+        if key in self._loaded:
+            return
+        self._loaded.add(key)
+        session = self._session(key)
+        if session is not None and key not in self._store:
+            history = self._disk_store.load(session)
+            if history:
+                self._store[key] = history
 
     def get(self, key) -> list[dict]:
+        self._ensure_loaded(key)
         return self._store.get(key, [])
 
     def set(self, key, history: list[dict]):
+        self._loaded.add(key)
         self._store[key] = list(history)
+        session = self._session(key)
+        if session is not None:
+            self._disk_store.rewrite(session, self._store[key])
+
+    def compact(self, key):
+        """Compact the on-disk log of a history if it has grown much larger than the history."""
+        session = self._session(key)
+        if session is not None:
+            self._disk_store.maybe_compact(session, self.get(key))
 
     def clear(self, key):
+        self._loaded.add(key)
         if key in self._store:
             del self._store[key]
+        session = self._session(key)
+        if session is not None:
+            self._disk_store.clear(session)
 
     def add_entry(
         self,
@@ -37,6 +79,7 @@ class ChatHistoryManager:
         user_text: str | None = None,
         attachments: list[dict] | None = None,
     ):
+        self._ensure_loaded(key)
         if key not in self._store:
             self._store[key] = []
 
@@ -47,30 +90,50 @@ class ChatHistoryManager:
         if attachments:
             entry["attachments"] = attachments
         history.append(entry)
+        session = self._session(key)
+        if session is not None:
+            self._disk_store.append_entry(session, entry)
         return entry
 
+    def update_entry(self, key, entry: dict, **fields) -> bool:
+        """Update fields of an entry of the history and record the change."""
+        history = self.get(key)
+        for index in range(len(history) - 1, -1, -1):
+            if history[index] is entry:
+                entry.update(fields)
+                session = self._session(key)
+                if session is not None:
+                    self._disk_store.update_entry(session, index, fields)
+                return True
+        return False
+
     def update_last_assistant(self, key, content: str) -> bool:
-        history = self._store.get(key, [])
+        history = self.get(key)
         if history and history[-1].get("role") == "assistant":
-            history[-1]["content"] = content
-            return True
+            return self.update_entry(key, history[-1], content=content)
         return False
 
+    def _pop_last(self, key):
+        self._store[key].pop()
+        session = self._session(key)
+        if session is not None:
+            self._disk_store.pop_entry(session)
+
     def remove_last_assistant_if_empty(self, key) -> bool:
         """Remove the last assistant entry if it's empty or just 'thinking...'"""
-        history = self._store.get(key, [])
+        history = self.get(key)
         if history and history[-1].get("role") == "assistant":
             content = history[-1].get("content", "")
             if not content or content == THINKING_PLACEHOLDER:
-                history.pop()
+                self._pop_last(key)
                 return True
         return False
 
     def remove_last_user(self, key) -> bool:
         """Remove the last user entry from history"""
-        history = self._store.get(key, [])
+        history = self.get(key)
         if history and history[-1].get("role") == "user":
-            history.pop()
+            self._pop_last(key)
             return True
         return False
 
@@ -91,9 +154,17 @@ class ChatHistoryManager:
 
 
 class ChatSession:
-    def __init__(self, history_store: dict, size_formatter: Callable[[int], str], instance_id: int):
+    def __init__(
+        self,
+        history_store: dict,
+        size_formatter: Callable[[int], str],
+        instance_id: int,
+        disk_store: ChatHistoryStore | None = None,
+        session_name: Callable[[tuple], str] | None = None,
+    ):
         self._instance_id = instance_id
-        self.history = ChatHistoryManager(history_store, size_formatter)
+        self.history = ChatHistoryManager(history_store, size_formatter, disk_store, session_name)
+        self.context = ContextBuilder()
         self.stream = StreamState()
 
     def history_key(self, provider: str | None, model: str | None):
@@ -104,8 +175,7 @@ class ChatSession:
 
     def save_history(self, provider: str | None, model: str | None):
         if provider and model is not None:
-            key = self.history_key(provider, model)
-            self.history.set(key, list(self.history.get(key)))
+            self.history.compact(self.history_key(provider, model))
 
     def clear_history(self, provider: str | None, model: str | None):
         self.history.clear(self.history_key(provider, model))
@@ -134,7 +204,14 @@ class ChatSession:
         self.stream.partial_text = text
 
     def get_last_message_role(self, chat_layout):
-        row_widget = self._get_last_row_widget(chat_layout)
+        """
+        Role of the last message and, for an assistant message, its label to stream into.
+        A restored assistant message is detached from the transcript for that.
+        """
+        item = last_chat_item(chat_layout)
+        if isinstance(item, ChatTranscript) and item.last_role != "assistant":
+            return ("user" if item.last_role == "user" else None), None
+        row_widget = detach_last_row(chat_layout)
         if not row_widget:
             return None, None
 
@@ -149,7 +226,11 @@ class ChatSession:
         return None, None
 
     def find_last_assistant_label(self, chat_layout) -> QTextBrowser | None:
-        row_widget = self._get_last_row_widget(chat_layout)
+        """The label of the last message if it is an assistant message, detached from the transcript to be edited."""
+        item = last_chat_item(chat_layout)
+        if isinstance(item, ChatTranscript) and item.last_role != "assistant":
+            return None
+        row_widget = detach_last_row(chat_layout)
         if not row_widget:
             return None
         return self._find_label_in_row(row_widget, "assistant-message")
@@ -171,18 +252,3 @@ class ChatSession:
                         if isinstance(inner, QTextBrowser):
                             return inner
         return None
-
-    @staticmethod
-    def _get_last_row_widget(chat_layout) -> QWidget | None:
-        if chat_layout is None:
-            return None
-        last_idx = chat_layout.count() - 2
-        if last_idx < 0:
-            return None
-        item = chat_layout.itemAt(last_idx)
-        if not item:
-            return None
-        widget = item.widget()
-        if widget and isinstance(widget, QWidget):
-            return widget
-        return None
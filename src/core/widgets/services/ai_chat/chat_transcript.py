@@ -0,0 +1,234 @@
+"""
+Virtualized view of a restored chat history.
+
+Only messages near the visible part of the chat area exist as widgets. The messages above and
+below them are stood in for by two spacers whose heights come from measured row heights, or from
+an estimate based on the message text for rows that have never been shown. last_chat_item() looks
+up the last item of the chat, which may be a transcript. Code that works on the last row of the
+chat (streaming into it, removing it) gets it through detach_last_row(), which moves the last
+restored message out of the transcript into a regular row first.
+"""
+
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt6.QtWidgets import QScrollArea, QSizePolicy, QVBoxLayout, QWidget
+
+from core.widgets.services.ai_chat.constants import (
+    TRANSCRIPT_CHARS_PER_LINE,
+    TRANSCRIPT_LINE_HEIGHT_PX,
+    TRANSCRIPT_MIN_ROW_HEIGHT_PX,
+    TRANSCRIPT_OVERSCAN_SCREENS,
+)
+
+
+def _estimate_row_height(text: str) -> int:
+    lines = sum(max(1, -(-len(line) // TRANSCRIPT_CHARS_PER_LINE)) for line in text.split("\n"))
+    return TRANSCRIPT_MIN_ROW_HEIGHT_PX + lines * TRANSCRIPT_LINE_HEIGHT_PX
+
+
+class ChatTranscript(QWidget):
+    def __init__(self, owner, messages: list[tuple[str, str]], scroll_area: QScrollArea, spacing: int):
+        super().__init__()
+        self._owner = owner
+        self._messages = messages
+        self._scroll = scroll_area
+        self._spacing = spacing
+        self._heights: list[int | None] = [None] * len(messages)
+        self._estimates: list[int | None] = [None] * len(messages)
+        self._rows: dict[int, QWidget] = {}
+        self._start = 0
+        self._end = 0
+        self._width = -1
+
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(spacing)
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self._top_spacer = QWidget()
+        self._bottom_spacer = QWidget()
+        for spacer in (self._top_spacer, self._bottom_spacer):
+            spacer.setFixedHeight(0)
+            spacer.setVisible(False)
+            layout.addWidget(spacer)
+
+        # Coalesce scroll and resize notifications into one window update per event loop pass
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(0)
+        self._update_timer.timeout.connect(self._update_window)
+        scroll_area.verticalScrollBar().valueChanged.connect(self.schedule_update)
+
+    @property
+    def message_count(self) -> int:
+        return len(self._messages)
+
+    @property
+    def last_role(self) -> str | None:
+        return self._messages[-1][0] if self._messages else None
+
+    def take_last_row(self) -> QWidget | None:
+        """Remove the last message from the transcript and return its row widget, None if there is none."""
+        if not self._messages:
+            return None
+        index = len(self._messages) - 1
+        role, text = self._messages.pop()
+        self._heights.pop()
+        self._estimates.pop()
+        row = self._rows.pop(index, None)
+        if row is not None:
+            row.removeEventFilter(self)
+            self.layout().removeWidget(row)
+            row.setProperty("_transcript_index", None)
+        else:
+            row = self._owner._build_message_row(role, text)
+        self._end = min(self._end, index)
+        self._start = min(self._start, self._end)
+        self._update_spacers()
+        self.schedule_update()
+        return row
+
+    def schedule_update(self, *_):
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _row_height(self, index: int) -> int:
+        height = self._heights[index]
+        if height is not None:
+            return height
+        estimate = self._estimates[index]
+        if estimate is None:
+            estimate = _estimate_row_height(self._messages[index][1])
+            self._estimates[index] = estimate
+        return estimate
+
+    def _span_height(self, start: int, end: int) -> int:
+        if end <= start:
+            return 0
+        return sum(self._row_height(i) for i in range(start, end)) + self._spacing * (end - start - 1)
+
+    def _visible_range(self) -> tuple[int, int]:
+        count = len(self._messages)
+        viewport_height = self._scroll.viewport().height()
+        top = self._scroll.verticalScrollBar().value() - self.y()
+        overscan = viewport_height * TRANSCRIPT_OVERSCAN_SCREENS
+        low, high = top - overscan, top + viewport_height + overscan
+
+        start = None
+        end = count
+        y = 0
+        for i in range(count):
+            if y > high:
+                end = i
+                break
+            y += self._row_height(i)
+            if start is None and y >= low:
+                start = i
+            y += self._spacing
+        if start is None:
+            start = count - 1
+        return start, max(end, start + 1)
+
+    def _update_window(self):
+        if not self._messages:
+            return
+        try:
+            start, end = self._visible_range()
+        except RuntimeError:
+            return
+        if (start, end) == (self._start, self._end):
+            return
+
+        layout = self.layout()
+        for index in [i for i in self._rows if not start <= i < end]:
+            row = self._rows.pop(index)
+            row.removeEventFilter(self)
+            layout.removeWidget(row)
+            row.setParent(None)
+            row.deleteLater()
+
+        for index in range(start, end):
+            if index in self._rows:
+                continue
+            role, text = self._messages[index]
+            row = self._owner._build_message_row(role, text)
+            row.setProperty("_transcript_index", index)
+            row.installEventFilter(self)
+            self._rows[index] = row
+            # Rows before this one are already in place, so its slot follows the top spacer directly
+            layout.insertWidget(1 + index - start, row)
+
+        self._start, self._end = start, end
+        self._update_spacers()
+
+    def _update_spacers(self):
+        count = len(self._messages)
+        for spacer, height in (
+            (self._top_spacer, self._span_height(0, self._start)),
+            (self._bottom_spacer, self._span_height(self._end, count)),
+        ):
+            spacer.setFixedHeight(height)
+            spacer.setVisible(height > 0)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Resize and isinstance(obj, QWidget):
+            index = obj.property("_transcript_index")
+            if index is not None and self._rows.get(index) is obj:
+                self._on_row_resized(index, obj, event.size().height())
+        return super().eventFilter(obj, event)
+
+    def _on_row_resized(self, index: int, row: QWidget, height: int):
+        previous = self._row_height(index)
+        self._heights[index] = height
+        if height == previous:
+            return
+        # Keep the visible content still when a row above the viewport settles to its real height
+        scrollbar = self._scroll.verticalScrollBar()
+        if row.y() + self.y() < scrollbar.value():
+            scrollbar.setValue(scrollbar.value() + height - previous)
+        self.schedule_update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        width = event.size().width()
+        if width != self._width:
+            # Text reflows at a new width, so heights measured at the old one no longer hold.
+            # Rendered rows were already resized by the layout and reported their new height.
+            self._width = width
+            self._heights = [h if i in self._rows else None for i, h in enumerate(self._heights)]
+            self._update_spacers()
+        self.schedule_update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_update()
+
+
+def last_chat_item(chat_layout) -> QWidget | None:
+    """The last widget of a chat layout whose final item is its stretch, a message row or a ChatTranscript."""
+    if chat_layout is None:
+        return None
+    last_idx = chat_layout.count() - 2
+    if last_idx < 0:
+        return None
+    item = chat_layout.itemAt(last_idx)
+    return item.widget() if item else None
+
+
+def detach_last_row(chat_layout) -> QWidget | None:
+    """
+    Move the last message of a trailing transcript into a regular row of the chat layout and return it.
+    The transcript is removed once it is empty. A last item that is already a regular row is returned as is.
+    """
+    widget = last_chat_item(chat_layout)
+    if not isinstance(widget, ChatTranscript):
+        return widget
+    last_idx = chat_layout.indexOf(widget)
+    row = widget.take_last_row()
+    if widget.message_count == 0:
+        chat_layout.removeWidget(widget)
+        widget.setParent(None)
+        widget.deleteLater()
+        last_idx -= 1
+    if row is not None:
+        chat_layout.insertWidget(last_idx + 1, row)
+    return row
@@ -5,15 +5,38 @@ THINKING_PLACEHOLDER = "thinking ..."
 DEFAULT_TIMEOUT_SECONDS = 120
 MESSAGE_QUEUE_TIMEOUT_SECONDS = 0.1
 FLUSH_INTERVAL_MS = 250
+FLUSH_INTERVAL_MIN_MS = 40
+FLUSH_INTERVAL_MAX_MS = 1000
+# Streaming flush interval is kept at this multiple of the measured render cost
+FLUSH_RENDER_COST_FACTOR = 4
 THINKING_ANIMATION_INTERVAL_MS = 300
 SCROLL_DELAY_MS = 50
 SCROLL_ANIMATION_MS = 200
-BATCH_RENDER_SIZE = 2
 BATCH_RENDER_DELAY_MS = 10
 OPENAI_CHUNK_BATCH = 50
 
+# Restored transcript virtualization
+# Messages within this many viewport heights above and below the visible area keep their widgets
+TRANSCRIPT_OVERSCAN_SCREENS = 1
+# Height estimate for messages that have not been measured yet
+TRANSCRIPT_MIN_ROW_HEIGHT_PX = 24
+TRANSCRIPT_LINE_HEIGHT_PX = 18
+TRANSCRIPT_CHARS_PER_LINE = 60
+
 # Syntax Highlighting
+# Code longer than this is highlighted progressively in steps instead of in one pass
 MAX_HIGHLIGHTED_CODE_LENGTH = 15000
+HIGHLIGHT_CACHE_SIZE = 128
+# Tokens highlighted between two checks of the time budget
+HIGHLIGHT_CHUNK_TOKENS = 256
+HIGHLIGHT_TIME_BUDGET_MS = 8
+
+# Chat history persistence and context budget
+HISTORY_COMPACT_MIN_OPS = 64
+HISTORY_COMPACT_FACTOR = 3
+CHARS_PER_TOKEN = 4
+MESSAGE_TOKEN_OVERHEAD = 4
+IMAGE_TOKEN_ESTIMATE = 765
 
 # Chat code block
 CODE_MONO_FONT = "'JetBrains Mono','Cascadia Code','Fira Code','Consolas','Monaco',monospace"
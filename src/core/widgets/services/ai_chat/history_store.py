@@ -0,0 +1,137 @@
+"""
+Append-only on-disk storage for AI chat history.
+
+Every session is a JSON Lines file of operations (add, update, pop). Loading replays the
+operations, and the file is compacted into plain "add" records once it grows well beyond
+the size of the history it describes. Attachments are stored as a description of their file
+only; their contents (base64 images, text files) are sent once and never written to disk.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+from core.widgets.services.ai_chat.constants import HISTORY_COMPACT_FACTOR, HISTORY_COMPACT_MIN_OPS
+
+STORED_ATTACHMENT_FIELDS = ("path", "name", "size", "is_image", "truncated", "compressed")
+
+
+def stored_entry(entry: dict) -> dict:
+    """The form of a history entry that is written to disk."""
+    attachments = entry.get("attachments")
+    if not attachments:
+        return entry
+    return {
+        **entry,
+        "attachments": [
+            {field: att[field] for field in STORED_ATTACHMENT_FIELDS if field in att} for att in attachments
+        ],
+    }
+
+
+class ChatHistoryStore:
+    def __init__(self, directory: Path):
+        self._directory = directory
+        self._op_counts: dict[str, int] = {}
+
+    def _path(self, session: str) -> Path:
+        safe_name = "".join(c if c.isalnum() or c in ("-", "_", ".") else "_" for c in session)
+        return self._directory / f"{safe_name}.jsonl"
+
+    def load(self, session: str) -> list[dict]:
+        """Replay the operation log of a session and return its history."""
+        path = self._path(session)
+        history: list[dict] = []
+        op_count = 0
+        corrupt = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A crash while appending can leave a truncated last line
+                        logging.warning("Skipping corrupt AI chat history record in %s", path)
+                        corrupt = True
+                        continue
+                    op_count += 1
+                    self._apply(history, record)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error("Failed to load AI chat history from %s: %s", path, e)
+        self._op_counts[session] = op_count
+        if corrupt:
+            # Rewrite so later appends do not land on the corrupt line
+            self.rewrite(session, history)
+        return history
+
+    @staticmethod
+    def _apply(history: list[dict], record: dict):
+        op = record.get("op")
+        if op == "add":
+            history.append(record.get("entry", {}))
+        elif op == "update" and history:
+            index = record.get("index", -1)
+            if -len(history) <= index < len(history):
+                history[index].update(record.get("fields", {}))
+        elif op == "pop" and history:
+            history.pop()
+
+    def _append(self, session: str, record: dict):
+        path = self._path(session)
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        except OSError as e:
+            logging.error("Failed to write AI chat history to %s: %s", path, e)
+            return
+        self._op_counts[session] = self._op_counts.get(session, 0) + 1
+
+    def append_entry(self, session: str, entry: dict):
+        self._append(session, {"op": "add", "entry": stored_entry(entry)})
+
+    def update_entry(self, session: str, index: int, fields: dict):
+        self._append(session, {"op": "update", "index": index, "fields": fields})
+
+    def pop_entry(self, session: str):
+        self._append(session, {"op": "pop"})
+
+    def maybe_compact(self, session: str, history: list[dict]):
+        """Rewrite the log as plain entries when it holds far more operations than entries."""
+        op_count = self._op_counts.get(session, 0)
+        if op_count > HISTORY_COMPACT_MIN_OPS and op_count > HISTORY_COMPACT_FACTOR * len(history):
+            self.rewrite(session, history)
+
+    def rewrite(self, session: str, history: list[dict]):
+        """Atomically replace the log of a session with one "add" record per entry."""
+        path = self._path(session)
+        if not history:
+            self.clear(session)
+            return
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in history:
+                    record = {"op": "add", "entry": stored_entry(entry)}
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.error("Failed to rewrite AI chat history %s: %s", path, e)
+            return
+        self._op_counts[session] = len(history)
+
+    def clear(self, session: str):
+        try:
+            self._path(session).unlink(missing_ok=True)
+        except OSError as e:
+            logging.error("Failed to clear AI chat history for %s: %s", session, e)
+        self._op_counts[session] = 0
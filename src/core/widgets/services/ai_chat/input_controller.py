@@ -92,12 +92,17 @@ class InputController:
             stopped_display = f"*{stopped_text}*"
         self._owner._stream_ui.stop_thinking_animation()
         self._owner._chat_session.stream.msg_label = None
-        history = self._owner._chat_session.get_history(self._owner._provider, self._owner._model_index)
+        history_manager = self._owner._chat_session.history
+        key = self._owner._chat_session.history_key(self._owner._provider, self._owner._model_index)
+        history = history_manager.get(key)
         if not partial_text:
             for entry in reversed(history):
                 if entry.get("role") == "user" and not entry.get("stopped"):
-                    entry["stopped"] = True
+                    history_manager.update_entry(key, entry, stopped=True)
                     break
+        stopped_fields = {"display": stopped_display}
+        if not partial_text:
+            stopped_fields["stopped"] = True
         if not history or history[-1]["role"] != "assistant":
             entry = self._owner._chat_session.add_to_history(
                 self._owner._provider,
@@ -105,14 +110,9 @@ class InputController:
                 "assistant",
                 stopped_text,
             )
-            entry["display"] = stopped_display
-            if not partial_text:
-                entry["stopped"] = True
+            history_manager.update_entry(key, entry, **stopped_fields)
         else:
-            history[-1]["content"] = stopped_text
-            history[-1]["display"] = stopped_display
-            if not partial_text:
-                history[-1]["stopped"] = True
+            history_manager.update_entry(key, history[-1], content=stopped_text, **stopped_fields)
 
         msg_label = self._owner._chat_session.stream.msg_label
         if msg_label is None:
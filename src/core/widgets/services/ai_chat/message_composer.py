@@ -1,4 +1,7 @@
 from collections.abc import Callable
+from typing import Any
+
+from core.widgets.services.ai_chat.constants import CHARS_PER_TOKEN, IMAGE_TOKEN_ESTIMATE, MESSAGE_TOKEN_OVERHEAD
 
 
 def format_attachments_for_display(attachments: list[dict], size_formatter: Callable[[int], str]) -> str:
@@ -64,26 +67,136 @@ def build_api_messages(history: list[dict], provider_type: str) -> list[dict]:
         return api_messages
 
     for msg in history:
-        role = msg["role"]
-        content = msg["content"]
-        attachments = msg.get("attachments", [])
+        api_messages.append(_encode_message(msg, include_images=True))
 
-        if attachments and role == "user":
-            ready_attachments = [att for att in attachments if not att.get("processing")]
-            content_parts = []
+    return api_messages
 
-            user_text = msg.get("user_text", "")
-            if user_text:
-                content_parts.append({"type": "text", "text": user_text})
 
-            for att in ready_attachments:
-                if att.get("is_image"):
-                    content_parts.append({"type": "image_url", "image_url": {"url": att["image_url"]}})
-                else:
-                    content_parts.append({"type": "text", "text": att["prompt"]})
+def _encode_message(msg: dict, include_images: bool) -> dict:
+    """Encode a history entry as an OpenAI chat message, optionally replacing images with their text reference."""
+    role = msg["role"]
+    content = msg["content"]
+    attachments = msg.get("attachments", [])
 
-            api_messages.append({"role": role, "content": content_parts})
-        else:
-            api_messages.append({"role": role, "content": content})
+    if attachments and role == "user":
+        ready_attachments = [att for att in attachments if not att.get("processing")]
+        content_parts = []
 
-    return api_messages
+        # Attachments restored from disk only describe their files, content holds the text that was sent
+        restored = any(not att.get("is_image") and "prompt" not in att for att in ready_attachments)
+        text = content if restored else msg.get("user_text", "")
+        if text:
+            content_parts.append({"type": "text", "text": text})
+
+        for att in ready_attachments:
+            if att.get("is_image") and include_images and att.get("image_url"):
+                content_parts.append({"type": "image_url", "image_url": {"url": att["image_url"]}})
+            elif att.get("is_image"):
+                content_parts.append({"type": "text", "text": att.get("prompt") or f"[Image: {att.get('name')}]"})
+            elif not restored:
+                content_parts.append({"type": "text", "text": att["prompt"]})
+
+        return {"role": role, "content": content_parts}
+    return {"role": role, "content": content}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text locally, at roughly CHARS_PER_TOKEN characters per token."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(message: dict) -> int:
+    content = message["content"]
+    if isinstance(content, str):
+        return MESSAGE_TOKEN_OVERHEAD + estimate_tokens(content)
+    tokens = MESSAGE_TOKEN_OVERHEAD
+    for part in content:
+        if part.get("type") == "image_url":
+            tokens += IMAGE_TOKEN_ESTIMATE
+        else:
+            tokens += estimate_tokens(part.get("text", ""))
+    return tokens
+
+
+def _count_images(msg: dict) -> int:
+    if msg.get("role") != "user":
+        return 0
+    return sum(
+        1
+        for att in msg.get("attachments", [])
+        if att.get("is_image") and att.get("image_url") and not att.get("processing")
+    )
+
+
+class ContextBuilder:
+    """
+    Builds the API message list for a chat turn within a token budget.
+    The newest messages are kept first, the system message always, and images beyond
+    the image limit are replaced by their text reference. Each history entry's encoded
+    form and token estimate are cached, so earlier turns are not re-encoded every turn.
+    """
+
+    def __init__(self):
+        self._cache: dict[tuple[int, bool], tuple[dict, Any, Any, dict, int]] = {}
+
+    def _encode(self, msg: dict, include_images: bool, used: dict) -> tuple[dict, int]:
+        key = (id(msg), include_images)
+        cached = self._cache.get(key)
+        if (
+            cached is not None
+            and cached[0] is msg
+            and cached[1] is msg.get("content")
+            and cached[2] is msg.get("attachments")
+        ):
+            used[key] = cached
+            return cached[3], cached[4]
+        encoded = _encode_message(msg, include_images)
+        tokens = estimate_message_tokens(encoded)
+        used[key] = (msg, msg.get("content"), msg.get("attachments"), encoded, tokens)
+        return encoded, tokens
+
+    def build(
+        self,
+        history: list[dict],
+        provider_type: str,
+        max_context_tokens: int = 0,
+        max_context_images: int = 0,
+    ) -> list[dict]:
+        """
+        Return the messages to send. A limit of 0 disables trimming by tokens or images,
+        the newest message is always sent even if it alone exceeds the budget.
+        """
+        if provider_type == "copilot":
+            return build_api_messages(history, provider_type)
+
+        used: dict = {}
+        system_message = None
+        turns = history
+        budget = max_context_tokens if max_context_tokens > 0 else None
+        images_left = max_context_images if max_context_images > 0 else None
+
+        if history and history[0].get("role") == "system":
+            system_message, tokens = self._encode(history[0], True, used)
+            turns = history[1:]
+            if budget is not None:
+                budget -= tokens
+
+        selected: list[dict] = []
+        for msg in reversed(turns):
+            include_images = True
+            if images_left is not None:
+                image_count = _count_images(msg)
+                include_images = image_count <= images_left
+                if include_images:
+                    images_left -= image_count
+            encoded, tokens = self._encode(msg, include_images, used)
+            if budget is not None:
+                if selected and tokens > budget:
+                    break
+                budget -= tokens
+            selected.append(encoded)
+        selected.reverse()
+
+        # Keep only entries that are still part of the history
+        self._cache = used
+        return [system_message, *selected] if system_message is not None else selected
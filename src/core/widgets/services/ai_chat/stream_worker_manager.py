@@ -1,11 +1,18 @@
 import logging
 import os
+import time
 
 from PyQt6.QtCore import QObject, Qt, QThread, QTimer, pyqtSignal
 
-from core.widgets.services.ai_chat.constants import FLUSH_INTERVAL_MS, SCROLL_DELAY_MS, THINKING_PLACEHOLDER
+from core.widgets.services.ai_chat.constants import (
+    FLUSH_INTERVAL_MAX_MS,
+    FLUSH_INTERVAL_MIN_MS,
+    FLUSH_INTERVAL_MS,
+    FLUSH_RENDER_COST_FACTOR,
+    SCROLL_DELAY_MS,
+    THINKING_PLACEHOLDER,
+)
 from core.widgets.services.ai_chat.copilot_client import CopilotAiChatClient
-from core.widgets.services.ai_chat.message_composer import build_api_messages
 from core.widgets.services.ai_chat.openai_client import AiChatClient
 
 
@@ -14,12 +21,31 @@ class StreamWorkerManager:
         self._owner = owner
         self._pending_text = ""
         self._flush_timer = None
+        self._flush_interval_ms = FLUSH_INTERVAL_MS
+        self._render_cost_ms: float | None = None
         self._copilot_clients: dict[str, CopilotAiChatClient] = {}  # provider_name -> client
 
     def stop_and_reset_stream(self):
         """Stop throttled UI updates and clear any pending text."""
         self._stop_flush_timer()
         self._pending_text = ""
+        self._reset_flush_interval()
+
+    def _reset_flush_interval(self):
+        """Forget the measured render cost so the next stream starts at the default interval."""
+        self._flush_interval_ms = FLUSH_INTERVAL_MS
+        self._render_cost_ms = None
+
+    def _adapt_flush_interval(self, render_ms: float):
+        """Keep the flush interval proportional to the smoothed render cost of a flush."""
+        if self._render_cost_ms is None:
+            self._render_cost_ms = render_ms
+        else:
+            self._render_cost_ms = 0.7 * self._render_cost_ms + 0.3 * render_ms
+        interval = int(self._render_cost_ms * FLUSH_RENDER_COST_FACTOR)
+        self._flush_interval_ms = max(FLUSH_INTERVAL_MIN_MS, min(FLUSH_INTERVAL_MAX_MS, interval))
+        if self._flush_timer is not None and self._flush_timer.interval() != self._flush_interval_ms:
+            self._flush_timer.setInterval(self._flush_interval_ms)
 
     def _start_flush_timer(self):
         """Start the throttle timer for batched UI updates."""
@@ -27,7 +53,7 @@ class StreamWorkerManager:
             self._flush_timer = QTimer(self._owner)
             self._flush_timer.timeout.connect(self._flush_pending_text)
         if not self._flush_timer.isActive():
-            self._flush_timer.start(FLUSH_INTERVAL_MS)
+            self._flush_timer.start(self._flush_interval_ms)
 
     def _stop_flush_timer(self):
         """Stop the throttle timer."""
@@ -46,13 +72,17 @@ class StreamWorkerManager:
         if msg_label is None:
             return
 
+        text = self._pending_text
+        self._pending_text = ""
+        started = time.perf_counter()
         try:
             if hasattr(msg_label, "set_streaming_text"):
-                msg_label.set_streaming_text(self._pending_text)
+                msg_label.set_streaming_text(text)
             else:
-                msg_label.setText(self._pending_text)
+                msg_label.setText(text)
         except RuntimeError:
-            pass
+            return
+        self._adapt_flush_interval((time.perf_counter() - started) * 1000)
 
     def send_to_api(self):
         msg_label = None
@@ -60,6 +90,8 @@ class StreamWorkerManager:
         max_tokens = 0
         temperature = 0.7
         top_p = 0.95
+        max_context_tokens = 0
+        max_context_images = 0
 
         self.cleanup_previous_worker()
 
@@ -84,6 +116,8 @@ class StreamWorkerManager:
             max_tokens = model_config.get("max_tokens", max_tokens)
             temperature = model_config.get("temperature", temperature)
             top_p = model_config.get("top_p", top_p)
+            max_context_tokens = model_config.get("max_context_tokens", max_context_tokens)
+            max_context_images = model_config.get("max_context_images", max_context_images)
 
             if isinstance(instructions, str) and instructions.strip().endswith("_chatmode.md"):
                 file_path = instructions.strip()
@@ -111,7 +145,12 @@ class StreamWorkerManager:
             else:
                 chat_history = [{"role": "system", "content": instructions}] + chat_history
 
-        api_messages = build_api_messages(chat_history, provider_type)
+        api_messages = self._owner._chat_session.context.build(
+            chat_history,
+            provider_type,
+            max_context_tokens,
+            max_context_images,
+        )
 
         self._owner._chat_session.start_streaming(msg_label)
 
@@ -233,6 +272,7 @@ class StreamWorkerManager:
         # Clean up throttle timer
         self._stop_flush_timer()
         self._pending_text = ""
+        self._reset_flush_interval()
 
         if hasattr(self._owner, "_worker") and self._owner._worker:
             try:
@@ -1,11 +1,26 @@
 """
 Syntax highlighting module for code blocks in AI chat.
 Provides simple regex-based syntax highlighting with inline color styles.
+Results are cached per (language, code hash); code longer than MAX_HIGHLIGHTED_CODE_LENGTH
+is highlighted progressively in line chunks on the event loop.
 """
 
+import hashlib
 import re
+import time
+from collections import OrderedDict, deque
+from functools import cache
+from itertools import islice
 
-from core.widgets.services.ai_chat.constants import MAX_HIGHLIGHTED_CODE_LENGTH
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from core.utils.singleton import QSingleton
+from core.widgets.services.ai_chat.constants import (
+    HIGHLIGHT_CACHE_SIZE,
+    HIGHLIGHT_CHUNK_TOKENS,
+    HIGHLIGHT_TIME_BUDGET_MS,
+    MAX_HIGHLIGHTED_CODE_LENGTH,
+)
 
 # COLORS - All syntax highlighting colors in one place
 SYNTAX_COLORS = {
@@ -777,6 +792,41 @@ _YAML_PATTERN = re.compile(
 )
 
 
+@cache
+def _keyword_pattern(lang):
+    """Compiled keyword pattern for a language, built once per language."""
+    keywords = KEYWORDS.get(lang, [])
+    if not keywords:
+        return None
+    flags = re.IGNORECASE if lang == "sql" else 0
+    return re.compile(r"\b(" + "|".join(re.escape(k) for k in keywords) + r")\b", flags)
+
+
+@cache
+def _token_pattern(hash_comments, slash_comments):
+    """
+    Compiled token pattern for strings, comments, numbers and function calls.
+    Only the comment syntax differs between languages, so languages sharing it share one pattern.
+    """
+    comment_patterns = []
+    if hash_comments:
+        comment_patterns.append(r"#[^\n]*")
+    if slash_comments:
+        comment_patterns.append(r"//[^\n]*")
+        comment_patterns.append(r"/\*[\s\S]*?\*/")
+
+    patterns = [
+        r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|`(?:[^`\\]|\\.)*`)',  # strings
+    ]
+    if comment_patterns:
+        patterns.append("(" + "|".join(comment_patterns) + ")")
+    else:
+        patterns.append("((?!))")  # empty placeholder
+    patterns.append(r"(\b\d+\.?\d*(?:e[+-]?\d+)?\b)")  # numbers
+    patterns.append(r"([a-zA-Z_]\w*)\s*(?=\()")  # functions
+    return re.compile("|".join(patterns))
+
+
 def _escape_html(s):
     """Escape HTML special characters."""
     return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
@@ -784,89 +834,75 @@ def _escape_html(s):
 
 def _highlight_css(code):
     """CSS syntax highlighting."""
-    if len(code) > MAX_HIGHLIGHTED_CODE_LENGTH:
-        return _escape_html(code)
-
-    result = []
     last_end = 0
 
     for match in _CSS_PATTERN.finditer(code):
         before = code[last_end : match.start()]
-        result.append(_escape_html(before))
+        yield _escape_html(before)
 
         if match.group(1):  # comment
-            result.append(f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(1))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(1))}</span>'
         elif match.group(2):  # string
-            result.append(f'<span style="color:{SYNTAX_COLORS["string"]};">{_escape_html(match.group(2))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["string"]};">{_escape_html(match.group(2))}</span>'
         elif match.group(3):  # at-rule
-            result.append(f'<span style="color:{SYNTAX_COLORS["keyword"]};">{_escape_html(match.group(3))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["keyword"]};">{_escape_html(match.group(3))}</span>'
         elif match.group(4):  # hex color
-            result.append(f'<span style="color:{SYNTAX_COLORS["number"]};">{match.group(4)}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["number"]};">{match.group(4)}</span>'
         elif match.group(5):  # selector
-            result.append(f'<span style="color:{SYNTAX_COLORS["selector"]};">{_escape_html(match.group(5))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["selector"]};">{_escape_html(match.group(5))}</span>'
         elif match.group(6):  # pseudo
-            result.append(f'<span style="color:{SYNTAX_COLORS["keyword"]};">{_escape_html(match.group(6))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["keyword"]};">{_escape_html(match.group(6))}</span>'
         elif match.group(7):  # function
-            result.append(f'<span style="color:{SYNTAX_COLORS["function"]};">{_escape_html(match.group(7))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["function"]};">{_escape_html(match.group(7))}</span>'
         elif match.group(8):  # property
-            result.append(f'<span style="color:{SYNTAX_COLORS["property"]};">{_escape_html(match.group(8))}</span>:')
+            yield f'<span style="color:{SYNTAX_COLORS["property"]};">{_escape_html(match.group(8))}</span>:'
         elif match.group(9):  # number
-            result.append(f'<span style="color:{SYNTAX_COLORS["number"]};">{match.group(9)}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["number"]};">{match.group(9)}</span>'
 
         last_end = match.end()
 
-    result.append(_escape_html(code[last_end:]))
-    return "".join(result)
+    yield _escape_html(code[last_end:])
 
 
 def _highlight_html(code):
     """HTML/XML syntax highlighting."""
-    if len(code) > MAX_HIGHLIGHTED_CODE_LENGTH:
-        return _escape_html(code)
-
-    result = []
     last_end = 0
 
     for match in _HTML_PATTERN.finditer(code):
         before = code[last_end : match.start()]
-        result.append(_escape_html(before))
+        yield _escape_html(before)
 
         if match.group(1):  # comment
-            result.append(f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(1))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(1))}</span>'
         elif match.group(2):  # DOCTYPE
-            result.append(f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(2))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(2))}</span>'
         elif match.group(3) and match.group(4):  # tag
             bracket = _escape_html(match.group(3))
             tag_name = match.group(4)
-            result.append(f'{bracket}<span style="color:{SYNTAX_COLORS["keyword"]};">{tag_name}</span>')
+            yield f'{bracket}<span style="color:{SYNTAX_COLORS["keyword"]};">{tag_name}</span>'
         elif match.group(5):  # attribute
-            result.append(f'<span style="color:{SYNTAX_COLORS["property"]};">{_escape_html(match.group(5))}</span>=')
+            yield f'<span style="color:{SYNTAX_COLORS["property"]};">{_escape_html(match.group(5))}</span>='
         elif match.group(6):  # string
-            result.append(f'<span style="color:{SYNTAX_COLORS["string"]};">{_escape_html(match.group(6))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["string"]};">{_escape_html(match.group(6))}</span>'
 
         last_end = match.end()
 
-    result.append(_escape_html(code[last_end:]))
-    return "".join(result)
+    yield _escape_html(code[last_end:])
 
 
 def _highlight_yaml(code):
     """YAML syntax highlighting - simple two-color approach."""
-    if len(code) > MAX_HIGHLIGHTED_CODE_LENGTH:
-        return _escape_html(code)
-
-    result = []
     last_end = 0
 
     for match in _YAML_PATTERN.finditer(code):
         before = code[last_end : match.start()]
         if before:
-            result.append(f'<span style="color:{SYNTAX_COLORS["yaml_value"]};">{_escape_html(before)}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["yaml_value"]};">{_escape_html(before)}</span>'
 
         if match.group(1):  # comment
-            result.append(f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(1))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(1))}</span>'
         elif match.group(2) and match.group(3):  # key:
-            result.append(
+            yield (
                 f'<span style="color:{SYNTAX_COLORS["yaml_key"]};">{_escape_html(match.group(2))}{match.group(3)}</span>'
             )
 
@@ -874,82 +910,172 @@ def _highlight_yaml(code):
 
     remaining = code[last_end:]
     if remaining:
-        result.append(f'<span style="color:{SYNTAX_COLORS["yaml_value"]};">{_escape_html(remaining)}</span>')
-    return "".join(result)
+        yield f'<span style="color:{SYNTAX_COLORS["yaml_value"]};">{_escape_html(remaining)}</span>'
 
 
 def _highlight_generic(code, lang):
     """Generic syntax highlighting for programming languages."""
-    if len(code) > MAX_HIGHLIGHTED_CODE_LENGTH:
-        return _escape_html(code)
-
-    # Get keywords for this language
-    keywords = KEYWORDS.get(lang, [])
-    if not keywords:
-        return _escape_html(code)
-
-    case_insensitive = lang == "sql"
-
-    # Build keyword pattern
-    if case_insensitive:
-        kw_pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keywords) + r")\b", re.IGNORECASE)
-    else:
-        kw_pattern = r"\b(" + "|".join(re.escape(k) for k in keywords) + r")\b"
-
-    # Build comment patterns
-    comment_patterns = []
-    if lang in HASH_COMMENT_LANGS:
-        comment_patterns.append(r"#[^\n]*")
-    if lang in SLASH_COMMENT_LANGS or not lang:
-        comment_patterns.append(r"//[^\n]*")
-        comment_patterns.append(r"/\*[\s\S]*?\*/")
-
-    # Build token pattern
-    patterns = [
-        r'("(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|`(?:[^`\\]|\\.)*`)',  # strings
-    ]
-    if comment_patterns:
-        patterns.append("(" + "|".join(comment_patterns) + ")")
-    else:
-        patterns.append("((?!))")  # empty placeholder
-    patterns.append(r"(\b\d+\.?\d*(?:e[+-]?\d+)?\b)")  # numbers
-    patterns.append(r"([a-zA-Z_]\w*)\s*(?=\()")  # functions
+    kw_pattern = _keyword_pattern(lang)
+    if kw_pattern is None:
+        yield _escape_html(code)
+        return
 
-    token_pattern = re.compile("|".join(patterns))
+    token_pattern = _token_pattern(lang in HASH_COMMENT_LANGS, lang in SLASH_COMMENT_LANGS or not lang)
 
     def highlight_keywords(text):
         if not text:
             return text
-        escaped = _escape_html(text)
-        if case_insensitive:
-            return kw_pattern.sub(f'<span style="color:{SYNTAX_COLORS["keyword"]};">\\1</span>', escaped)
-        return re.sub(kw_pattern, f'<span style="color:{SYNTAX_COLORS["keyword"]};">\\1</span>', escaped)
+        return kw_pattern.sub(f'<span style="color:{SYNTAX_COLORS["keyword"]};">\\1</span>', _escape_html(text))
 
-    result = []
     last_end = 0
 
     for match in token_pattern.finditer(code):
         before = code[last_end : match.start()]
-        result.append(highlight_keywords(before))
+        yield highlight_keywords(before)
 
         if match.group(1):  # string
-            result.append(f'<span style="color:{SYNTAX_COLORS["string"]};">{_escape_html(match.group(1))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["string"]};">{_escape_html(match.group(1))}</span>'
         elif match.group(2):  # comment
-            result.append(f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(2))}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["comment"]};">{_escape_html(match.group(2))}</span>'
         elif match.group(3):  # number
-            result.append(f'<span style="color:{SYNTAX_COLORS["number"]};">{match.group(3)}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["number"]};">{match.group(3)}</span>'
         elif match.group(4):  # function
-            result.append(f'<span style="color:{SYNTAX_COLORS["function"]};">{match.group(4)}</span>')
+            yield f'<span style="color:{SYNTAX_COLORS["function"]};">{match.group(4)}</span>'
 
         last_end = match.end()
 
-    result.append(highlight_keywords(code[last_end:]))
-    return "".join(result)
+    yield highlight_keywords(code[last_end:])
+
+
+def _normalize_lang(lang):
+    lang = lang.lower().strip()
+    return LANG_ALIASES.get(lang, lang)
+
+
+def _highlight_parts(code, lang):
+    """
+    Highlighted HTML of code for an already normalized language, one token at a time. The tokenizer
+    keeps its position between pieces, so strings and comments spanning many lines come out the same
+    whether the pieces are taken in one pass or in steps.
+    """
+    # No language specified - just escape HTML
+    if not lang:
+        yield _escape_html(code)
+
+    # Route to specialized highlighters
+    elif lang in ("css", "scss", "sass", "less"):
+        yield from _highlight_css(code)
+
+    elif lang in ("html", "htm", "xml", "xhtml", "svg", "vue", "svelte"):
+        yield from _highlight_html(code)
+
+    elif lang in ("yaml", "yml"):
+        yield from _highlight_yaml(code)
+
+    # Only use generic highlighter if language has defined keywords
+    elif lang in KEYWORDS:
+        yield from _highlight_generic(code, lang)
+
+    # Unknown language - just escape HTML, no highlighting
+    else:
+        yield _escape_html(code)
+
+
+def _highlight(code, lang):
+    """Route code to the highlighter for an already normalized language."""
+    return "".join(_highlight_parts(code, lang))
+
+
+class _HighlightCache:
+    """
+    LRU cache of highlighted HTML keyed by (language, code hash).
+    The generation changes whenever an entry is evicted.
+    """
+
+    def __init__(self, max_entries):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self.generation = 0
+
+    @staticmethod
+    def key(code, lang):
+        return lang, hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key):
+        html = self._entries.get(key)
+        if html is not None:
+            self._entries.move_to_end(key)
+        return html
+
+    def put(self, key, html):
+        self._entries[key] = html
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.generation += 1
+
+
+_cache = _HighlightCache(HIGHLIGHT_CACHE_SIZE)
+
+
+class ProgressiveHighlighter(QObject, metaclass=QSingleton):
+    """
+    Highlights large code blocks in steps on the event loop, spending at most
+    HIGHLIGHT_TIME_BUDGET_MS per tick, and stores the result in the highlight cache.
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self._jobs = deque()
+        self._pending = set()
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._process)
+
+    def schedule(self, key, code, lang):
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        self._jobs.append((key, _highlight_parts(code, lang), []))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _process(self):
+        deadline = time.perf_counter() + HIGHLIGHT_TIME_BUDGET_MS / 1000
+        while self._jobs and time.perf_counter() < deadline:
+            key, pieces, parts = self._jobs[0]
+            step = list(islice(pieces, HIGHLIGHT_CHUNK_TOKENS))
+            parts.extend(step)
+            if len(step) == HIGHLIGHT_CHUNK_TOKENS:
+                continue
+            self._jobs.popleft()
+            self._pending.discard(key)
+            _cache.put(key, "".join(parts))
+            self.finished.emit()
+        if not self._jobs:
+            self._timer.stop()
+
+
+def highlight_pending(code, lang=""):
+    """Whether simple_syntax_highlight() currently returns code unhighlighted because its progressive highlight runs."""
+    lang = _normalize_lang(lang)
+    if not lang or len(code) <= MAX_HIGHLIGHTED_CODE_LENGTH:
+        return False
+    return _cache.get(_cache.key(code, lang)) is None
+
+
+def highlight_generation():
+    """Generation of the highlight cache, a finished progressive highlight can only be pending again once it changes."""
+    return _cache.generation
 
 
 def simple_syntax_highlight(code, lang=""):
     """
     Apply syntax highlighting to code.
+    Code longer than MAX_HIGHLIGHTED_CODE_LENGTH is returned escaped until its progressive
+    highlight finishes, which is announced by ProgressiveHighlighter.finished.
 
     Args:
         code: The source code to highlight (not HTML-escaped)
@@ -958,29 +1084,19 @@ def simple_syntax_highlight(code, lang=""):
     Returns:
         HTML string with inline color styles
     """
-    if len(code) > MAX_HIGHLIGHTED_CODE_LENGTH:
-        return _escape_html(code)
-
-    lang = lang.lower().strip()
-    lang = LANG_ALIASES.get(lang, lang)
-
-    # No language specified - just escape HTML
+    lang = _normalize_lang(lang)
     if not lang:
         return _escape_html(code)
 
-    # Route to specialized highlighters
-    if lang in ("css", "scss", "sass", "less"):
-        return _highlight_css(code)
-
-    if lang in ("html", "htm", "xml", "xhtml", "svg", "vue", "svelte"):
-        return _highlight_html(code)
+    key = _cache.key(code, lang)
+    html = _cache.get(key)
+    if html is not None:
+        return html
 
-    if lang in ("yaml", "yml"):
-        return _highlight_yaml(code)
-
-    # Only use generic highlighter if language has defined keywords
-    if lang in KEYWORDS:
-        return _highlight_generic(code, lang)
+    if len(code) > MAX_HIGHLIGHTED_CODE_LENGTH:
+        ProgressiveHighlighter().schedule(key, code, lang)
+        return _escape_html(code)
 
-    # Unknown language - just escape HTML, no highlighting
-    return _escape_html(code)
+    html = _highlight(code, lang)
+    _cache.put(key, html)
+    return html
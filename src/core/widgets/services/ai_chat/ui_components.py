@@ -1,14 +1,31 @@
 import re
+from collections.abc import Iterator
 from enum import StrEnum
+from functools import lru_cache
 from typing import Any
 
 from PyQt6.QtCore import QEvent, QPoint, QSize, Qt, pyqtSignal
-from PyQt6.QtGui import QColor, QContextMenuEvent, QKeyEvent, QMouseEvent, QPainter, QPaintEvent
+from PyQt6.QtGui import (
+    QColor,
+    QContextMenuEvent,
+    QKeyEvent,
+    QMouseEvent,
+    QPainter,
+    QPaintEvent,
+    QTextCharFormat,
+    QTextCursor,
+)
 from PyQt6.QtWidgets import QLabel, QSizePolicy, QTextBrowser, QTextEdit, QWidget
 
+from core.utils.markdown import split_markdown_blocks
 from core.utils.utilities import PopupWidget, refresh_widget_style
-from core.widgets.services.ai_chat.constants import CODE_MONO_FONT
-from core.widgets.services.ai_chat.syntax_highlight import simple_syntax_highlight
+from core.widgets.services.ai_chat.constants import CODE_MONO_FONT, MAX_HIGHLIGHTED_CODE_LENGTH
+from core.widgets.services.ai_chat.syntax_highlight import (
+    ProgressiveHighlighter,
+    highlight_generation,
+    highlight_pending,
+    simple_syntax_highlight,
+)
 
 
 def _escape_html(s: str) -> str:
@@ -16,13 +33,47 @@ def _escape_html(s: str) -> str:
     return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 
+_CHAT_LINK = re.compile(r"\[([^\]]+)]\((https?://[^)]+)\)")
+_CHAT_CODE_BLOCK = re.compile(r"```([a-zA-Z0-9]*)[ \t]*\r?\n([\s\S]*?)```")
+
+
 def format_chat_text(text: str) -> str:
     """
     Format chat text to HTML with basic Markdown.
+    Blocks separated by blank lines are formatted independently and cached, so re-rendering
+    a message (or the final render of a streamed one) only formats blocks it has not seen.
     """
     if not text:
         return text
 
+    parts = []
+    for block in split_markdown_blocks(text, (_CHAT_CODE_BLOCK, _CHAT_LINK), raw_html=False):
+        content = block.rstrip("\n")
+        parts.append(_format_chat_block(content, *_highlight_state(content)) if content else "")
+        parts.append("<br>" * (len(block) - len(content)))
+    return "".join(parts)
+
+
+def _highlight_state(text: str) -> tuple[tuple[bool, ...], int]:
+    """
+    Which code blocks of text are still waiting for their progressive highlight, and while any is,
+    the highlight cache generation. A finished highlight evicted from the highlight cache is pending
+    again, the new generation makes its block be formatted again, which schedules the highlight.
+    """
+    if "```" not in text:
+        return (), 0
+    pending = tuple(highlight_pending(m.group(2), m.group(1) or "") for m in _CHAT_CODE_BLOCK.finditer(text))
+    return pending, highlight_generation() if any(pending) else 0
+
+
+@lru_cache(maxsize=256)
+def _format_chat_block(text: str, pending_highlights: tuple[bool, ...], cache_generation: int) -> str:
+    """
+    Format a single chat block to HTML.
+    Which of its code blocks still wait for a progressive highlight is part of the cache key, so a
+    block is formatted again once its own highlight finishes and other blocks stay cached.
+    """
+
     def repl(match):
         label, url = match.group(1), match.group(2)
         label_stripped = label.strip()
@@ -32,7 +83,7 @@ def format_chat_text(text: str) -> str:
             return url
         return f"{label_stripped} {url}"
 
-    text = re.sub(r"\[([^\]]+)]\((https?://[^)]+)\)", repl, text)
+    text = _CHAT_LINK.sub(repl, text)
 
     # Extract code blocks BEFORE escaping HTML (syntax highlighter handles its own escaping)
     code_blocks = []
@@ -52,7 +103,7 @@ def format_chat_text(text: str) -> str:
         code_blocks.append(block_html)
         return code_block_placeholder.format(len(code_blocks) - 1)
 
-    text = re.sub(r"```([a-zA-Z0-9]*)[ \t]*\r?\n([\s\S]*?)```", extract_code_block, text)
+    text = _CHAT_CODE_BLOCK.sub(extract_code_block, text)
 
     # Extract inline code BEFORE escaping HTML
     inline_codes = []
@@ -98,6 +149,24 @@ def format_chat_text(text: str) -> str:
     return text
 
 
+def _stream_block_ends(text: str, start: int) -> Iterator[int]:
+    """
+    Yield the end offsets of the completed Markdown blocks of ``text`` after ``start``.
+    A block is complete once a blank line and more text follow it and it does not leave a code
+    fence open, until then more newlines may still extend the blank line that ends it.
+    """
+    in_fence = False
+    pos = start
+    while (idx := text.find("\n\n", pos)) != -1:
+        if text.count("```", pos, idx) % 2:
+            in_fence = not in_fence
+        pos = idx + 2
+        while pos < len(text) and text[pos] == "\n":
+            pos += 1
+        if not in_fence and pos < len(text):
+            yield pos
+
+
 class ContextMenuMixin:
     """Mixin class to provide shared context menu functionality for chat widgets"""
 
@@ -260,9 +329,17 @@ class ChatMessageBrowser(ContextMenuMixin, QTextBrowser):
         self._init_context_menu(is_input_widget=False)
         # Connect document size changes to update geometry
         self.document().contentsChanged.connect(self.updateGeometry)
+        # Incremental streaming state, None while the browser is not streaming
+        self._stream_text: str | None = None
+        self._stream_committed = 0
+        self._stream_tail_pos = 0
+        self._source_text = ""
+        ProgressiveHighlighter().finished.connect(self._on_highlight_finished)
 
     def setText(self, text):
         """Override setText to handle formatting and store original HTML"""
+        self._stream_text = None
+        self._source_text = text or ""
         if text:
             processed_text = format_chat_text(text)
             self.setHtml(processed_text)
@@ -271,10 +348,43 @@ class ChatMessageBrowser(ContextMenuMixin, QTextBrowser):
         self.updateGeometry()
 
     def set_streaming_text(self, text: str):
-        """Set plain text without formatting for streaming."""
-        self.setPlainText(text)
+        """
+        Render streamed text incrementally.
+        Completed blocks are formatted once and inserted as the same HTML setText would produce, the
+        trailing unfinished block stays plain text and only the delta since the previous call is appended.
+        """
+        if self._stream_text is None or not text.startswith(self._stream_text):
+            self.clear()
+            self._stream_text = ""
+            self._stream_committed = 0
+            self._stream_tail_pos = 0
+
+        cursor = QTextCursor(self.document())
+        cursor.beginEditBlock()
+        block_ends = list(_stream_block_ends(text, self._stream_committed))
+        if block_ends:
+            # Replace the plain text tail of the finished blocks with formatted HTML, one block at a
+            # time so the document does not depend on how the text was split into chunks
+            cursor.setPosition(self._stream_tail_pos)
+            cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+            for end in block_ends:
+                cursor.insertHtml(format_chat_text(text[self._stream_committed : end]))
+                self._stream_committed = end
+            self._stream_tail_pos = cursor.position()
+            self._stream_text = text[: self._stream_committed]
+
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text[len(self._stream_text) :], QTextCharFormat())
+        cursor.endEditBlock()
+        self._stream_text = text
         self.updateGeometry()
 
+    def _on_highlight_finished(self):
+        """Re-render once a large code block of this message has been highlighted."""
+        if self._stream_text is None and len(self._source_text) > MAX_HIGHLIGHTED_CODE_LENGTH:
+            self.setText(self._source_text)
+
     def sizeHint(self):
         """Return size hint based on document content height"""
         doc = self.document()
@@ -0,0 +1,267 @@
+"""
+Shared cava audio visualizer process.
+
+Widgets with the same cava configuration share one CavaEngine, and with it one cava process.
+Raw frames are decoded in a reader thread straight from a reused buffer into an array, and only
+the newest frame is handed to the main thread: when the GUI falls behind, older frames that were
+never published are dropped instead of queueing up.
+"""
+
+import hashlib
+import logging
+import os
+import subprocess
+import threading
+import time
+from array import array
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from core.utils.system import app_data_path
+
+# Array typecode and full-scale value of cava's raw output formats
+BIT_FORMATS = {"16bit": ("H", 65535), "8bit": ("B", 255)}
+RESTART_DELAY_MS = 500
+# Frames per second still painted while the widget or its bar is hidden
+HIDDEN_FRAME_RATE = 2
+
+
+@dataclass(frozen=True, slots=True)
+class CavaFrame:
+    """One frame of bar levels. A level divided by norm is the bar height from 0 to 1."""
+
+    values: array
+    norm: int
+    silent: bool
+
+
+def decode_frame(buffer: bytes | bytearray | memoryview, typecode: str, norm: int) -> CavaFrame:
+    values = array(typecode)
+    values.frombytes(buffer)
+    return CavaFrame(values, norm, values.count(0) == len(values))
+
+
+def read_exact(stream, buffer: memoryview) -> bool:
+    """Fill buffer from stream, False if the stream ended first."""
+    filled = 0
+    while filled < len(buffer):
+        read = stream.readinto(buffer[filled:])
+        if not read:
+            return False
+        filled += read
+    return True
+
+
+def _terminate(process: subprocess.Popen) -> None:
+    if process.poll() is None:
+        try:
+            process.terminate()
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+class FrameGate:
+    """
+    Decides which frames a widget repaints. A silent frame is painted once, and the silence that
+    follows is skipped until the first frame with sound. While hidden, frames are painted at no
+    more than hidden_fps.
+    """
+
+    def __init__(self, hidden_fps: float = HIDDEN_FRAME_RATE, clock: Callable[[], float] = time.monotonic):
+        self._hidden_interval = 1.0 / hidden_fps if hidden_fps > 0 else float("inf")
+        self._clock = clock
+        self._last_paint: float | None = None
+        self._showing_silence = False
+        self.painted = 0
+        self.skipped = 0
+
+    @property
+    def idle(self) -> bool:
+        return self._showing_silence
+
+    def should_paint(self, frame: CavaFrame, visible: bool) -> bool:
+        now = self._clock()
+        if frame.silent and self._showing_silence:
+            paint = False
+        elif not visible and self._last_paint is not None:
+            paint = now - self._last_paint >= self._hidden_interval
+        else:
+            paint = True
+        if paint:
+            self._last_paint = now
+            self._showing_silence = frame.silent
+            self.painted += 1
+        else:
+            self.skipped += 1
+        return paint
+
+    def reset(self) -> None:
+        """Paint the next frame, e.g. after the samples were cleared."""
+        self._showing_silence = False
+        self._last_paint = None
+
+
+class CavaSubscription:
+    def __init__(self, callback: Callable[[CavaFrame], None], owner: QWidget | None):
+        self.callback = callback
+        self.owner = owner
+        self.active = True
+
+
+class CavaEngine(QObject):
+    """One cava process whose frames are delivered to every subscribed widget."""
+
+    _engines: dict[str, CavaEngine] = {}
+    _frame_ready = pyqtSignal()
+
+    def __init__(
+        self,
+        config_text: str,
+        bars: int,
+        bit_format: str,
+        command: list[str] | None = None,
+        parent: QObject | None = None,
+    ):
+        super().__init__(parent)
+        self._config_text = config_text
+        self._bars = bars
+        self._typecode, self._norm = BIT_FORMATS.get(bit_format, BIT_FORMATS["8bit"])
+        # A replacement for cava that writes raw frames to stdout, e.g. a synthetic frame producer
+        self._command = command
+        self._subscriptions: list[CavaSubscription] = []
+        self._lock = threading.Lock()
+        self._latest: CavaFrame | None = None
+        self._stop_event = threading.Event()
+        self._process: subprocess.Popen | None = None
+        self._thread: threading.Thread | None = None
+        self.frames_decoded = 0
+        self.frames_dropped = 0
+        self._frame_ready.connect(self._publish)
+
+    @classmethod
+    def shared(cls, config_text: str, bars: int, bit_format: str) -> CavaEngine:
+        engine = cls._engines.get(config_text)
+        if engine is None or sip.isdeleted(engine):
+            engine = cls(config_text, bars, bit_format)
+            cls._engines[config_text] = engine
+            app = QApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(engine.stop)
+        return engine
+
+    def subscribe(self, callback: Callable[[CavaFrame], None], owner: QWidget | None = None) -> CavaSubscription:
+        """Deliver frames to callback, starting cava for the first subscriber."""
+        subscription = CavaSubscription(callback, owner)
+        self._subscriptions.append(subscription)
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self.unsubscribe(subscription))
+        self.start()
+        return subscription
+
+    def unsubscribe(self, subscription: CavaSubscription | None) -> None:
+        """Stop cava and forget the engine once its last subscriber is gone."""
+        if subscription is None or not subscription.active:
+            return
+        subscription.active = False
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        if not self._subscriptions:
+            self.stop()
+            if CavaEngine._engines.get(self._config_text) is self:
+                del CavaEngine._engines[self._config_text]
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="CavaEngine", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        process = self._process
+        if process is not None:
+            _terminate(process)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def restart(self) -> None:
+        self.stop()
+        QTimer.singleShot(RESTART_DELAY_MS, lambda: self.start() if self._subscriptions else None)
+
+    def _run(self) -> None:
+        command = self._command
+        config_path = None
+        process = None
+        try:
+            if command is None:
+                digest = hashlib.sha1(self._config_text.encode("utf-8")).hexdigest()[:12]
+                config_path = app_data_path(f"yasb_cava_config_{digest}")
+                with open(config_path, "w") as config_file:
+                    config_file.write(self._config_text)
+                command = ["cava", "-p", str(config_path)]
+            process = self._process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+            self._read_frames(process.stdout)
+        except Exception as e:
+            logging.error("Error starting cava process: %s", e)
+        finally:
+            # Nothing reads the process anymore, and stop() can run before it is assigned
+            if process is not None:
+                _terminate(process)
+            if self._process is process:
+                self._process = None
+            with self._lock:
+                self._latest = None
+            if config_path is not None:
+                try:
+                    os.unlink(config_path)
+                except OSError:
+                    pass
+
+    def _read_frames(self, stream) -> None:
+        buffer = memoryview(bytearray(self._bars * array(self._typecode).itemsize))
+        while not self._stop_event.is_set():
+            try:
+                if not read_exact(stream, buffer):
+                    break
+                frame = decode_frame(buffer, self._typecode, self._norm)
+            except Exception as e:
+                logging.error("Error reading cava data: %s", e)
+                break
+            self.frames_decoded += 1
+            with self._lock:
+                # Only one frame is ever waiting for the GUI, a newer frame replaces it
+                pending = self._latest is not None
+                if pending:
+                    self.frames_dropped += 1
+                self._latest = frame
+            if not pending:
+                try:
+                    self._frame_ready.emit()
+                except RuntimeError:
+                    break
+
+    def _publish(self) -> None:
+        with self._lock:
+            frame, self._latest = self._latest, None
+        if frame is None:
+            return
+        for subscription in list(self._subscriptions):
+            try:
+                subscription.callback(frame)
+            except RuntimeError:
+                # The owner was deleted on the C++ side
+                self.unsubscribe(subscription)
+            except Exception:
+                logging.exception("Cava frame subscriber failed")
@@ -0,0 +1,69 @@
+"""
+Alarm scheduling for the clock widget.
+
+Alarms are kept in a heap ordered by their next firing time, so a tick only compares the current
+time with the head of the heap instead of checking every alarm once a minute.
+"""
+
+import heapq
+import itertools
+from datetime import datetime, timedelta
+
+# An alarm whose minute passed longer ago than this (e.g. while the system slept) is skipped
+MISSED_ALARM_GRACE = timedelta(minutes=1)
+
+
+def next_alarm_time(alarm: dict, after: datetime) -> datetime | None:
+    """
+    The first time after the minute containing `after` at which the alarm fires, or None if it
+    never does. Alarms without days, or with all seven, fire every day.
+    """
+    try:
+        hour, minute = (int(part) for part in alarm["time"].split(":"))
+    except KeyError, ValueError, AttributeError:
+        return None
+    days = alarm.get("days", [])
+    every_day = not days or len(days) == 7
+    current_minute = after.replace(second=0, microsecond=0)
+    for offset in range(8):
+        day = current_minute + timedelta(days=offset)
+        candidate = day.replace(hour=hour, minute=minute)
+        if candidate > current_minute and (every_day or candidate.weekday() in days):
+            return candidate
+    return None
+
+
+class AlarmSchedule:
+    """Heap of the upcoming occurrences of every enabled alarm."""
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int, dict]] = []
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def reschedule(self, alarms: list[dict], now: datetime) -> None:
+        """Rebuild the heap after alarms were loaded, added, edited or removed."""
+        self._heap = []
+        for alarm in alarms:
+            if alarm.get("enabled", True):
+                self._push(alarm, now)
+
+    def next_due(self) -> datetime | None:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[dict]:
+        """Remove the alarms due at `now`, schedule their next occurrences and return them."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, alarm = heapq.heappop(self._heap)
+            if now - fire_at < MISSED_ALARM_GRACE:
+                due.append(alarm)
+            self._push(alarm, max(fire_at, now))
+        return due
+
+    def _push(self, alarm: dict, after: datetime) -> None:
+        fire_at = next_alarm_time(alarm, after)
+        if fire_at is not None:
+            heapq.heappush(self._heap, (fire_at, next(self._sequence), alarm))
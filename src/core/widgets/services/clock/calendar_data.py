@@ -0,0 +1,234 @@
+"""
+Holiday data for the clock widget's calendar.
+
+Computing holidays means importing the `holidays` package, which takes long enough to stall the
+bar, and then evaluating its rules for every year shown. CalendarDataService does both on a
+background thread for the years around today, keeps the results per (country, subdivision, year)
+and persists them, so later starts and popup opens are served from the cache without importing
+the package at all. The cache is dropped when the installed `holidays` version changes.
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+from importlib import metadata
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.utils.singleton import QSingleton
+from core.utils.system import app_data_path
+
+CACHE_FILENAME = "clock_holidays.json"
+CACHE_VERSION = 1
+# Years around the current one that are prepared ahead of time
+PREFETCH_YEARS_BEFORE = 1
+PREFETCH_YEARS_AFTER = 1
+
+
+@dataclass(frozen=True)
+class YearHolidays:
+    """Holidays of one country and subdivision in one year."""
+
+    names: dict[date, str] = field(default_factory=dict)
+    dates: frozenset[date] = frozenset()
+    ordered: tuple[tuple[date, str], ...] = ()
+
+    @classmethod
+    def from_mapping(cls, holidays: dict[date, str]) -> YearHolidays:
+        names = dict(holidays)
+        return cls(names=names, dates=frozenset(names), ordered=tuple(sorted(names.items())))
+
+
+EMPTY_YEAR = YearHolidays()
+
+
+def _installed_holidays_version() -> str | None:
+    try:
+        return metadata.version("holidays")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _cache_key(country: str, subdivision: str | None, year: int) -> str:
+    return f"{country}|{subdivision or ''}|{year}"
+
+
+class CalendarDataService(QObject, metaclass=QSingleton):
+    """Shared, persisted holiday data. Results computed in the background are announced with holidays_ready."""
+
+    holidays_ready = pyqtSignal(str, object, int)
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._years: dict[str, YearHolidays] = {}
+        self._supported_countries: frozenset[str] | None = None
+        self._module = None
+        self._unavailable = False
+        self._pending: set[str] = set()
+        self._requests: list[tuple[str, str | None, int]] = []
+        self._wake = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._cache_path = str(app_data_path(CACHE_FILENAME))
+        self._package_version = _installed_holidays_version()
+        self._load_cache()
+
+    def resolve_country(self, country_code: str | None) -> str | None:
+        """Return the upper-cased country code if holidays are available for it."""
+        if not country_code or not re.fullmatch(r"[A-Z]{2}", country_code.upper()):
+            return None
+        if self._supported_countries is None:
+            return None
+        country = country_code.upper()
+        return country if country in self._supported_countries else None
+
+    def year_holidays(self, country: str, subdivision: str | None, year: int) -> YearHolidays | None:
+        """Cached holidays for a year, or None if they are still being prepared (a load is then queued)."""
+        key = _cache_key(country, subdivision, year)
+        with self._lock:
+            cached = self._years.get(key)
+        if cached is None:
+            self.prefetch(country, subdivision, (year,))
+        return cached
+
+    def holiday_name(self, country: str, subdivision: str | None, day: date) -> str | None:
+        year = self.year_holidays(country, subdivision, day.year)
+        return year.names.get(day) if year else None
+
+    def upcoming(self, country: str, subdivision: str | None, today: date, count: int) -> list[tuple[date, str]]:
+        """The next holidays from today on, looking into the following year if needed."""
+        result: list[tuple[date, str]] = []
+        for year in (today.year, today.year + 1):
+            holidays = self.year_holidays(country, subdivision, year)
+            if holidays is None:
+                continue
+            start = bisect.bisect_left(holidays.ordered, (today, ""))
+            result.extend(holidays.ordered[start : start + count - len(result)])
+            if len(result) >= count:
+                break
+        return result
+
+    def prefetch_around(self, country_code: str | None, subdivision: str | None, year: int) -> None:
+        """Prepare the holidays of the years around the given one, loading the package first if needed."""
+        if not country_code:
+            return
+        years = tuple(range(year - PREFETCH_YEARS_BEFORE, year + PREFETCH_YEARS_AFTER + 1))
+        self.prefetch(country_code.upper(), subdivision, years)
+
+    def prefetch(self, country: str, subdivision: str | None, years: tuple[int, ...]) -> None:
+        if self._unavailable:
+            return
+        with self._lock:
+            for year in years:
+                key = _cache_key(country, subdivision, year)
+                if key in self._years or key in self._pending:
+                    continue
+                self._pending.add(key)
+                self._requests.append((country, subdivision, year))
+        self._start_worker()
+
+    def _start_worker(self) -> None:
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="CalendarDataService", daemon=True)
+                self._worker.start()
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self._ensure_module()
+            except Exception:
+                logging.exception("Failed to load the holidays package")
+                with self._lock:
+                    self._unavailable = True
+                    self._requests.clear()
+                    self._pending.clear()
+                return
+
+            computed = []
+            while True:
+                with self._lock:
+                    if not self._requests:
+                        break
+                    country, subdivision, year = self._requests.pop(0)
+                holidays = self._compute(country, subdivision, year)
+                key = _cache_key(country, subdivision, year)
+                with self._lock:
+                    self._years[key] = holidays
+                    self._pending.discard(key)
+                computed.append((country, subdivision, year))
+                self.holidays_ready.emit(country, subdivision, year)
+            if computed:
+                self._save_cache()
+
+    def _ensure_module(self) -> None:
+        if self._module is not None:
+            return
+        import importlib
+
+        module = importlib.import_module("holidays")
+        supported = frozenset(module.list_supported_countries())
+        with self._lock:
+            self._module = module
+            if supported != self._supported_countries:
+                self._supported_countries = supported
+                changed = True
+            else:
+                changed = False
+        if changed:
+            self._save_cache()
+
+    def _compute(self, country: str, subdivision: str | None, year: int) -> YearHolidays:
+        if country not in (self._supported_countries or ()):
+            return EMPTY_YEAR
+        try:
+            return YearHolidays.from_mapping(self._module.country_holidays(country, years=[year], subdiv=subdivision))
+        except Exception:
+            return EMPTY_YEAR
+
+    def _load_cache(self) -> None:
+        try:
+            with open(self._cache_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning("Ignoring unreadable holiday cache %s: %s", self._cache_path, e)
+            return
+        if data.get("version") != CACHE_VERSION or data.get("holidays_version") != self._package_version:
+            return
+        try:
+            self._supported_countries = frozenset(data.get("supported_countries") or ()) or None
+            for key, entries in data.get("years", {}).items():
+                self._years[key] = YearHolidays.from_mapping({date.fromisoformat(d): name for d, name in entries})
+        except Exception as e:
+            logging.warning("Ignoring invalid holiday cache %s: %s", self._cache_path, e)
+            self._supported_countries = None
+            self._years.clear()
+
+    def _save_cache(self) -> None:
+        with self._lock:
+            data = {
+                "version": CACHE_VERSION,
+                "holidays_version": self._package_version,
+                "supported_countries": sorted(self._supported_countries or ()),
+                "years": {
+                    key: [[day.isoformat(), name] for day, name in holidays.ordered]
+                    for key, holidays in self._years.items()
+                },
+            }
+        tmp_path = f"{self._cache_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self._cache_path)
+        except Exception as e:
+            logging.warning("Failed to write holiday cache %s: %s", self._cache_path, e)
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Literal
 
 from PyQt6.QtCore import QEvent, QObject, QPoint, QPointF, QRect, QSize, Qt, pyqtSignal
-from PyQt6.QtGui import QColor, QCursor, QGuiApplication, QMouseEvent, QPainter, QPen, QPixmap
+from PyQt6.QtGui import QColor, QCursor, QGuiApplication, QImage, QMouseEvent, QPainter, QPen, QPixmap
 from PyQt6.QtWidgets import (
     QApplication,
     QButtonGroup,
@@ -60,6 +60,12 @@ _MIN_CROP = 8
 # Rect/circle: avoid collapsed drags with fat pens (looks like a thick line).
 _MIN_SHAPE = 4
 _HISTORY_MAX = 80
+# Undo replays from the nearest raster checkpoint instead of the original capture. One is taken
+# every few ops and after every op that is expensive to replay or replaces the image.
+_CHECKPOINT_INTERVAL = 10
+_CHECKPOINT_MEMORY_MAX = 256 * 1024 * 1024
+# Tools previewed as a shape over the canvas while dragging, repainted over their bounding box only.
+_SHAPE_TOOLS = ("arrow", "rect", "circle", "blur", "crop")
 # Compact palette for the popup (rows of 6).
 _PALETTE = [
     "#ff3b30",
@@ -140,6 +146,17 @@ class ClearOp:
 
 
 EditOp = FreehandOp | ArrowOp | RectOp | CircleOp | BlurOp | CropOp | ClearOp
+_CHECKPOINT_OPS = (BlurOp, CropOp, ClearOp)
+
+
+@dataclass(slots=True)
+class _Checkpoint:
+    """Base and layer after a number of ops. Pixmaps are implicitly shared until painted on."""
+
+    base: QPixmap
+    layer: QPixmap
+    # Bytes the checkpoint keeps alive; a base still shared with the original capture is free
+    nbytes: int = 0
 
 
 class _FramelessPopup(QFrame):
@@ -436,6 +453,13 @@ class EditorCanvas(QWidget):
         self._layer = QPixmap()
         self._ops: list[EditOp] = []
         self._redo_ops: list[EditOp] = []
+        # Number of applied ops -> state after them; 0 is the start of the history and always kept
+        self._checkpoints: dict[int, _Checkpoint] = {}
+        # Ops folded into the start of the history, so the checkpoint interval counts every op ever made
+        self._folded_ops = 0
+        # base + layer composed once per committed change; null until painted or exported again
+        self._committed = QPixmap()
+        # In-progress pen/highlighter stroke, baked onto the layer on release
         self._stroke_temp = QPixmap()
         self.tool = "pen"
         self.color = QColor(_DEFAULT_COLOR)
@@ -448,6 +472,8 @@ class EditorCanvas(QWidget):
         self._start = QPoint()
         self._current = QPoint()
         self._points: list[QPoint] = []
+        # Display rect of the shape preview as last painted, repainted together with the new one
+        self._preview_dirty = QRect()
         self.setMouseTracking(True)
         self.setCursor(Qt.CursorShape.CrossCursor)
         self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
@@ -458,6 +484,12 @@ class EditorCanvas(QWidget):
         self._original.setDevicePixelRatio(1.0)
         self._ops.clear()
         self._redo_ops.clear()
+        self._checkpoints.clear()
+        self._folded_ops = 0
+        if not self._original.isNull():
+            base = QPixmap(self._original)
+            base.setDevicePixelRatio(1.0)
+            self._checkpoints[0] = self._make_checkpoint(base, self._empty_layer(base.size()))
         self._stroke_temp = QPixmap()
         self._rebuild()
 
@@ -517,11 +549,25 @@ class EditorCanvas(QWidget):
         self.update()
 
     def composite(self) -> QPixmap:
-        out = QPixmap(self._base.size())
+        """base + layer, cached until the next committed change. Callers must not paint into it."""
+        if self._committed.isNull() and not self._base.isNull():
+            out = QPixmap(self._base.size())
+            out.setDevicePixelRatio(1.0)
+            out.fill(Qt.GlobalColor.transparent)
+            p = QPainter(out)
+            p.drawPixmap(0, 0, self._base)
+            p.drawPixmap(0, 0, self._layer)
+            p.end()
+            self._committed = out
+        return self._committed
+
+    def _composite_region(self, r: QRect) -> QImage:
+        """base + layer under r only (image coords), for ops that read the composed image."""
+        out = QImage(r.size(), QImage.Format.Format_ARGB32_Premultiplied)
         out.fill(Qt.GlobalColor.transparent)
         p = QPainter(out)
-        p.drawPixmap(0, 0, self._base)
-        p.drawPixmap(0, 0, self._layer)
+        p.drawPixmap(QPoint(0, 0), self._base, r)
+        p.drawPixmap(QPoint(0, 0), self._layer, r)
         p.end()
         return out
 
@@ -531,13 +577,63 @@ class EditorCanvas(QWidget):
         layer.fill(Qt.GlobalColor.transparent)
         return layer
 
-    def _commit_op(self, op: EditOp) -> None:
+    def _commit_op(self, op: EditOp, *, apply: bool = False) -> None:
+        """Record op, applying it first unless it was already drawn live (pen strokes)."""
+        if apply:
+            self._apply_op(op)
         self._ops.append(op)
-        if len(self._ops) > _HISTORY_MAX:
-            # Drop oldest; rebuild so canvas still matches remaining ops.
-            self._ops.pop(0)
-            self._rebuild()
         self._redo_ops.clear()
+        self._committed = QPixmap()
+        n = len(self._ops)
+        for k in [k for k in self._checkpoints if k >= n]:
+            del self._checkpoints[k]
+        if n > _HISTORY_MAX:
+            self._drop_oldest_op()
+        self._checkpoint_if_due(op)
+
+    def _make_checkpoint(self, base: QPixmap, layer: QPixmap) -> _Checkpoint:
+        nbytes = layer.width() * layer.height() * 4
+        if base.cacheKey() != self._original.cacheKey():
+            nbytes += base.width() * base.height() * 4
+        return _Checkpoint(base, layer, nbytes)
+
+    def _checkpoint_if_due(self, op: EditOp) -> None:
+        """Snapshot the current state after op if it is expensive to replay or the interval is reached."""
+        n = len(self._ops)
+        due = isinstance(op, _CHECKPOINT_OPS) or (self._folded_ops + n) % _CHECKPOINT_INTERVAL == 0
+        if n in self._checkpoints or not due:
+            return
+        self._checkpoints[n] = self._make_checkpoint(QPixmap(self._base), QPixmap(self._layer))
+        self._evict_checkpoints()
+
+    def _evict_checkpoints(self) -> None:
+        """Drop the checkpoints furthest from the current position until the memory budget is met."""
+        total = sum(cp.nbytes for cp in self._checkpoints.values())
+        n = len(self._ops)
+        while total > _CHECKPOINT_MEMORY_MAX and len(self._checkpoints) > 1:
+            furthest = max((k for k in self._checkpoints if k != 0), key=lambda k: abs(k - n))
+            total -= self._checkpoints.pop(furthest).nbytes
+
+    def _drop_oldest_op(self) -> None:
+        """Forget the oldest op by folding it into the start of the history; its effect stays."""
+        op = self._ops.pop(0)
+        self._folded_ops += 1
+        root = self._checkpoints.pop(1, None)
+        if root is None:
+            root = self._replayed(self._checkpoints[0], [op])
+        self._checkpoints = {k - 1: cp for k, cp in self._checkpoints.items() if k > 1}
+        self._checkpoints[0] = root
+
+    def _replayed(self, checkpoint: _Checkpoint, ops: list[EditOp]) -> _Checkpoint:
+        """Checkpoint of the state after applying ops to checkpoint, leaving the canvas untouched."""
+        base, layer = self._base, self._layer
+        self._base, self._layer = QPixmap(checkpoint.base), QPixmap(checkpoint.layer)
+        try:
+            for op in ops:
+                self._apply_op(op)
+            return self._make_checkpoint(self._base, self._layer)
+        finally:
+            self._base, self._layer = base, layer
 
     def _apply_op(self, op: EditOp) -> None:
         """Apply one op to current base/layer (image coords)."""
@@ -585,8 +681,9 @@ class EditorCanvas(QWidget):
             return
 
         if isinstance(op, BlurOp):
-            r = QRect(op.x, op.y, op.w, op.h)
-            apply_blur_region(self._layer, self.composite(), r, strength=op.strength)
+            r = QRect(op.x, op.y, op.w, op.h).intersected(QRect(0, 0, self._base.width(), self._base.height()))
+            if not r.isEmpty():
+                apply_blur_region(self._layer, self._composite_region(r), r, strength=op.strength)
             return
 
         if isinstance(op, CropOp):
@@ -607,16 +704,19 @@ class EditorCanvas(QWidget):
             self._layer = self._empty_layer(self._base.size())
 
     def _rebuild(self) -> None:
-        """Rebuild base+layer from original + command list."""
+        """Rebuild base+layer for the command list, replaying from the nearest checkpoint."""
+        self._committed = QPixmap()
         if self._original.isNull():
             self._base = QPixmap()
             self._layer = QPixmap()
             self._relayout()
             return
-        self._base = QPixmap(self._original)
-        self._base.setDevicePixelRatio(1.0)
-        self._layer = self._empty_layer(self._base.size())
-        for op in self._ops:
+        n = len(self._ops)
+        start = max(k for k in self._checkpoints if k <= n)
+        checkpoint = self._checkpoints[start]
+        self._base = QPixmap(checkpoint.base)
+        self._layer = QPixmap(checkpoint.layer)
+        for op in self._ops[start:]:
             self._apply_op(op)
         self._clear_stroke_temp()
         self._relayout()
@@ -627,24 +727,33 @@ class EditorCanvas(QWidget):
         self._redo_ops.append(self._ops.pop())
         if len(self._redo_ops) > _HISTORY_MAX:
             self._redo_ops.pop(0)
+        # Checkpoints past the last redoable op can't be reached anymore
+        reachable = len(self._ops) + len(self._redo_ops)
+        for k in [k for k in self._checkpoints if k > reachable]:
+            del self._checkpoints[k]
         self._rebuild()
         self.tool_finished.emit()
 
     def redo(self) -> None:
         if not self._redo_ops:
             return
-        self._ops.append(self._redo_ops.pop())
+        op = self._redo_ops.pop()
+        # The canvas shows the state right before op, so only op itself needs to be applied
+        self._apply_op(op)
+        self._ops.append(op)
+        self._committed = QPixmap()
         if len(self._ops) > _HISTORY_MAX:
-            self._ops.pop(0)
-        self._rebuild()
+            self._drop_oldest_op()
+        self._checkpoint_if_due(op)
+        self._clear_stroke_temp()
+        self._relayout()
         self.tool_finished.emit()
 
     def clear_all(self) -> None:
         """Reset to the image as opened (all strokes, crops). Undoable."""
         if self._original.isNull():
             return
-        self._commit_op(ClearOp())
-        self._apply_op(self._ops[-1])
+        self._commit_op(ClearOp(), apply=True)
         self._clear_stroke_temp()
         self._relayout()
         self.tool_finished.emit()
@@ -656,6 +765,25 @@ class EditorCanvas(QWidget):
     def _to_disp(self, img_pt: QPoint) -> QPoint:
         return QPoint(int(img_pt.x() * self._zoom), int(img_pt.y() * self._zoom))
 
+    def _segment_dirty(self, a: QPoint, b: QPoint) -> QRect:
+        """Display rect a stroke segment from a to b (image coords) can touch, smoothing included."""
+        pad = self.stroke_width // 2 + 2
+        r = QRect(a, b).normalized().adjusted(-pad, -pad, pad, pad)
+        z = self._zoom if self._zoom > 0.01 else 1.0
+        return QRect(int(r.x() * z), int(r.y() * z), int(r.width() * z) + 2, int(r.height() * z) + 2)
+
+    def _shape_preview_dirty(self) -> QRect:
+        """Display rect the current shape preview covers, arrow heads and stroke width included."""
+        if self.tool not in _SHAPE_TOOLS:
+            return QRect()
+        sel = QRect(self._to_disp(self._start), self._to_disp(self._current)).normalized()
+        if self.tool in ("blur", "crop"):
+            pad = 2
+        else:
+            preview_w = max(1, int(round(self.stroke_width * self._zoom)))
+            pad = int(preview_w * 1.6) + 6
+        return sel.adjusted(-pad, -pad, pad, pad)
+
     def _shape_min_side(self) -> int:
         """Minimum width/height so a thick stroke doesn't collapse into a line."""
         return max(_MIN_SHAPE, (self.stroke_width + 1) // 2)
@@ -675,13 +803,16 @@ class EditorCanvas(QWidget):
         if not self._stroke_temp.isNull():
             self._stroke_temp.fill(Qt.GlobalColor.transparent)
 
-    def _commit_highlight_stroke(self) -> None:
-        """Bake one highlighter stroke onto the layer with a single opacity pass."""
+    def _stroke_opacity(self) -> float:
+        return _HIGHLIGHT_ALPHA / 255.0 if self.tool == "highlight" else 1.0
+
+    def _commit_stroke(self) -> None:
+        """Bake the pen/highlighter stroke onto the layer with a single opacity pass."""
         if self._stroke_temp.isNull():
             return
         lp = QPainter(self._layer)
         lp.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        lp.setOpacity(_HIGHLIGHT_ALPHA / 255.0)
+        lp.setOpacity(self._stroke_opacity())
         lp.drawPixmap(0, 0, self._stroke_temp)
         lp.end()
         self._clear_stroke_temp()
@@ -816,9 +947,11 @@ class EditorCanvas(QWidget):
         self._start = p
         self._current = p
         self._points = [p]
-        if self.tool == "highlight":
+        if self.tool in ("pen", "highlight"):
             self._ensure_stroke_temp()
             self._clear_stroke_temp()
+        self._preview_dirty = self._shape_preview_dirty()
+        # Full repaint once: the crop preview dims the whole canvas
         self.update()
 
     def mouseMoveEvent(self, e):
@@ -835,15 +968,18 @@ class EditorCanvas(QWidget):
             return
         p = self._to_img(e.position().toPoint())
         self._current = p
-        if self.tool in ("pen", "highlight") and self._points:
-            prev = self._points[-1]
-            self._points.append(p)
-            if self.tool == "highlight":
+        if self.tool in ("pen", "highlight"):
+            if self._points:
+                prev = self._points[-1]
+                self._points.append(p)
                 self._ensure_stroke_temp()
                 self._draw_freehand_to(self._stroke_temp, prev, p, alpha=None)
-            else:
-                self._draw_freehand_to(self._layer, prev, p, alpha=None)
-        self.update()
+                self.update(self._segment_dirty(prev, p))
+            return
+        # Only the old and the new preview change, the crop dimming outside both stays the same
+        dirty = self._shape_preview_dirty()
+        self.update(self._preview_dirty.united(dirty))
+        self._preview_dirty = dirty
 
     def mouseReleaseEvent(self, e):
         if e.button() == Qt.MouseButton.LeftButton and self._panning:
@@ -858,55 +994,43 @@ class EditorCanvas(QWidget):
         w = self.stroke_width
         color_name = self.color.name(QColor.NameFormat.HexRgb)
 
-        if self.tool == "pen":
-            if self._points:
-                prev = self._points[-1]
-                self._points.append(p)
-                self._draw_freehand_to(self._layer, prev, p, alpha=None)
-            pts = tuple(self._pt(q) for q in self._points)
-            if pts:
-                self._commit_op(FreehandOp(style="pen", points=pts, color=color_name, width=w))
-        elif self.tool == "highlight":
+        if self.tool in ("pen", "highlight"):
             if self._points:
                 self._ensure_stroke_temp()
                 self._draw_freehand_to(self._stroke_temp, self._points[-1], p, alpha=None)
                 self._points.append(p)
             pts = tuple(self._pt(q) for q in self._points)
-            self._commit_highlight_stroke()
+            self._commit_stroke()
             if pts:
-                self._commit_op(FreehandOp(style="highlight", points=pts, color=color_name, width=w))
+                self._commit_op(FreehandOp(style=self.tool, points=pts, color=color_name, width=w))
         elif self.tool == "arrow":
             if (p - self._start).manhattanLength() >= self._shape_min_side():
                 op = ArrowOp(a=self._pt(self._start), b=self._pt(p), color=color_name, width=w)
-                self._commit_op(op)
-                self._apply_op(op)
+                self._commit_op(op, apply=True)
         elif self.tool == "rect":
             if self._drag_shape_ok(self._start, p):
                 op = RectOp(a=self._pt(self._start), b=self._pt(p), color=color_name, width=w)
-                self._commit_op(op)
-                self._apply_op(op)
+                self._commit_op(op, apply=True)
         elif self.tool == "circle":
             if self._drag_shape_ok(self._start, p):
                 op = CircleOp(a=self._pt(self._start), b=self._pt(p), color=color_name, width=w)
-                self._commit_op(op)
-                self._apply_op(op)
+                self._commit_op(op, apply=True)
         elif self.tool == "blur":
             r = QRect(self._start, p).normalized()
             if r.width() >= 4 and r.height() >= 4:
                 op = BlurOp(x=r.x(), y=r.y(), w=r.width(), h=r.height(), strength=self.blur_strength)
-                self._commit_op(op)
-                self._apply_op(op)
+                self._commit_op(op, apply=True)
         elif self.tool == "crop":
             r = QRect(self._start, p).normalized()
             bounds = QRect(0, 0, self._base.width(), self._base.height())
             r = r.intersected(bounds)
             if r.width() >= _MIN_CROP and r.height() >= _MIN_CROP:
                 op = CropOp(x=r.x(), y=r.y(), w=r.width(), h=r.height())
-                self._commit_op(op)
-                self._apply_op(op)
+                self._commit_op(op, apply=True)
                 self._relayout()
                 self.tool_finished.emit()
         self._points = []
+        self._preview_dirty = QRect()
         self.update()
 
     def paintEvent(self, e):
@@ -921,32 +1045,17 @@ class EditorCanvas(QWidget):
         smooth = not self._panning
         p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, smooth)
 
-        z = self._zoom if self._zoom > 0.01 else 1.0
-        src = QRect(
-            max(0, int(dirty.x() / z)),
-            max(0, int(dirty.y() / z)),
-            min(self._base.width(), int((dirty.width() + z) / z) + 1),
-            min(self._base.height(), int((dirty.height() + z) / z) + 1),
-        )
-        src = src.intersected(QRect(0, 0, self._base.width(), self._base.height()))
-        if src.isEmpty():
-            return
-        dest = QRect(
-            int(round(src.x() * z)),
-            int(round(src.y() * z)),
-            max(1, int(round(src.width() * z))),
-            max(1, int(round(src.height() * z))),
-        )
-        p.drawPixmap(dest, self._base, src)
-        if not self._layer.isNull():
-            p.drawPixmap(dest, self._layer, src)
+        # The whole image is drawn and the painter's clip limits the work to the dirty region. Scaling
+        # only the source rect under it would sample differently at fractional zoom and leave seams.
+        dest = self.rect()
+        p.drawPixmap(dest, self.composite())
 
-        if self._drawing and self.tool == "highlight" and not self._stroke_temp.isNull():
-            p.setOpacity(_HIGHLIGHT_ALPHA / 255.0)
-            p.drawPixmap(dest, self._stroke_temp, src)
+        if self._drawing and self.tool in ("pen", "highlight") and not self._stroke_temp.isNull():
+            p.setOpacity(self._stroke_opacity())
+            p.drawPixmap(dest, self._stroke_temp)
             p.setOpacity(1.0)
 
-        if self._drawing and self.tool in ("arrow", "rect", "circle", "blur", "crop"):
+        if self._drawing and self.tool in _SHAPE_TOOLS:
             a = self._to_disp(self._start)
             b = self._to_disp(self._current)
             sel = QRect(a, b).normalized()
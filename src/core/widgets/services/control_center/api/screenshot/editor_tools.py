@@ -97,20 +97,17 @@ def draw_pen_segment(
     p.drawLine(a, b)
 
 
-def apply_blur_region(layer: QPixmap, composite: QPixmap, r: QRect, strength: int = 5) -> None:
+def apply_blur_region(layer: QPixmap, source: QImage, r: QRect, strength: int = 5) -> None:
     """
     Soft frosted blur into layer over rect r (image-buffer coords).
 
+    source is the composed image under r only, so the cost follows the region, not the image.
     Multi-pass smooth scale - not chunky pixelation.
     strength: 1 (light) … 10 (heavy).
     """
-    bounds = QRect(0, 0, composite.width(), composite.height())
-    r = r.intersected(bounds)
-    if r.width() < 4 or r.height() < 4:
-        return
-    src = composite.toImage().copy(r)
-    if src.isNull():
+    if r.width() < 4 or r.height() < 4 or source.isNull():
         return
+    src = source
     if src.format() != QImage.Format.Format_ARGB32_Premultiplied:
         src = src.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
 
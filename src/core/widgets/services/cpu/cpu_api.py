@@ -8,36 +8,14 @@ by running: lodctr /r (as Administrator) or rebuilding performance counters.
 
 import ctypes
 import logging
-import time
 from ctypes import POINTER, byref, wintypes
-from typing import NamedTuple
-
-from PyQt6.QtCore import QThread, pyqtSignal
-from PyQt6.QtWidgets import QApplication
 
 from core.utils.system import get_build_and_ubr
 from core.utils.win32.bindings.kernel32 import kernel32
 from core.utils.win32.bindings.pdh import pdh
 from core.utils.win32.constants import PDH_FMT_DOUBLE, PDH_FMT_LARGE
 from core.utils.win32.structs import PDH_FMT_COUNTERVALUE_DOUBLE, PDH_FMT_COUNTERVALUE_LARGE, SYSTEM_INFO
-
-
-class CpuFreq(NamedTuple):
-    """CPU frequency in MHz."""
-
-    current: float
-    min: float
-    max: float
-
-
-class CpuData(NamedTuple):
-    """CPU data snapshot."""
-
-    freq: CpuFreq
-    percent: float
-    percent_per_core: list[float]
-    cores_physical: int
-    cores_logical: int
+from core.widgets.services.metrics.data import CpuData, CpuFreq
 
 
 class CpuAPI:
@@ -295,46 +273,3 @@ class CpuAPI:
                 cores_physical=physical,
                 cores_logical=logical,
             )
-
-
-class CpuWorker(QThread):
-    """Background thread for non-blocking CPU data collection."""
-
-    _instance: CpuWorker | None = None
-    data_ready = pyqtSignal(object)
-
-    @classmethod
-    def get_instance(cls, update_interval: int) -> CpuWorker:
-        """Get or create the singleton worker instance."""
-        if cls._instance is None:
-            cls._instance = cls(update_interval)
-        return cls._instance
-
-    def __init__(self, update_interval: int, parent=None):
-        super().__init__(parent)
-        self._running = True
-        self._update_interval = update_interval
-        app_inst = QApplication.instance()
-        if app_inst is not None:
-            app_inst.aboutToQuit.connect(self.stop)
-
-    def stop(self):
-        """Signal the worker to stop."""
-        self._running = False
-        CpuWorker._instance = None
-
-    def run(self):
-        """Collect CPU data in a loop until stopped."""
-        while self._running:
-            started = time.perf_counter()
-            try:
-                data = CpuAPI.get_data()
-                if self._running:
-                    self.data_ready.emit(data)
-            except Exception as e:
-                logging.error("CPU worker error: %s", e)
-
-            elapsed_ms = int((time.perf_counter() - started) * 1000)
-            sleep_ms = self._update_interval - elapsed_ms
-            if sleep_ms > 0:
-                self.msleep(sleep_ms)
@@ -0,0 +1,63 @@
+"""
+Custom widget commands: what identifies them, how they are started and how their output is parsed.
+"""
+
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class CommandKey:
+    """Everything that affects a command's output. Widgets with equal keys share its runs."""
+
+    cmd: tuple[str, ...]
+    use_shell: bool = True
+    encoding: str | None = None
+    return_format: str = "json"
+    cwd: str | None = None
+    env: tuple[tuple[str, str], ...] | None = None
+    # Start the command once and parse every line it prints, instead of running it per interval
+    stream: bool = False
+
+
+def popen_args(key: CommandKey) -> str | list[str]:
+    # A POSIX shell only runs the first list item as the command, so it gets the command line instead
+    if key.use_shell and sys.platform != "win32":
+        return " ".join(key.cmd)
+    return list(key.cmd)
+
+
+def popen_kwargs(key: CommandKey) -> dict[str, Any]:
+    return {
+        "creationflags": getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        "shell": key.use_shell,
+        "encoding": key.encoding,
+        "cwd": key.cwd,
+        "env": dict(key.env) if key.env is not None else None,
+    }
+
+
+def parse_output(output: str | bytes, return_format: str) -> Any:
+    """Parse a command's output as the custom widget's {data}, None if it is not valid JSON."""
+    if isinstance(output, bytes):
+        output = output.decode("utf-8", errors="replace")
+    if return_format == "json":
+        try:
+            return json.loads(output)
+        except json.JSONDecodeError:
+            return None
+    return output.strip()
+
+
+def run_command(key: CommandKey) -> Any:
+    """Run a command to completion and return its parsed output."""
+    proc = subprocess.run(
+        popen_args(key),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        **popen_kwargs(key),
+    )
+    return parse_output(proc.stdout, key.return_format)
@@ -0,0 +1,147 @@
+"""
+Shared execution of custom widget commands.
+
+Custom widgets with the same command (the same bar on several monitors, for example) subscribe
+to one CommandKey. A run requested while the previous run of the same key is still in flight is
+skipped, and every run's parsed output is delivered to all subscribers of its key. Commands run
+on a small shared thread pool instead of a new thread per widget and tick. Streamed keys share
+one long-running process that lives as long as the key has subscribers.
+"""
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from core.widgets.services.custom.command import CommandKey, run_command
+from core.widgets.services.custom.command_stream import CommandStream
+
+MAX_WORKERS = 4
+
+
+class CommandSubscription:
+    def __init__(self, key: CommandKey, callback: Callable[[Any], None], owner: QWidget | None):
+        self.key = key
+        self.callback = callback
+        self.owner = owner
+        self.active = True
+
+
+class CommandScheduler(QObject):
+    """Runs each distinct custom widget command at most once at a time and shares the result."""
+
+    _shared: CommandScheduler | None = None
+    _run_finished = pyqtSignal(object, bool, object)
+
+    def __init__(self, max_workers: int = MAX_WORKERS, runner: Callable[[CommandKey], Any] = run_command, parent=None):
+        super().__init__(parent)
+        self._runner = runner
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="CustomCommand")
+        self._subscriptions: dict[CommandKey, list[CommandSubscription]] = {}
+        self._in_flight: set[CommandKey] = set()
+        self._results: dict[CommandKey, Any] = {}
+        self._streams: dict[CommandKey, CommandStream] = {}
+        self.skipped_runs = 0
+        self._run_finished.connect(self._on_run_finished)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    @classmethod
+    def shared(cls) -> CommandScheduler:
+        if cls._shared is None or sip.isdeleted(cls._shared):
+            cls._shared = cls()
+        return cls._shared
+
+    def subscribe(
+        self, key: CommandKey, callback: Callable[[Any], None], owner: QWidget | None = None
+    ) -> CommandSubscription:
+        """
+        Deliver the output of every run of key to callback until unsubscribed or the owner is destroyed.
+        Late subscribers get the latest output right away, and streamed keys start their process here.
+        """
+        subscription = CommandSubscription(key, callback, owner)
+        self._subscriptions.setdefault(key, []).append(subscription)
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self.unsubscribe(subscription))
+        if key in self._results:
+            callback(self._results[key])
+        if key.stream and key not in self._streams:
+            stream = CommandStream(key, lambda result: self._emit_result(key, True, result))
+            self._streams[key] = stream
+            stream.start()
+        return subscription
+
+    def unsubscribe(self, subscription: CommandSubscription | None) -> None:
+        if subscription is None or not subscription.active:
+            return
+        subscription.active = False
+        subscribers = self._subscriptions.get(subscription.key, [])
+        if subscription in subscribers:
+            subscribers.remove(subscription)
+        if not subscribers:
+            self._subscriptions.pop(subscription.key, None)
+            self._results.pop(subscription.key, None)
+            stream = self._streams.pop(subscription.key, None)
+            if stream is not None:
+                stream.stop()
+
+    def last_result(self, key: CommandKey) -> Any:
+        return self._results.get(key)
+
+    def request(self, key: CommandKey) -> bool:
+        """Start a run of key unless one is already in flight. Returns whether a run was started."""
+        if key.stream:
+            # Streamed output arrives on its own
+            return False
+        if key in self._in_flight:
+            self.skipped_runs += 1
+            return False
+        self._in_flight.add(key)
+        try:
+            self._executor.submit(self._run, key)
+        except RuntimeError:
+            # The pool was shut down while the application quits
+            self._in_flight.discard(key)
+            return False
+        return True
+
+    def _run(self, key: CommandKey) -> None:
+        try:
+            result = self._runner(key)
+        except Exception as e:
+            logging.error("Custom command %s failed: %s", " ".join(key.cmd), e)
+            ok, result = False, None
+        else:
+            ok = True
+        self._emit_result(key, ok, result)
+
+    def _emit_result(self, key: CommandKey, ok: bool, result: Any) -> None:
+        try:
+            self._run_finished.emit(key, ok, result)
+        except RuntimeError:
+            pass
+
+    def _on_run_finished(self, key: CommandKey, ok: bool, result: Any) -> None:
+        self._in_flight.discard(key)
+        if not ok or key not in self._subscriptions:
+            return
+        self._results[key] = result
+        for subscription in list(self._subscriptions[key]):
+            try:
+                subscription.callback(result)
+            except RuntimeError:
+                # The owner was deleted on the C++ side
+                self.unsubscribe(subscription)
+            except Exception:
+                logging.exception("Custom command subscriber for %s failed", " ".join(key.cmd))
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for stream in self._streams.values():
+            stream.stop()
+        self._streams.clear()
@@ -0,0 +1,204 @@
+"""
+Long-running custom widget commands.
+
+A streamed command is started once and every line it writes to stdout is parsed like the output
+of a polled command. When the process exits it is restarted with exponential backoff, which is
+reset once a process has stayed up for a while. With use_shell the started process is only the
+shell, so the whole process tree is stopped: on Windows through a job object that also kills it
+when the bar exits, elsewhere through a process group.
+"""
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from core.widgets.services.custom.command import CommandKey, parse_output, popen_args, popen_kwargs
+
+if sys.platform == "win32":
+    import ctypes
+
+    import pywintypes
+    import win32api
+    import win32con
+    import win32job
+
+RESTART_BACKOFF_MIN_SECONDS = 1.0
+RESTART_BACKOFF_MAX_SECONDS = 60.0
+# A process that ran at least this long restarts after the minimum delay again
+STABLE_RUN_SECONDS = 30.0
+
+CREATE_SUSPENDED = 0x00000004
+PROCESS_SUSPEND_RESUME = 0x0800
+
+
+class _ProcessTree:
+    """A started process and every process it starts."""
+
+    def __init__(self, proc: subprocess.Popen, job=None):
+        self.proc = proc
+        # Windows job object holding the tree, closing it kills whatever is still running
+        self._job = job
+
+    @classmethod
+    def start(cls, args: str | list[str], **kwargs) -> _ProcessTree:
+        if sys.platform != "win32":
+            return cls(subprocess.Popen(args, start_new_session=True, **kwargs))
+        # Started suspended so the shell can't start anything before it is in the job
+        kwargs["creationflags"] = kwargs.get("creationflags", 0) | CREATE_SUSPENDED
+        proc = subprocess.Popen(args, **kwargs)
+        try:
+            handle = win32api.OpenProcess(
+                win32con.PROCESS_SET_QUOTA | win32con.PROCESS_TERMINATE | PROCESS_SUSPEND_RESUME, False, proc.pid
+            )
+        except pywintypes.error as e:
+            proc.kill()
+            proc.wait()
+            if proc.stdout is not None:
+                proc.stdout.close()
+            raise OSError(f"Failed to open started process {proc.pid}: {e}") from e
+        try:
+            job = cls._create_job(handle)
+            ctypes.windll.ntdll.NtResumeProcess(int(handle))
+        finally:
+            handle.Close()
+        return cls(proc, job)
+
+    @staticmethod
+    def _create_job(handle):
+        try:
+            job = win32job.CreateJobObject(None, "")
+            info = win32job.QueryInformationJobObject(job, win32job.JobObjectExtendedLimitInformation)
+            info["BasicLimitInformation"]["LimitFlags"] |= win32job.JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+            win32job.SetInformationJobObject(job, win32job.JobObjectExtendedLimitInformation, info)
+            win32job.AssignProcessToJobObject(job, handle)
+        except pywintypes.error as e:
+            logging.debug("Failed to put custom command in a job object, stopping it with taskkill: %s", e)
+            return None
+        return job
+
+    def kill(self) -> None:
+        """Kill the tree without waiting for it to exit."""
+        if self._job is not None:
+            try:
+                win32job.TerminateJobObject(self._job, 1)
+                return
+            except pywintypes.error as e:
+                logging.debug("Failed to terminate custom command job: %s", e)
+        if self.proc.poll() is not None:
+            return
+        try:
+            if sys.platform == "win32":
+                # Not waited for, stopping a stream never blocks the caller
+                subprocess.Popen(
+                    ["taskkill", "/F", "/T", "/PID", str(self.proc.pid)],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    creationflags=subprocess.CREATE_NO_WINDOW,
+                )
+            else:
+                os.killpg(self.proc.pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """Release the job object, which kills any process of the tree that is still running."""
+        if self._job is not None:
+            self._job.Close()
+            self._job = None
+
+
+class CommandStream:
+    """Keeps one command running and hands each parsed line of its output to on_output."""
+
+    def __init__(
+        self,
+        key: CommandKey,
+        on_output: Callable[[Any], None],
+        backoff_min: float = RESTART_BACKOFF_MIN_SECONDS,
+        backoff_max: float = RESTART_BACKOFF_MAX_SECONDS,
+        stable_after: float = STABLE_RUN_SECONDS,
+    ):
+        self.key = key
+        self._on_output = on_output
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._stable_after = stable_after
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._tree: _ProcessTree | None = None
+        self._thread: threading.Thread | None = None
+        self.restarts = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="CustomCommandStream", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Kill the process tree without waiting, the reader thread ends once the output is closed."""
+        self._stop_event.set()
+        with self._lock:
+            if self._tree is not None:
+                self._tree.kill()
+
+    def _run(self) -> None:
+        delay = self._backoff_min
+        while not self._stop_event.is_set():
+            started = time.monotonic()
+            try:
+                returncode = self._consume()
+            except OSError as e:
+                logging.error("Failed to start custom command %s: %s", " ".join(self.key.cmd), e)
+                returncode = None
+            if self._stop_event.is_set():
+                break
+            if time.monotonic() - started >= self._stable_after:
+                delay = self._backoff_min
+            logging.warning(
+                "Custom command %s exited with %s, restarting in %.1f s", " ".join(self.key.cmd), returncode, delay
+            )
+            if self._stop_event.wait(delay):
+                break
+            delay = min(delay * 2, self._backoff_max)
+            self.restarts += 1
+
+    def _consume(self) -> int | None:
+        tree = _ProcessTree.start(
+            popen_args(self.key),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            stdin=subprocess.DEVNULL,
+            **popen_kwargs(self.key),
+        )
+        proc = tree.proc
+        with self._lock:
+            self._tree = tree
+            stopped = self._stop_event.is_set()
+        if stopped:
+            tree.kill()
+        try:
+            for line in proc.stdout:
+                if self._stop_event.is_set():
+                    break
+                if not line.strip():
+                    continue
+                result = parse_output(line, self.key.return_format)
+                if result is None:
+                    logging.debug("Skipping unparsable line from %s: %r", " ".join(self.key.cmd), line)
+                    continue
+                self._on_output(result)
+        finally:
+            with self._lock:
+                self._tree = None
+            tree.kill()
+            proc.stdout.close()
+            returncode = proc.wait()
+            tree.close()
+        return returncode
@@ -1,15 +1,20 @@
 import json
 import logging
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from enum import StrEnum, auto
 from typing import Any, cast
 
+from PyQt6 import sip
 from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal
 from PyQt6.QtNetwork import QAbstractSocket
 from PyQt6.QtWebSockets import QWebSocket
 
 logger = logging.getLogger("glazewm_client")
 
+# Queries requested within this window are sent once
+QUERY_COALESCE_MS = 15
+
 
 @dataclass
 class Window:
@@ -61,12 +66,35 @@ class TilingDirection(StrEnum):
     VERTICAL = auto()
 
 
+# Slices of the model each subscription event can affect. Events that carry the new data
+# themselves (or are applied to the cached model directly) need no query.
+EVENT_QUERIES: dict[str, tuple[QueryType, ...]] = {
+    "binding_modes_changed": (),
+    "tiling_direction_changed": (),
+    "workspace_updated": (),
+    "workspace_deactivated": (),
+    "workspace_activated": (QueryType.MONITORS,),
+    "focus_changed": (QueryType.MONITORS, QueryType.TILING_DIRECTION),
+    "focused_container_moved": (QueryType.MONITORS, QueryType.TILING_DIRECTION),
+}
+
+
 class GlazewmClient(QObject):
     workspaces_data_processed = pyqtSignal(list)
     tiling_direction_processed = pyqtSignal(TilingDirection)
     binding_mode_changed = pyqtSignal(BindingMode)
     glazewm_connection_status = pyqtSignal(bool)
 
+    _shared_clients: dict[str, GlazewmClient] = {}
+
+    @classmethod
+    def shared(cls, uri: str) -> GlazewmClient:
+        """Return the process-wide client for uri, so all widgets share one websocket."""
+        client = cls._shared_clients.get(uri)
+        if client is None or sip.isdeleted(client):
+            client = cls._shared_clients[uri] = cls(uri)
+        return client
+
     def __init__(
         self,
         uri: str,
@@ -87,6 +115,76 @@ class GlazewmClient(QObject):
         self._reconnect_timer.setInterval(reconnect_interval)
         self._reconnect_timer.timeout.connect(self.connect)  # type: ignore
 
+        self._events: set[str] = set()
+        self._queries: set[QueryType] = set()
+        self._pending_queries: set[QueryType] = set()
+        self._in_flight_queries: set[QueryType] = set()
+        self._query_timer = QTimer(self)
+        self._query_timer.setSingleShot(True)
+        self._query_timer.setInterval(QUERY_COALESCE_MS)
+        self._query_timer.timeout.connect(self._send_pending_queries)  # type: ignore
+
+        # Cached model, updated from query responses and event payloads
+        self._monitors_data: list[dict[str, Any]] | None = None
+        self._workspace_cache: dict[str, tuple[dict[str, Any], Workspace]] = {}
+        self._monitors: list[Monitor] | None = None
+        self._tiling_direction: TilingDirection | None = None
+        self._binding_mode: BindingMode | None = None
+
+    def subscribe(self, events: Iterable[str], queries: Iterable[QueryType]):
+        """
+        Register the events and query slices a widget needs. Slices already in the cached model
+        are replayed to the new widget instead of being queried again.
+        """
+        new_events = set(events) - self._events
+        self._events.update(new_events)
+        queries = set(queries)
+        self._queries.update(queries)
+        if not self._is_connected():
+            return
+        if new_events:
+            self._websocket.sendTextMessage(f"sub -e {' '.join(sorted(new_events))}")
+        QTimer.singleShot(0, lambda: self.glazewm_connection_status.emit(self._is_connected()))
+        missing = [query for query in queries if not self._replay(query)]
+        self._request(missing)
+
+    @property
+    def monitors(self) -> list[Monitor] | None:
+        """Last known monitors, or None before the first monitors query completed."""
+        return self._monitors
+
+    def _replay(self, query: QueryType) -> bool:
+        if query == QueryType.MONITORS and self._monitors is not None:
+            QTimer.singleShot(0, lambda: self.workspaces_data_processed.emit(self._monitors))
+        elif query == QueryType.TILING_DIRECTION and self._tiling_direction is not None:
+            QTimer.singleShot(0, lambda: self.tiling_direction_processed.emit(self._tiling_direction))
+        elif query == QueryType.BINDING_MODES and self._binding_mode is not None:
+            QTimer.singleShot(0, lambda: self.binding_mode_changed.emit(self._binding_mode))
+        else:
+            return False
+        return True
+
+    def _is_connected(self) -> bool:
+        return self._websocket.state() == QAbstractSocket.SocketState.ConnectedState
+
+    def _request(self, queries: Iterable[QueryType]):
+        """Schedule queries. A burst of events results in one query per slice."""
+        queries = set(queries) & self._queries
+        if not queries:
+            return
+        self._pending_queries.update(queries)
+        if not self._query_timer.isActive():
+            self._query_timer.start()
+
+    def _send_pending_queries(self):
+        if not self._is_connected():
+            return
+        # A slice still waiting for its response is sent again once that response arrives
+        for query in sorted(self._pending_queries - self._in_flight_queries):
+            self._pending_queries.discard(query)
+            self._in_flight_queries.add(query)
+            self._websocket.sendTextMessage(query)
+
     def activate_workspace(self, workspace_name: str):
         self._websocket.sendTextMessage(f"command focus --workspace {workspace_name}")
 
@@ -112,7 +210,10 @@ class GlazewmClient(QObject):
         self._websocket.sendTextMessage("command focus --prev-active-workspace")
 
     def connect(self):
-        if self._websocket.state() == QAbstractSocket.SocketState.ConnectedState:
+        if self._websocket.state() in (
+            QAbstractSocket.SocketState.ConnectedState,
+            QAbstractSocket.SocketState.ConnectingState,
+        ):
             return
         logger.debug("Connecting to %s", self._uri.toString())
         self._websocket.open(self._uri)
@@ -122,6 +223,10 @@ class GlazewmClient(QObject):
         for message in self.initial_messages:
             logger.debug("Sent initial message: %s", message)
             self._websocket.sendTextMessage(message)
+        if self._events:
+            self._websocket.sendTextMessage(f"sub -e {' '.join(sorted(self._events))}")
+        self._in_flight_queries.clear()
+        self._request(self._queries)
 
         # Stop reconnect timer
         self._reconnect_timer.stop()
@@ -142,30 +247,97 @@ class GlazewmClient(QObject):
             return
 
         if response.get("messageType") == MessageType.EVENT_SUBSCRIPTION:
-            self._websocket.sendTextMessage(QueryType.MONITORS)
-            self._websocket.sendTextMessage(QueryType.TILING_DIRECTION)
-            self._websocket.sendTextMessage(QueryType.BINDING_MODES)
+            event_data = response.get("data")
+            self._handle_event(event_data if isinstance(event_data, dict) else {})
         elif response.get("messageType") == MessageType.CLIENT_RESPONSE:
+            client_message = response.get("clientMessage")
+            if client_message in self._in_flight_queries:
+                self._in_flight_queries.discard(client_message)
+                if self._pending_queries:
+                    self._query_timer.start()
             raw_data: Any = response.get("data")
             if not isinstance(raw_data, dict):
                 logger.warning("Expected 'data' to be a dict, got %s", type(raw_data).__name__)
                 return
             data = cast(dict[str, Any], raw_data)
-            if response.get("clientMessage") == QueryType.MONITORS:
+            if client_message == QueryType.MONITORS:
                 monitors = data.get("monitors", [])
                 if monitors is None:
                     logger.warning("Expected 'monitors' to be a list, got None")
                     return
-                self.workspaces_data_processed.emit(self._process_workspaces(monitors))
-            elif response.get("clientMessage") == QueryType.TILING_DIRECTION:
-                tiling_direction = TilingDirection(data.get("tilingDirection", TilingDirection.HORIZONTAL))
-                self.tiling_direction_processed.emit(tiling_direction)
-            elif response.get("clientMessage") == QueryType.BINDING_MODES:
+                self._set_monitors_data(monitors)
+            elif client_message == QueryType.TILING_DIRECTION:
+                self._set_tiling_direction(data.get("tilingDirection", TilingDirection.HORIZONTAL))
+            elif client_message == QueryType.BINDING_MODES:
                 binding_modes = data.get("bindingModes", [])
                 if binding_modes is None:
                     logger.warning("Expected 'bindingModes' to be a list, got %s", type(binding_modes).__name__)
                     return
-                self.binding_mode_changed.emit(self._process_binding_modes(binding_modes))
+                self._set_binding_mode(binding_modes)
+
+    def _handle_event(self, data: dict[str, Any]):
+        """Apply an event payload to the cached model and query only the slices it can affect."""
+        event_type = data.get("eventType")
+        if event_type == "binding_modes_changed" and isinstance(data.get("newBindingModes"), list):
+            self._set_binding_mode(data["newBindingModes"])
+        elif event_type == "tiling_direction_changed" and data.get("newTilingDirection"):
+            self._set_tiling_direction(data["newTilingDirection"])
+        elif event_type == "workspace_updated" and isinstance(data.get("updatedWorkspace"), dict):
+            if not self._patch_workspace(data["updatedWorkspace"]):
+                self._request([QueryType.MONITORS])
+        elif event_type == "workspace_deactivated" and data.get("deactivatedId"):
+            if not self._remove_workspace(data["deactivatedId"]):
+                self._request([QueryType.MONITORS])
+        else:
+            self._request(EVENT_QUERIES.get(event_type, tuple(QueryType)))
+
+    def _set_monitors_data(self, monitors: list[dict[str, Any]]):
+        if monitors == self._monitors_data and self._monitors is not None:
+            return
+        self._monitors_data = monitors
+        self._emit_monitors()
+
+    def _emit_monitors(self):
+        data = self._monitors_data or []
+        self._monitors = self._process_workspaces(data)
+        live_ids = {child.get("id") for monitor in data for child in monitor.get("children", [])}
+        for workspace_id in self._workspace_cache.keys() - live_ids:
+            del self._workspace_cache[workspace_id]
+        self.workspaces_data_processed.emit(self._monitors)
+
+    def _patch_workspace(self, workspace: dict[str, Any]) -> bool:
+        for monitor in self._monitors_data or []:
+            children = monitor.get("children", [])
+            for i, child in enumerate(children):
+                if child.get("type") == "workspace" and child.get("id") == workspace.get("id"):
+                    if child != workspace:
+                        children[i] = workspace
+                        self._emit_monitors()
+                    return True
+        return False
+
+    def _remove_workspace(self, workspace_id: str) -> bool:
+        for monitor in self._monitors_data or []:
+            children = monitor.get("children", [])
+            for i, child in enumerate(children):
+                if child.get("type") == "workspace" and child.get("id") == workspace_id:
+                    del children[i]
+                    self._emit_monitors()
+                    return True
+        return False
+
+    def _set_tiling_direction(self, value: str):
+        try:
+            tiling_direction = TilingDirection(value)
+        except ValueError:
+            logger.warning("Unknown tiling direction %s", value)
+            return
+        self._tiling_direction = tiling_direction
+        self.tiling_direction_processed.emit(tiling_direction)
+
+    def _set_binding_mode(self, binding_modes: list[dict[str, Any]]):
+        self._binding_mode = self._process_binding_modes(binding_modes)
+        self.binding_mode_changed.emit(self._binding_mode)
 
     def _process_workspaces(self, data: list[dict[str, Any]]) -> list[Monitor]:
         monitors: list[Monitor] = []
@@ -178,16 +350,7 @@ class GlazewmClient(QObject):
             if not monitor_name:
                 monitor_name = f"Unknown_{handle}"
             workspaces_data = [
-                Workspace(
-                    name=child.get("name", ""),
-                    display_name=child.get("displayName", ""),
-                    is_displayed=child.get("isDisplayed", False),
-                    focus=child.get("hasFocus", False),
-                    num_windows=len(child.get("children", [])),
-                    windows=self._read_windows(child),
-                )
-                for child in mon.get("children", [])
-                if child.get("type") == "workspace"
+                self._process_workspace(child) for child in mon.get("children", []) if child.get("type") == "workspace"
             ]
             monitors.append(
                 Monitor(
@@ -198,6 +361,24 @@ class GlazewmClient(QObject):
             )
         return monitors
 
+    def _process_workspace(self, data: dict[str, Any]) -> Workspace:
+        # Unchanged workspaces keep their dataclass instead of being rebuilt on every update
+        workspace_id = data.get("id")
+        cached = self._workspace_cache.get(workspace_id) if workspace_id else None
+        if cached is not None and cached[0] == data:
+            return cached[1]
+        workspace = Workspace(
+            name=data.get("name", ""),
+            display_name=data.get("displayName", ""),
+            is_displayed=data.get("isDisplayed", False),
+            focus=data.get("hasFocus", False),
+            num_windows=len(data.get("children", [])),
+            windows=self._read_windows(data),
+        )
+        if workspace_id:
+            self._workspace_cache[workspace_id] = (data, workspace)
+        return workspace
+
     def _process_binding_modes(self, data: list[dict[str, Any]]) -> BindingMode:
         if len(data) == 0:
             return BindingMode(name=None, display_name=None)
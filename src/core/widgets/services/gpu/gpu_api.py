@@ -3,9 +3,6 @@ import logging
 from ctypes import byref, wintypes
 from typing import NamedTuple
 
-from PyQt6.QtCore import QThread, pyqtSignal
-from PyQt6.QtWidgets import QApplication
-
 from core.utils.win32.bindings.pdh import pdh
 from core.utils.win32.constants import PDH_FMT_DOUBLE
 
@@ -493,53 +490,3 @@ class GpuApi:
         ]
         for luid, adl_idx in zip(amd_luids, self._adl.active_indices):
             self._luid_info[luid]["adl_index"] = adl_idx
-
-
-class GpuWorker(QThread):
-    _instance: GpuWorker | None = None
-    data_ready = pyqtSignal(list)
-
-    @classmethod
-    def get_instance(cls, update_interval: int) -> GpuWorker:
-        if cls._instance is None:
-            cls._instance = cls(update_interval)
-        return cls._instance
-
-    def add_index(self, index: int) -> None:
-        self._gpu_indices.add(index)
-
-    def __init__(self, update_interval: int, parent=None):
-        super().__init__(parent)
-        self._running = True
-        self._update_interval = update_interval
-        self._gpu_indices: set[int] = set()
-        app = QApplication.instance()
-        if app is not None:
-            app.aboutToQuit.connect(self.stop)
-
-    def stop(self) -> None:
-        self._running = False
-        GpuWorker._instance = None
-
-    def run(self) -> None:
-        api = GpuApi(self._gpu_indices)
-        try:
-            api.prime()
-            available = {info["index"] for info in api._luid_info.values()}
-            missing = self._gpu_indices - available
-            if missing:
-                logger.warning("GpuWorker gpu_index %s not found. Available indices: %s", missing, sorted(available))
-            if not (self._gpu_indices & available):
-                return
-            while self._running:
-                try:
-                    data = api.collect()
-                    if self._running:
-                        self.data_ready.emit(data)
-                except Exception as e:
-                    logger.error("GpuWorker %s", e)
-                    if self._running:
-                        self.data_ready.emit([])
-                self.msleep(self._update_interval)
-        finally:
-            api.close()
@@ -1,16 +1,19 @@
-import json
 import logging
 import threading
 import uuid
 
 import pywintypes
+import win32event
 import win32file
 import win32pipe
+import winerror
 from PyQt6.QtCore import QThread
 
 from core.events.komorebi import KomorebiEvent
 from core.events.service import EventService
 from core.widgets.services.komorebi.client import KomorebiClient
+from core.widgets.services.komorebi.pipe_protocol import KomorebiConnection, KomorebiMessageFramer
+from core.widgets.services.komorebi.state_diff import KomorebiStateDiffer
 
 KOMOREBI_PIPE_BUFF_SIZE = 64 * 1024 * 8
 KOMOREBI_PIPE_NAME = "yasb"
@@ -21,10 +24,15 @@ class KomorebiEventListener(QThread):
         super().__init__()
         self._komorebic = KomorebiClient()
         self._stop_event = threading.Event()
+        # Signalled together with _stop_event so blocking pipe waits wake up on stop
+        self._stop_handle = win32event.CreateEvent(None, True, False, None)
+        self._connection = KomorebiConnection()
+        self._framer = KomorebiMessageFramer()
         self.pipe_name = f"{pipe_name}-{uuid.uuid1()}"
         self.buffer_size = buffer_size
         self.event_service = EventService()
         self.pipe = None
+        self._state_differ = KomorebiStateDiffer()
 
     def __str__(self):
         return "Komorebi Event Listener"
@@ -34,7 +42,7 @@ class KomorebiEventListener(QThread):
         return not self._stop_event.is_set()
 
     def _create_pipe(self) -> None:
-        open_mode = win32pipe.PIPE_ACCESS_DUPLEX
+        open_mode = win32pipe.PIPE_ACCESS_DUPLEX | win32file.FILE_FLAG_OVERLAPPED
         pipe_mode = win32pipe.PIPE_TYPE_MESSAGE | win32pipe.PIPE_READMODE_MESSAGE | win32pipe.PIPE_WAIT
         max_instances = 1
         buffer_size_in = self.buffer_size
@@ -61,68 +69,109 @@ class KomorebiEventListener(QThread):
                 pass
             self.pipe = None
 
-    def run(self):
+    def _wait_for(self, overlapped: pywintypes.OVERLAPPED) -> bool:
+        """Block until an overlapped operation completes. Returns False if the listener was stopped first."""
+        result = win32event.WaitForMultipleObjects([overlapped.hEvent, self._stop_handle], False, win32event.INFINITE)
+        if result == win32event.WAIT_OBJECT_0:
+            return True
+        win32file.CancelIo(self.pipe)
+        try:
+            # The buffer and event must outlive the cancelled operation
+            win32file.GetOverlappedResult(self.pipe, overlapped, True)
+        except pywintypes.error:
+            pass
+        return False
+
+    def _connect_pipe(self) -> bool:
+        overlapped = pywintypes.OVERLAPPED()
+        overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        result = win32pipe.ConnectNamedPipe(self.pipe, overlapped)
+        if result == winerror.ERROR_PIPE_CONNECTED:
+            return True
+        if not self._wait_for(overlapped):
+            return False
+        win32file.GetOverlappedResult(self.pipe, overlapped, False)
+        return True
+
+    def _read_messages(self) -> None:
+        """Read notifications until the pipe breaks or the listener stops. Blocks without polling."""
+        overlapped = pywintypes.OVERLAPPED()
+        overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        buffer = win32file.AllocateReadBuffer(self.buffer_size)
         while self._app_running:
-            should_reconnect = True
+            win32file.ReadFile(self.pipe, buffer, overlapped)
+            if not self._wait_for(overlapped):
+                return
+            try:
+                size = win32file.GetOverlappedResult(self.pipe, overlapped, False)
+                end_of_message = True
+            except pywintypes.error as e:
+                if e.winerror != winerror.ERROR_MORE_DATA:
+                    raise
+                # The message is larger than the buffer, the rest comes with the next read
+                size = len(buffer)
+                end_of_message = False
+
+            messages = self._framer.feed(bytes(buffer[:size]))
+            if end_of_message:
+                messages.extend(self._framer.end_of_message())
+            for message in messages:
+                self._handle_message(message)
+
+    def _handle_message(self, message: dict) -> None:
+        try:
+            event = message["event"]
+            state = message["state"]
+        except KeyError:
+            logging.exception("Failed to parse komorebi state. Received data: %s", message)
+            return
+        if event and state:
+            self._emit_event(event, state)
+
+    def run(self):
+        while self._connection.running:
+            self._connection.connecting()
             try:
                 self._create_pipe()
-                self._wait_until_komorebi_online()
-
-                while self._app_running:
-                    try:
-                        buffer, bytes_to_read, result = win32pipe.PeekNamedPipe(self.pipe, 1)
-                        if not bytes_to_read:
-                            if self._stop_event.wait(0.05):
-                                break
-                            continue
-
-                        result, data = win32file.ReadFile(self.pipe, bytes_to_read, None)
-
-                        if not data.strip():
-                            continue
-
-                        try:
-                            event_message = json.loads(data.decode("utf-8"))
-                            event = event_message["event"]
-                            state = event_message["state"]
-
-                            if event and state:
-                                self._emit_event(event, state)
-                        except KeyError, ValueError:
-                            logging.exception("Failed to parse komorebi state. Received data: %s", data)
-                    except pywintypes.error as e:
-                        if e.winerror == 109:  # ERROR_BROKEN_PIPE
-                            logging.warning("Pipe has been ended: %s", e)
-                            break
-                        else:
-                            logging.exception("Unexpected error occurred: %s", e)
-            except BaseException, Exception:
+                if self._wait_until_komorebi_online():
+                    self._connection.connected()
+                    self._read_messages()
+            except pywintypes.error as e:
+                if e.winerror == winerror.ERROR_BROKEN_PIPE:
+                    logging.warning("Pipe has been ended: %s", e)
+                else:
+                    logging.exception("Unexpected error occurred: %s", e)
+            except Exception:
                 logging.exception("Komorebi has disconnected from the named pipe %s", self.pipe_name)
             finally:
                 self._close_pipe()
+                self._framer.reset()
                 self.event_service.emit_event(KomorebiEvent.KomorebiDisconnect)
-                if not self._app_running:
-                    should_reconnect = False
-                elif should_reconnect:
-                    logging.info("Attempting to reconnect to Komorebi...")
-                    if self._stop_event.wait(3):
-                        should_reconnect = False
-            if not should_reconnect:
+
+            delay = self._connection.disconnected()
+            if delay is None:
+                break
+            logging.info("Attempting to reconnect to Komorebi in %.0f seconds...", delay)
+            if self._stop_event.wait(delay):
                 break
 
     def stop(self):
+        self._connection.stop()
         self._stop_event.set()
-        self._close_pipe()
+        win32event.SetEvent(self._stop_handle)
 
     def _emit_event(self, event: dict, state: dict) -> None:
         if isinstance(event, str):
             return
         self.event_service.emit_event(KomorebiEvent.KomorebiUpdate, event, state)
+        # Diffing runs here on the listener thread so widgets only receive what changed
+        changes = self._state_differ.update(state)
+        self.event_service.emit_event(KomorebiEvent.KomorebiChange, event, state, changes)
 
         if event["type"] in KomorebiEvent:
             self.event_service.emit_event(KomorebiEvent[event["type"]], event, state)
 
-    def _wait_until_komorebi_online(self):
+    def _wait_until_komorebi_online(self) -> bool:
         logging.debug("Waiting for Komorebi to subscribe to named pipe %s", self.pipe_name)
         stderr, proc = self._komorebic.wait_until_subscribed_to_pipe(self.pipe_name)
 
@@ -137,13 +186,14 @@ class KomorebiEventListener(QThread):
 
         while self._app_running and proc.returncode != 0:
             if self._stop_event.wait(5):
-                return
+                return False
             stderr, proc = self._komorebic.wait_until_subscribed_to_pipe(self.pipe_name)
 
         if not self._app_running or self.pipe is None:
-            return
+            return False
 
-        win32pipe.ConnectNamedPipe(self.pipe, None)
+        if not self._connect_pipe():
+            return False
         logging.info("Komorebi connected to named pipe: %s", self.pipe_name)
         state = self._komorebic.query_state()
 
@@ -153,7 +203,9 @@ class KomorebiEventListener(QThread):
                 "Retrying in 2 second... Is komorebi online and its binaries added to $PATH?"
             )
             if self._stop_event.wait(2):
-                return
+                return False
             state = self._komorebic.query_state()
 
+        self._state_differ.reset(state)
         self.event_service.emit_event(KomorebiEvent.KomorebiConnect, state)
+        return True
@@ -0,0 +1,120 @@
+"""
+Transport-independent parts of the komorebi pipe listener.
+
+KomorebiMessageFramer turns raw bytes into decoded notifications and KomorebiConnection tracks
+the connect/reconnect cycle. Neither touches the pipe handle, so both work with any byte stream.
+"""
+
+import json
+import logging
+from enum import Enum, auto
+
+RECONNECT_INITIAL_DELAY_SECS = 1.0
+RECONNECT_MAX_DELAY_SECS = 30.0
+RECONNECT_BACKOFF_FACTOR = 2.0
+
+
+class KomorebiMessageFramer:
+    """Splits a byte stream of newline-delimited JSON notifications into messages."""
+
+    def __init__(self, max_buffer_size: int = 64 * 1024 * 1024):
+        self._buffer = bytearray()
+        self._max_buffer_size = max_buffer_size
+
+    def feed(self, data: bytes) -> list[dict]:
+        """Add received bytes and return every notification completed by them."""
+        self._buffer += data
+        messages = []
+        while True:
+            newline = self._buffer.find(b"\n")
+            if newline < 0:
+                break
+            line = bytes(self._buffer[:newline])
+            del self._buffer[: newline + 1]
+            message = self._decode(line)
+            if message is not None:
+                messages.append(message)
+        if len(self._buffer) > self._max_buffer_size:
+            logging.warning("Discarding %d bytes of unterminated komorebi data", len(self._buffer))
+            self._buffer.clear()
+        return messages
+
+    def end_of_message(self) -> list[dict]:
+        """Flush a pipe message that ended without a trailing newline, if it holds complete JSON."""
+        if not self._buffer.strip():
+            self._buffer.clear()
+            return []
+        try:
+            message = json.loads(self._buffer.decode("utf-8"))
+        except ValueError:
+            # Incomplete, the rest arrives with the next read
+            return []
+        self._buffer.clear()
+        return [message] if isinstance(message, dict) else []
+
+    def reset(self):
+        self._buffer.clear()
+
+    @staticmethod
+    def _decode(line: bytes) -> dict | None:
+        if not line.strip():
+            return None
+        try:
+            message = json.loads(line.decode("utf-8"))
+        except ValueError:
+            logging.exception("Failed to parse komorebi state. Received data: %s", line)
+            return None
+        return message if isinstance(message, dict) else None
+
+
+class ConnectionState(Enum):
+    DISCONNECTED = auto()
+    CONNECTING = auto()
+    CONNECTED = auto()
+    BACKOFF = auto()
+    STOPPED = auto()
+
+
+class KomorebiConnection:
+    """
+    State machine for the listener's connection to komorebi.
+    Failed or dropped connections are retried with exponential backoff, which resets once a
+    connection succeeds.
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = RECONNECT_INITIAL_DELAY_SECS,
+        max_delay: float = RECONNECT_MAX_DELAY_SECS,
+        factor: float = RECONNECT_BACKOFF_FACTOR,
+    ):
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self._factor = factor
+        self._delay = initial_delay
+        self.state = ConnectionState.DISCONNECTED
+
+    @property
+    def running(self) -> bool:
+        return self.state != ConnectionState.STOPPED
+
+    def connecting(self):
+        if self.running:
+            self.state = ConnectionState.CONNECTING
+
+    def connected(self):
+        if self.running:
+            self.state = ConnectionState.CONNECTED
+            self._delay = self._initial_delay
+
+    def disconnected(self) -> float | None:
+        """Record a lost or failed connection and return the delay before the next attempt."""
+        if not self.running:
+            return None
+        self.state = ConnectionState.BACKOFF
+        delay = self._delay
+        self._delay = min(self._delay * self._factor, self._max_delay)
+        return delay
+
+    def stop(self):
+        self.state = ConnectionState.STOPPED
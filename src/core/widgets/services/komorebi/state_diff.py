@@ -0,0 +1,238 @@
+"""
+Structural diffing of komorebi states.
+
+Komorebi sends its complete state with every event. KomorebiStateDiffer keeps a compact summary
+of the previous state and turns each new one into a StateChangeSet, so widgets can update only
+what actually changed instead of re-processing every monitor, workspace and container.
+"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any
+
+
+class StateChangeKind(Enum):
+    WORKSPACE_ADDED = "WorkspaceAdded"
+    WORKSPACE_REMOVED = "WorkspaceRemoved"
+    WORKSPACE_RENAMED = "WorkspaceRenamed"
+    WORKSPACE_FOCUS_CHANGED = "WorkspaceFocusChanged"
+    MONITOR_FOCUS_CHANGED = "MonitorFocusChanged"
+    LAYOUT_CHANGED = "LayoutChanged"
+    LAYER_CHANGED = "LayerChanged"
+    WINDOW_COUNT_CHANGED = "WindowCountChanged"
+    WINDOWS_CHANGED = "WindowsChanged"
+    FLOAT_OVERRIDE_CHANGED = "FloatOverrideChanged"
+    PAUSE_CHANGED = "PauseChanged"
+
+
+@dataclass(frozen=True)
+class StateChange:
+    kind: StateChangeKind
+    monitor_id: int | None = None
+    workspace_index: int | None = None
+    old: Any = None
+    new: Any = None
+
+
+@dataclass
+class StateChangeSet:
+    changes: list[StateChange] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def of(self, *kinds: StateChangeKind, monitor_id: int | None = None) -> list[StateChange]:
+        """Changes of the given kinds, limited to one monitor (and global changes) if monitor_id is set."""
+        return [
+            change
+            for change in self.changes
+            if change.kind in kinds
+            and (monitor_id is None or change.monitor_id is None or change.monitor_id == monitor_id)
+        ]
+
+    def has(self, *kinds: StateChangeKind, monitor_id: int | None = None) -> bool:
+        return bool(self.of(*kinds, monitor_id=monitor_id))
+
+    def workspace_indexes(self, *kinds: StateChangeKind, monitor_id: int | None = None) -> set[int]:
+        return {
+            change.workspace_index
+            for change in self.of(*kinds, monitor_id=monitor_id)
+            if change.workspace_index is not None
+        }
+
+    def for_monitor(self, monitor_id: int) -> StateChangeSet:
+        return StateChangeSet(
+            [change for change in self.changes if change.monitor_id is None or change.monitor_id == monitor_id]
+        )
+
+
+@dataclass(frozen=True)
+class WorkspaceSummary:
+    name: str | None
+    layout: Any
+    layer: str | None
+    windows: tuple[int, ...]
+    floating_windows: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class MonitorSummary:
+    monitor_id: int | None
+    focused_workspace: int | None
+    workspaces: tuple[WorkspaceSummary, ...]
+
+
+@dataclass(frozen=True)
+class StateSummary:
+    focused_monitor: int | None
+    float_override: bool
+    is_paused: bool
+    monitors: tuple[MonitorSummary, ...]
+
+
+def _elements(value: Any) -> list:
+    if isinstance(value, dict):
+        elements = value.get("elements")
+        if isinstance(elements, list):
+            return elements
+    return []
+
+
+def _hwnd(window: Any) -> int | None:
+    return window.get("hwnd") if isinstance(window, dict) else None
+
+
+def _summarize_workspace(workspace: dict) -> WorkspaceSummary:
+    windows = []
+    for container in _elements(workspace.get("containers")):
+        windows.extend(_hwnd(window) for window in _elements(container.get("windows")))
+    monocle = workspace.get("monocle_container")
+    if isinstance(monocle, dict):
+        windows.extend(_hwnd(window) for window in _elements(monocle.get("windows")))
+    maximized = _hwnd(workspace.get("maximized_window"))
+    if maximized is not None:
+        windows.append(maximized)
+    floating = tuple(_hwnd(window) for window in _elements(workspace.get("floating_windows")))
+    return WorkspaceSummary(
+        name=workspace.get("name"),
+        layout=workspace.get("layout"),
+        layer=workspace.get("layer"),
+        windows=tuple(windows),
+        floating_windows=floating,
+    )
+
+
+def summarize_state(state: dict) -> StateSummary:
+    """Reduce a komorebi state to the parts widgets render."""
+    monitors = state.get("monitors") or {}
+    summaries = []
+    for monitor in _elements(monitors):
+        workspaces = monitor.get("workspaces") or {}
+        summaries.append(
+            MonitorSummary(
+                monitor_id=monitor.get("id"),
+                focused_workspace=workspaces.get("focused"),
+                workspaces=tuple(_summarize_workspace(ws) for ws in _elements(workspaces)),
+            )
+        )
+    return StateSummary(
+        focused_monitor=monitors.get("focused"),
+        float_override=bool(state.get("float_override")),
+        is_paused=bool(state.get("is_paused")),
+        monitors=tuple(summaries),
+    )
+
+
+def _window_count(workspace: WorkspaceSummary) -> int:
+    return len(workspace.windows) + len(workspace.floating_windows)
+
+
+def _diff_monitor(old: MonitorSummary | None, new: MonitorSummary, changes: list[StateChange]):
+    monitor_id = new.monitor_id
+    old_workspaces = old.workspaces if old else ()
+    old_focused = old.focused_workspace if old else None
+    if old_focused != new.focused_workspace:
+        changes.append(
+            StateChange(
+                StateChangeKind.WORKSPACE_FOCUS_CHANGED,
+                monitor_id,
+                new.focused_workspace,
+                old_focused,
+                new.focused_workspace,
+            )
+        )
+
+    for index, workspace in enumerate(new.workspaces):
+        if index >= len(old_workspaces):
+            changes.append(StateChange(StateChangeKind.WORKSPACE_ADDED, monitor_id, index, None, workspace.name))
+            continue
+        previous = old_workspaces[index]
+        if previous == workspace:
+            continue
+        if previous.name != workspace.name:
+            changes.append(
+                StateChange(StateChangeKind.WORKSPACE_RENAMED, monitor_id, index, previous.name, workspace.name)
+            )
+        if previous.layout != workspace.layout:
+            changes.append(
+                StateChange(StateChangeKind.LAYOUT_CHANGED, monitor_id, index, previous.layout, workspace.layout)
+            )
+        if previous.layer != workspace.layer:
+            changes.append(
+                StateChange(StateChangeKind.LAYER_CHANGED, monitor_id, index, previous.layer, workspace.layer)
+            )
+        if previous.windows != workspace.windows or previous.floating_windows != workspace.floating_windows:
+            old_count, new_count = _window_count(previous), _window_count(workspace)
+            if old_count != new_count:
+                changes.append(
+                    StateChange(StateChangeKind.WINDOW_COUNT_CHANGED, monitor_id, index, old_count, new_count)
+                )
+            changes.append(StateChange(StateChangeKind.WINDOWS_CHANGED, monitor_id, index))
+
+    for index in range(len(new.workspaces), len(old_workspaces)):
+        changes.append(
+            StateChange(StateChangeKind.WORKSPACE_REMOVED, monitor_id, index, old_workspaces[index].name, None)
+        )
+
+
+def diff_states(old: StateSummary | None, new: StateSummary) -> StateChangeSet:
+    """Compute the changes between two state summaries. A missing old state reports everything as added."""
+    changes: list[StateChange] = []
+    if old is None or old.focused_monitor != new.focused_monitor:
+        old_focused = old.focused_monitor if old else None
+        changes.append(StateChange(StateChangeKind.MONITOR_FOCUS_CHANGED, old=old_focused, new=new.focused_monitor))
+    if old is not None and old.float_override != new.float_override:
+        changes.append(
+            StateChange(StateChangeKind.FLOAT_OVERRIDE_CHANGED, old=old.float_override, new=new.float_override)
+        )
+    if old is not None and old.is_paused != new.is_paused:
+        changes.append(StateChange(StateChangeKind.PAUSE_CHANGED, old=old.is_paused, new=new.is_paused))
+
+    old_monitors = {monitor.monitor_id: monitor for monitor in old.monitors} if old else {}
+    for monitor in new.monitors:
+        previous = old_monitors.get(monitor.monitor_id)
+        if previous != monitor:
+            _diff_monitor(previous, monitor, changes)
+    # Workspaces of a disconnected monitor are reported as removed
+    new_ids = {monitor.monitor_id for monitor in new.monitors}
+    for monitor_id, monitor in old_monitors.items():
+        if monitor_id not in new_ids:
+            for index, workspace in enumerate(monitor.workspaces):
+                changes.append(StateChange(StateChangeKind.WORKSPACE_REMOVED, monitor_id, index, workspace.name, None))
+    return StateChangeSet(changes)
+
+
+class KomorebiStateDiffer:
+    """Keeps the previous komorebi state summary and diffs every new state against it."""
+
+    def __init__(self):
+        self._previous: StateSummary | None = None
+
+    def reset(self, state: dict | None = None) -> None:
+        self._previous = summarize_state(state) if state else None
+
+    def update(self, state: dict) -> StateChangeSet:
+        summary = summarize_state(state)
+        changes = diff_states(self._previous, summary)
+        self._previous = summary
+        return changes
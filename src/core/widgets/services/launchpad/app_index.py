@@ -0,0 +1,93 @@
+"""
+Fuzzy search over the launchpad's apps.
+
+Everything a query is matched against (lowercased title, its words and initials) is computed once
+when the index is built. Results are ranked with the same tiers as the quick launch fuzzy matcher
+and keep the launchpad order within a tier. Every tier implies a subsequence match, so when a query
+extends the previous one only the previous matches are scored again.
+"""
+
+from typing import Any
+
+from core.widgets.services.quick_launch.fuzzy import _get_initials
+
+GROUP_PREFIX = "group:"
+
+
+class _Entry:
+    __slots__ = ("app", "position", "title", "words", "initials", "group")
+
+    def __init__(self, app: dict[str, Any], position: int):
+        title = str(app.get("title") or "")
+        self.app = app
+        self.position = position
+        self.title = title.lower()
+        self.words = tuple(self.title.split())
+        self.initials = _get_initials(title) if title else ""
+        self.group = str(app.get("group") or "").lower()
+
+    def score(self, query: str) -> int | None:
+        """Match tier of a lowercased query, higher is better, None for no match."""
+        if self.initials.startswith(query):
+            return 6 if query == self.initials else 5
+        if self.title.startswith(query):
+            return 4
+        for word in self.words:
+            if word.startswith(query):
+                return 3
+        if query in self.title:
+            return 2
+        remaining = iter(self.title)
+        if all(ch in remaining for ch in query):
+            return 1
+        return None
+
+
+class AppIndex:
+    def __init__(self, apps: list[dict[str, Any]]):
+        self._entries = [_Entry(app, position) for position, app in enumerate(apps)]
+        self._keys: dict[int, str] = {}
+        seen: dict[str, int] = {}
+        for app in apps:
+            key = str(app.get("id", ""))
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            self._keys[id(app)] = key if count == 0 else f"{key}#{count}"
+        self._last_query = ""
+        self._last_matches: list[_Entry] = self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def keys(self) -> set[str]:
+        return set(self._keys.values())
+
+    def key_of(self, app: dict[str, Any]) -> str:
+        """Stable key of an app, unique within the index even if two apps share an id."""
+        key = self._keys.get(id(app))
+        return key if key is not None else str(app.get("id", ""))
+
+    def search(self, text: str) -> list[dict[str, Any]]:
+        """Apps matching text, best match first. "group:name" lists the apps of matching groups."""
+        query = text.strip().lower()
+        if query.startswith(GROUP_PREFIX):
+            group_query = query[len(GROUP_PREFIX) :].strip()
+            return [entry.app for entry in self._entries if group_query in entry.group]
+        if not query:
+            self._last_query, self._last_matches = "", self._entries
+            return [entry.app for entry in self._entries]
+
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_matches
+        else:
+            candidates = self._entries
+        scored = []
+        for entry in candidates:
+            score = entry.score(query)
+            if score is not None:
+                scored.append((-score, entry.position, entry))
+        scored.sort(key=lambda item: (item[0], item[1]))
+        matches = [item[2] for item in scored]
+        self._last_query, self._last_matches = query, matches
+        return [entry.app for entry in matches]
@@ -0,0 +1,64 @@
+"""
+In-memory copy of the launchpad's apps.json.
+
+The file is parsed once and kept until its modification time or size changes, so filtering and
+repainting the launchpad never touch the disk. Every change of the cached list bumps revision,
+which lets callers rebuild anything derived from it (the search index, app tiles) only when needed.
+"""
+
+import json
+import logging
+import os
+from typing import Any
+
+
+class AppStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._apps: list[dict[str, Any]] = []
+        self._stamp: tuple[int, int] | None = None
+        self.revision = 0
+
+    def _file_stamp(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def apps(self) -> list[dict[str, Any]]:
+        """The cached app list, reloaded if the file changed. Callers must not modify it."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            self._apps = self._read() if stamp is not None else []
+            self._stamp = stamp
+            self.revision += 1
+        return self._apps
+
+    def load(self) -> list[dict[str, Any]]:
+        """A copy of the app list that can be modified and passed to save()."""
+        return [dict(app) for app in self.apps]
+
+    def save(self, apps: list[dict[str, Any]]) -> bool:
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(apps, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            logging.error("Failed to save apps to %s: %s", self.path, e)
+            # Whatever made it to disk is read back on the next access
+            self._stamp = None
+            return False
+        self._apps = [dict(app) for app in apps]
+        self._stamp = self._file_stamp()
+        self.revision += 1
+        return True
+
+    def _read(self) -> list[dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                apps = json.load(f)
+        except Exception as e:
+            logging.error("Failed to load apps from %s: %s", self.path, e)
+            return []
+        return apps if isinstance(apps, list) else []
@@ -1,12 +1,7 @@
 """Windows native API for memory statistics."""
 
 import ctypes
-import logging
 from ctypes import wintypes
-from typing import NamedTuple
-
-from PyQt6.QtCore import QThread, pyqtSignal
-from PyQt6.QtWidgets import QApplication
 
 from core.utils.win32.bindings.kernel32 import kernel32
 from core.utils.win32.bindings.ntdll import SystemMemoryListInformation, ntdll
@@ -19,33 +14,7 @@ from core.utils.win32.structs import (
     PERFORMANCE_INFORMATION,
     SYSTEM_MEMORY_LIST_INFORMATION,
 )
-
-
-class VirtualMemory(NamedTuple):
-    """Virtual memory statistics."""
-
-    total: int
-    available: int
-    percent: float
-    used: int
-    free: int
-
-
-class SwapMemory(NamedTuple):
-    """Swap memory statistics."""
-
-    total: int
-    used: int
-    free: int
-    percent: float
-
-
-class MemoryData(NamedTuple):
-    """Combined memory data snapshot."""
-
-    virtual: VirtualMemory
-    swap: SwapMemory
-    cached_bytes: int = 0
+from core.widgets.services.metrics.data import MemoryData, SwapMemory, VirtualMemory
 
 
 class MemoryAPI:
@@ -204,41 +173,3 @@ class MemoryAPI:
             swap=cls.swap_memory(),
             cached_bytes=cls._get_cached_bytes(),
         )
-
-
-class MemoryWorker(QThread):
-    """Background thread for non-blocking memory data collection."""
-
-    _instance: MemoryWorker | None = None
-    data_ready = pyqtSignal(object)
-
-    @classmethod
-    def get_instance(cls, update_interval: int) -> MemoryWorker:
-        """Get or create the singleton worker instance."""
-        if cls._instance is None:
-            cls._instance = cls(update_interval)
-        return cls._instance
-
-    def __init__(self, update_interval: int, parent=None):
-        super().__init__(parent)
-        self._running = True
-        self._update_interval = update_interval
-        app_inst = QApplication.instance()
-        if app_inst is not None:
-            app_inst.aboutToQuit.connect(self.stop)
-
-    def stop(self):
-        """Signal the worker to stop."""
-        self._running = False
-        MemoryWorker._instance = None
-
-    def run(self):
-        """Collect memory data in a loop until stopped."""
-        while self._running:
-            try:
-                data = MemoryAPI.get_data()
-                if self._running:
-                    self.data_ready.emit(data)
-            except Exception as e:
-                logging.error("Memory worker error: %s", e)
-            self.msleep(self._update_interval)
@@ -0,0 +1,52 @@
+"""
+Snapshot types published by the metric sources.
+
+They are kept free of any platform API so sources for other platforms can produce them too.
+"""
+
+from typing import NamedTuple
+
+
+class CpuFreq(NamedTuple):
+    """CPU frequency in MHz."""
+
+    current: float
+    min: float
+    max: float
+
+
+class CpuData(NamedTuple):
+    """CPU data snapshot."""
+
+    freq: CpuFreq
+    percent: float
+    percent_per_core: list[float]
+    cores_physical: int
+    cores_logical: int
+
+
+class VirtualMemory(NamedTuple):
+    """Virtual memory statistics."""
+
+    total: int
+    available: int
+    percent: float
+    used: int
+    free: int
+
+
+class SwapMemory(NamedTuple):
+    """Swap memory statistics."""
+
+    total: int
+    used: int
+    free: int
+    percent: float
+
+
+class MemoryData(NamedTuple):
+    """Combined memory data snapshot."""
+
+    virtual: VirtualMemory
+    swap: SwapMemory
+    cached_bytes: int = 0
@@ -0,0 +1,125 @@
+"""
+Metric sources backed by the Linux /proc filesystem.
+
+They produce the same snapshot types as the Windows sources, so the sampler and the widgets can
+be exercised on Linux.
+"""
+
+from core.widgets.services.metrics.data import CpuData, CpuFreq, MemoryData, SwapMemory, VirtualMemory
+from core.widgets.services.metrics.sources import MetricSource
+
+
+def _read_lines(path: str) -> list[str]:
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+class ProcCpuSource(MetricSource):
+    """CPU usage from the tick counters in /proc/stat, frequency and core counts from /proc/cpuinfo."""
+
+    def __init__(self, proc_root: str = "/proc", sys_root: str = "/sys"):
+        self._proc_root = proc_root
+        self._sys_root = sys_root
+        self._previous: dict[str, tuple[int, int]] = {}
+        self._cores_physical = 1
+        self._max_freq = 0.0
+
+    def open(self) -> None:
+        cores = set()
+        physical_id = None
+        for line in _read_lines(f"{self._proc_root}/cpuinfo"):
+            key, _, value = line.partition(":")
+            key = key.strip()
+            if key == "physical id":
+                physical_id = value.strip()
+            elif key == "core id":
+                cores.add((physical_id, value.strip()))
+        self._cores_physical = max(1, len(cores))
+        try:
+            max_khz = _read_lines(f"{self._sys_root}/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq")[0]
+            self._max_freq = int(max_khz) / 1000.0
+        except OSError, IndexError, ValueError:
+            self._max_freq = 0.0
+
+    def _usage(self, name: str, fields: list[str]) -> float:
+        ticks = [int(value) for value in fields[:8]]
+        idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0)
+        total = sum(ticks)
+        previous_total, previous_idle = self._previous.get(name, (0, 0))
+        self._previous[name] = (total, idle)
+        if not previous_total or total <= previous_total:
+            return 0.0
+        busy = (total - previous_total) - (idle - previous_idle)
+        return min(100.0, max(0.0, round(busy * 100.0 / (total - previous_total), 1)))
+
+    def sample(self) -> CpuData:
+        percent = 0.0
+        per_core = []
+        for line in _read_lines(f"{self._proc_root}/stat"):
+            if not line.startswith("cpu"):
+                continue
+            name, *fields = line.split()
+            if name == "cpu":
+                percent = self._usage(name, fields)
+            else:
+                per_core.append(self._usage(name, fields))
+
+        freqs = [
+            float(line.partition(":")[2])
+            for line in _read_lines(f"{self._proc_root}/cpuinfo")
+            if line.startswith("cpu MHz")
+        ]
+        current = round(sum(freqs) / len(freqs), 1) if freqs else 0.0
+        logical = max(1, len(per_core))
+        return CpuData(
+            freq=CpuFreq(current=current, min=0.0, max=self._max_freq or current),
+            percent=percent,
+            percent_per_core=per_core or [percent],
+            cores_physical=min(self._cores_physical, logical),
+            cores_logical=logical,
+        )
+
+    def history_value(self, value: CpuData) -> float:
+        return value.percent
+
+
+class ProcMemorySource(MetricSource):
+    """Physical and swap memory from /proc/meminfo."""
+
+    def __init__(self, proc_root: str = "/proc"):
+        self._proc_root = proc_root
+
+    def sample(self) -> MemoryData:
+        info: dict[str, int] = {}
+        for line in _read_lines(f"{self._proc_root}/meminfo"):
+            key, _, value = line.partition(":")
+            parts = value.split()
+            if parts:
+                info[key] = int(parts[0]) * 1024
+
+        total = info.get("MemTotal", 0)
+        free = info.get("MemFree", 0)
+        available = info.get("MemAvailable", free)
+        used = total - available
+        swap_total = info.get("SwapTotal", 0)
+        swap_free = info.get("SwapFree", 0)
+        swap_used = swap_total - swap_free
+        return MemoryData(
+            virtual=VirtualMemory(
+                total=total,
+                available=available,
+                percent=round(used * 100.0 / total, 1) if total else 0.0,
+                used=used,
+                free=free,
+            ),
+            swap=SwapMemory(
+                total=swap_total,
+                used=swap_used,
+                free=swap_free,
+                percent=round(swap_used * 100.0 / swap_total, 1) if swap_total else 0.0,
+            ),
+            cached_bytes=info.get("Cached", 0),
+        )
+
+    def history_value(self, value: MemoryData) -> float:
+        return value.virtual.percent
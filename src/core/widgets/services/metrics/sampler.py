@@ -0,0 +1,271 @@
+"""
+One sampler for the system metrics shown by the bar.
+
+Widgets subscribe to a (metric, interval) pair. The sampler thread ticks at the greatest common
+divisor of all subscribed intervals, and on each tick reads every source needed by a due
+subscription exactly once. Results are published on the main thread as immutable snapshots that
+carry the metric's recent history, so chart widgets do not have to keep their own.
+"""
+
+import logging
+import math
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from core.utils.ring_buffer import RingBuffer
+from core.widgets.services.metrics.sources import CpuSource, GpuSource, MemorySource, MetricSource
+
+# Tick value used for the immediate sample taken for new subscriptions
+IMMEDIATE_TICK = -1
+
+
+@dataclass(frozen=True)
+class MetricSnapshot:
+    metric: str
+    value: Any
+    timestamp: float
+    history: tuple[float, ...] = ()
+
+
+class MetricSubscription:
+    def __init__(
+        self,
+        metric: str,
+        interval_ms: int,
+        callback: Callable[[MetricSnapshot], None],
+        owner: QWidget | None,
+        history_size: int,
+    ):
+        self.metric = metric
+        self.interval_ms = interval_ms
+        self.callback = callback
+        self.owner = owner
+        self.history_size = history_size
+        self.active = True
+        # Set until the first snapshot is delivered, so new subscribers do not wait a full interval
+        self.pending = True
+
+    def is_due(self, tick_ms: int) -> bool:
+        return self.pending or (tick_ms >= 0 and tick_ms % self.interval_ms == 0)
+
+
+def default_sources() -> dict[str, MetricSource]:
+    if sys.platform == "win32":
+        return {"cpu": CpuSource(), "memory": MemorySource(), "gpu": GpuSource()}
+    from core.widgets.services.metrics.proc_sources import ProcCpuSource, ProcMemorySource
+
+    return {"cpu": ProcCpuSource(), "memory": ProcMemorySource()}
+
+
+class _SamplerThread(QThread):
+    samples_ready = pyqtSignal(int, object)
+
+    def __init__(self, sampler: MetricsSampler):
+        super().__init__()
+        self._sampler = sampler
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    def wake(self) -> None:
+        self._wake_event.set()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        self.wait(1000)
+
+    def run(self) -> None:
+        tick_ms = 0
+        started = time.monotonic()
+        try:
+            while not self._stop_event.is_set():
+                base = self._sampler.base_interval_ms
+                timeout = None if base is None else max(0.0, started + tick_ms / 1000 - time.monotonic())
+                woken = self._wake_event.wait(timeout)
+                self._wake_event.clear()
+                if self._stop_event.is_set():
+                    break
+                if woken:
+                    self._emit(IMMEDIATE_TICK)
+                    if base is None or base != self._sampler.base_interval_ms:
+                        # The tick grid changed, start a new one from the sample just taken
+                        tick_ms = self._sampler.base_interval_ms or 0
+                        started = time.monotonic()
+                    continue
+
+                self._emit(tick_ms)
+                tick_ms += base
+                if started + tick_ms / 1000 < time.monotonic():
+                    # Fell behind (system sleep or a slow source), skip the missed ticks
+                    started = time.monotonic() - tick_ms / 1000
+        finally:
+            self._sampler.close_sources()
+
+    def _emit(self, tick_ms: int) -> None:
+        samples = self._sampler.sample_due(tick_ms)
+        if samples and not self._stop_event.is_set():
+            self.samples_ready.emit(tick_ms, samples)
+
+
+class MetricsSampler(QObject):
+    """Samples each metric source once per tick for all subscribed widgets."""
+
+    _shared: MetricsSampler | None = None
+
+    def __init__(self, sources: dict[str, MetricSource] | None = None, parent: QObject | None = None):
+        super().__init__(parent)
+        self._sources = sources if sources is not None else default_sources()
+        self._opened: set[str] = set()
+        self._failed: set[str] = set()
+        self._subscriptions: list[MetricSubscription] = []
+        self._histories: dict[tuple[str, int], RingBuffer] = {}
+        self._lock = threading.Lock()
+        self.base_interval_ms: int | None = None
+        self._thread: _SamplerThread | None = None
+
+    @classmethod
+    def shared(cls) -> MetricsSampler:
+        if cls._shared is None or sip.isdeleted(cls._shared):
+            cls._shared = cls()
+        return cls._shared
+
+    def source(self, metric: str) -> MetricSource | None:
+        return self._sources.get(metric)
+
+    def subscribe(
+        self,
+        metric: str,
+        interval_ms: int,
+        callback: Callable[[MetricSnapshot], None],
+        owner: QWidget | None = None,
+        history_size: int = 0,
+    ) -> MetricSubscription:
+        """
+        Deliver a snapshot of metric to callback every interval_ms milliseconds, with up to
+        history_size past values. The subscription ends when the owner widget is destroyed.
+        """
+        if metric not in self._sources:
+            raise ValueError(f"Unknown metric '{metric}'")
+        if interval_ms <= 0:
+            raise ValueError(f"Metric interval must be positive, got {interval_ms}")
+        subscription = MetricSubscription(metric, interval_ms, callback, owner, history_size)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            key = (metric, interval_ms)
+            history = self._histories.get(key)
+            if history is None:
+                self._histories[key] = RingBuffer(history_size)
+            elif history.capacity < history_size:
+                self._histories[key] = history.resized(history_size)
+            self._update_base_interval()
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self.unsubscribe(subscription))
+        self._ensure_thread()
+        self._thread.wake()
+        return subscription
+
+    def unsubscribe(self, subscription: MetricSubscription | None) -> None:
+        if subscription is None or not subscription.active:
+            return
+        subscription.active = False
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            key = (subscription.metric, subscription.interval_ms)
+            if not any((s.metric, s.interval_ms) == key for s in self._subscriptions):
+                self._histories.pop(key, None)
+            self._update_base_interval()
+        if self._thread is not None:
+            self._thread.wake()
+
+    def sample_due(self, tick_ms: int) -> dict[str, tuple[Any, float]]:
+        """Read every source with a subscription due at tick_ms. Runs on the sampler thread."""
+        with self._lock:
+            metrics = {s.metric for s in self._subscriptions if s.is_due(tick_ms)}
+        samples = {}
+        for metric in metrics:
+            source = self._sources[metric]
+            if metric in self._failed:
+                continue
+            if metric not in self._opened:
+                try:
+                    source.open()
+                except Exception:
+                    logging.exception("Failed to open the %s metric source", metric)
+                    self._failed.add(metric)
+                    continue
+                self._opened.add(metric)
+            try:
+                samples[metric] = (source.sample(), time.time())
+            except Exception as e:
+                logging.error("Failed to sample %s: %s", metric, e)
+        return samples
+
+    def close_sources(self) -> None:
+        for metric in list(self._opened):
+            try:
+                self._sources[metric].close()
+            except Exception:
+                logging.exception("Failed to close the %s metric source", metric)
+        self._opened.clear()
+
+    def publish(self, tick_ms: int, samples: dict[str, tuple[Any, float]]) -> None:
+        """Record history and deliver snapshots to the due subscriptions. Runs on the main thread."""
+        with self._lock:
+            due = [s for s in self._subscriptions if s.metric in samples and s.is_due(tick_ms)]
+        snapshots: dict[tuple[str, int], MetricSnapshot] = {}
+        for subscription in due:
+            key = (subscription.metric, subscription.interval_ms)
+            snapshot = snapshots.get(key)
+            if snapshot is None:
+                value, timestamp = samples[subscription.metric]
+                history = self._histories.get(key)
+                if history is not None and tick_ms != IMMEDIATE_TICK:
+                    point = self._sources[subscription.metric].history_value(value)
+                    if point is not None:
+                        history.append(point)
+                history_values = history.to_tuple() if history is not None else ()
+                snapshot = MetricSnapshot(subscription.metric, value, timestamp, history_values)
+                snapshots[key] = snapshot
+            if subscription.history_size < len(snapshot.history):
+                snapshot = MetricSnapshot(
+                    snapshot.metric,
+                    snapshot.value,
+                    snapshot.timestamp,
+                    snapshot.history[len(snapshot.history) - subscription.history_size :],
+                )
+            subscription.pending = False
+            try:
+                subscription.callback(snapshot)
+            except RuntimeError:
+                # The owner was deleted on the C++ side
+                self.unsubscribe(subscription)
+            except Exception:
+                logging.exception("Metric subscriber for %s failed", subscription.metric)
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+    def _update_base_interval(self) -> None:
+        intervals = {s.interval_ms for s in self._subscriptions}
+        self.base_interval_ms = math.gcd(*intervals) if intervals else None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = _SamplerThread(self)
+        self._thread.samples_ready.connect(self.publish)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+        self._thread.start()
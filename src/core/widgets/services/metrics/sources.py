@@ -0,0 +1,91 @@
+"""
+Metric sources read by MetricsSampler.
+
+A source is opened, sampled and closed on the sampler thread. The platform APIs are imported
+when a source is opened, so the sampler itself can be used where they are not available.
+"""
+
+import logging
+from typing import Any
+
+
+class MetricSource:
+    """Base class for a system metric read once per sampler tick."""
+
+    def open(self) -> None:
+        """Acquire handles or counters. Called on the sampler thread before the first sample."""
+
+    def sample(self) -> Any:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release what open() acquired."""
+
+    def history_value(self, value: Any) -> float | None:
+        """The number recorded in the metric's history for a sampled value, or None to keep no history."""
+        return None
+
+
+class CpuSource(MetricSource):
+    def open(self) -> None:
+        from core.widgets.services.cpu.cpu_api import CpuAPI
+
+        self._api = CpuAPI
+
+    def sample(self):
+        return self._api.get_data()
+
+    def history_value(self, value) -> float:
+        return value.percent
+
+
+class MemorySource(MetricSource):
+    def open(self) -> None:
+        from core.widgets.services.memory.memory_api import MemoryAPI
+
+        self._api = MemoryAPI
+
+    def sample(self):
+        return self._api.get_data()
+
+    def history_value(self, value) -> float:
+        return value.virtual.percent
+
+
+class GpuSource(MetricSource):
+    """All requested GPUs in one list. Widgets register their gpu_index with add_index() before subscribing."""
+
+    def __init__(self):
+        self._gpu_indices: set[int] = set()
+        self._api = None
+
+    def add_index(self, index: int) -> None:
+        self._gpu_indices.add(index)
+
+    def open(self) -> None:
+        from core.widgets.services.gpu.gpu_api import GpuApi
+
+        api = GpuApi(self._gpu_indices)
+        api.prime()
+        available = {info["index"] for info in api._luid_info.values()}
+        missing = self._gpu_indices - available
+        if missing:
+            logging.warning("GPU index %s not found. Available indices: %s", missing, sorted(available))
+        if not (self._gpu_indices & available):
+            api.close()
+            return
+        self._api = api
+
+    def sample(self) -> list:
+        if self._api is None:
+            return []
+        try:
+            return self._api.collect()
+        except Exception as e:
+            logging.error("GPU sampling failed: %s", e)
+            return []
+
+    def close(self) -> None:
+        if self._api is not None:
+            self._api.close()
+            self._api = None
@@ -16,6 +16,7 @@ from core.utils.win32.bindings import (
 )
 from core.utils.win32.bindings import user32 as _user32_raw
 from core.utils.win32.bindings.ole32 import ole32
+from core.utils.win32.icon_cache import IconCache
 from core.utils.win32.structs import MSG
 from core.widgets.services.taskbar.application_window import ApplicationWindow
 
@@ -341,6 +342,7 @@ class TaskbarWindowManager(QObject):
     def _on_window_destroyed(self, hwnd):
         """Remove a window when it's destroyed."""
         try:
+            IconCache().forget_window(hwnd)
             if hwnd in self._windows:
                 self._remove_window(hwnd)
         except Exception as e:
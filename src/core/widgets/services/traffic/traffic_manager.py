@@ -1,6 +1,4 @@
-import json
 import logging
-import re
 import time
 from datetime import datetime
 
@@ -8,6 +6,7 @@ from PyQt6.QtWidgets import QApplication
 
 from core.utils.system import app_data_path
 from core.widgets.services.traffic.network_api import NetworkAPI
+from core.widgets.services.traffic.traffic_store import TrafficStore
 
 
 class TrafficDataManager:
@@ -18,7 +17,7 @@ class TrafficDataManager:
         str, dict
     ] = {}  # {interface: {total_bytes_sent, total_bytes_recv, today_sent, today_recv, etc}}
     _global_data_folder = None
-    _interface_last_save_times: dict[str, float] = {}  # Track save time per interface
+    _store: TrafficStore | None = None
     _quit_handler_registered = False  # Track if global quit handler is registered
 
     @classmethod
@@ -29,6 +28,7 @@ class TrafficDataManager:
 
         try:
             cls._global_data_folder = app_data_path()
+            cls._store = TrafficStore(cls._global_data_folder)
 
             # Register quit handler once when data storage is set up
             cls._register_cleanup_handlers()
@@ -55,11 +55,11 @@ class TrafficDataManager:
     def destroy(cls):
         """Save data for all active interfaces on application quit"""
         try:
-            saved_interfaces = []
             for interface in cls._interface_data.keys():
                 if cls._interface_data[interface].get("_loaded", False):
-                    cls.save_interface_data(interface)
-                    saved_interfaces.append(interface)
+                    cls.stage_interface_data(interface)
+            if cls._store is not None:
+                cls._store.flush()
 
         except Exception as e:
             logging.error("Error saving interfaces on quit: %s", e)
@@ -67,15 +67,9 @@ class TrafficDataManager:
     @classmethod
     def get_interface_data_file(cls, interface: str):
         """Get the data file path for a specific interface"""
-        if cls._global_data_folder is None:
+        if cls._store is None:
             return None
-
-        # Sanitize interface name for filename
-        safe_interface = re.sub(r'[<>:"/\\|?*\s]', "_", interface.lower())
-        if safe_interface == "auto":
-            safe_interface = "system_auto"
-
-        return cls._global_data_folder / f"yasb_traffic_{safe_interface}.json"
+        return cls._store.path(interface)
 
     @classmethod
     def initialize_interface(cls, interface: str):
@@ -97,13 +91,11 @@ class TrafficDataManager:
             "today_start_sent": None,
             "today_start_recv": None,
             "session_start_time": time.time(),
+            "daily": {},
+            "monthly": {},
             "_loaded": False,
         }
 
-        # Initialize save time
-        if interface not in cls._interface_last_save_times:
-            cls._interface_last_save_times[interface] = time.time()
-
         # Load from file
         cls._load_from_file(interface)
         cls.initialize_today_tracking(interface)
@@ -146,21 +138,19 @@ class TrafficDataManager:
 
     @classmethod
     def _load_from_file(cls, interface: str):
-        """Load data from JSON file"""
-        data_file = cls.get_interface_data_file(interface)
-        if data_file and data_file.exists():
-            try:
-                with open(data_file) as f:
-                    data = json.load(f)
-
-                cls._interface_data[interface]["total_bytes_sent"] = data.get("total_sent", 0)
-                cls._interface_data[interface]["total_bytes_recv"] = data.get("total_recv", 0)
-                cls._interface_data[interface]["today_sent"] = data.get("today_sent", 0)
-                cls._interface_data[interface]["today_recv"] = data.get("today_recv", 0)
-                cls._interface_data[interface]["today_date"] = data.get("today_date", None)
-
-            except Exception as e:
-                logging.error("Error loading traffic data for interface %s: %s", interface, e)
+        """Load data from the traffic store"""
+        if cls._store is None:
+            return
+        data = cls._store.load(interface)
+        if not data:
+            return
+        cls._interface_data[interface]["total_bytes_sent"] = data.get("total_sent", 0)
+        cls._interface_data[interface]["total_bytes_recv"] = data.get("total_recv", 0)
+        cls._interface_data[interface]["today_sent"] = data.get("today_sent", 0)
+        cls._interface_data[interface]["today_recv"] = data.get("today_recv", 0)
+        cls._interface_data[interface]["today_date"] = data.get("today_date", None)
+        cls._interface_data[interface]["daily"] = data["daily"]
+        cls._interface_data[interface]["monthly"] = data["monthly"]
 
     @classmethod
     def _apply_alignment(cls, text: str, max_length: int, alignment: str) -> str:
@@ -213,9 +203,10 @@ class TrafficDataManager:
             # Update today tracking and total data
             cls.update_today_and_total_tracking(interface, current_io)
 
-            # Handle periodic saving
-            if cls.should_save_data(interface):
-                cls.save_interface_data(interface)
+            # Buffer the update, the store writes it out once its flush interval has passed
+            cls.stage_interface_data(interface)
+            if cls._store is not None:
+                cls._store.flush_if_due()
 
             # Calculate speeds per second
             upload_speed_per_sec = upload_diff / interval_seconds if interval_seconds > 0 else 0
@@ -276,31 +267,32 @@ class TrafficDataManager:
             return None
 
     @classmethod
-    def save_interface_data(cls, interface: str):
-        """Save traffic data for a specific interface"""
-        if interface not in cls._interface_data:
-            return
+    def _build_record(cls, interface: str) -> dict:
+        interface_data = cls._interface_data[interface]
+        return {
+            "interface": interface,
+            "total_sent": interface_data["total_bytes_sent"],
+            "total_recv": interface_data["total_bytes_recv"],
+            "today_sent": interface_data["today_sent"],
+            "today_recv": interface_data["today_recv"],
+            "today_date": interface_data["today_date"],
+            "daily": interface_data["daily"],
+            "monthly": interface_data["monthly"],
+        }
 
-        data_file = cls.get_interface_data_file(interface)
-        if data_file is None:
+    @classmethod
+    def stage_interface_data(cls, interface: str):
+        """Buffer traffic data for a specific interface until the store's next flush"""
+        if interface not in cls._interface_data or cls._store is None:
             return
+        cls._store.stage(interface, cls._build_record(interface))
 
-        try:
-            interface_data = cls._interface_data[interface]
-            data = {
-                "interface": interface,
-                "total_sent": interface_data["total_bytes_sent"],
-                "total_recv": interface_data["total_bytes_recv"],
-                "today_sent": interface_data["today_sent"],
-                "today_recv": interface_data["today_recv"],
-                "today_date": interface_data["today_date"],
-            }
-
-            with open(data_file, "w") as f:
-                json.dump(data, f, indent=2)
-
-        except Exception as e:
-            logging.error("Error saving traffic data for %s: %s", interface, e)
+    @classmethod
+    def save_interface_data(cls, interface: str):
+        """Save traffic data for a specific interface immediately"""
+        if interface not in cls._interface_data or cls._store is None:
+            return
+        cls._store.write(interface, cls._build_record(interface))
 
     @classmethod
     def initialize_today_tracking(cls, interface: str):
@@ -420,6 +412,13 @@ class TrafficDataManager:
             if today_diff_recv > 0:
                 cls._interface_data[interface]["total_bytes_recv"] += today_diff_recv
 
+            # Keep today's totals in the daily history, days that ended keep their last value
+            if today_diff_sent > 0 or today_diff_recv > 0:
+                cls._interface_data[interface]["daily"][today] = [
+                    cls._interface_data[interface]["today_sent"],
+                    cls._interface_data[interface]["today_recv"],
+                ]
+
         except Exception as e:
             logging.error("Error updating today and total tracking for %s: %s", interface, e)
 
@@ -473,25 +472,14 @@ class TrafficDataManager:
             cls._interface_data[interface]["today_start_sent"] = current_io.bytes_sent
             cls._interface_data[interface]["today_start_recv"] = current_io.bytes_recv
             cls._interface_data[interface]["today_date"] = datetime.now().strftime("%Y-%m-%d")
+            cls._interface_data[interface]["daily"] = {}
+            cls._interface_data[interface]["monthly"] = {}
 
             cls.save_interface_data(interface)
 
         except Exception as e:
             logging.error("Error resetting interface data for %s: %s", interface, e)
 
-    @classmethod
-    def should_save_data(cls, interface: str):
-        """Check if data should be saved for a specific interface (every 10 seconds per interface)"""
-        current_time = time.time()
-        if interface not in cls._interface_last_save_times:
-            cls._interface_last_save_times[interface] = current_time
-            return True
-
-        if current_time - cls._interface_last_save_times[interface] >= 10:
-            cls._interface_last_save_times[interface] = current_time
-            return True
-        return False
-
     @classmethod
     def format_data_size(cls, bytes_value):
         """Format data size in bytes to human readable format"""
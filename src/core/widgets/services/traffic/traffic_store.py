@@ -0,0 +1,102 @@
+"""
+Buffered on-disk storage for per-interface traffic totals.
+
+Updates are kept in memory and written at most once per flush interval, or when flush() is called
+at shutdown. Each interface is one compact JSON file that is replaced atomically, so an interrupted
+write leaves the previous file intact. Per-day totals older than DAILY_HISTORY_DAYS are rolled up
+into per-month totals when a file is written.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+FLUSH_INTERVAL_SECONDS = 60
+DAILY_HISTORY_DAYS = 62
+
+
+def roll_up(daily: dict[str, list[int]], monthly: dict[str, list[int]], today: date) -> None:
+    """Move the daily totals older than DAILY_HISTORY_DAYS into the totals of their month."""
+    cutoff = (today - timedelta(days=DAILY_HISTORY_DAYS)).isoformat()
+    for day in [day for day in daily if day < cutoff]:
+        sent, recv = daily.pop(day)
+        month = monthly.setdefault(day[:7], [0, 0])
+        month[0] += sent
+        month[1] += recv
+
+
+class TrafficStore:
+    def __init__(
+        self,
+        directory: Path,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._directory = directory
+        self._flush_interval = flush_interval
+        self._clock = clock
+        self._pending: dict[str, dict] = {}
+        self._last_flush = clock()
+
+    def path(self, interface: str) -> Path:
+        safe_interface = re.sub(r'[<>:"/\\|?*\s]', "_", interface.lower())
+        if safe_interface == "auto":
+            safe_interface = "system_auto"
+        return self._directory / f"yasb_traffic_{safe_interface}.json"
+
+    def load(self, interface: str) -> dict:
+        """The stored record of an interface, or an empty dict if there is none."""
+        path = self.path(interface)
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.error("Error loading traffic data for interface %s: %s", interface, e)
+            return {}
+        if not isinstance(record, dict):
+            logging.error("Ignoring malformed traffic data in %s", path)
+            return {}
+        record.setdefault("daily", {})
+        record.setdefault("monthly", {})
+        return record
+
+    def stage(self, interface: str, record: dict) -> None:
+        """Buffer the latest record of an interface until the next flush."""
+        self._pending[interface] = record
+
+    def flush_if_due(self) -> None:
+        if self._pending and self._clock() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write every buffered record."""
+        pending, self._pending = self._pending, {}
+        for interface, record in pending.items():
+            if not self.write(interface, record):
+                # Retry with the next flush unless a newer record was staged meanwhile
+                self._pending.setdefault(interface, record)
+        self._last_flush = self._clock()
+
+    def write(self, interface: str, record: dict) -> bool:
+        """Roll up and atomically replace the stored record of an interface."""
+        path = self.path(interface)
+        roll_up(record.setdefault("daily", {}), record.setdefault("monthly", {}), date.today())
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(record, separators=(",", ":")))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.error("Error saving traffic data for %s: %s", interface, e)
+            return False
+        return True
@@ -0,0 +1,109 @@
+"""
+Disk cache of wallpaper gallery thumbnails.
+
+Making a thumbnail means decoding a wallpaper that is often 4K or larger, so each one is made
+once and stored as a small JPEG keyed by the wallpaper file and the thumbnail size in device
+pixels. JPEG sources are decoded at a reduced scale through Pillow's draft mode, and every
+thumbnail is scaled to cover its cell and cropped around the center like the gallery draws it.
+Nothing here needs Qt, and all of it is safe to call from worker threads. A CancelToken stops a
+thumbnail that is no longer wanted between the steps of making it.
+"""
+
+import logging
+import threading
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from core.utils.disk_cache import DiskCache
+
+THUMBNAIL_CACHE_DIR = "wallpaper_thumbnails"
+THUMBNAIL_QUALITY = 90
+
+
+class ThumbnailCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    """Shared by the jobs of one gallery page, cancelled when the page is left."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise ThumbnailCancelled
+
+
+def make_thumbnail(image_path: str, width: int, height: int, token: CancelToken | None = None) -> Image.Image:
+    """The image scaled to cover width x height and center-cropped to exactly that size."""
+    with Image.open(image_path) as image:
+        # Lets the JPEG decoder skip most of the work, the result is still at least width x height
+        image.draft("RGB", (width, height))
+        if token is not None:
+            token.raise_if_cancelled()
+            image.load()
+            token.raise_if_cancelled()
+        if image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info:
+            # Wallpapers are shown without transparency, so flatten onto black like the desktop does
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size)
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        return ImageOps.fit(image, (width, height), Image.Resampling.BICUBIC)
+
+
+class ThumbnailCache:
+    _shared: ThumbnailCache | None = None
+
+    def __init__(self, disk: DiskCache | None = None):
+        self._disk = disk if disk is not None else DiskCache(THUMBNAIL_CACHE_DIR, ".jpg")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> ThumbnailCache:
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def get(self, image_path: str, width: int, height: int, token: CancelToken | None = None) -> Path | None:
+        """
+        Path of the width x height thumbnail of image_path, made first if it isn't cached yet.
+        None if the image can't be read or token was cancelled before the thumbnail was made.
+        """
+        entry = self._disk.entry_path(image_path, width, height)
+        if entry is None:
+            return None
+        if entry.is_file():
+            with self._lock:
+                self.hits += 1
+            return entry
+        if token is not None and token.cancelled:
+            return None
+        with self._lock:
+            self.misses += 1
+        try:
+            thumbnail = make_thumbnail(image_path, width, height, token)
+        except ThumbnailCancelled:
+            return None
+        except Exception as e:
+            logging.debug("Failed to make a thumbnail of %s: %s", image_path, e)
+            return None
+        if not self._disk.write(entry, lambda path: thumbnail.save(path, "JPEG", quality=THUMBNAIL_QUALITY)):
+            return None
+        return entry
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
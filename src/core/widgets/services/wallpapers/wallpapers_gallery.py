@@ -1,4 +1,6 @@
 import os
+import time
+from collections import deque
 from functools import partial
 
 from PyQt6.QtCore import (
@@ -15,7 +17,7 @@ from PyQt6.QtCore import (
     QTimer,
     pyqtSignal,
 )
-from PyQt6.QtGui import QCursor, QImageReader, QPainter, QPainterPath, QPixmap, QWheelEvent
+from PyQt6.QtGui import QCursor, QImage, QImageReader, QPainter, QPainterPath, QPixmap, QWheelEvent
 from PyQt6.QtWidgets import (
     QApplication,
     QFrame,
@@ -35,8 +37,15 @@ from core.utils.utilities import refresh_widget_style
 from core.utils.win32.backdrop import enable_blur
 from core.utils.win32.utils import apply_qmenu_style
 from core.utils.win32.window_actions import force_foreground_focus
+from core.widgets.services.wallpapers.thumbnail_cache import CancelToken, ThumbnailCache
 from core.widgets.services.wallpapers.wallpaper_manager import WallpaperManager
 
+# Thumbnails of the page being shown are loaded before those of adjacent pages
+PAGE_PRIORITY = 1
+PREFETCH_PRIORITY = 0
+# GUI thread time spent converting loaded thumbnails to pixmaps before yielding to the event loop
+PIXMAP_BATCH_BUDGET_MS = 8
+
 
 class HoverLabel(QFrame):
     """HoverLabel: QFrame that displays a wallpaper thumbnail in the gallery."""
@@ -81,11 +90,122 @@ class HoverLabel(QFrame):
 
 
 class ImageSignals(QObject):
-    loaded = pyqtSignal(str, QPixmap, int)
+    loaded = pyqtSignal(str, QImage, int)
+
+
+def read_thumbnail(image_path: str, target_w: int, target_h: int) -> QImage:
+    """Scale an image to fill target_w x target_h device pixels with Qt, cropping the edges."""
+    # Get original image dimensions first
+    reader = QImageReader(image_path)
+    original_size = reader.size()
+
+    if not original_size.isValid():
+        # Fallback if we can't determine original size
+        reader.setScaledSize(QSize(target_w, target_h))
+        image = reader.read()
+    else:
+        # Calculate dimensions to FILL the target area (may crop edges)
+        orig_aspect = original_size.width() / original_size.height()
+        target_aspect = target_w / target_h if target_h != 0 else 1.0
+
+        if orig_aspect > target_aspect:
+            # Image is wider than target - scale to match height and crop width
+            scaled_height = target_h
+            scaled_width = int(scaled_height * orig_aspect)
+        else:
+            # Image is taller than target - scale to match width and crop height
+            scaled_width = target_w
+            scaled_height = int(scaled_width / orig_aspect) if orig_aspect != 0 else target_h
+
+        reader.setScaledSize(QSize(scaled_width, scaled_height))
+        image = reader.read()
+
+    # Create a transparent image of the target size
+    thumbnail = QImage(target_w, target_h, QImage.Format.Format_ARGB32_Premultiplied)
+    thumbnail.fill(Qt.GlobalColor.transparent)
+
+    # Paint the image centered within the target area
+    painter = QPainter(thumbnail)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+
+    # Calculate position to center the image (may crop edges)
+    x = (target_w - image.width()) // 2
+    y = (target_h - image.height()) // 2
+
+    # Create source rectangle that ensures the image fills the target area
+    source_x = max(0, -x)
+    source_y = max(0, -y)
+    source_width = min(image.width() - source_x, target_w)
+    source_height = min(image.height() - source_y, target_h)
+
+    # Draw only the visible portion of the image
+    painter.drawImage(
+        QRect(max(0, x), max(0, y), source_width, source_height),
+        image,
+        QRect(source_x, source_y, source_width, source_height),
+    )
+    painter.end()
+    return thumbnail
+
+
+class PixmapBatcher(QObject):
+    """
+    Converts loaded thumbnails to QPixmap on the GUI thread. Images that arrive between two passes
+    of the event loop are converted as one batch, within PIXMAP_BATCH_BUDGET_MS per pass, and
+    images whose page was cancelled meanwhile are dropped without being converted.
+    """
+
+    def __init__(self, deliver, parent=None):
+        super().__init__(parent)
+        self._deliver = deliver
+        self._pending = deque()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._convert_batch)
+
+    def add(self, token, image_path, image, index):
+        if token.cancelled:
+            return
+        self._pending.append((token, image_path, image, index))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def clear(self):
+        self._pending.clear()
+        self._timer.stop()
+
+    def _convert_batch(self):
+        deadline = time.perf_counter() + PIXMAP_BATCH_BUDGET_MS / 1000
+        while self._pending:
+            token, image_path, image, index = self._pending.popleft()
+            if token.cancelled:
+                continue
+            self._deliver(token, image_path, QPixmap.fromImage(image), index)
+            if time.perf_counter() >= deadline:
+                break
+        if self._pending:
+            self._timer.start()
 
 
 class ImageLoader(QRunnable):
-    def __init__(self, image_path, width, height, corner_radius, index, dpr: float = 1.0):
+    """
+    Loads one thumbnail through the disk cache as a QImage. Prefetch loaders only make sure the
+    thumbnail is cached and don't report anything. Nothing is reported once the token is cancelled.
+    """
+
+    def __init__(
+        self,
+        image_path,
+        width,
+        height,
+        corner_radius,
+        index,
+        dpr: float = 1.0,
+        prefetch: bool = False,
+        token: CancelToken | None = None,
+    ):
         super().__init__()
         self.image_path = image_path
         self.target_width = width
@@ -93,67 +213,29 @@ class ImageLoader(QRunnable):
         self.corner_radius = corner_radius
         self.index = index
         self.dpr = float(dpr) if dpr else 1.0
+        self.prefetch = prefetch
+        self.token = token if token is not None else CancelToken()
         self.signals = ImageSignals()
 
     def run(self):
+        if self.token.cancelled:
+            return
         target_w = int(self.target_width * self.dpr)
         target_h = int(self.target_height * self.dpr)
 
-        # Get original image dimensions first
-        reader = QImageReader(self.image_path)
-        original_size = reader.size()
-
-        if not original_size.isValid():
-            # Fallback if we can't determine original size
-            reader.setScaledSize(QSize(target_w, target_h))
-            image = reader.read()
-        else:
-            # Calculate dimensions to FILL the target area (may crop edges)
-            orig_aspect = original_size.width() / original_size.height()
-            target_aspect = target_w / target_h if target_h != 0 else 1.0
-
-            if orig_aspect > target_aspect:
-                # Image is wider than target - scale to match height and crop width
-                scaled_height = target_h
-                scaled_width = int(scaled_height * orig_aspect)
-            else:
-                # Image is taller than target - scale to match width and crop height
-                scaled_width = target_w
-                scaled_height = int(scaled_width / orig_aspect) if orig_aspect != 0 else target_h
-
-            reader.setScaledSize(QSize(scaled_width, scaled_height))
-            image = reader.read()
-
-        # Create a transparent pixmap of the target size
-        pixmap = QPixmap(target_w, target_h)
-        pixmap.fill(Qt.GlobalColor.transparent)
-
-        # Paint the image centered within the target area
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
-
-        # Calculate position to center the image (may crop edges)
-        x = (target_w - image.width()) // 2
-        y = (target_h - image.height()) // 2
-
-        # Create source rectangle that ensures the image fills the target area
-        source_x = max(0, -x)
-        source_y = max(0, -y)
-        source_width = min(image.width() - source_x, target_w)
-        source_height = min(image.height() - source_y, target_h)
-
-        # Draw only the visible portion of the image
-        painter.drawImage(
-            QRect(max(0, x), max(0, y), source_width, source_height),
-            image,
-            QRect(source_x, source_y, source_width, source_height),
-        )
-        painter.end()
-
-        pixmap.setDevicePixelRatio(self.dpr)
+        cached = ThumbnailCache.shared().get(self.image_path, target_w, target_h, self.token)
+        if self.prefetch or self.token.cancelled:
+            return
+        image = QImage(str(cached)) if cached is not None else QImage()
+        if image.isNull():
+            # A format the thumbnail cache can't read, let Qt try
+            image = read_thumbnail(self.image_path, target_w, target_h)
+            if self.token.cancelled:
+                return
+        image.setDevicePixelRatio(self.dpr)
 
-        self.signals.loaded.emit(self.image_path, pixmap, self.index)
+        # QPixmap must only be created on the GUI thread
+        self.signals.loaded.emit(self.image_path, image, self.index)
 
 
 class ImageGallery(QMainWindow):
@@ -246,10 +328,11 @@ class ImageGallery(QMainWindow):
         self.button_row_height = 0
         self.window_width = 0
         self.window_height = 0
-        self.load_token = 0
-        self.active_token = 0
+        self.page_token: CancelToken | None = None
+        self.pixmap_batcher = PixmapBatcher(self._handle_image_loaded, self)
         self.expected_images = 0
         self.loaded_images = 0
+        self.labels = []
 
     def initUI(self, parent=None):
         """Initialize the UI components and layout for the wallpapers gallery window."""
@@ -455,32 +538,31 @@ class ImageGallery(QMainWindow):
     def load_images(self):
         """Load images for the current page in the background."""
         self.is_loading = True
-        self.load_token += 1
-        current_token = self.load_token
-        self.active_token = current_token
+        # Stop the jobs of the previous page, queued ones never start and running ones return early
+        self._cancel_page_jobs()
+        current_token = self.page_token = CancelToken()
         remaining_images = max(0, len(self.image_files) - self.current_index)
         self.expected_images = min(self.images_per_page, remaining_images)
         self.loaded_images = 0
 
-        # Clear existing widgets and their pixmaps to free memory
+        # Take the labels of the previous page out of the grid, they are reused for this one
         while self.image_layout.count():
-            item = self.image_layout.takeAt(0)
-            if item.widget():
-                widget = item.widget()
-                widget.setPixmap(QPixmap())  # Clear the pixmap to release memory
-                widget.deleteLater()
+            widget = self.image_layout.takeAt(0).widget()
+            if widget:
+                widget.hide()
 
-        # Create placeholder labels and add to grid
+        # Place a label per image and add to grid
         for i in range(self.expected_images):
             index = self.current_index + i
             row = i // self.columns
             col = i % self.columns
 
-            label = HoverLabel(self)
+            label = self._page_label(i)
             label.image_index = index
-            label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            label.setPixmap(None)
             label.mousePressEvent = self.create_mouse_press_event(index)
             self.image_layout.addWidget(label, row, col)
+            label.show()
 
             # Start loading the actual image in background
             image_path = self.image_files[index]
@@ -491,9 +573,12 @@ class ImageGallery(QMainWindow):
                 self.corner_radius,
                 i,
                 dpr=getattr(self, "dpr", 1.0),
+                token=current_token,
             )
-            loader.signals.loaded.connect(partial(self._handle_image_loaded, current_token))
-            self.threadpool.start(loader)
+            loader.signals.loaded.connect(partial(self.pixmap_batcher.add, current_token))
+            self.threadpool.start(loader, PAGE_PRIORITY)
+
+        self._prefetch_adjacent_pages(current_token)
 
         self.image_layout.setSpacing(self.image_spacing)
         margin = max(0, self.image_spacing)
@@ -507,9 +592,43 @@ class ImageGallery(QMainWindow):
             self.focused_index = self.current_index
         self.update_focus()
 
+    def _page_label(self, slot):
+        """The label for a position on the page, created the first time a page needs it."""
+        while len(self.labels) <= slot:
+            label = HoverLabel(self)
+            label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            self.labels.append(label)
+        return self.labels[slot]
+
+    def _cancel_page_jobs(self):
+        if self.page_token is not None:
+            self.page_token.cancel()
+        self.threadpool.clear()
+        self.pixmap_batcher.clear()
+
+    def _prefetch_adjacent_pages(self, token):
+        """Make sure the thumbnails of the next and previous page are cached on disk."""
+        dpr = getattr(self, "dpr", 1.0)
+        next_start = self.current_index + self.images_per_page
+        prev_start = max(0, self.current_index - self.images_per_page)
+        indexes = list(range(next_start, min(next_start + self.images_per_page, len(self.image_files))))
+        indexes += range(prev_start, self.current_index)
+        for index in indexes:
+            loader = ImageLoader(
+                self.image_files[index],
+                self.image_width,
+                self.image_height,
+                self.corner_radius,
+                -1,
+                dpr=dpr,
+                prefetch=True,
+                token=token,
+            )
+            self.threadpool.start(loader, PREFETCH_PRIORITY)
+
     def _handle_image_loaded(self, token, image_path, pixmap, index):
-        """Process image load callbacks, ignoring stale requests."""
-        if token != self.active_token:
+        """Process converted thumbnails, ignoring those of pages that were left."""
+        if token is not self.page_token:
             return
 
         self.update_image_label(image_path, pixmap, index)
@@ -761,14 +880,14 @@ class ImageGallery(QMainWindow):
 
     def _on_fade_out_finished(self):
         """Cleanup when fade-out animation finishes."""
-        self.threadpool.clear()
+        self._cancel_page_jobs()
 
         while self.image_layout.count():
-            item = self.image_layout.takeAt(0)
-            if item.widget():
-                widget = item.widget()
-                widget.setPixmap(QPixmap())
-                widget.deleteLater()
+            self.image_layout.takeAt(0)
+        for label in self.labels:
+            label.setPixmap(QPixmap())
+            label.deleteLater()
+        self.labels.clear()
 
         self.destroy()
 
@@ -5,14 +5,12 @@ import re
 
 import win32gui
 import win32process
-from PIL import Image
 from PyQt6.QtCore import QElapsedTimer, Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtWidgets import QLabel
 
 from core.events.service import EventService
 from core.events.win32 import WinEvent
-from core.utils.win32.app_icons import get_window_icon
+from core.utils.win32.icon_cache import IconCache
 from core.utils.win32.utils import get_app_name_from_aumid, get_app_name_from_pid, get_hwnd_info
 from core.validation.widgets.yasb.active_window import ActiveWindowConfig
 from core.widgets.base import BaseWidget
@@ -73,7 +71,6 @@ class ActiveWindowWidget(BaseWidget):
         self._ignore_window.classes += IGNORED_CLASSES
         self._ignore_window.processes += IGNORED_PROCESSES
         self._ignore_window.titles += IGNORED_TITLES
-        self._icon_cache = dict()
         self._app_name_cache = dict()
         if self.config.label_icon:
             self._widget_container_layout.addWidget(self._window_icon_label)
@@ -339,27 +336,10 @@ class ActiveWindowWidget(BaseWidget):
             win_info["app_name"] = app_name
 
             if self.config.label_icon:
-                cache_key = (hwnd, title, self.dpi)
-
-                if cache_key in self._icon_cache:
-                    icon_img = self._icon_cache[cache_key]
-                else:
-                    self.dpi = self.screen().devicePixelRatio()
-                    icon_img = get_window_icon(hwnd)
-                    if icon_img:
-                        icon_img = icon_img.resize(
-                            (int(self.config.label_icon_size * self.dpi), int(self.config.label_icon_size * self.dpi)),
-                            Image.LANCZOS,
-                        ).convert("RGBA")
-                    if not process["name"] == "explorer.exe":
-                        # Do not cache icons for explorer.exe windows
-                        self._icon_cache[cache_key] = icon_img
-                if icon_img:
-                    qimage = QImage(icon_img.tobytes(), icon_img.width, icon_img.height, QImage.Format.Format_RGBA8888)
-                    self.pixmap = QPixmap.fromImage(qimage)
-                    self.pixmap.setDevicePixelRatio(self.dpi)
-                else:
-                    self.pixmap = None
+                self.dpi = self.screen().devicePixelRatio()
+                self.pixmap = IconCache().window_icon(
+                    hwnd, self.config.label_icon_size, self.dpi, title=title, process=process
+                )
 
             if (
                 title.strip() in self._ignore_window.titles
@@ -17,6 +17,7 @@ from PyQt6.QtWidgets import (
 )
 
 from core.ui.components.loader import LoaderLine
+from core.utils.system import app_data_path
 from core.utils.tooltip import set_tooltip
 from core.utils.win32.utils import apply_qmenu_style, find_focused_screen
 from core.utils.win32.window_actions import force_foreground_focus
@@ -27,6 +28,7 @@ from core.widgets.services.ai_chat.chat_render import ChatRender
 from core.widgets.services.ai_chat.chat_session import ChatSession
 from core.widgets.services.ai_chat.constants import THINKING_PLACEHOLDER
 from core.widgets.services.ai_chat.context_menu_service import ContextMenuService
+from core.widgets.services.ai_chat.history_store import ChatHistoryStore
 from core.widgets.services.ai_chat.input_controller import InputController
 from core.widgets.services.ai_chat.provider_model_manager import ProviderModelManager
 from core.widgets.services.ai_chat.stream_ui_controller import StreamUiController
@@ -65,6 +67,8 @@ class AiChatWidget(BaseWidget):
             AiChatWidget._persistent_chat_history,
             lambda size_bytes: naturalsize(size_bytes, binary=True, format="%.1f"),
             id(self),
+            ChatHistoryStore(app_data_path("ai_chat_history")) if config.persist_history else None,
+            self._history_session_name,
         )
         self._attachment_manager = AttachmentManager(self)
         self._chat_render = ChatRender(self)
@@ -91,6 +95,11 @@ class AiChatWidget(BaseWidget):
         self.callback_middle = self.config.callbacks.on_middle
         self._new_notification = False
 
+    def _history_session_name(self, key) -> str:
+        """Name of the on-disk history for a (instance, provider, model) history key."""
+        _, provider, model_index = key
+        return f"{self.widget_name}_{self.screen_name}_{provider}_{model_index}"
+
     def _update_label(self):
         """Update the label content and notification dot state."""
         if not self._notification_dot["enabled"]:
@@ -436,6 +445,12 @@ class AiChatWidget(BaseWidget):
     def _append_message(self, role, text, is_error=False):
         """Append a message to the chat layout"""
         self._chat_render.remove_placeholder()
+        row = self._build_message_row(role, text, is_error)
+        insert_pos = self.chat_layout.count() - 1
+        self.chat_layout.insertWidget(insert_pos, row)
+
+    def _build_message_row(self, role, text, is_error=False) -> QFrame:
+        """Build the row widget of a single chat message"""
         row = QFrame()
         row.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
         row_layout = QHBoxLayout(row)
@@ -488,9 +503,7 @@ class AiChatWidget(BaseWidget):
 
         row_layout.addWidget(icon_label)
         row_layout.addWidget(msg_wrapper)
-
-        insert_pos = self.chat_layout.count() - 1
-        self.chat_layout.insertWidget(insert_pos, row)
+        return row
 
     def _on_clear_chat(self):
         self._chat_session.clear_history(self._provider, self._model_index)
@@ -130,7 +130,7 @@ class BatteryWidget(BaseWidget):
         if self._battery_state is None:
             if self.config.hide_unsupported:
                 self.hide()
-                self.timer.stop()
+                self.stop_timer()
                 return
 
             for part in label_parts:
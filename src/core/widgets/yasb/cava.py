@@ -1,18 +1,37 @@
-import atexit
 import logging
-import os
 import shutil
-import struct
-import subprocess
-import threading
+from collections.abc import Sequence
+from functools import lru_cache
 
-from PyQt6.QtCore import QPointF, QRectF, QTimer, pyqtSignal
-from PyQt6.QtGui import QColor, QLinearGradient, QPainter, QPainterPath
-from PyQt6.QtWidgets import QApplication, QFrame, QLabel
+from PyQt6.QtCore import QPointF, QRectF, QTimer
+from PyQt6.QtGui import QBrush, QColor, QLinearGradient, QPainter, QPainterPath
+from PyQt6.QtWidgets import QFrame, QLabel
 
-from core.utils.system import app_data_path
+from core.utils.tick_scheduler import is_widget_shown
 from core.validation.widgets.yasb.cava import CavaConfig
 from core.widgets.base import BaseWidget
+from core.widgets.services.cava.engine import BIT_FORMATS, CavaEngine, CavaFrame, CavaSubscription, FrameGate
+
+
+@lru_cache(maxsize=32)
+def gradient_brush(kind: str, stops: tuple[int, ...]) -> QBrush:
+    """
+    Gradient brush for the given ARGB color stops, shared by every bar that uses them. The gradient
+    is in object bounding mode, so the same brush fits any bar geometry.
+    """
+    step = 1.0 / (len(stops) - 1) if len(stops) > 1 else 1.0
+    if kind == "waves_mirrored":
+        gradient = QLinearGradient(0, 0, 0, 1)
+        for idx, rgba in enumerate(stops):
+            s = idx * step
+            gradient.setColorAt(max(0.0, 0.5 - s * 0.5), QColor.fromRgba(rgba))
+            gradient.setColorAt(min(1.0, 0.5 + s * 0.5), QColor.fromRgba(rgba))
+    else:
+        gradient = QLinearGradient(0, 0, 0, 1) if kind == "down" else QLinearGradient(0, 1, 0, 0)
+        for idx, rgba in enumerate(stops):
+            gradient.setColorAt(idx * step, QColor.fromRgba(rgba))
+    gradient.setCoordinateMode(QLinearGradient.CoordinateMode.ObjectBoundingMode)
+    return QBrush(gradient)
 
 
 class CavaBar(QFrame):
@@ -55,6 +74,12 @@ class CavaBar(QFrame):
         self._dpr = dpr if dpr > 0 else 1.0
         return self._dpr
 
+    def _brush(self, kind: str = "up") -> QBrush | QColor:
+        """The configured gradient, or the foreground color without one."""
+        if self._cava_widget.config.gradient == 1 and self._cava_widget.colors:
+            return gradient_brush(kind, tuple(color.rgba() for color in self._cava_widget.colors))
+        return self._cava_widget.foreground_color
+
     def _get_fade_opacity(self, x_position: float) -> float:
         """Calculate opacity based on position for edge fade effect."""
         fade_left = self._cava_widget._edge_fade_left
@@ -111,10 +136,12 @@ class CavaBar(QFrame):
         bar_w_px = max(1, round(self._cava_widget.config.bar_width * dpr))
         bar_s_px = max(0, round(self._cava_widget.config.bar_spacing * dpr))
         left_margin_px = round((self._cava_widget.config.bar_spacing / 2.0) * dpr)
+        min_height_logical = float(self._cava_widget.config.min_bar_height) / dpr
+        level_scale = self._cava_widget.level_scale
+        brush = self._brush()
 
         for i, sample in enumerate(self._cava_widget.samples):
-            min_height_logical = float(self._cava_widget.config.min_bar_height) / dpr
-            computed_height = sample * float(self._cava_widget.config.bar_height)
+            computed_height = sample * level_scale
             height = max(min_height_logical, computed_height)
             if height > 0.0:
                 x_px = left_margin_px + i * (bar_w_px + bar_s_px)
@@ -126,24 +153,11 @@ class CavaBar(QFrame):
                 rw = bar_w_px / dpr
                 rh = h_px / dpr
 
-                if self._cava_widget.config.gradient == 1 and self._cava_widget.colors:
-                    gradient = QLinearGradient(0, 1, 0, 0)
-                    gradient.setCoordinateMode(QLinearGradient.CoordinateMode.ObjectBoundingMode)
-                    stop_step = 1.0 / (len(self._cava_widget.colors) - 1)
-                    for idx, color in enumerate(self._cava_widget.colors):
-                        gradient.setColorAt(idx * stop_step, color)
-
-                    if self._cava_widget._edge_fade_left > 0 or self._cava_widget._edge_fade_right > 0:
-                        fade_opacity = self._get_fade_opacity(rx + rw / 2)
-                        painter.setOpacity(fade_opacity)
-
-                    painter.fillRect(QRectF(rx, ry, rw, rh), gradient)
-                else:
-                    if self._cava_widget._edge_fade_left > 0 or self._cava_widget._edge_fade_right > 0:
-                        fade_opacity = self._get_fade_opacity(rx + rw / 2)
-                        painter.setOpacity(fade_opacity)
+                if self._cava_widget._edge_fade_left > 0 or self._cava_widget._edge_fade_right > 0:
+                    fade_opacity = self._get_fade_opacity(rx + rw / 2)
+                    painter.setOpacity(fade_opacity)
 
-                    painter.fillRect(QRectF(rx, ry, rw, rh), self._cava_widget.foreground_color)
+                painter.fillRect(QRectF(rx, ry, rw, rh), brush)
 
     def draw_bars_mirrored(self, painter: QPainter) -> None:
         """Draw mirrored bar visualization"""
@@ -163,26 +177,15 @@ class CavaBar(QFrame):
         total_bars_width_px = bars_count * band_w_px + max(0, (bars_count - 1)) * band_s_px
         left_margin_px = max(0, (total_w_px - total_bars_width_px) // 2)
 
-        # Precompute brushes (single gradient instance reused)
-        if self._cava_widget.config.gradient == 1 and self._cava_widget.colors:
-            stop_step = 1.0 / (len(self._cava_widget.colors) - 1)
-            gradient_upper = QLinearGradient(0, 1, 0, 0)
-            gradient_upper.setCoordinateMode(QLinearGradient.CoordinateMode.ObjectBoundingMode)
-            gradient_lower = QLinearGradient(0, 0, 0, 1)
-            gradient_lower.setCoordinateMode(QLinearGradient.CoordinateMode.ObjectBoundingMode)
-            for idx, color in enumerate(self._cava_widget.colors):
-                gradient_upper.setColorAt(idx * stop_step, color)
-                gradient_lower.setColorAt(idx * stop_step, color)
-            brush_upper = gradient_upper
-            brush_lower = gradient_lower
-        else:
-            brush_upper = brush_lower = self._cava_widget.foreground_color
+        brush_upper = self._brush("up")
+        brush_lower = self._brush("down")
+        min_height_logical = float(self._cava_widget.config.min_bar_height) / dpr
+        level_scale = self._cava_widget.level_scale
 
         for i, sample in enumerate(samples):
             ux_px = left_margin_px + i * (band_w_px + band_s_px)
 
-            min_height_logical = float(self._cava_widget.config.min_bar_height) / dpr
-            full_height_logical = max(min_height_logical, sample * float(self._cava_widget.config.bar_height))
+            full_height_logical = max(min_height_logical, sample * level_scale)
 
             full_h_px = round(full_height_logical * dpr)
             if full_h_px <= 0:
@@ -222,15 +225,8 @@ class CavaBar(QFrame):
         height = float(self._cava_widget.config.bar_height)
         samples = self._cava_widget.samples
 
-        if self._cava_widget.config.gradient == 1 and self._cava_widget.colors:
-            stop_step = 1.0 / (len(self._cava_widget.colors) - 1)
-            gradient = QLinearGradient(0, 1, 0, 0)
-            gradient.setCoordinateMode(QLinearGradient.CoordinateMode.ObjectBoundingMode)
-            for idx, color in enumerate(self._cava_widget.colors):
-                gradient.setColorAt(idx * stop_step, color)
-            brush = gradient
-        else:
-            brush = self._cava_widget.foreground_color
+        brush = self._brush()
+        level_scale = self._cava_widget.level_scale
 
         n = len(samples)
         if n == 0:
@@ -248,7 +244,7 @@ class CavaBar(QFrame):
         min_h_logical = float(self._cava_widget.config.min_bar_height) / dpr
         for i in range(n):
             cx = i * step + step / 2.0
-            val = max(min_h_logical, smooth(i) * height)
+            val = max(min_h_logical, smooth(i) * level_scale)
             top = max(0.0, height - val)
             points.append(QPointF(cx, top))
 
@@ -293,20 +289,8 @@ class CavaBar(QFrame):
         samples = self._cava_widget.samples
         center_y = height / 2.0
 
-        if self._cava_widget.config.gradient == 1 and self._cava_widget.colors:
-            colors_len = len(self._cava_widget.colors)
-            stop_step = 1.0 / (colors_len - 1) if colors_len > 1 else 1.0
-            gradient = QLinearGradient(0, 0, 0, 1)
-            gradient.setCoordinateMode(QLinearGradient.CoordinateMode.ObjectBoundingMode)
-            for idx, color in enumerate(self._cava_widget.colors):
-                s = idx * stop_step
-                pos_top = max(0.0, 0.5 - s * 0.5)
-                pos_bottom = min(1.0, 0.5 + s * 0.5)
-                gradient.setColorAt(pos_top, color)
-                gradient.setColorAt(pos_bottom, color)
-            fill_brush = gradient
-        else:
-            fill_brush = self._cava_widget.foreground_color
+        fill_brush = self._brush("waves_mirrored")
+        level_scale = self._cava_widget.level_scale
 
         n = len(samples)
         if n == 0:
@@ -326,7 +310,7 @@ class CavaBar(QFrame):
         min_h_logical = float(self._cava_widget.config.min_bar_height) / dpr
         for i in range(n):
             cx = i * step + step / 2.0
-            val = max(min_h_logical, smooth(i) * height / 2.0)
+            val = max(min_h_logical, smooth(i) * level_scale / 2.0)
             top_y = max(0.0, center_y - val)
             bottom_y = min(height, center_y + val)
             top_points.append(QPointF(cx, top_y))
@@ -365,34 +349,30 @@ class CavaBar(QFrame):
 
 class CavaWidget(BaseWidget):
     validation_schema = CavaConfig
-    samplesUpdated = pyqtSignal(list)
-    _instance_counter = 0  # Class variable to track instances
 
     _edge_fade_left: int
     _edge_fade_right: int
-    _cava_process: subprocess.Popen[bytes] | None
-    thread_cava: threading.Thread | None
     foreground_color: QColor
     colors: list[QColor]
-    samples: list[float]
-    _instance_id: int
+    samples: Sequence[int]
+    level_scale: float
+    _engine: CavaEngine | None
+    _engine_subscription: CavaSubscription | None
+    frame_gate: FrameGate
     _hide_cava_widget: bool
-    _stop_cava: bool
     _hide_timer: QTimer | None
     _bar_frame: CavaBar
 
     def __init__(self, config: CavaConfig):
         super().__init__(class_name=f"cava-widget {config.class_name}")
         self.config = config
-        # Assign unique instance ID
-        CavaWidget._instance_counter += 1
-        self._instance_id = CavaWidget._instance_counter
 
-        self._cava_process = None
-        self.thread_cava = None
+        self._engine = None
+        self._engine_subscription = None
+        # Counts painted and skipped frames, see FrameGate
+        self.frame_gate = FrameGate()
         self._hide_timer = None
         self._hide_cava_widget = True
-        self._stop_cava = False
 
         # Parse edge_fade parameter - support both integer and [left, right] formats
         if isinstance(self.config.edge_fade, list) and len(self.config.edge_fade) == 2:
@@ -403,9 +383,12 @@ class CavaWidget(BaseWidget):
             self._edge_fade_left = self.config.edge_fade
             self._edge_fade_right = self.config.edge_fade
 
-        # Set up samples and colors
+        # Set up samples and colors. Samples are raw cava levels, level_scale turns them into pixels
         self.samples = [0] * self.config.bars_number
+        _, norm = BIT_FORMATS.get(self.config.output_bit_format, BIT_FORMATS["8bit"])
+        self.level_scale = self.config.bar_height / norm
         self.colors = []
+        self.initialize_colors()
 
         # Construct container layout
         self._init_container()
@@ -426,10 +409,9 @@ class CavaWidget(BaseWidget):
         self.callback_right = self.config.callbacks.on_right
         self.callback_middle = self.config.callbacks.on_middle
 
-        # Connect signal and start audio processing
-        self.samplesUpdated.connect(self.on_samples_updated)
-        self.destroyed.connect(self.stop_cava)
-        self.start_cava()
+        # Widgets with the same cava configuration (e.g. on every monitor) share one cava process
+        self._engine = CavaEngine.shared(self._cava_config(), self.config.bars_number, self.config.output_bit_format)
+        self._engine_subscription = self._engine.subscribe(self.on_frame, owner=self)
 
         # Set up auto-hide timer for silence
         if self.config.hide_empty and self.config.sleep_timer > 0:
@@ -440,18 +422,12 @@ class CavaWidget(BaseWidget):
         else:
             self._hide_timer = None
 
-        if QApplication.instance():
-            QApplication.instance().aboutToQuit.connect(self.stop_cava)
-        atexit.register(self.stop_cava)
-
     def _reload_cava(self):
-        """Stop current cava process and start a new one"""
+        """Restart the shared cava process"""
         try:
-            self.stop_cava()
-
             self.samples = [0] * self.config.bars_number
-
-            QTimer.singleShot(500, self.start_cava)
+            self.frame_gate.reset()
+            self._engine.restart()
 
             if self.config.hide_empty and self.config.sleep_timer > 0:
                 if self._hide_timer:
@@ -461,19 +437,6 @@ class CavaWidget(BaseWidget):
         except Exception as e:
             logging.error("Error reloading cava: %s", e)
 
-    def stop_cava(self) -> None:
-        self._stop_cava = True
-        self.colors.clear()
-        if self._cava_process and self._cava_process.poll() is None:
-            try:
-                self._cava_process.terminate()
-                self._cava_process.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                self._cava_process.kill()
-        if self.thread_cava and self.thread_cava.is_alive():
-            if threading.current_thread() != self.thread_cava:
-                self.thread_cava.join(timeout=2)
-
     def initialize_colors(self) -> None:
         self.foreground_color = QColor(self.config.foreground)
         if self.config.gradient == 1:
@@ -488,32 +451,28 @@ class CavaWidget(BaseWidget):
                 except Exception as e:
                     logging.error("Error setting gradient color '%s': %s", color_str, e)
 
-    def on_samples_updated(self, new_samples: list) -> None:
+    def on_frame(self, frame: CavaFrame) -> None:
         try:
-            self.samples = new_samples
-        except Exception:
-            return
-        if any(val != 0 for val in new_samples):
-            try:
-                if self.config.hide_empty and self.config.sleep_timer > 0:
-                    if self._hide_cava_widget:
-                        self.show()
-                        self._hide_cava_widget = False
-                    if self._hide_timer:
-                        self._hide_timer.start()
+            if not frame.silent and self.config.hide_empty and self.config.sleep_timer > 0:
+                if self._hide_cava_widget:
+                    self.show()
+                    self._hide_cava_widget = False
+                if self._hide_timer:
+                    self._hide_timer.start()
+            # Skip repainting sustained silence, and throttle while the bar is hidden or autohidden
+            if self.frame_gate.should_paint(frame, is_widget_shown(self._bar_frame)):
+                self.samples = frame.values
+                self.level_scale = self.config.bar_height / frame.norm
                 self._bar_frame.update()
-            except Exception as e:
-                logging.error("Error updating cava widget: %s", e)
+        except Exception as e:
+            logging.error("Error updating cava widget: %s", e)
 
     def hide_bar_frame(self) -> None:
         self.hide()
         self._hide_cava_widget = True
 
-    def start_cava(self) -> None:
-        # Reset stop flag to allow new process to start
-        self._stop_cava = False
-
-        # Build configuration file, temp config file will be created in YASB TEMP directory
+    def _cava_config(self) -> str:
+        """The cava configuration file for this widget's options."""
         lines: list[str] = []
         lines.append("# Cava config auto-generated by YASB")
         lines.append("[general]")
@@ -553,58 +512,4 @@ class CavaWidget(BaseWidget):
         lines.append(f"waves = {self.config.waves}")
         lines.append(f"noise_reduction = {int(self.config.noise_reduction)}")
 
-        config_template = "\n".join(lines) + "\n"
-
-        self.initialize_colors()
-
-        # Determine byte type settings for reading audio data
-        if self.config.output_bit_format == "16bit":
-            bytetype, bytesize, bytenorm = ("H", 2, 65535)
-        else:
-            bytetype, bytesize, bytenorm = ("B", 1, 255)
-
-        def process_audio():
-            cava_config_path = None
-            try:
-                cava_config_path = app_data_path(f"yasb_cava_config_{self._instance_id}")
-                with open(cava_config_path, "w") as config_file:
-                    config_file.write(config_template)
-                    config_file.flush()
-
-                self._cava_process = subprocess.Popen(
-                    ["cava", "-p", cava_config_path],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.DEVNULL,
-                    creationflags=subprocess.CREATE_NO_WINDOW,
-                )
-
-                chunk = bytesize * self.config.bars_number
-                fmt = bytetype * self.config.bars_number
-
-                while not self._stop_cava:
-                    try:
-                        data = self._cava_process.stdout.read(chunk)
-                        if len(data) < chunk:
-                            break
-                        samples = [val / bytenorm for val in struct.unpack(fmt, data)]
-                        self.samplesUpdated.emit(samples)
-                    except Exception as e:
-                        logging.error("Error reading cava data: %s", e)
-                        break
-
-            except Exception as e:
-                logging.error("Error starting cava process: %s", e)
-            finally:
-                # Clean up config file
-                if cava_config_path and os.path.exists(cava_config_path):
-                    try:
-                        os.unlink(cava_config_path)
-                    except:
-                        pass
-
-        # Wait for previous thread to finish if it exists
-        if self.thread_cava and self.thread_cava.is_alive():
-            self.thread_cava.join(timeout=1)
-
-        self.thread_cava = threading.Thread(target=process_audio, daemon=True)
-        self.thread_cava.start()
+        return "\n".join(lines) + "\n"
@@ -29,16 +29,20 @@ from PyQt6.QtWidgets import (
 )
 
 from core.config import HOME_CONFIGURATION_DIR
+from core.utils.label_template import compile_datetime_template, parse_label, set_label_text
+from core.utils.tick_scheduler import TickScheduler
 from core.utils.tooltip import set_tooltip
 from core.utils.utilities import PopupWidget, refresh_widget_style
 from core.utils.win32.backdrop import enable_blur
 from core.utils.win32.utils import apply_qmenu_style
 from core.validation.widgets.yasb.clock import ClockConfig
 from core.widgets.base import BaseWidget
+from core.widgets.services.clock.alarm_schedule import AlarmSchedule
+from core.widgets.services.clock.calendar_data import CalendarDataService
 from settings import SCRIPT_PATH
 
-_holidays_cache = {"module": None, "supported_countries": None, "country_holidays": {}}
 NOTIFICATION_SOUND = os.path.join(SCRIPT_PATH, "assets", "sound", "notification02.wav")
+CLOCK_LABEL_PLACEHOLDERS = ("icon", "alarm")
 
 
 class ClockWidgetSharedState:
@@ -61,21 +65,27 @@ class ClockWidgetSharedState:
         self._widget_instances = []
         self._alarms = []
         self._snoozed_alarms = []
-        self._triggered_alarms = set()
+        self._alarm_schedule = AlarmSchedule()
         self._last_check_minute = None
-        self._startup_minute = datetime.now().strftime("%H:%M")
         self._timer_seconds_remaining = 0
         self._timer_active = False
         self._alarms_file = os.path.join(HOME_CONFIGURATION_DIR, "alarms.json")
+        self._tick_subscription = None
         self._load_alarms()
+        # Alarms set for the current minute do not fire at startup
+        self._alarm_schedule.reschedule(self._alarms, datetime.now())
 
     def register_widget(self, widget):
         """Register a widget instance and start timer if this is first."""
         if widget not in self._widget_instances:
             self._widget_instances.append(widget)
 
-            if len(self._widget_instances) == 1:
-                widget.start_timer()
+            # Alarms and the countdown timer keep running while the bars are hidden, so the shared
+            # tick has no owner widget. Hidden clocks only skip their label refresh.
+            if self._tick_subscription is None and widget.timer_interval and widget.timer_interval > 0:
+                self._tick_subscription = TickScheduler.shared().subscribe(
+                    widget.timer_interval, self.on_timer_tick, name="ClockWidgetSharedState.on_timer_tick"
+                )
 
             def update_widget():
                 try:
@@ -107,37 +117,14 @@ class ClockWidgetSharedState:
                 self._trigger_alarm(alarm)
 
         now = datetime.now()
-        current_time = now.strftime("%H:%M")
-        minute_changed = False
-        if self._last_check_minute != current_time:
-            self._last_check_minute = current_time
-            self._triggered_alarms.clear()
-            self._check_alarms()
-            minute_changed = True
-
-        self.notify_all_widgets(update_tooltip=minute_changed)
+        for alarm in self._alarm_schedule.pop_due(now):
+            self._trigger_alarm(alarm)
 
-    def _check_alarms(self):
-        """Check alarms and trigger any that should fire at the current minute."""
-        now = datetime.now()
         current_time = now.strftime("%H:%M")
-        current_day = now.weekday()
-
-        for idx, alarm in enumerate(self._alarms):
-            if not alarm.get("enabled", True):
-                continue
-
-            if idx in self._triggered_alarms:
-                continue
+        minute_changed = self._last_check_minute != current_time
+        self._last_check_minute = current_time
 
-            if current_time == self._startup_minute:
-                continue
-
-            if alarm["time"] == current_time:
-                days = alarm.get("days", [])
-                if not days or len(days) == 7 or current_day in days:
-                    self._triggered_alarms.add(idx)
-                    self._trigger_alarm(alarm)
+        self.notify_all_widgets(update_tooltip=minute_changed)
 
     def _trigger_alarm(self, alarm):
         """Trigger an alarm on the first registered widget (UI action)."""
@@ -161,6 +148,8 @@ class ClockWidgetSharedState:
         """Notify all registered widgets to refresh label and optional tooltip."""
         for widget in self._widget_instances[:]:
             try:
+                if not widget.isVisible():
+                    continue
                 widget._update_label()
                 if update_tooltip:
                     widget._update_tooltip()
@@ -179,6 +168,7 @@ class ClockWidgetSharedState:
 
     def save_alarms(self):
         """Persist alarms to disk in a tidy JSON format."""
+        self._alarm_schedule.reschedule(self._alarms, datetime.now())
         try:
             json_str = json.dumps(self._alarms, indent=2, ensure_ascii=False)
             json_str = re.sub(
@@ -214,30 +204,6 @@ class FormattedSpinBox(QSpinBox):
         """)
 
 
-def _get_holidays_module():
-    """Lazily import the `holidays` module and cache supported countries."""
-    import importlib
-
-    if _holidays_cache["module"] is None:
-        _holidays_cache["module"] = importlib.import_module("holidays")
-        _holidays_cache["supported_countries"] = set(_holidays_cache["module"].list_supported_countries())
-    return _holidays_cache["module"]
-
-
-def _get_cached_country_holidays(country, year, subdivision=None):
-    """Return cached holidays for a country/year, loading if needed."""
-    cache_key = f"{country}_{year}_{subdivision}"
-    if cache_key not in _holidays_cache["country_holidays"]:
-        holidays_module = _get_holidays_module()
-        try:
-            _holidays_cache["country_holidays"][cache_key] = holidays_module.country_holidays(
-                country, years=[year], subdiv=subdivision
-            )
-        except Exception:
-            _holidays_cache["country_holidays"][cache_key] = {}
-    return _holidays_cache["country_holidays"][cache_key]
-
-
 class CustomCalendar(QCalendarWidget):
     def __init__(
         self,
@@ -259,7 +225,7 @@ class CustomCalendar(QCalendarWidget):
         self.setVerticalHeaderFormat(QCalendarWidget.VerticalHeaderFormat.NoVerticalHeader)
         self.setNavigationBarVisible(False)
         self.setAutoFillBackground(False)
-        self._holidays = set()
+        self._holidays = frozenset()
         self._current_year = None
         format = self.weekdayTextFormat(Qt.DayOfWeek.Monday)
         for day in range(Qt.DayOfWeek.Monday.value, Qt.DayOfWeek.Sunday.value + 1):
@@ -277,32 +243,41 @@ class CustomCalendar(QCalendarWidget):
             qt_locale = QLocale(parent._locale)
             self.setLocale(qt_locale)
 
+        self._calendar_data = CalendarDataService()
         self.update_calendar_display()
         self._update_holidays_for_year(self.selectedDate().year())
         self.currentPageChanged.connect(self._on_page_changed)
+        if show_holidays:
+            self._calendar_data.holidays_ready.connect(self._on_holidays_ready)
 
     def _update_holidays_for_year(self, year):
-        """Update the holiday cache for the given year (if supported)."""
-        self._holidays = set()
+        """Show the cached holidays of the given year (if supported); uncached years are loaded in the background."""
+        self._holidays = frozenset()
         self._current_year = year
-        if _holidays_cache["supported_countries"] is None:
+        if not self.show_holidays:
             return
-        country = None
-        if (
-            self.country_code
-            and re.fullmatch(r"[A-Z]{2}", self.country_code.upper())
-            and self.country_code.upper() in _holidays_cache["supported_countries"]
-        ):
-            country = self.country_code.upper()
+        country = self._calendar_data.resolve_country(self.country_code)
         if not country:
             return
-        h = _get_cached_country_holidays(country, year, self.subdivision)
-        self._holidays = set(h.keys())
+        holidays = self._calendar_data.year_holidays(country, self.subdivision, year)
+        if holidays is not None:
+            self._holidays = holidays.dates
 
     def _on_page_changed(self, year, month):
-        """When calendar page changes, refresh holidays if year changed."""
+        """When calendar page changes, refresh holidays if year changed and prepare the neighbouring years."""
         if year != self._current_year:
             self._update_holidays_for_year(year)
+            self._calendar_data.prefetch_around(self.country_code, self.subdivision, year)
+
+    def _on_holidays_ready(self, country, subdivision, year):
+        """Repaint once the holidays of the shown year have been computed in the background."""
+        if (
+            year == self._current_year
+            and subdivision == self.subdivision
+            and country == self._calendar_data.resolve_country(self.country_code)
+        ):
+            self._update_holidays_for_year(year)
+            self.updateCells()
 
     def paintCell(self, painter, rect, date):
         """Custom paint for cells; draw holiday dates in holiday_color."""
@@ -389,12 +364,17 @@ class ClockWidget(BaseWidget):
         self._update_label()
 
         if self.config.calendar.show_holidays:
-            QTimer.singleShot(0, _get_holidays_module)
+            CalendarDataService().prefetch_around(self._country_code, self._subdivision, datetime.now().year)
 
     def _on_timer_tick(self):
         """Forward a timer tick event into the shared state handler."""
         self._shared_state.on_timer_tick()
 
+    def showEvent(self, event):
+        """Refresh the label skipped by shared ticks while the clock was hidden."""
+        super().showEvent(event)
+        self._update_label()
+
     def _validate_timezones(self, timezones):
         """Validate provided timezone strings and return the valid ones."""
         valid_timezones = []
@@ -479,9 +459,7 @@ class ClockWidget(BaseWidget):
         # Choose which label set to update (primary or alternate)
         active_widgets = self._widgets_alt if self._show_alt_label else self._widgets
         active_label_content = self._label_alt_content if self._show_alt_label else self._label_content
-        label_parts = re.split("(<span.*?>.*?</span>)", active_label_content)
-        label_parts = [part for part in label_parts if part]
-        widget_index = 0
+        label_parts = parse_label(active_label_content)
         now = datetime.now(ZoneInfo(self._active_tz)) if self._active_tz else datetime.now().astimezone()
         current_hour = f"{now.hour:02d}"
         current_minute = f"{now.minute:02d}"
@@ -492,12 +470,9 @@ class ClockWidget(BaseWidget):
         if minute_changed:
             self._current_minute = current_minute
 
-        # Temporarily switch locale so strftime outputs are localized
-        org_locale_time, org_locale_ctype = self._set_locale_context()
-
         timer_active = self._shared_state._timer_active and self._shared_state._timer_seconds_remaining >= 0
         if timer_active:
-            self._timer_label.setText(self._format_timer_display())
+            set_label_text(self._timer_label, self._format_timer_display())
 
             alt_class = " alt" if self._show_alt_label else ""
             timer_class = f"label{alt_class} timer"
@@ -514,81 +489,57 @@ class ClockWidget(BaseWidget):
                 self._timer_label.hide()
                 self._timer_visible = False
 
-        for part in label_parts:
-            part = part.strip()
-            if part and widget_index < len(active_widgets) and isinstance(active_widgets[widget_index], QLabel):
-                alt_class = " alt" if self._show_alt_label else ""
-                current_class = active_widgets[widget_index].property("class")
-                if "<span" in part and "</span>" in part:
-                    icon_placeholder = re.sub(r"<span.*?>|</span>", "", part).strip()
-                    if icon_placeholder == "{icon}":
-                        icon = self._get_icon_for_hour(now.hour)
-                        if active_widgets[widget_index].text() != icon:
-                            active_widgets[widget_index].setText(icon)
-
-                        new_class = f"icon{alt_class} clock_{current_hour}"
-                        if current_class != new_class:
-                            active_widgets[widget_index].setProperty("class", new_class)
-                            refresh_widget_style(active_widgets[widget_index])
-                    elif icon_placeholder == "{alarm}":
-                        if self._shared_state._snoozed_alarms:
-                            active_widgets[widget_index].setText(self.config.alarm_icons.snooze)
-                            new_class = f"icon{alt_class} alarm snooze"
-                            if current_class != new_class:
-                                active_widgets[widget_index].setProperty("class", new_class)
-                                refresh_widget_style(active_widgets[widget_index])
-                            active_widgets[widget_index].setVisible(True)
-                        elif self._has_enabled_alarms():
-                            active_widgets[widget_index].setText(self.config.alarm_icons.enabled)
-                            new_class = f"icon{alt_class} alarm"
-                            if current_class != new_class:
-                                active_widgets[widget_index].setProperty("class", new_class)
-                                refresh_widget_style(active_widgets[widget_index])
-                            active_widgets[widget_index].setVisible(True)
-                        else:
-                            active_widgets[widget_index].setText("")
-                            active_widgets[widget_index].setVisible(False)
-
-                    else:
-                        active_widgets[widget_index].setText(icon_placeholder)
+        alt_class = " alt" if self._show_alt_label else ""
+        snoozed = bool(self._shared_state._snoozed_alarms)
+        alarm_enabled = snoozed or self._has_enabled_alarms()
+        if snoozed:
+            alarm_icon = self.config.alarm_icons.snooze
+        elif alarm_enabled:
+            alarm_icon = self.config.alarm_icons.enabled
+        else:
+            alarm_icon = ""
+        values = {"icon": self._get_icon_for_hour(now.hour), "alarm": alarm_icon}
+        templates = [
+            None if part.is_icon else compile_datetime_template(part.text, CLOCK_LABEL_PLACEHOLDERS)
+            for part in label_parts
+        ]
+
+        # Switch locale only while formatting fields whose output is localized
+        if any(template is not None and template.uses_locale for template in templates):
+            org_locale_time, org_locale_ctype = self._set_locale_context()
+        else:
+            org_locale_time, org_locale_ctype = None, None
+
+        for part, template, label in zip(label_parts, templates, active_widgets):
+            if not isinstance(label, QLabel):
+                continue
+            current_class = label.property("class")
+            if part.is_icon:
+                if part.text == "{icon}":
+                    set_label_text(label, values["icon"])
+                    new_class = f"icon{alt_class} clock_{current_hour}"
+                elif part.text == "{alarm}":
+                    set_label_text(label, alarm_icon)
+                    if not alarm_enabled:
+                        label.setVisible(False)
+                        continue
+                    new_class = f"icon{alt_class} alarm snooze" if snoozed else f"icon{alt_class} alarm"
+                    label.setVisible(True)
                 else:
-                    has_alarm = "{alarm}" in part and (self._shared_state._snoozed_alarms or self._has_enabled_alarms())
-
-                    if "{icon}" in part:
-                        icon = self._get_icon_for_hour(now.hour)
-                        part = part.replace("{icon}", icon)
-
-                    if "{alarm}" in part:
-                        if self._shared_state._snoozed_alarms:
-                            part = part.replace("{alarm}", self.config.alarm_icons.snooze)
-                        elif self._has_enabled_alarms():
-                            part = part.replace("{alarm}", self.config.alarm_icons.enabled)
-                        else:
-                            part = part.replace("{alarm}", "")
-                    try:
-                        datetime_format_search = re.search(r"\{(.*)}", part)
-                        datetime_format_str = datetime_format_search.group()
-                        datetime_format = datetime_format_search.group(1)
-                        format_label_content = part.replace(datetime_format_str, now.strftime(datetime_format))
-                    except Exception:
-                        format_label_content = part
-
-                    active_widgets[widget_index].setText(format_label_content)
-
-                    if has_alarm:
-                        if self._shared_state._snoozed_alarms:
-                            new_class = f"label{alt_class} alarm snooze"
-                        else:
-                            new_class = f"label{alt_class} alarm"
-                    else:
-                        new_class = f"label{alt_class} clock_{current_hour}"
-
-                    if current_class != new_class:
-                        active_widgets[widget_index].setProperty("class", new_class)
-                        refresh_widget_style(active_widgets[widget_index])
-
-                    self._previous_alarm_state = has_alarm
-                widget_index += 1
+                    set_label_text(label, part.text)
+                    continue
+            else:
+                set_label_text(label, template.render(now, values))
+                has_alarm = "{alarm}" in part.text and alarm_enabled
+                if has_alarm:
+                    new_class = f"label{alt_class} alarm snooze" if snoozed else f"label{alt_class} alarm"
+                else:
+                    new_class = f"label{alt_class} clock_{current_hour}"
+                self._previous_alarm_state = has_alarm
+
+            if current_class != new_class:
+                label.setProperty("class", new_class)
+                refresh_widget_style(label)
 
         self._restore_locale_context(org_locale_time, org_locale_ctype)
 
@@ -665,22 +616,13 @@ class ClockWidget(BaseWidget):
 
     def update_holiday_label(self, qdate: QDate):
         """Show holiday name for the selected date, if available for country."""
-        if _holidays_cache["supported_countries"] is None:
-            self.holiday_label.setText("")
-            return
-        country = None
-        if (
-            self._country_code
-            and re.fullmatch(r"[A-Z]{2}", self._country_code.upper())
-            and self._country_code.upper() in _holidays_cache["supported_countries"]
-        ):
-            country = self._country_code.upper()
+        calendar_data = CalendarDataService()
+        country = calendar_data.resolve_country(self._country_code)
         if not country:
             self.holiday_label.setText("")
             return
-        h = _get_cached_country_holidays(country, qdate.year(), self._subdivision)
         dt = date(qdate.year(), qdate.month(), qdate.day())
-        holiday_name = h.get(dt)
+        holiday_name = calendar_data.holiday_name(country, self._subdivision, dt)
         if holiday_name:
             self.holiday_label.setText(holiday_name)
         else:
@@ -837,26 +779,17 @@ class ClockWidget(BaseWidget):
                 upcoming_widgets.append(lbl)
 
             try:
-                if self.config.calendar.show_holidays and _holidays_cache["supported_countries"] is not None:
-                    country = None
-                    if (
-                        self._country_code
-                        and re.fullmatch(r"[A-Z]{2}", self._country_code.upper())
-                        and self._country_code.upper() in _holidays_cache["supported_countries"]
-                    ):
-                        country = self._country_code.upper()
+                if self.config.calendar.show_holidays:
+                    calendar_data = CalendarDataService()
+                    country = calendar_data.resolve_country(self._country_code)
 
                     if country:
                         today_dt = (
                             datetime.now(ZoneInfo(self._active_tz)) if self._active_tz else datetime.now().astimezone()
                         ).date()
-                        holidays = {}
-                        for y in (today_dt.year, today_dt.year + 1):
-                            holidays.update(_get_cached_country_holidays(country, y, self._subdivision))
-
-                        upcoming = sorted(((d, n) for d, n in holidays.items() if d >= today_dt), key=lambda x: x[0])
+                        upcoming = calendar_data.upcoming(country, self._subdivision, today_dt, 4)
                         qlocale = QLocale(self._locale) if self._locale else QLocale.system()
-                        for idx, (d, name) in enumerate(upcoming[:4]):
+                        for idx, (d, name) in enumerate(upcoming):
                             qdate = QDate(d.year, d.month, d.day)
                             day_month = f"{qdate.day():02d}.{qdate.month():02d}"
                             max_len = 20
@@ -1,8 +1,8 @@
 import re
-from collections import deque
 
 from PyQt6.QtWidgets import QLabel
 
+from core.utils.ring_buffer import RingBuffer
 from core.utils.stat_popup import build_stat_popup
 from core.utils.utilities import (
     PopupWidget,
@@ -11,23 +11,21 @@ from core.utils.utilities import (
 )
 from core.validation.widgets.yasb.cpu import CpuConfig
 from core.widgets.base import BaseWidget
-from core.widgets.services.cpu.cpu_api import CpuData, CpuFreq, CpuWorker
+from core.widgets.services.metrics.data import CpuData, CpuFreq
+from core.widgets.services.metrics.sampler import MetricSnapshot, MetricsSampler
 
 
 class CpuWidget(BaseWidget):
     validation_schema = CpuConfig
 
-    _instances: list[CpuWidget] = []
-    _worker: CpuWorker | None = None
-
     def __init__(self, config: CpuConfig):
         super().__init__(class_name=f"cpu-widget {config.class_name}")
         self.config = config
-        self._cpu_freq_history = deque([0] * config.histogram_num_columns, maxlen=config.histogram_num_columns)
-        self._cpu_perc_history = deque([0] * config.histogram_num_columns, maxlen=config.histogram_num_columns)
+        self._cpu_freq_history = RingBuffer(config.histogram_num_columns, fill=0)
+        self._cpu_perc_history = RingBuffer(config.histogram_num_columns, fill=0)
         self._show_alt_label = False
         self._last_data: CpuData | None = None
-        self._history: deque = deque(maxlen=config.menu.graph_history_size)
+        self._history: tuple[float, ...] = ()
         self.progress_widget = None
         self.progress_widget = build_progress_widget(self, self.config.progress_bar.model_dump())
 
@@ -41,16 +39,14 @@ class CpuWidget(BaseWidget):
         self.callback_right = self.config.callbacks.on_right
         self.callback_middle = self.config.callbacks.on_middle
 
-        # Add this instance to the shared instances list
-        if self not in CpuWidget._instances:
-            CpuWidget._instances.append(self)
-
-        # Start the shared CPU worker thread
-        if self.config.update_interval > 0 and CpuWidget._worker is None:
-            worker = CpuWorker.get_instance(self.config.update_interval)
-            worker.data_ready.connect(CpuWidget._on_data_ready)
-            worker.start()
-            CpuWidget._worker = worker
+        if self.config.update_interval > 0:
+            MetricsSampler.shared().subscribe(
+                "cpu",
+                self.config.update_interval,
+                self._on_snapshot,
+                owner=self,
+                history_size=self.config.menu.graph_history_size if self.config.menu.enabled else 0,
+            )
 
         self._show_placeholder()
 
@@ -65,18 +61,14 @@ class CpuWidget(BaseWidget):
         )
         self._update_label(data)
 
-    @classmethod
-    def _on_data_ready(cls, data: CpuData):
-        """Slot called on the main thread when new CPU data arrives from the worker."""
-        for inst in cls._instances[:]:
-            try:
-                inst._last_data = data
-                inst._update_label(data)
-                if inst.config.menu.enabled:
-                    inst._history.append(data.percent)
-                    inst._update_popup(data)
-            except RuntimeError:
-                cls._instances.remove(inst)
+    def _on_snapshot(self, snapshot: MetricSnapshot):
+        """Called on the main thread with each CPU sample."""
+        data = snapshot.value
+        self._last_data = data
+        self._update_label(data)
+        if self.config.menu.enabled:
+            self._history = snapshot.history
+            self._update_popup(data)
 
     def _update_popup(self, data: CpuData):
         """Push fresh data into the open popup if visible."""
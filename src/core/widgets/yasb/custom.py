@@ -1,66 +1,15 @@
 import json
 import re
 import subprocess
-import threading
 
-from PyQt6.QtCore import QObject, pyqtSignal
 from PyQt6.QtWidgets import QLabel
 
 from core.utils.tooltip import set_tooltip
 from core.utils.win32.system_function import function_map
 from core.validation.widgets.yasb.custom import CustomConfig
 from core.widgets.base import BaseWidget
-
-
-class CustomWorker(QObject):
-    finished = pyqtSignal()
-    data_ready = pyqtSignal(object)
-
-    def __init__(
-        self,
-        cmd: list[str] | None,
-        use_shell: bool,
-        encoding: str | None,
-        return_type: str,
-        hide_empty: bool,
-    ):
-        super().__init__()
-        self.cmd = cmd
-        self.use_shell = use_shell
-        self.encoding = encoding
-        self.return_type = return_type
-        self.hide_empty = hide_empty
-        self._is_running = True
-
-    def stop(self):
-        self._is_running = False
-
-    def run(self):
-        exec_data = None
-        if self.cmd and self._is_running:
-            proc = subprocess.Popen(
-                self.cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.DEVNULL,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-                shell=self.use_shell,
-                encoding=self.encoding,
-            )
-            output = proc.stdout.read()
-            if self.return_type == "json":
-                try:
-                    exec_data = json.loads(output)
-                except json.JSONDecodeError:
-                    exec_data = None
-            else:
-                exec_data = output.decode("utf-8").strip()
-
-        if self._is_running:
-            try:
-                self.data_ready.emit(exec_data)
-                self.finished.emit()
-            except RuntimeError:
-                pass
+from core.widgets.services.custom.command import CommandKey
+from core.widgets.services.custom.command_scheduler import CommandScheduler
 
 
 class CustomWidget(BaseWidget):
@@ -72,7 +21,7 @@ class CustomWidget(BaseWidget):
         self._exec_data: dict | str | None = None
         self._exec_cmd = self.config.exec_options.run_cmd.split(" ") if self.config.exec_options.run_cmd else None
         self._show_alt_label = False
-        self._worker = None  # Keep reference to worker for cleanup
+        self._command_key = None
 
         # Construct container
         self._init_container()
@@ -80,6 +29,18 @@ class CustomWidget(BaseWidget):
             self.config.label, self.config.label_alt, label_placeholder=self.config.label_placeholder
         )
 
+        if self._exec_cmd:
+            self._command_key = CommandKey(
+                cmd=tuple(self._exec_cmd),
+                use_shell=self.config.exec_options.use_shell,
+                encoding=self.config.exec_options.encoding,
+                return_format=self.config.exec_options.return_format,
+                stream=self.config.exec_options.stream,
+            )
+            # Identical widgets (e.g. on every monitor) share one run of the command per interval,
+            # or one long-running process when streaming
+            CommandScheduler.shared().subscribe(self._command_key, self._handle_exec_data, owner=self)
+
         self.register_callback("toggle_label", self._toggle_label)
         self.register_callback("exec_custom", self._exec_callback)
 
@@ -90,7 +51,7 @@ class CustomWidget(BaseWidget):
 
         if self.config.exec_options.run_once:
             self._exec_callback()
-        else:
+        elif not self.config.exec_options.stream:
             self.start_timer()
 
     def _toggle_label(self):
@@ -161,21 +122,8 @@ class CustomWidget(BaseWidget):
             set_tooltip(self._widget_container, tooltip_text, delay=400)
 
     def _exec_callback(self):
-        if self._exec_cmd:
-            if self._worker:
-                self._worker.stop()
-
-            self._worker = CustomWorker(
-                self._exec_cmd,
-                self.config.exec_options.use_shell,
-                self.config.exec_options.encoding,
-                self.config.exec_options.return_format,
-                self.config.exec_options.hide_empty,
-            )
-            worker_thread = threading.Thread(target=self._worker.run)
-            self._worker.data_ready.connect(self._handle_exec_data)
-            self._worker.finished.connect(self._worker.deleteLater)
-            worker_thread.start()
+        if self._command_key:
+            CommandScheduler.shared().request(self._command_key)
         else:
             self._update_label()
 
@@ -1,9 +1,9 @@
 import re
-from collections import deque
 
 from humanize import naturalsize
 from PyQt6.QtWidgets import QFrame, QLabel, QVBoxLayout
 
+from core.utils.ring_buffer import RingBuffer
 from core.utils.stat_popup import GraphWidget, build_stat_popup
 from core.utils.utilities import (
     PopupWidget,
@@ -12,25 +12,24 @@ from core.utils.utilities import (
 )
 from core.validation.widgets.yasb.gpu import GpuConfig
 from core.widgets.base import BaseWidget
-from core.widgets.services.gpu.gpu_api import GpuData, GpuWorker
+from core.widgets.services.gpu.gpu_api import GpuData
+from core.widgets.services.metrics.sampler import MetricSnapshot, MetricsSampler
 
 
 class GpuWidget(BaseWidget):
     validation_schema = GpuConfig
 
-    # Class-level shared data and worker
     _instances: list[GpuWidget] = []
-    _worker: GpuWorker | None = None
 
     def __init__(self, config: GpuConfig):
         super().__init__(class_name=f"gpu-widget {config.class_name}")
         self.config = config
-        self._gpu_util_history = deque([0] * config.histogram_num_columns, maxlen=config.histogram_num_columns)
-        self._gpu_mem_history = deque([0] * config.histogram_num_columns, maxlen=config.histogram_num_columns)
+        self._gpu_util_history = RingBuffer(config.histogram_num_columns, fill=0)
+        self._gpu_mem_history = RingBuffer(config.histogram_num_columns, fill=0)
         self._show_alt_label = False
         self._last_gpu_data: GpuData | None = None
-        self._history: deque = deque(maxlen=config.menu.graph_history_size)
-        self._temp_history: deque = deque(maxlen=config.menu.graph_history_size)
+        self._history = RingBuffer(config.menu.graph_history_size)
+        self._temp_history = RingBuffer(config.menu.graph_history_size)
 
         self.progress_widget = None
         self.progress_widget = build_progress_widget(self, self.config.progress_bar.model_dump())
@@ -49,14 +48,10 @@ class GpuWidget(BaseWidget):
         if self not in GpuWidget._instances:
             GpuWidget._instances.append(self)
 
-        # Start the shared GPU worker thread
         if self.config.update_interval > 0:
-            worker = GpuWorker.get_instance(self.config.update_interval)
-            worker.add_index(self.config.gpu_index)
-            if GpuWidget._worker is None:
-                worker.data_ready.connect(GpuWidget._on_gpu_data)
-                worker.start()
-                GpuWidget._worker = worker
+            sampler = MetricsSampler.shared()
+            sampler.source("gpu").add_index(self.config.gpu_index)
+            sampler.subscribe("gpu", self.config.update_interval, self._on_snapshot, owner=self)
 
         self._show_placeholder()
 
@@ -77,24 +72,19 @@ class GpuWidget(BaseWidget):
         )
         self._update_label(data)
 
-    @classmethod
-    def _on_gpu_data(cls, gpu_data_list: list[GpuData]):
-        """Slot called on main thread when GPU worker emits data."""
-        for inst in cls._instances[:]:
-            try:
-                gpu_data = next((g for g in gpu_data_list if g.index == inst.config.gpu_index), None)
-                if gpu_data:
-                    if inst.isHidden():
-                        inst.show()
-                    inst._update_label(gpu_data)
-                    if inst.config.menu.enabled:
-                        inst._history.append(gpu_data.utilization)
-                        inst._temp_history.append(gpu_data.temp)
-                        inst._update_popup(gpu_data)
-                elif not inst.isHidden():
-                    inst.hide()
-            except RuntimeError:
-                cls._instances.remove(inst)
+    def _on_snapshot(self, snapshot: MetricSnapshot):
+        """Called on the main thread with the data of all sampled GPUs."""
+        gpu_data = next((g for g in snapshot.value if g.index == self.config.gpu_index), None)
+        if gpu_data:
+            if self.isHidden():
+                self.show()
+            self._update_label(gpu_data)
+            if self.config.menu.enabled:
+                self._history.append(gpu_data.utilization)
+                self._temp_history.append(gpu_data.temp)
+                self._update_popup(gpu_data)
+        elif not self.isHidden():
+            self.hide()
 
     def _update_label(self, gpu_data: GpuData):
         """Update the label with GPU data."""
@@ -181,9 +171,9 @@ class GpuWidget(BaseWidget):
             return
         try:
             if popup._graph is not None:
-                popup._graph.set_data(list(self._history))
+                popup._graph.set_data(self._history.to_list())
             if popup._temp_graph is not None:
-                popup._temp_graph.set_data(list(self._temp_history))
+                popup._temp_graph.set_data(self._temp_history.to_list())
             format_size = popup._format_size
             labels = popup._stat_labels
             labels["usage"].setText(f"{gpu_data.utilization:.0f}%")
@@ -288,7 +278,7 @@ class GpuWidget(BaseWidget):
             temp_graph = GraphWidget("gpu-temp-graph", show_grid=menu.show_graph_grid)
             temp_layout.addWidget(temp_graph)
             if self._temp_history:
-                temp_graph.set_data(list(self._temp_history))
+                temp_graph.set_data(self._temp_history.to_list())
             main_layout.insertWidget(stats_index, temp_graph_container)
 
             popup._temp_graph = temp_graph
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import shutil
@@ -13,15 +12,24 @@ from PyQt6.QtCore import (
     QEvent,
     QMimeData,
     QPropertyAnimation,
-    QSize,
     QStringListModel,
     Qt,
     QThread,
     QTimer,
     pyqtSignal,
 )
-from PyQt6.QtGui import QAction, QColor, QDrag, QIcon, QKeySequence, QPainter, QPixmap, QShortcut, QWheelEvent
-from PyQt6.QtSvg import QSvgRenderer
+from PyQt6.QtGui import (
+    QAction,
+    QColor,
+    QDrag,
+    QIcon,
+    QImage,
+    QKeySequence,
+    QPainter,
+    QPixmap,
+    QShortcut,
+    QWheelEvent,
+)
 from PyQt6.QtWidgets import (
     QApplication,
     QCompleter,
@@ -49,45 +57,31 @@ from core.utils.win32.utils import apply_qmenu_style, get_foreground_hwnd, set_f
 from core.utils.win32.window_actions import force_foreground_focus
 from core.validation.widgets.yasb.launchpad import LaunchpadConfig
 from core.widgets.base import BaseWidget
+from core.widgets.services.launchpad.app_index import AppIndex
+from core.widgets.services.launchpad.app_store import AppStore
+from core.widgets.services.launchpad.icon_cache import ScaledIconCache
 
 _ICON_CACHE = {}
+# Cache keys of icons that could not be loaded, their tiles show no icon instead of retrying
+_FAILED_ICONS = set()
 
 
 @lru_cache(maxsize=256)
 def load_and_scale_icon(icon_path: str, size: int, dpr=1.0) -> QPixmap:
     """Load and scale icon with caching, supports SVG"""
     try:
-        ext = os.path.splitext(icon_path)[1].lower()
-        target_size = int(size * dpr)
-        if ext == ".svg":
-            renderer = QSvgRenderer(icon_path)
-            pixmap = QPixmap(target_size, target_size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-            painter = QPainter(pixmap)
-            renderer.render(painter)
-            painter.end()
-            pixmap.setDevicePixelRatio(dpr)
-            return pixmap
-        else:
-            pixmap = QPixmap(icon_path)
-            if pixmap.isNull():
-                return QPixmap()
-            scaled_pixmap = pixmap.scaled(
-                QSize(target_size, target_size),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation,
-            )
-            scaled_pixmap.setDevicePixelRatio(dpr)
-            return scaled_pixmap
+        return QPixmap.fromImage(ScaledIconCache.shared().get(icon_path, size, dpr))
     except Exception as e:
         logging.error("Failed to load icon %s: %s", icon_path, e)
         return QPixmap()
 
 
 class IconLoadWorker(QThread):
-    """Background thread for loading icons"""
+    """Background thread for loading icons, in request order"""
 
-    icon_loaded = pyqtSignal(str, QPixmap)
+    # QPixmap must only be created on the GUI thread
+    icon_loaded = pyqtSignal(str, QImage)
+    icon_failed = pyqtSignal(str)
 
     def __init__(self, icon_requests):
         super().__init__()
@@ -98,16 +92,22 @@ class IconLoadWorker(QThread):
         self._should_stop = True
 
     def run(self):
+        cache = ScaledIconCache.shared()
         for icon_path, size, dpr in self.icon_requests:
             if self._should_stop:
                 break
-            if os.path.isfile(icon_path):
-                try:
-                    pixmap = load_and_scale_icon(icon_path, size, dpr)
-                    if not pixmap.isNull() and not self._should_stop:
-                        self.icon_loaded.emit(icon_path, pixmap)
-                except Exception as e:
-                    logging.error("Failed to load icon in worker: %s", e)
+            try:
+                image = cache.get(icon_path, size, dpr)
+            except Exception as e:
+                logging.error("Failed to load icon in worker: %s", e)
+                image = QImage()
+            if self._should_stop:
+                break
+            if image.isNull():
+                self.icon_failed.emit(icon_path)
+            else:
+                self.icon_loaded.emit(icon_path, image)
+        logging.debug("Launchpad icon cache: %(hits)d hits, %(misses)d misses", cache.stats())
 
 
 class UrlFetchWorker(QThread):
@@ -603,6 +603,14 @@ class LaunchpadWidget(BaseWidget):
         self._is_closing = False
         self._app_icons = []
         self._all_apps = []
+        self._apps_store = AppStore(self._data_file)
+        self._app_index: AppIndex | None = None
+        self._app_index_revision = -1
+        # Tiles live as long as the popup and are only re-laid out when the search changes
+        self._app_tiles: dict[str, QFrame] = {}
+        self._group_tiles: dict[str, QFrame] = {}
+        self._no_apps_label: QLabel | None = None
+        self._tile_height = 0
         self._icon_worker = None
         self._grid_columns = 0
         self._num_drag_items = 0
@@ -782,32 +790,17 @@ class LaunchpadWidget(BaseWidget):
         return app_icon
 
     def _load_app_icon(self, app_icon):
-        """Load icon for an app icon widget"""
+        """Show an icon that is already in memory, others are loaded in the background when on screen"""
         icon_path = app_icon.app_data.get("icon", "")
-        if not icon_path or not os.path.isfile(icon_path):
+        cache_key = f"{icon_path}_{self._app_icon_size}_{self._dpr}"
+        if not icon_path or cache_key in _FAILED_ICONS or not os.path.isfile(icon_path):
             app_icon.icon_label.setText("")
             app_icon._icon_loaded = True
             return
-        cache_key = f"{icon_path}_{self._app_icon_size}_{self._dpr}"
         if cache_key in _ICON_CACHE:
             app_icon.icon_label.setPixmap(_ICON_CACHE[cache_key])
             refresh_widget_style(app_icon.icon_label)
             app_icon._icon_loaded = True
-            return
-        try:
-            pixmap = load_and_scale_icon(icon_path, self._app_icon_size, self._dpr)
-            if not pixmap.isNull():
-                _ICON_CACHE[cache_key] = pixmap
-                app_icon.icon_label.setPixmap(pixmap)
-                refresh_widget_style(app_icon.icon_label)
-                app_icon._icon_loaded = True
-            else:
-                app_icon.icon_label.setText("")
-                app_icon._icon_loaded = True
-        except Exception as e:
-            logging.error("Failed to load icon %s: %s", icon_path, e)
-            app_icon.icon_label.setText("")
-            app_icon._icon_loaded = True
 
     def _reorder_apps(self, source_app_id: str, target_app_id: str):
         try:
@@ -1103,6 +1096,13 @@ class LaunchpadWidget(BaseWidget):
         scroll_area.setWidget(grid_container)
         main_layout.addWidget(scroll_area)
 
+        # Request the icons of tiles scrolled into view once scrolling pauses
+        icon_scroll_timer = QTimer(self.popup)
+        icon_scroll_timer.setSingleShot(True)
+        icon_scroll_timer.setInterval(50)
+        icon_scroll_timer.timeout.connect(lambda: self._request_tile_icons(self._app_icons))
+        scroll_area.verticalScrollBar().valueChanged.connect(lambda _value: icon_scroll_timer.start())
+
         self.popup.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.popup.container = container
         self.popup.search_container = search_container
@@ -1369,8 +1369,12 @@ class LaunchpadWidget(BaseWidget):
         QTimer.singleShot(0, self._focus_first_icon)
 
     def _popup_close_event(self, event):
+        self._stop_background_loading()
+
+    def _stop_background_loading(self):
         if self._icon_worker and self._icon_worker.isRunning():
-            self._icon_worker.terminate()
+            # The worker checks the flag between icons, at most one more is loaded
+            self._icon_worker.stop()
             self._icon_worker.wait()
 
     def _update_search_results(self, text: str):
@@ -1379,39 +1383,23 @@ class LaunchpadWidget(BaseWidget):
     def _populate_grid(self, search_text: str = ""):
         if not self._launchpad_popup:
             return
-        grid_layout = self._launchpad_popup.grid_layout
-        for i in reversed(range(grid_layout.count())):
-            child = grid_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        self._app_icons.clear()
-        self._all_apps = self._load_apps()
-
-        # Filter apps based on search text
-        filtered_apps = []
-        if search_text:
-            # Support group:name syntax for filtering by group
-            if search_text.startswith("group:"):
-                group_filter = search_text[6:].strip().lower()
-                for app_data in self._all_apps:
-                    app_group = (app_data.get("group") or "").lower()
-                    if group_filter in app_group:
-                        filtered_apps.append(app_data)
-            else:
-                for app_data in self._all_apps:
-                    if search_text.lower() in app_data.get("title", "").lower():
-                        filtered_apps.append(app_data)
-        else:
-            filtered_apps = self._all_apps
+        self._all_apps = self._apps_store.apps
+        index = self._current_app_index()
+
+        # Filter apps based on search text, "group:name" filters by group
+        filtered_apps = index.search(search_text) if search_text else self._all_apps
 
         if not filtered_apps:
-            no_apps_label = QLabel(
-                f"No applications found<div style='font-size:14pt;margin-top:12px;font-weight:400'>press <b>{self._shortcuts['add_app']}</b> to add new apps</div>"
-            )
-            no_apps_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            no_apps_label.setTextFormat(Qt.TextFormat.RichText)
-            no_apps_label.setStyleSheet("font-size: 24pt;font-family: 'Segoe UI';padding: 40px")
-            grid_layout.addWidget(no_apps_label, 0, 0, 1, 1)
+            self._layout_tiles([])
+            if self._no_apps_label is None:
+                self._no_apps_label = QLabel(
+                    f"No applications found<div style='font-size:14pt;margin-top:12px;font-weight:400'>press <b>{self._shortcuts['add_app']}</b> to add new apps</div>"
+                )
+                self._no_apps_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                self._no_apps_label.setTextFormat(Qt.TextFormat.RichText)
+                self._no_apps_label.setStyleSheet("font-size: 24pt;font-family: 'Segoe UI';padding: 40px")
+            self._launchpad_popup.grid_layout.addWidget(self._no_apps_label, 0, 0, 1, 1)
+            self._no_apps_label.show()
             return
 
         # Create group-style grid or flat grid based on grouping and search
@@ -1420,17 +1408,64 @@ class LaunchpadWidget(BaseWidget):
         else:
             self._populate_flat_grid(filtered_apps)
 
-    def _populate_flat_grid(self, filtered_apps: list[dict[str, Any]]):
-        """Populate grid without grouping (original behavior)"""
+    def _current_app_index(self) -> AppIndex:
+        """The search index of the app list, rebuilt and stale tiles dropped when apps.json changed"""
+        if self._app_index is None or self._app_index_revision != self._apps_store.revision:
+            self._app_index = AppIndex(self._apps_store.apps)
+            self._app_index_revision = self._apps_store.revision
+            keys = self._app_index.keys
+            for key in [key for key in self._app_tiles if key not in keys]:
+                self._discard_tile(self._app_tiles.pop(key))
+        return self._app_index
+
+    def _discard_tile(self, tile: QFrame):
+        self._launchpad_popup.grid_layout.removeWidget(tile)
+        tile.hide()
+        tile.deleteLater()
+
+    def _app_tile(self, app_data: dict[str, Any], index: AppIndex) -> QFrame:
+        """The tile of an app, created on first use and reused while the app is unchanged"""
+        key = index.key_of(app_data)
+        tile = self._app_tiles.get(key)
+        if tile is not None and tile.app_data is not app_data:
+            if tile.app_data == app_data:
+                tile.app_data = app_data
+            else:
+                self._discard_tile(tile)
+                tile = None
+        if tile is None:
+            tile = self._create_app_icon_widget(app_data)
+            self._app_tiles[key] = tile
+        return tile
+
+    def _group_tile(self, group_name: str, apps: list[dict[str, Any]]) -> QFrame:
+        tile = self._group_tiles.get(group_name)
+        if tile is not None and tile.apps_in_group != apps:
+            self._discard_tile(tile)
+            tile = None
+        if tile is None:
+            tile = self._create_group_widget(group_name, apps)
+            self._group_tiles[group_name] = tile
+        return tile
+
+    def _layout_tiles(self, tiles: list[QFrame]):
+        """Place tiles in the grid in order and hide every other tile instead of destroying it"""
+        grid_container = self._launchpad_popup.grid_container
         grid_layout = self._launchpad_popup.grid_layout
+        grid_container.setUpdatesEnabled(False)
+        try:
+            keep = set(tiles)
+            for i in reversed(range(grid_layout.count())):
+                child = grid_layout.takeAt(i).widget()
+                if child is not None and child not in keep:
+                    child.hide()
+            self._app_icons = list(tiles)
+            if not tiles:
+                return
 
-        for app_data in filtered_apps:
-            app_icon = self._create_app_icon_widget(app_data)
-            self._app_icons.append(app_icon)
-
-        if self._app_icons:
-            first_icon = self._app_icons[0]
-            first_icon.setParent(self._launchpad_popup.grid_container)
+            first_icon = tiles[0]
+            if first_icon.parentWidget() is not grid_container:
+                first_icon.setParent(grid_container)
             first_icon.updateGeometry()
 
             self._recalculate_grid_columns()
@@ -1439,35 +1474,60 @@ class LaunchpadWidget(BaseWidget):
             if self._grid_columns <= 0:
                 self._grid_columns = 1
 
-            rows = (len(self._app_icons) + self._grid_columns - 1) // self._grid_columns
-            icon_height = self._app_icons[0].height()
+            rows = (len(tiles) + self._grid_columns - 1) // self._grid_columns
+            icon_height = first_icon.height()
             total_height = rows * icon_height
 
             # Set the grid container to the exact height needed
-            self._launchpad_popup.grid_container.setFixedHeight(total_height)
-
-        for index, app_icon in enumerate(self._app_icons):
-            # Ensure _grid_columns is not 0 before using modulo
-            if self._grid_columns <= 0:
-                self._grid_columns = 1
-            row = index // self._grid_columns
-            col = index % self._grid_columns
-            grid_layout.addWidget(app_icon, row, col)
+            grid_container.setFixedHeight(total_height)
+            self._tile_height = icon_height
+
+            for index, tile in enumerate(tiles):
+                row = index // self._grid_columns
+                col = index % self._grid_columns
+                grid_layout.addWidget(tile, row, col)
+                tile.show()
+        finally:
+            grid_container.setUpdatesEnabled(True)
+
+    def _request_tile_icons(self, tiles: list[QFrame]):
+        """
+        Load the icons of the tiles on screen first, then those of the next page.
+        Icons further down are requested once they are scrolled close.
+        """
+        if not self._launchpad_popup:
+            return
+        start, end = 0, len(tiles)
+        if self._tile_height > 0:
+            scroll_area = self._launchpad_popup.scroll_area
+            viewport_height = scroll_area.viewport().height() or self._launchpad_popup.height()
+            columns = max(1, self._grid_columns)
+            first_row = scroll_area.verticalScrollBar().value() // self._tile_height
+            page_rows = viewport_height // self._tile_height + 1
+            start = first_row * columns
+            end = (first_row + 2 * page_rows) * columns
 
         icon_requests = []
-        for app_data in filtered_apps:
-            icon_path = app_data.get("icon", "")
-            if icon_path and os.path.isfile(icon_path):
-                cache_key = f"{icon_path}_{self._app_icon_size}_{self._dpr}"
-                if cache_key not in _ICON_CACHE:
-                    icon_requests.append((icon_path, self._app_icon_size, self._dpr))
+        requested = set()
+        for tile in tiles[start:end]:
+            if getattr(tile, "_icon_loaded", True):
+                continue
+            icon_path = tile.app_data.get("icon", "")
+            if icon_path and icon_path not in requested:
+                requested.add(icon_path)
+                icon_requests.append((icon_path, self._app_icon_size, self._dpr))
         if icon_requests:
             self._start_background_loading(icon_requests)
 
+    def _populate_flat_grid(self, filtered_apps: list[dict[str, Any]]):
+        """Populate grid without grouping (original behavior)"""
+        index = self._current_app_index()
+        tiles = [self._app_tile(app_data, index) for app_data in filtered_apps]
+        self._layout_tiles(tiles)
+        self._request_tile_icons(tiles)
+
     def _populate_grouped_grid(self, filtered_apps: list[dict[str, Any]]):
         """Populate grid with icons for group"""
-        grid_layout = self._launchpad_popup.grid_layout
-
         # Group apps by group field
         grouped_apps = {}
         uncategorized_apps = []
@@ -1481,57 +1541,17 @@ class LaunchpadWidget(BaseWidget):
             else:
                 uncategorized_apps.append(app_data)
 
-        # Create list of items to display: group + uncategorized apps
-        display_items = []
-
-        for group_name in sorted(grouped_apps.keys()):
-            display_items.append({"type": "group", "group": group_name, "apps": grouped_apps[group_name]})
-
-        # Add uncategorized apps
-        for app_data in uncategorized_apps:
-            display_items.append({"type": "app", "data": app_data})
-
-        # Create widgets for all items
-        for item in display_items:
-            if item["type"] == "group":
-                group_widget = self._create_group_widget(item["group"], item["apps"])
-                self._app_icons.append(group_widget)
-            else:
-                app_icon = self._create_app_icon_widget(item["data"])
-                self._app_icons.append(app_icon)
-
-        if self._app_icons:
-            first_icon = self._app_icons[0]
-            first_icon.setParent(self._launchpad_popup.grid_container)
-            first_icon.updateGeometry()
-
-            self._recalculate_grid_columns()
-
-            if self._grid_columns <= 0:
-                self._grid_columns = 1
-
-            rows = (len(self._app_icons) + self._grid_columns - 1) // self._grid_columns
-            icon_height = self._app_icons[0].height()
-            total_height = rows * icon_height
-            self._launchpad_popup.grid_container.setFixedHeight(total_height)
+        # Groups first, then uncategorized apps
+        tiles = [self._group_tile(group_name, grouped_apps[group_name]) for group_name in sorted(grouped_apps)]
+        index = self._current_app_index()
+        app_tiles = [self._app_tile(app_data, index) for app_data in uncategorized_apps]
+        for group_name in [name for name in self._group_tiles if name not in grouped_apps]:
+            self._discard_tile(self._group_tiles.pop(group_name))
 
-        for index, widget in enumerate(self._app_icons):
-            if self._grid_columns <= 0:
-                self._grid_columns = 1
-            row = index // self._grid_columns
-            col = index % self._grid_columns
-            grid_layout.addWidget(widget, row, col)
+        self._layout_tiles(tiles + app_tiles)
 
         # Load icons in background for uncategorized apps only
-        icon_requests = []
-        for app_data in uncategorized_apps:
-            icon_path = app_data.get("icon", "")
-            if icon_path and os.path.isfile(icon_path):
-                cache_key = f"{icon_path}_{self._app_icon_size}_{self._dpr}"
-                if cache_key not in _ICON_CACHE:
-                    icon_requests.append((icon_path, self._app_icon_size, self._dpr))
-        if icon_requests:
-            self._start_background_loading(icon_requests)
+        self._request_tile_icons(app_tiles)
 
     def _create_group_widget(self, group_name: str, apps: list[dict[str, Any]]):
         group_widget = QFrame()
@@ -1633,14 +1653,6 @@ class LaunchpadWidget(BaseWidget):
         self._launchpad_popup.back_button.setText(f"\U0001f860 {group_name}")
         self._launchpad_popup.back_button.show()
 
-        # Clear grid and app icons
-        grid_layout = self._launchpad_popup.grid_layout
-        for i in reversed(range(grid_layout.count())):
-            child = grid_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        self._app_icons.clear()
-
         self._populate_flat_grid(apps)
 
     def _close_group(self):
@@ -1767,8 +1779,13 @@ class LaunchpadWidget(BaseWidget):
             self._launchpad_popup.hide()
             self._launchpad_popup.deleteLater()
             self._launchpad_popup = None
-            self._app_icons.clear()
-            self._all_apps.clear()
+            # The tiles were children of the popup
+            self._app_icons = []
+            self._all_apps = []
+            self._app_tiles.clear()
+            self._group_tiles.clear()
+            self._no_apps_label = None
+            self._tile_height = 0
             self._is_closing = False
             AppListLoader.clear_cache()
 
@@ -1809,23 +1826,30 @@ class LaunchpadWidget(BaseWidget):
         self._focus_icon(0)
 
     def _start_background_loading(self, icon_requests):
-        if self._icon_worker and self._icon_worker.isRunning():
-            self._icon_worker.terminate()
-            self._icon_worker.wait()
+        self._stop_background_loading()
         self._icon_worker = IconLoadWorker(icon_requests)
         self._icon_worker.icon_loaded.connect(self._on_background_icon_loaded)
+        self._icon_worker.icon_failed.connect(self._on_background_icon_failed)
         self._icon_worker.start()
 
-    def _on_background_icon_loaded(self, icon_path: str, pixmap: QPixmap):
+    def _on_background_icon_loaded(self, icon_path: str, image: QImage):
+        pixmap = QPixmap.fromImage(image)
         cache_key = f"{icon_path}_{self._app_icon_size}_{self._dpr}"
         _ICON_CACHE[cache_key] = pixmap
-        for app_icon in self._app_icons:
+        for app_icon in self._app_tiles.values():
             if hasattr(app_icon, "app_data") and app_icon.app_data.get("icon", "") == icon_path:
                 if hasattr(app_icon, "_icon_loaded") and not app_icon._icon_loaded:
                     app_icon.icon_label.setPixmap(pixmap)
                     refresh_widget_style(app_icon.icon_label)
                     app_icon._icon_loaded = True
 
+    def _on_background_icon_failed(self, icon_path: str):
+        """Stop requesting an icon that can't be loaded, its tiles stay without an icon"""
+        _FAILED_ICONS.add(f"{icon_path}_{self._app_icon_size}_{self._dpr}")
+        for app_icon in self._app_tiles.values():
+            if hasattr(app_icon, "app_data") and app_icon.app_data.get("icon", "") == icon_path:
+                app_icon._icon_loaded = True
+
     def _recalculate_grid_columns(self):
         """Recalculate the number of columns based on available width and icon size"""
         scrollbar_width = 0
@@ -2050,23 +2074,17 @@ class LaunchpadWidget(BaseWidget):
                     for cache_key in list(_ICON_CACHE.keys()):
                         if filename in cache_key:
                             del _ICON_CACHE[cache_key]
+                    _FAILED_ICONS.difference_update([key for key in _FAILED_ICONS if filename in key])
 
         except Exception as e:
             logging.error("Failed to cleanup unused icons: %s", e)
 
     def _load_apps(self) -> list[dict[str, Any]]:
-        try:
-            if os.path.exists(self._data_file):
-                with open(self._data_file, encoding="utf-8") as f:
-                    apps = json.load(f)
-                return apps
-        except Exception as e:
-            logging.error("Failed to load apps from %s: %s", self._data_file, e)
-        return []
+        return self._apps_store.load()
 
     def _get_all_groups(self) -> list[str]:
         """Get all unique groups from apps"""
-        apps = self._load_apps()
+        apps = self._apps_store.apps
         groups = set()
         for app in apps:
             group = app.get("group")
@@ -2100,8 +2118,4 @@ class LaunchpadWidget(BaseWidget):
             logging.error("Failed to order apps by %s: %s", order_type, e)
 
     def _save_apps(self, apps: list[dict[str, Any]]):
-        try:
-            with open(self._data_file, "w", encoding="utf-8") as f:
-                json.dump(apps, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logging.error("Failed to save apps to %s: %s", self._data_file, e)
+        self._apps_store.save(apps)
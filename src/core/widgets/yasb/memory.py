@@ -1,4 +1,3 @@
-import collections
 import re
 
 from humanize import naturalsize
@@ -12,21 +11,19 @@ from core.utils.utilities import (
 )
 from core.validation.widgets.yasb.memory import MemoryConfig
 from core.widgets.base import BaseWidget
-from core.widgets.services.memory.memory_api import MemoryData, MemoryWorker, SwapMemory, VirtualMemory
+from core.widgets.services.metrics.data import MemoryData, SwapMemory, VirtualMemory
+from core.widgets.services.metrics.sampler import MetricSnapshot, MetricsSampler
 
 
 class MemoryWidget(BaseWidget):
     validation_schema = MemoryConfig
 
-    _instances: list[MemoryWidget] = []
-    _worker: MemoryWorker | None = None
-
     def __init__(self, config: MemoryConfig):
         super().__init__(class_name=f"memory-widget {config.class_name}")
         self.config = config
         self._show_alt_label = False
         self._last_data: MemoryData | None = None
-        self._history: collections.deque = collections.deque(maxlen=config.menu.graph_history_size)
+        self._history: tuple[float, ...] = ()
 
         self.progress_widget = None
         self.progress_widget = build_progress_widget(self, self.config.progress_bar.model_dump())
@@ -40,16 +37,14 @@ class MemoryWidget(BaseWidget):
         self.callback_right = self.config.callbacks.on_right
         self.callback_middle = self.config.callbacks.on_middle
 
-        # Add this instance to the shared instances list
-        if self not in MemoryWidget._instances:
-            MemoryWidget._instances.append(self)
-
-        # Start the shared memory worker thread
-        if self.config.update_interval > 0 and MemoryWidget._worker is None:
-            worker = MemoryWorker.get_instance(self.config.update_interval)
-            worker.data_ready.connect(MemoryWidget._on_data_ready)
-            worker.start()
-            MemoryWidget._worker = worker
+        if self.config.update_interval > 0:
+            MetricsSampler.shared().subscribe(
+                "memory",
+                self.config.update_interval,
+                self._on_snapshot,
+                owner=self,
+                history_size=self.config.menu.graph_history_size if self.config.menu.enabled else 0,
+            )
 
         self._show_placeholder()
 
@@ -59,18 +54,14 @@ class MemoryWidget(BaseWidget):
         swap_mem = SwapMemory(total=0, used=0, free=0, percent=0.0)
         self._update_label(virtual_mem, swap_mem)
 
-    @classmethod
-    def _on_data_ready(cls, data: MemoryData):
-        """Slot called on main thread when new memory data arrives from the worker."""
-        for inst in cls._instances[:]:
-            try:
-                inst._last_data = data
-                inst._update_label(data.virtual, data.swap)
-                if inst.config.menu.enabled:
-                    inst._history.append(data.virtual.percent)
-                    inst._update_popup(data)
-            except RuntimeError:
-                cls._instances.remove(inst)
+    def _on_snapshot(self, snapshot: MetricSnapshot):
+        """Called on the main thread with each memory sample."""
+        data = snapshot.value
+        self._last_data = data
+        self._update_label(data.virtual, data.swap)
+        if self.config.menu.enabled:
+            self._history = snapshot.history
+            self._update_popup(data)
 
     def _update_popup(self, data: MemoryData):
         """Push fresh data into the open popup if visible."""
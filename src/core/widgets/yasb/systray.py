@@ -24,6 +24,7 @@ from win32con import HWND_BROADCAST
 
 from core.bar_helper import AppBarManager
 from core.utils.system import app_data_path
+from core.utils.tick_scheduler import TickScheduler
 from core.utils.utilities import refresh_widget_style
 from core.utils.win32.bindings import IsWindow
 from core.utils.win32.bindings.user32 import RegisterWindowMessage, SendNotifyMessage
@@ -131,10 +132,10 @@ class SystrayWidget(BaseWidget):
         self.current_state: dict[str, IconState] = {}
         self.screen_id: str | None = None
 
-        # This timer will check if icons are still valid and have actual process attached
-        self.icon_check_timer = QTimer(self)
-        self.icon_check_timer.timeout.connect(self.check_icons)
-        self.icon_check_timer.start(5000)
+        # Periodically check if icons are still valid and have actual process attached
+        self._icon_check_subscription = TickScheduler.shared().subscribe(
+            5000, self.check_icons, owner=self, name="SystrayWidget.check_icons"
+        )
 
         self.refresh_systray_timer = QTimer(self)
         self.refresh_systray_timer.timeout.connect(self.refresh_systray)
@@ -13,6 +13,7 @@ from core.utils.tooltip import set_tooltip
 from core.utils.utilities import refresh_widget_style
 from core.utils.win32.app_icons import get_stock_icon, get_window_icon
 from core.utils.win32.constants import KnownCLSID
+from core.utils.win32.icon_cache import IconCache
 from core.utils.win32.utils import get_monitor_hwnd, get_monitor_info
 from core.utils.win32.window_actions import (
     can_minimize,
@@ -1829,23 +1830,9 @@ class TaskbarWidget(BaseWidget):
                 is_empty = self._recycle_bin_state.get("is_empty", True)
                 return self._get_recycle_bin_icon(is_empty)
 
-            cache_key = (hwnd, title, self._dpi)
-            if cache_key in self._icon_cache:
-                icon_img = self._icon_cache[cache_key]
-            else:
-                icon_img = get_window_icon(hwnd)
-                if icon_img and self._dpi is not None:
-                    pixel_size = int(self.config.icon_size * self._dpi)
-                    icon_img = icon_img.resize((pixel_size, pixel_size), Image.LANCZOS).convert("RGBA")
-                    self._icon_cache[cache_key] = icon_img
-
-            if not icon_img:
+            if self._dpi is None:
                 return None
-
-            qimage = QImage(icon_img.tobytes(), icon_img.width, icon_img.height, QImage.Format.Format_RGBA8888)
-            pixmap = QPixmap.fromImage(qimage)
-            pixmap.setDevicePixelRatio(self._dpi)
-            return pixmap
+            return IconCache().window_icon(hwnd, self.config.icon_size, self._dpi, title=title)
 
         except Exception:
             logging.debug("Failed to get icons for window with HWND %s", hwnd, exc_info=True)
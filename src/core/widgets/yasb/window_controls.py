@@ -4,9 +4,10 @@ import os
 import win32api
 import win32gui
 import win32process
-from PyQt6.QtCore import QEasingCurve, QPropertyAnimation, QTimer
+from PyQt6.QtCore import QEasingCurve, QPropertyAnimation
 from PyQt6.QtWidgets import QGraphicsOpacityEffect, QLabel, QPushButton
 
+from core.utils.tick_scheduler import TickScheduler, TickSubscription
 from core.utils.tooltip import set_tooltip
 from core.utils.utilities import refresh_widget_style
 from core.utils.win32.utils import get_app_name_from_pid, is_window_maximized
@@ -66,9 +67,7 @@ class _ForegroundPoller:
 
     def __init__(self):
         self._callbacks: list = []
-        self._timer = QTimer()
-        self._timer.setInterval(200)
-        self._timer.timeout.connect(self._poll)
+        self._subscription: TickSubscription | None = None
         self._app_name_cache: dict[int, str] = {}
         self._last_hwnd: int = 0
         self._last_result: _ForegroundPollResult | None = None
@@ -77,8 +76,8 @@ class _ForegroundPoller:
         if callback in self._callbacks:
             return
         self._callbacks.append(callback)
-        if len(self._callbacks) == 1:
-            self._timer.start()
+        if self._subscription is None:
+            self._subscription = TickScheduler.shared().subscribe(200, self._poll, name="_ForegroundPoller._poll")
 
     def unregister(self, callback):
         try:
@@ -86,7 +85,8 @@ class _ForegroundPoller:
         except ValueError:
             pass
         if not self._callbacks:
-            self._timer.stop()
+            TickScheduler.shared().unsubscribe(self._subscription)
+            self._subscription = None
 
     def _broadcast(self, result: _ForegroundPollResult):
         self._last_result = result
@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("winrt")
+
+from core.widgets.services.ai_chat import syntax_highlight  # noqa: E402
+from core.widgets.services.ai_chat.constants import MAX_HIGHLIGHTED_CODE_LENGTH  # noqa: E402
+from core.widgets.services.ai_chat.syntax_highlight import (  # noqa: E402
+    ProgressiveHighlighter,
+    _HighlightCache,
+    simple_syntax_highlight,
+)
+from core.widgets.services.ai_chat.ui_components import _format_chat_block, format_chat_text  # noqa: E402
+
+LARGE_CODE = "def f(x):\n    return x + 1\n" * (MAX_HIGHLIGHTED_CODE_LENGTH // 25)
+MESSAGE = f"Here it is:\n\n```python\n{LARGE_CODE}```"
+
+
+@pytest.fixture
+def small_cache(monkeypatch, qapp):
+    monkeypatch.setattr(syntax_highlight, "_cache", _HighlightCache(1))
+    _format_chat_block.cache_clear()
+    yield
+    _format_chat_block.cache_clear()
+
+
+def finish_highlights():
+    highlighter = ProgressiveHighlighter()
+    while highlighter._jobs:
+        highlighter._process()
+
+
+def is_highlighted(html: str) -> bool:
+    return "<span" in html
+
+
+def test_large_block_is_formatted_again_once_highlighted(small_cache):
+    assert not is_highlighted(format_chat_text(MESSAGE))
+    finish_highlights()
+    assert is_highlighted(format_chat_text(MESSAGE))
+
+
+def test_evicted_highlight_is_scheduled_again(small_cache):
+    format_chat_text(MESSAGE)
+    finish_highlights()
+    assert is_highlighted(format_chat_text(MESSAGE))
+
+    # Highlighting other code evicts the large block from the one-entry cache
+    simple_syntax_highlight("x = 1", "python")
+    assert not is_highlighted(format_chat_text(MESSAGE))
+    assert ProgressiveHighlighter()._jobs
+
+    finish_highlights()
+    assert is_highlighted(format_chat_text(MESSAGE))
+
+
+def test_finished_blocks_stay_cached_while_others_are_pending(small_cache):
+    format_chat_text("intro")
+    hits = _format_chat_block.cache_info().hits
+    assert not is_highlighted(format_chat_text(f"intro\n\n{MESSAGE}"))
+    assert _format_chat_block.cache_info().hits == hits + 1
+    finish_highlights()
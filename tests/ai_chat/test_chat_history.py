@@ -0,0 +1,92 @@
+import json
+
+from core.widgets.services.ai_chat.chat_session import ChatHistoryManager
+from core.widgets.services.ai_chat.history_store import ChatHistoryStore
+from core.widgets.services.ai_chat.message_composer import ContextBuilder, compose_user_message
+
+IMAGE_URL = "data:image/png;base64," + "iVBORw0KGgo" * 100
+KEY = ("openai", "model")
+
+
+def size_formatter(size: int) -> str:
+    return f"{size} B"
+
+
+def attachments() -> list[dict]:
+    return [
+        {
+            "path": "C:/notes.txt",
+            "name": "notes.txt",
+            "size": 12,
+            "truncated": False,
+            "is_image": False,
+            "prompt": "notes.txt:\nhello world",
+        },
+        {
+            "path": "C:/shot.png",
+            "name": "shot.png",
+            "size": 2048,
+            "is_image": True,
+            "image_url": IMAGE_URL,
+            "prompt": "[Image: shot.png]",
+            "compressed": True,
+        },
+    ]
+
+
+def manager(tmp_path) -> ChatHistoryManager:
+    return ChatHistoryManager({}, size_formatter, ChatHistoryStore(tmp_path), lambda key: "-".join(key))
+
+
+def add_user_turn(history: ChatHistoryManager) -> dict:
+    files = attachments()
+    payload_text, _ = compose_user_message("what is in these?", files, size_formatter)
+    return history.add_entry(KEY, "user", payload_text, user_text="what is in these?", attachments=files)
+
+
+def test_attachment_contents_are_not_written_to_disk(tmp_path):
+    history = manager(tmp_path)
+    entry = add_user_turn(history)
+    assert entry["attachments"][1]["image_url"] == IMAGE_URL
+
+    log = (tmp_path / "openai-model.jsonl").read_text(encoding="utf-8")
+    assert "base64" not in log
+    stored = json.loads(log)["entry"]["attachments"]
+    assert [sorted(att) for att in stored] == [
+        ["is_image", "name", "path", "size", "truncated"],
+        ["compressed", "is_image", "name", "path", "size"],
+    ]
+
+
+def test_rewrite_drops_attachment_contents(tmp_path):
+    history = manager(tmp_path)
+    entry = add_user_turn(history)
+    history.set(KEY, [entry, {"role": "assistant", "content": "a screenshot"}])
+    assert "base64" not in (tmp_path / "openai-model.jsonl").read_text(encoding="utf-8")
+    assert entry["attachments"][1]["image_url"] == IMAGE_URL
+
+
+def test_restored_history_is_sent_as_text(tmp_path):
+    entry = add_user_turn(manager(tmp_path))
+    history = manager(tmp_path)
+    restored = history.get(KEY)
+    assert restored[0]["content"] == entry["content"]
+
+    display = history.compute_display_for_history_entry(restored[0])
+    assert "shot.png (2048 B) [compressed]" in display
+
+    (message,) = ContextBuilder().build(restored, "openai", max_context_images=1)
+    assert message["content"] == [
+        {"type": "text", "text": entry["content"]},
+        {"type": "text", "text": "[Image: shot.png]"},
+    ]
+
+
+def test_live_history_still_sends_images(tmp_path):
+    entry = add_user_turn(manager(tmp_path))
+    (message,) = ContextBuilder().build([entry], "openai", max_context_images=1)
+    assert message["content"] == [
+        {"type": "text", "text": "what is in these?"},
+        {"type": "text", "text": "notes.txt:\nhello world"},
+        {"type": "image_url", "image_url": {"url": IMAGE_URL}},
+    ]
@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("winrt")
+
+from core.widgets.services.ai_chat.ui_components import ChatMessageBrowser  # noqa: E402
+
+RESPONSE = (
+    "Here is **bold**, `inline code` and a [link](https://example.com).\n\n"
+    "```python\ndef f(x):\n\n    return x + 1\n```\n\n"
+    "- item *one*\n- item two\n\n\n"
+    "Read more at www.example.org\n\n"
+    "Done."
+)
+
+
+@pytest.fixture
+def make_browser(qapp):
+    browsers = []
+
+    def make():
+        browser = ChatMessageBrowser()
+        browser.resize(400, 300)
+        browsers.append(browser)
+        return browser
+
+    yield make
+    for browser in browsers:
+        browser.deleteLater()
+
+
+def stream(browser: ChatMessageBrowser, text: str, chunk: int):
+    for end in range(chunk, len(text), chunk):
+        browser.set_streaming_text(text[:end])
+    browser.set_streaming_text(text)
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 7, 40])
+def test_chunked_stream_matches_a_single_render(make_browser, chunk):
+    streamed = make_browser()
+    stream(streamed, RESPONSE, chunk)
+    rendered = make_browser()
+    rendered.set_streaming_text(RESPONSE)
+
+    assert streamed.toHtml() == rendered.toHtml()
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 40])
+def test_stream_matches_the_final_render(make_browser, chunk):
+    streamed = make_browser()
+    stream(streamed, RESPONSE, chunk)
+    final = make_browser()
+    final.setText(RESPONSE)
+
+    # The unfinished last block is plain text, "Done." renders the same either way
+    assert streamed.toHtml() == final.toHtml()
+
+
+def test_every_prefix_matches_a_single_render(make_browser):
+    streamed = make_browser()
+    for end in range(1, len(RESPONSE) + 1):
+        streamed.set_streaming_text(RESPONSE[:end])
+        rendered = make_browser()
+        rendered.set_streaming_text(RESPONSE[:end])
+        assert streamed.toHtml() == rendered.toHtml(), end
+
+
+def test_text_that_is_not_a_continuation_starts_over(make_browser):
+    streamed = make_browser()
+    stream(streamed, RESPONSE, 5)
+    streamed.set_streaming_text("Retrying.\n\nSecond try")
+    rendered = make_browser()
+    rendered.set_streaming_text("Retrying.\n\nSecond try")
+
+    assert streamed.toHtml() == rendered.toHtml()
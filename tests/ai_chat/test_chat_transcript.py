@@ -0,0 +1,99 @@
+import pytest
+from PyQt6.QtWidgets import QFrame, QScrollArea, QTextBrowser, QVBoxLayout, QWidget
+
+from core.widgets.services.ai_chat.chat_session import ChatSession
+from core.widgets.services.ai_chat.chat_transcript import ChatTranscript, detach_last_row, last_chat_item
+
+
+class Owner:
+    """Builds message rows shaped like the AI chat widget's rows."""
+
+    def _build_message_row(self, role: str, text: str) -> QWidget:
+        row = QFrame()
+        QVBoxLayout(row)
+        wrapper = QFrame()
+        wrapper.setProperty("class", f"{role}-message")
+        QVBoxLayout(wrapper).addWidget(QTextBrowser())
+        wrapper.layout().itemAt(0).widget().setPlainText(text)
+        row.layout().addWidget(wrapper)
+        return row
+
+
+@pytest.fixture
+def chat(qapp):
+    scroll = QScrollArea()
+    scroll.setWidgetResizable(True)
+    chat_widget = QWidget()
+    layout = QVBoxLayout(chat_widget)
+    layout.addStretch()
+    scroll.setWidget(chat_widget)
+    scroll.resize(400, 300)
+    yield scroll, layout
+    scroll.deleteLater()
+
+
+def add_transcript(chat, messages: list[tuple[str, str]]) -> ChatTranscript:
+    scroll, layout = chat
+    transcript = ChatTranscript(Owner(), messages, scroll, max(layout.spacing(), 0))
+    layout.insertWidget(layout.count() - 1, transcript)
+    return transcript
+
+
+def role_of(row: QWidget) -> str:
+    return row.layout().itemAt(0).widget().property("class")
+
+
+def conversation(count: int) -> list[tuple[str, str]]:
+    return [("user" if i % 2 == 0 else "assistant", f"message {i}") for i in range(count)]
+
+
+def test_lookup_does_not_change_the_layout(chat):
+    _, layout = chat
+    transcript = add_transcript(chat, conversation(4))
+    assert last_chat_item(layout) is transcript
+    assert last_chat_item(layout) is transcript
+    assert transcript.message_count == 4
+    assert layout.count() == 2
+
+
+def test_detach_moves_the_last_message_out_of_the_transcript(chat):
+    _, layout = chat
+    transcript = add_transcript(chat, conversation(4))
+    row = detach_last_row(layout)
+    assert role_of(row) == "assistant-message"
+    assert transcript.message_count == 3
+    assert layout.indexOf(row) == layout.indexOf(transcript) + 1
+    # A regular last row is returned as it is
+    assert detach_last_row(layout) is row
+    assert last_chat_item(layout) is row
+
+
+def test_detaching_the_only_message_removes_the_transcript(chat):
+    _, layout = chat
+    add_transcript(chat, conversation(1))
+    row = detach_last_row(layout)
+    assert role_of(row) == "user-message"
+    assert layout.count() == 2
+    assert layout.itemAt(0).widget() is row
+
+
+def test_detach_from_an_empty_layout(chat):
+    _, layout = chat
+    assert last_chat_item(layout) is None
+    assert detach_last_row(layout) is None
+
+
+def test_session_lookups_only_detach_assistant_messages(chat):
+    _, layout = chat
+    session = ChatSession({}, str, 1)
+    transcript = add_transcript(chat, conversation(3))
+    assert session.get_last_message_role(layout) == ("user", None)
+    assert session.find_last_assistant_label(layout) is None
+    assert transcript.message_count == 3
+
+    transcript.take_last_row().deleteLater()
+    role, label = session.get_last_message_role(layout)
+    assert role == "assistant"
+    assert label.toPlainText() == "message 1"
+    assert transcript.message_count == 1
+    assert session.find_last_assistant_label(layout) is label
@@ -0,0 +1,129 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.widgets.services.ai_chat.message_composer import ContextBuilder, estimate_message_tokens
+
+pytest.importorskip("openai")
+
+from core.widgets.services.ai_chat.openai_client import AiChatClient  # noqa: E402
+
+REPLY = "The newest turn was received."
+IMAGE_URL = "data:image/png;base64,iVBORw0KGgo="
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Answers chat completions with a streamed reply and records the request bodies."""
+
+    requests: list[dict]
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append({"path": self.path, "body": body})
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for index, word in enumerate(REPLY.split(" ")):
+            chunk = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{"index": 0, "delta": {"content": word if index == 0 else " " + word}}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAIHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def user_turn(index: int, image: bool = False) -> dict:
+    text = f"question {index} " + "x" * 200
+    entry = {"role": "user", "content": text, "user_text": text}
+    if image:
+        entry["attachments"] = [
+            {
+                "path": f"C:/shot{index}.png",
+                "name": f"shot{index}.png",
+                "size": 10,
+                "is_image": True,
+                "image_url": IMAGE_URL,
+                "prompt": f"[Image: shot{index}.png]",
+            }
+        ]
+    return entry
+
+
+def conversation(turns: int) -> list[dict]:
+    history = [{"role": "system", "content": "You are a helpful assistant."}]
+    for index in range(turns):
+        history.append(user_turn(index, image=True))
+        history.append({"role": "assistant", "content": f"answer {index} " + "y" * 200})
+    history.append(user_turn(turns, image=True))
+    return history
+
+
+def send(server, messages: list[dict]) -> tuple[str, dict]:
+    provider = {"provider": "fake", "api_endpoint": f"http://127.0.0.1:{server.server_address[1]}/v1"}
+    client = AiChatClient(provider, "fake-model", 0)
+    reply = "".join(client.chat(messages, 0.7, 0.95))
+    (request,) = server.requests
+    assert request["path"] == "/v1/chat/completions"
+    return reply, request["body"]
+
+
+def test_trimmed_context_is_sent(server):
+    history = conversation(10)
+    builder = ContextBuilder()
+    messages = builder.build(history, "openai", max_context_tokens=2000, max_context_images=2)
+    reply, body = send(server, messages)
+
+    assert reply == REPLY
+    assert body["model"] == "fake-model"
+    assert body["stream"] is True
+    sent = body["messages"]
+    assert sent == messages
+    assert sent[0] == {"role": "system", "content": "You are a helpful assistant."}
+    assert sum(estimate_message_tokens(message) for message in sent) <= 2000
+
+    # The newest turns are kept, in order
+    assert sent[-1]["content"][0]["text"] == history[-1]["content"]
+    assert [message["role"] for message in sent[1:]] == [entry["role"] for entry in history[-(len(sent) - 1) :]]
+    assert len(sent) < len(history)
+    parts = [part["type"] for message in sent if isinstance(message["content"], list) for part in message["content"]]
+    assert parts.count("image_url") == 2
+
+
+def test_images_beyond_the_limit_are_sent_as_text(server):
+    history = conversation(3)
+    messages = ContextBuilder().build(history, "openai", max_context_images=2)
+    _, body = send(server, messages)
+
+    sent = body["messages"]
+    assert len(sent) == len(history)
+    image_parts = [
+        part["type"] for message in sent if isinstance(message["content"], list) for part in message["content"][1:]
+    ]
+    assert image_parts == ["text", "text", "image_url", "image_url"]
+    assert sent[1]["content"][1] == {"type": "text", "text": "[Image: shot0.png]"}
+
+
+def test_unlimited_context_sends_the_whole_history(server):
+    history = conversation(3)
+    _, body = send(server, ContextBuilder().build(history, "openai"))
+    assert len(body["messages"]) == len(history)
+    assert body["messages"][-1]["content"][1] == {"type": "image_url", "image_url": {"url": IMAGE_URL}}
@@ -0,0 +1,125 @@
+"""
+Compare opening a restored chat with one widget per message against ChatTranscript.
+
+The chat is built in an offscreen scroll area shaped like the AI chat popup, shown, and laid
+out. The transcript is then scrolled from the bottom to the top and its last message detached,
+which is what streaming into or removing the last restored message does.
+
+    python tests/benchmarks/bench_chat_transcript.py [--messages N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QFrame, QScrollArea, QTextBrowser, QVBoxLayout, QWidget  # noqa: E402
+
+from core.widgets.services.ai_chat.chat_transcript import ChatTranscript, detach_last_row  # noqa: E402
+
+
+class Owner:
+    """Builds message rows shaped like the AI chat widget's rows."""
+
+    def _build_message_row(self, role: str, text: str) -> QWidget:
+        row = QFrame()
+        QVBoxLayout(row)
+        wrapper = QFrame()
+        wrapper.setProperty("class", f"{role}-message")
+        browser = QTextBrowser()
+        browser.setPlainText(text)
+        QVBoxLayout(wrapper).addWidget(browser)
+        row.layout().addWidget(wrapper)
+        return row
+
+
+def conversation(count: int) -> list[tuple[str, str]]:
+    paragraph = "Restored chat messages are rendered only near the viewport. " * 6
+    return [
+        ("user", f"Question {i}?") if i % 2 == 0 else ("assistant", "\n\n".join([paragraph] * (1 + i % 4)))
+        for i in range(count)
+    ]
+
+
+def settle(app: QApplication):
+    for _ in range(3):
+        app.processEvents()
+        app.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+def open_chat(app: QApplication, messages: list[tuple[str, str]], virtualized: bool):
+    """Build, show and lay out a chat, return (scroll area, chat layout, milliseconds)."""
+    start = time.perf_counter()
+    scroll = QScrollArea()
+    scroll.setWidgetResizable(True)
+    chat_widget = QWidget()
+    layout = QVBoxLayout(chat_widget)
+    layout.addStretch()
+    scroll.setWidget(chat_widget)
+    scroll.resize(420, 640)
+    owner = Owner()
+    if virtualized:
+        transcript = ChatTranscript(owner, messages, scroll, max(layout.spacing(), 0))
+        layout.insertWidget(layout.count() - 1, transcript)
+        transcript.schedule_update()
+    else:
+        for role, text in messages:
+            layout.insertWidget(layout.count() - 1, owner._build_message_row(role, text))
+    scroll.show()
+    settle(app)
+    scroll.verticalScrollBar().setValue(scroll.verticalScrollBar().maximum())
+    settle(app)
+    return scroll, layout, (time.perf_counter() - start) * 1000
+
+
+def scroll_through(app: QApplication, scroll: QScrollArea, steps: int = 40) -> float:
+    """Milliseconds per scroll step from the bottom to the top."""
+    scrollbar = scroll.verticalScrollBar()
+    start = time.perf_counter()
+    for step in range(steps, -1, -1):
+        scrollbar.setValue(scrollbar.maximum() * step // steps)
+        settle(app)
+    return (time.perf_counter() - start) * 1000 / (steps + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    messages = conversation(args.messages)
+    print(f"{len(messages)} messages, {sum(len(text) for _, text in messages) / 1024:.0f} KiB")
+
+    eager = virtual = scroll_step = detach = 0.0
+    for _ in range(args.repeat):
+        scroll, _, elapsed = open_chat(app, messages, virtualized=False)
+        eager += elapsed / args.repeat
+        scroll.deleteLater()
+        settle(app)
+
+        scroll, layout, elapsed = open_chat(app, list(messages), virtualized=True)
+        virtual += elapsed / args.repeat
+        scroll_step += scroll_through(app, scroll) / args.repeat
+        start = time.perf_counter()
+        detach_last_row(layout)
+        settle(app)
+        detach += (time.perf_counter() - start) * 1000 / args.repeat
+        scroll.deleteLater()
+        settle(app)
+
+    print(f"open, one widget per message {eager:8.1f} ms")
+    print(f"open, ChatTranscript         {virtual:8.1f} ms")
+    print(f"ChatTranscript scroll step   {scroll_step:8.2f} ms")
+    print(f"detach_last_row              {detach:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Measure undo and redo of the screenshot editor after 200 ops, with and without checkpoints.
+
+A 1920x1080 capture gets 200 annotation ops (pen strokes, shapes, blurs and the odd crop) on an
+offscreen EditorCanvas. Every op is then undone and redone one by one. Without checkpoints each
+undo replays the whole history from the original capture, which is what the editor did before.
+
+    python tests/benchmarks/bench_editor_history.py [--ops N] [--size WxH]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QColor, QLinearGradient, QPainter, QPixmap  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from core.widgets.services.control_center.api.screenshot import editor  # noqa: E402
+from core.widgets.services.control_center.api.screenshot.editor import (  # noqa: E402
+    ArrowOp,
+    BlurOp,
+    CropOp,
+    EditorCanvas,
+    FreehandOp,
+    RectOp,
+)
+
+
+def capture(width: int, height: int) -> QPixmap:
+    pixmap = QPixmap(width, height)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor("#1e1e2e"))
+    gradient.setColorAt(1, QColor("#89b4fa"))
+    painter = QPainter(pixmap)
+    painter.fillRect(pixmap.rect(), gradient)
+    painter.end()
+    return pixmap
+
+
+def history(count: int, width: int, height: int) -> list:
+    rnd = random.Random(0)
+    ops = []
+    for index in range(count):
+        w, h = width - index // 40 * 8, height - index // 40 * 8
+
+        def point():
+            return rnd.randrange(w), rnd.randrange(h)
+
+        kind = rnd.random()
+        if index % 40 == 39:
+            ops.append(CropOp(4, 4, w - 8, h - 8))
+        elif kind < 0.5:
+            # A stroke as the mouse reports it, a few pixels between points
+            x, y = point()
+            points = []
+            for _ in range(60):
+                x = min(max(0, x + rnd.randint(-6, 6)), w - 1)
+                y = min(max(0, y + rnd.randint(-6, 6)), h - 1)
+                points.append((x, y))
+            ops.append(FreehandOp(rnd.choice(["pen", "highlight"]), tuple(points), "#ff453a", 4))
+        elif kind < 0.8:
+            ops.append(rnd.choice([ArrowOp, RectOp])(point(), point(), "#30d158", 3))
+        else:
+            x, y = point()
+            ops.append(BlurOp(x, y, 160, 90, 6))
+    return ops
+
+
+def run(ops: list, image: QPixmap, checkpoints: bool) -> dict[str, float]:
+    if not checkpoints:
+        editor._CHECKPOINT_INTERVAL = len(ops) + 1
+        editor._CHECKPOINT_OPS = ()
+    canvas = EditorCanvas()
+    canvas.set_image(image)
+    timings = {}
+
+    start = time.perf_counter()
+    for op in ops:
+        canvas._commit_op(op, apply=True)
+    timings["commit"] = (time.perf_counter() - start) * 1000 / len(ops)
+
+    undone = 0
+    start = time.perf_counter()
+    while canvas._ops:
+        canvas.undo()
+        undone += 1
+    timings["undo"] = (time.perf_counter() - start) * 1000 / undone
+
+    start = time.perf_counter()
+    while canvas._redo_ops:
+        canvas.redo()
+    timings["redo"] = (time.perf_counter() - start) * 1000 / undone
+    timings["checkpoints"] = len(canvas._checkpoints)
+    timings["memory"] = sum(cp.nbytes for cp in canvas._checkpoints.values()) / 1024 / 1024
+    canvas.deleteLater()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=200)
+    parser.add_argument("--size", default="1920x1080")
+    args = parser.parse_args()
+    width, height = (int(value) for value in args.size.split("x"))
+
+    app = QApplication.instance() or QApplication([])
+    image = capture(width, height)
+    ops = history(args.ops, width, height)
+    print(f"{len(ops)} ops on {width}x{height} ({app.platformName()}), history limited to {editor._HISTORY_MAX}")
+    for label, checkpoints in (("checkpoints", True), ("full replay", False)):
+        timings = run(ops, image, checkpoints)
+        print(
+            f"{label:12} commit {timings['commit']:7.2f} ms  undo {timings['undo']:8.2f} ms  "
+            f"redo {timings['redo']:7.2f} ms  ({timings['checkpoints']} checkpoints, {timings['memory']:.0f} MiB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Measure the screenshot editor's frame time while drawing, with dirty rect repaints and full repaints.
+
+Synthetic QMouseEvents drag across an offscreen EditorCanvas showing a 1920x1080 capture. Every mouse
+move is followed by the repaint it causes, and the time of both is one frame. Full repaints are what
+the canvas did before it only updated the region a stroke segment or shape preview touches.
+
+    python tests/benchmarks/bench_editor_paint.py [--moves N] [--zoom Z]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent, QPoint, QPointF, Qt  # noqa: E402
+from PyQt6.QtGui import QColor, QLinearGradient, QMouseEvent, QPainter, QPixmap  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QScrollArea, QWidget  # noqa: E402
+
+from core.widgets.services.control_center.api.screenshot.editor import EditorCanvas  # noqa: E402
+
+TOOLS = ["pen", "highlight", "arrow", "rect", "crop"]
+
+
+def capture(width: int, height: int) -> QPixmap:
+    pixmap = QPixmap(width, height)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor("#1e1e2e"))
+    gradient.setColorAt(1, QColor("#89b4fa"))
+    painter = QPainter(pixmap)
+    painter.fillRect(pixmap.rect(), gradient)
+    painter.end()
+    return pixmap
+
+
+def send(app: QApplication, canvas: EditorCanvas, kind: QEvent.Type, pos: QPoint):
+    button = Qt.MouseButton.NoButton if kind == QEvent.Type.MouseMove else Qt.MouseButton.LeftButton
+    buttons = Qt.MouseButton.NoButton if kind == QEvent.Type.MouseButtonRelease else Qt.MouseButton.LeftButton
+    point = QPointF(pos)
+    global_point = QPointF(canvas.mapToGlobal(pos))
+    app.sendEvent(canvas, QMouseEvent(kind, point, global_point, button, buttons, Qt.KeyboardModifier.NoModifier))
+
+
+def drag(app: QApplication, canvas: EditorCanvas, tool: str, moves: int) -> list[float]:
+    """Milliseconds of every frame of one drag."""
+    canvas.tool = tool
+    path = [QPoint(200 + step * 3, 150 + (step * 7) % 400) for step in range(moves + 1)]
+    send(app, canvas, QEvent.Type.MouseButtonPress, path[0])
+    app.processEvents()
+    frames = []
+    for pos in path[1:]:
+        start = time.perf_counter()
+        send(app, canvas, QEvent.Type.MouseMove, pos)
+        # The repaint the move asked for
+        app.processEvents()
+        frames.append((time.perf_counter() - start) * 1000)
+    send(app, canvas, QEvent.Type.MouseButtonRelease, path[-1])
+    canvas.undo()
+    app.processEvents()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--moves", type=int, default=120)
+    parser.add_argument("--zoom", type=float, default=1.0)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    scroll = QScrollArea()
+    canvas = EditorCanvas()
+    canvas.set_image(capture(1920, 1080))
+    scroll.setWidget(canvas)
+    scroll.resize(1600, 900)
+    scroll.show()
+    canvas.set_zoom(args.zoom)
+    app.processEvents()
+
+    print(f"1920x1080 capture at {args.zoom:g}x in a 1600x900 view ({app.platformName()}), {args.moves} moves per drag")
+    print(f"{'tool':10} {'dirty rect':>22} {'full repaint':>22}")
+    for tool in TOOLS:
+        results = []
+        for full in (False, True):
+            if full:
+                canvas.update = lambda *_: QWidget.update(canvas)
+            frames = drag(app, canvas, tool, args.moves)
+            if full:
+                del canvas.update
+            results.append(f"{statistics.median(frames):7.2f} / {max(frames):7.2f} ms")
+        print(f"{tool:10} {results[0]:>22} {results[1]:>22}")
+    print("median / worst frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Measure the launchpad's search, tile relayout and icon loading with 1,000 apps.
+
+A temporary apps.json with generated apps and icons (some of them unreadable) is searched as if
+typed key by key. Every keystroke re-lays out the tiles of the matches in an offscreen grid, either
+reusing the existing tiles like LaunchpadWidget._layout_tiles or building new ones, which is what
+the launchpad did before tiles were cached. Icons are loaded through ScaledIconCache, cold and warm.
+
+    python tests/benchmarks/bench_launchpad.py [--apps N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QColor, QImage  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QFrame, QGridLayout, QLabel, QVBoxLayout, QWidget  # noqa: E402
+
+from core.utils.disk_cache import DiskCache  # noqa: E402
+from core.widgets.services.launchpad.app_index import AppIndex  # noqa: E402
+from core.widgets.services.launchpad.app_store import AppStore  # noqa: E402
+from core.widgets.services.launchpad.icon_cache import ScaledIconCache  # noqa: E402
+
+WORDS = ["Visual", "Studio", "Code", "Steam", "Spotify", "Chrome", "Microsoft", "Terminal", "Note", "Pad", "Paint"]
+GROUPS = [None, None, None, "Dev", "Media", "Games"]
+QUERY = "visual studio"
+COLUMNS = 6
+ICON_SIZE = 48
+ICON_COUNT = 100
+BROKEN_EVERY = 10
+
+
+def write_apps(directory: Path, count: int) -> str:
+    """Write apps.json and its icons, every BROKEN_EVERY-th icon is not a readable image."""
+    icons = []
+    for index in range(ICON_COUNT):
+        path = directory / f"icon{index}.png"
+        if index % BROKEN_EVERY == 0:
+            path.write_bytes(b"not a png")
+        else:
+            image = QImage(256, 256, QImage.Format.Format_ARGB32)
+            image.fill(QColor.fromHsv(index * 3 % 360, 200, 220))
+            image.save(str(path))
+        icons.append(str(path))
+    apps = [
+        {
+            "id": index,
+            "title": " ".join(WORDS[(index * k + k) % len(WORDS)] for k in range(1, 2 + index % 3)) + f" {index}",
+            "group": GROUPS[index % len(GROUPS)],
+            "icon": icons[index % ICON_COUNT],
+        }
+        for index in range(count)
+    ]
+    path = directory / "apps.json"
+    path.write_text(json.dumps(apps), encoding="utf-8")
+    return str(path)
+
+
+def make_tile(app: dict) -> QFrame:
+    tile = QFrame()
+    layout = QVBoxLayout(tile)
+    icon = QLabel()
+    icon.setFixedSize(ICON_SIZE, ICON_SIZE)
+    layout.addWidget(icon)
+    layout.addWidget(QLabel(app["title"]))
+    tile.app_data = app
+    return tile
+
+
+def layout_tiles(grid: QGridLayout, container: QWidget, tiles: list[QFrame]):
+    """Place tiles in order and hide the others, like LaunchpadWidget._layout_tiles."""
+    container.setUpdatesEnabled(False)
+    keep = set(tiles)
+    for i in reversed(range(grid.count())):
+        child = grid.takeAt(i).widget()
+        if child is not None and child not in keep:
+            child.hide()
+    for index, tile in enumerate(tiles):
+        grid.addWidget(tile, index // COLUMNS, index % COLUMNS)
+        tile.show()
+    container.setUpdatesEnabled(True)
+
+
+def type_query(app: QApplication, store: AppStore, reuse: bool) -> float:
+    """Milliseconds per keystroke of QUERY, search and relayout included."""
+    container = QWidget()
+    grid = QGridLayout(container)
+    container.resize(COLUMNS * 120, 800)
+    container.show()
+    index = AppIndex(store.apps)
+    tiles: dict[str, QFrame] = {}
+    layout_tiles(grid, container, [make_tile(app_data) for app_data in store.apps])
+    app.processEvents()
+
+    start = time.perf_counter()
+    for length in range(1, len(QUERY) + 1):
+        matches = index.search(QUERY[:length])
+        if reuse:
+            shown = []
+            for app_data in matches:
+                key = index.key_of(app_data)
+                if key not in tiles:
+                    tiles[key] = make_tile(app_data)
+                shown.append(tiles[key])
+        else:
+            for i in reversed(range(grid.count())):
+                grid.takeAt(i).widget().deleteLater()
+            shown = [make_tile(app_data) for app_data in matches]
+        layout_tiles(grid, container, shown)
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) * 1000 / len(QUERY)
+    container.deleteLater()
+    app.processEvents()
+    return elapsed
+
+
+def load_icons(cache: ScaledIconCache, paths: list[str]) -> tuple[float, int]:
+    """Milliseconds to load every icon of paths and how many could not be loaded."""
+    start = time.perf_counter()
+    failed = sum(1 for path in paths if cache.get(path, ICON_SIZE, 1.0).isNull())
+    return (time.perf_counter() - start) * 1000, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--apps", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        store = AppStore(write_apps(directory, args.apps))
+
+        start = time.perf_counter()
+        apps = store.apps
+        load = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            store.apps
+        cached = (time.perf_counter() - start) * 1000 / args.repeat
+        start = time.perf_counter()
+        index = AppIndex(apps)
+        build = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for length in range(1, len(QUERY) + 1):
+                index.search(QUERY[:length])
+        search = (time.perf_counter() - start) * 1000 / (args.repeat * len(QUERY))
+
+        rebuild = sum(type_query(app, store, reuse=False) for _ in range(args.repeat)) / args.repeat
+        reuse = sum(type_query(app, store, reuse=True) for _ in range(args.repeat)) / args.repeat
+
+        icon_paths = list(dict.fromkeys(app_data["icon"] for app_data in apps))
+        cache = ScaledIconCache(DiskCache("icons", ".png", directory=directory / "cache"))
+        cold, failed = load_icons(cache, icon_paths)
+        warm, _ = load_icons(cache, icon_paths)
+        broken = [path for path in icon_paths if cache.get(path, ICON_SIZE, 1.0).isNull()]
+        retry, _ = load_icons(cache, broken)
+
+    print(f"{len(apps)} apps, {len(icon_paths)} icons of which {failed} unreadable")
+    print(f"apps.json load           {load:8.2f} ms")
+    print(f"apps.json cached access  {cached:8.3f} ms")
+    print(f"AppIndex build           {build:8.2f} ms")
+    print(f"search per keystroke     {search:8.3f} ms")
+    print(f"keystroke, new tiles     {rebuild:8.2f} ms")
+    print(f"keystroke, reused tiles  {reuse:8.2f} ms")
+    print(f"icons, cold disk cache   {cold:8.2f} ms")
+    print(f"icons, warm disk cache   {warm:8.2f} ms")
+    print(f"retrying unreadable      {retry:8.2f} ms per scroll pause")
+
+
+if __name__ == "__main__":
+    main()
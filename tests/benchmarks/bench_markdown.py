@@ -0,0 +1,57 @@
+"""
+Compare md_to_html with md_to_html_cached on the docs.
+
+Each document is rendered once to warm the block cache, then re-rendered after a one-paragraph
+edit, which is what the README and changelog views do when their content is refreshed.
+
+    python tests/benchmarks/bench_markdown.py [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / "src"))
+
+from core.utils.markdown import _md_block_to_html, md_to_html, md_to_html_cached  # noqa: E402
+
+
+def timed(func, texts: list[str], repeat: int) -> float:
+    """Milliseconds per pass over *texts*."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = [ROOT / "README.md", *sorted((ROOT / "docs").rglob("*.md"))]
+    texts = [path.read_text(encoding="utf-8") for path in paths]
+    edited = [text.replace("\n\n", "\n\nEdited paragraph.\n\n", 1) for text in texts]
+    size = sum(len(text) for text in texts)
+    print(f"{len(texts)} documents, {size / 1024:.0f} KiB")
+
+    full = timed(md_to_html, edited, args.repeat)
+    cold = warm = 0.0
+    for text, changed in zip(texts, edited):
+        _md_block_to_html.cache_clear()
+        cold += timed(md_to_html_cached, [text], 1)
+        # Alternate between the two versions so every pass renders a changed document
+        start = time.perf_counter()
+        for index in range(args.repeat):
+            md_to_html_cached(changed if index % 2 == 0 else text)
+        warm += (time.perf_counter() - start) * 1000 / args.repeat
+    print(f"md_to_html                 {full:8.2f} ms")
+    print(f"md_to_html_cached (cold)   {cold:8.2f} ms")
+    print(f"md_to_html_cached (edited) {warm:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
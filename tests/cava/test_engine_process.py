@@ -0,0 +1,92 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+# The engine module reads cava's config location from the Windows registry helpers
+pytest.importorskip("winreg")
+
+from core.widgets.services.cava import engine as cava_engine  # noqa: E402
+from core.widgets.services.cava.engine import CavaEngine  # noqa: E402
+
+BARS = 4
+# Writes 8 bit frames of BARS bars until it is terminated
+PRODUCER = [
+    sys.executable,
+    "-c",
+    "import sys, time\nwhile True:\n    sys.stdout.buffer.write(bytes(range(4)))\n"
+    "    sys.stdout.buffer.flush()\n    time.sleep(0.01)",
+]
+
+
+@pytest.fixture
+def engine(qapp):
+    engine = CavaEngine("test", BARS, "8bit", command=PRODUCER)
+    yield engine
+    engine.stop()
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    processes = []
+    popen = subprocess.Popen
+
+    def record(*args, **kwargs):
+        process = popen(*args, **kwargs)
+        processes.append(process)
+        return process
+
+    monkeypatch.setattr(cava_engine.subprocess, "Popen", record)
+    return processes
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_stop_ends_the_process(engine, spawned):
+    engine.start()
+    wait_for(lambda: engine.frames_decoded > 0)
+    engine.stop()
+    (process,) = spawned
+    assert process.poll() is not None
+    assert engine._process is None
+    assert engine._latest is None
+
+
+def test_stop_before_the_process_is_assigned(engine, spawned, monkeypatch):
+    popen = cava_engine.subprocess.Popen
+
+    def stop_while_starting(*args, **kwargs):
+        # stop() runs after the process was created but before _run assigned it
+        process = popen(*args, **kwargs)
+        engine.stop()
+        return process
+
+    monkeypatch.setattr(cava_engine.subprocess, "Popen", stop_while_starting)
+    engine._run()
+    (process,) = spawned
+    assert process.poll() is not None
+    assert engine._process is None
+
+
+def test_restart_leaves_one_process(engine, spawned):
+    engine.start()
+    engine.stop()
+    engine.start()
+    wait_for(lambda: len(spawned) == 2 and engine._process is spawned[1])
+    engine.stop()
+    assert all(process.poll() is not None for process in spawned)
+
+
+def test_process_ending_on_its_own_resets_the_engine(qapp, spawned):
+    engine = CavaEngine("test", BARS, "8bit", command=[sys.executable, "-c", "import sys; sys.stdout.write('ab')"])
+    engine._run()
+    (process,) = spawned
+    assert process.poll() is not None
+    assert engine._process is None
+    assert engine.frames_decoded == 0
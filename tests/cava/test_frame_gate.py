@@ -0,0 +1,106 @@
+from array import array
+
+import pytest
+
+# The engine module reads cava's config location from the Windows registry helpers
+pytest.importorskip("winreg")
+
+from core.widgets.services.cava.engine import CavaFrame, FrameGate, decode_frame  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def frame(*values: int) -> CavaFrame:
+    return CavaFrame(array("B", values), 255, not any(values))
+
+
+LOUD = frame(10, 200, 30)
+SILENT = frame(0, 0, 0)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def gate(clock):
+    return FrameGate(hidden_fps=2, clock=clock)
+
+
+def paint_all(gate: FrameGate, clock: FakeClock, frames, visible=True, interval=1 / 64) -> list[bool]:
+    painted = []
+    for item in frames:
+        painted.append(gate.should_paint(item, visible))
+        clock.now += interval
+    return painted
+
+
+def test_decode_frame_flags_silence():
+    assert decode_frame(bytes(4), "B", 255).silent
+    loud = decode_frame(array("H", [0, 65535]).tobytes(), "H", 65535)
+    assert not loud.silent
+    assert list(loud.values) == [0, 65535]
+
+
+def test_visible_sound_is_always_painted(gate, clock):
+    assert paint_all(gate, clock, [LOUD] * 10) == [True] * 10
+    assert (gate.painted, gate.skipped) == (10, 0)
+
+
+def test_sustained_silence_is_skipped(gate, clock):
+    painted = paint_all(gate, clock, [LOUD, SILENT] + [SILENT] * 100)
+    # The first silent frame clears the bars, the rest of the silence is not repainted
+    assert painted == [True, True] + [False] * 100
+    assert (gate.painted, gate.skipped) == (2, 100)
+    assert gate.idle
+
+
+def test_first_loud_frame_resumes_painting(gate, clock):
+    paint_all(gate, clock, [SILENT] * 50)
+    assert gate.idle
+    assert gate.should_paint(LOUD, True)
+    assert not gate.idle
+    assert paint_all(gate, clock, [LOUD, SILENT, SILENT]) == [True, True, False]
+    assert (gate.painted, gate.skipped) == (4, 50)
+
+
+def test_hidden_frames_are_throttled(gate, clock):
+    # Two seconds of 64 fps frames while hidden are painted at 2 fps
+    painted = paint_all(gate, clock, [LOUD] * 128, visible=False, interval=1 / 64)
+    assert [index for index, paint in enumerate(painted) if paint] == [0, 32, 64, 96]
+    assert (gate.painted, gate.skipped) == (4, 124)
+
+
+def test_hidden_silence_is_not_painted_after_the_interval(gate, clock):
+    paint_all(gate, clock, [SILENT] * 5, visible=False)
+    clock.now += 10
+    assert not gate.should_paint(SILENT, False)
+    assert gate.should_paint(LOUD, False)
+    assert (gate.painted, gate.skipped) == (2, 5)
+
+
+def test_showing_again_paints_every_frame(gate, clock):
+    paint_all(gate, clock, [LOUD] * 10, visible=False)
+    assert paint_all(gate, clock, [LOUD] * 5) == [True] * 5
+
+
+def test_zero_hidden_fps_paints_nothing_hidden(clock):
+    gate = FrameGate(hidden_fps=0, clock=clock)
+    assert gate.should_paint(LOUD, False)
+    clock.now += 3600
+    assert not gate.should_paint(LOUD, False)
+
+
+def test_reset_paints_the_next_frame(gate, clock):
+    paint_all(gate, clock, [SILENT, SILENT])
+    gate.reset()
+    assert not gate.idle
+    assert gate.should_paint(SILENT, False)
+    assert (gate.painted, gate.skipped) == (2, 1)
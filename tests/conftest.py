@@ -0,0 +1,14 @@
+import os
+
+import pytest
+
+# Widget tests render offscreen so the suite can run without a desktop session
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    yield app
@@ -0,0 +1,271 @@
+import os
+import sys
+import time
+
+import pytest
+from PyQt6 import sip
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from core.widgets.services.custom.command import CommandKey, parse_output
+from core.widgets.services.custom.command_scheduler import CommandScheduler
+from core.widgets.services.custom.command_stream import CommandStream
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses POSIX shell commands")
+
+PRODUCER = """
+import json, os, sys, time
+print(json.dumps({"pid": os.getpid(), "n": 0}), flush=True)
+print("not json", flush=True)
+for n in range(1, int(sys.argv[1]) + 1):
+    print(json.dumps({"pid": os.getpid(), "n": n}), flush=True)
+    time.sleep(float(sys.argv[2]))
+"""
+
+
+def producer_key(lines: int, interval: float) -> CommandKey:
+    return CommandKey(cmd=(sys.executable, "-c", PRODUCER, str(lines), str(interval)), use_shell=False, stream=True)
+
+
+def wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        QApplication.processEvents()
+        time.sleep(0.01)
+
+
+def process_exited(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    # A killed grandchild stays a zombie until its new parent reaps it
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] == "Z"
+    except OSError:
+        return False
+
+
+@pytest.fixture
+def scheduler(qapp):
+    scheduler = CommandScheduler(max_workers=2)
+    yield scheduler
+    scheduler.shutdown()
+    scheduler.deleteLater()
+
+
+def test_json_output_is_parsed(scheduler):
+    key = CommandKey(cmd=("echo", '\'{"text": "hi", "count": 2}\''))
+    received = []
+    scheduler.subscribe(key, received.append)
+    assert scheduler.request(key)
+    wait_until(lambda: received)
+    assert received == [{"text": "hi", "count": 2}]
+    assert scheduler.last_result(key) == {"text": "hi", "count": 2}
+
+
+def test_plain_output_is_stripped(scheduler):
+    key = CommandKey(cmd=("echo", "'  plain text  '"), return_format="string")
+    received = []
+    scheduler.subscribe(key, received.append)
+    scheduler.request(key)
+    wait_until(lambda: received)
+    assert received == ["plain text"]
+
+
+def test_invalid_json_is_delivered_as_none():
+    assert parse_output(b"not json\n", "json") is None
+    assert parse_output("[1, 2]\n", "json") == [1, 2]
+
+
+def test_in_flight_runs_are_deduplicated(scheduler):
+    key = CommandKey(cmd=("sleep 0.2;", "echo", "1"))
+    received = []
+    scheduler.subscribe(key, received.append)
+    assert scheduler.request(key)
+    assert not scheduler.request(key)
+    assert not scheduler.request(key)
+    assert scheduler.skipped_runs == 2
+    wait_until(lambda: received)
+    QApplication.processEvents()
+    assert received == [1]
+    # Once the run finished the key can run again
+    assert scheduler.request(key)
+    wait_until(lambda: len(received) == 2)
+    assert scheduler.skipped_runs == 2
+
+
+def test_output_fans_out_to_every_subscriber(scheduler):
+    key = CommandKey(cmd=("echo", "'{\"v\": 1}'"))
+    other_key = CommandKey(cmd=("echo", "'{\"v\": 2}'"))
+    first, second, other = [], [], []
+    scheduler.subscribe(key, first.append)
+    scheduler.subscribe(key, second.append)
+    scheduler.subscribe(other_key, other.append)
+    scheduler.request(key)
+    wait_until(lambda: first and second)
+    assert first == second == [{"v": 1}]
+    assert other == []
+
+
+def test_late_subscriber_gets_last_result(scheduler):
+    key = CommandKey(cmd=("echo", "3"))
+    first = []
+    scheduler.subscribe(key, first.append)
+    scheduler.request(key)
+    wait_until(lambda: first)
+    late = []
+    scheduler.subscribe(key, late.append)
+    assert late == [3]
+
+
+def test_unsubscribed_key_drops_its_result(scheduler):
+    key = CommandKey(cmd=("echo", "4"))
+    received = []
+    subscription = scheduler.subscribe(key, received.append)
+    scheduler.request(key)
+    wait_until(lambda: received)
+    scheduler.unsubscribe(subscription)
+    assert scheduler.last_result(key) is None
+
+
+def test_destroyed_owner_is_unsubscribed(scheduler):
+    key = CommandKey(cmd=("echo", "5"))
+    owner = QWidget()
+    received = []
+    scheduler.subscribe(key, received.append, owner)
+    sip.delete(owner)
+    assert scheduler.last_result(key) is None
+    scheduler.request(key)
+    time.sleep(0.2)
+    QApplication.processEvents()
+    assert received == []
+
+
+def test_failing_runner_is_not_delivered(qapp):
+    def runner(key):
+        raise ValueError("boom")
+
+    scheduler = CommandScheduler(runner=runner)
+    key = CommandKey(cmd=("anything",))
+    received = []
+    scheduler.subscribe(key, received.append)
+    scheduler.request(key)
+    wait_until(lambda: key not in scheduler._in_flight)
+    assert received == []
+    assert scheduler.request(key)
+    scheduler.shutdown()
+
+
+def test_streamed_key_is_shared_and_stopped(scheduler):
+    key = producer_key(lines=200, interval=0.02)
+    first, second = [], []
+    subscriptions = [scheduler.subscribe(key, first.append), scheduler.subscribe(key, second.append)]
+    assert not scheduler.request(key)
+    wait_until(lambda: len(second) >= 3)
+    # One process feeds both subscribers, and the unparsable line is skipped
+    assert len({result["pid"] for result in first}) == 1
+    assert [result["n"] for result in second[:3]] == [0, 1, 2]
+    pid = first[0]["pid"]
+    for subscription in subscriptions:
+        scheduler.unsubscribe(subscription)
+    wait_until(lambda: process_exited(pid))
+    count = len(first)
+    time.sleep(0.1)
+    QApplication.processEvents()
+    assert len(first) == count
+
+
+def test_stream_restarts_with_growing_backoff():
+    received = []
+    stream = CommandStream(
+        producer_key(lines=0, interval=0), received.append, backoff_min=0.05, backoff_max=0.2, stable_after=60
+    )
+    stream.start()
+    try:
+        deadline = time.monotonic() + 5
+        while stream.restarts < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stream.stop()
+    stream._thread.join(2)
+    assert not stream._thread.is_alive()
+    assert stream.restarts >= 4
+    # Every restarted process printed its first line
+    assert len({result["pid"] for result in received}) >= 4
+
+
+def test_stream_backoff_delays(monkeypatch):
+    stream = CommandStream(producer_key(lines=0, interval=0), lambda result: None, backoff_min=1, backoff_max=4)
+    delays = []
+
+    def wait(delay):
+        delays.append(delay)
+        if len(delays) == 5:
+            stream._stop_event.set()
+        return stream._stop_event.is_set()
+
+    monkeypatch.setattr(stream, "_consume", lambda: 1)
+    monkeypatch.setattr(stream._stop_event, "wait", wait)
+    stream._run()
+    assert delays == [1, 2, 4, 4, 4]
+    assert stream.restarts == 4
+
+
+def test_stable_run_resets_backoff(monkeypatch):
+    stream = CommandStream(
+        producer_key(lines=0, interval=0), lambda result: None, backoff_min=1, backoff_max=8, stable_after=30
+    )
+    now = [0.0]
+    runtimes = iter([1, 1, 1, 40, 1])
+    delays = []
+
+    def consume():
+        now[0] += next(runtimes)
+        return 0
+
+    def wait(delay):
+        delays.append(delay)
+        if len(delays) == 5:
+            stream._stop_event.set()
+        return stream._stop_event.is_set()
+
+    monkeypatch.setattr("core.widgets.services.custom.command_stream.time.monotonic", lambda: now[0])
+    monkeypatch.setattr(stream, "_consume", consume)
+    monkeypatch.setattr(stream._stop_event, "wait", wait)
+    stream._run()
+    assert delays == [1, 2, 4, 1, 2]
+
+
+def test_stop_kills_the_running_process():
+    received = []
+    stream = CommandStream(producer_key(lines=1000, interval=0.01), received.append)
+    stream.start()
+    deadline = time.monotonic() + 5
+    while not received and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pid = received[0]["pid"]
+    started = time.perf_counter()
+    stream.stop()
+    # stop() never waits for the process
+    assert time.perf_counter() - started < 0.1
+    stream._thread.join(2)
+    assert not stream._thread.is_alive()
+    assert process_exited(pid)
+    assert stream.restarts == 0
+
+
+def test_stop_kills_the_shell_and_its_children():
+    received = []
+    key = CommandKey(cmd=(f"{sys.executable} -c '{PRODUCER}' 1000 0.01",), stream=True)
+    stream = CommandStream(key, received.append)
+    stream.start()
+    deadline = time.monotonic() + 5
+    while not received and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pid = received[0]["pid"]
+    stream.stop()
+    stream._thread.join(2)
+    wait_until(lambda: process_exited(pid))
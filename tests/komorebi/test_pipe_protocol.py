@@ -0,0 +1,120 @@
+import io
+import json
+
+import pytest
+
+from core.widgets.services.komorebi.pipe_protocol import (
+    ConnectionState,
+    KomorebiConnection,
+    KomorebiMessageFramer,
+)
+
+
+def notification(index: int) -> dict:
+    return {"event": {"type": "FocusChange", "content": index}, "state": {"monitors": {"elements": [], "focused": 0}}}
+
+
+def stream_of(*messages: dict) -> io.BytesIO:
+    return io.BytesIO(b"".join(json.dumps(message).encode("utf-8") + b"\n" for message in messages))
+
+
+def read_all(framer: KomorebiMessageFramer, stream: io.BufferedIOBase, chunk_size: int) -> list[dict]:
+    received = []
+    while chunk := stream.read(chunk_size):
+        received.extend(framer.feed(chunk))
+    return received
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096])
+def test_messages_split_across_reads(chunk_size):
+    messages = [notification(index) for index in range(20)]
+    assert read_all(KomorebiMessageFramer(), stream_of(*messages), chunk_size) == messages
+
+
+def test_several_messages_in_one_read():
+    messages = [notification(index) for index in range(3)]
+    assert KomorebiMessageFramer().feed(stream_of(*messages).getvalue()) == messages
+
+
+def test_partial_message_is_kept_until_completed():
+    framer = KomorebiMessageFramer()
+    data = stream_of(notification(1)).getvalue()
+    assert framer.feed(data[:10]) == []
+    assert framer.feed(data[10:-1]) == []
+    assert framer.feed(data[-1:]) == [notification(1)]
+
+
+def test_multibyte_character_split_across_reads():
+    message = {"event": {"type": "TitleUpdate"}, "state": {"title": "naïve — 日本語"}}
+    data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+    split = data.index("日".encode()) + 1
+    framer = KomorebiMessageFramer()
+    assert framer.feed(data[:split]) == []
+    assert framer.feed(data[split:]) == [message]
+
+
+def test_end_of_message_without_newline():
+    framer = KomorebiMessageFramer()
+    data = json.dumps(notification(1)).encode("utf-8")
+    assert framer.feed(data[:5]) == []
+    # Pipe read ended in the middle of the JSON document
+    assert framer.end_of_message() == []
+    assert framer.feed(data[5:]) == []
+    assert framer.end_of_message() == [notification(1)]
+    assert framer.end_of_message() == []
+
+
+def test_invalid_and_blank_lines_are_skipped():
+    framer = KomorebiMessageFramer()
+    data = b"\n{not json}\n[1, 2]\n" + stream_of(notification(2)).getvalue()
+    assert framer.feed(data) == [notification(2)]
+
+
+def test_oversized_message_is_discarded():
+    framer = KomorebiMessageFramer(max_buffer_size=1024)
+    assert framer.feed(b'{"state": "' + b"x" * 2048) == []
+    # The rest of the oversized message is dropped with its terminating line
+    assert framer.feed(b'"}\n') == []
+    assert framer.feed(stream_of(notification(3)).getvalue()) == [notification(3)]
+
+
+def test_complete_messages_larger_than_the_limit_are_delivered():
+    framer = KomorebiMessageFramer(max_buffer_size=64)
+    message = {"state": "x" * 256}
+    assert framer.feed(stream_of(message).getvalue()) == [message]
+
+
+def test_reset_drops_buffered_data():
+    framer = KomorebiMessageFramer()
+    framer.feed(b'{"event": ')
+    framer.reset()
+    assert framer.feed(stream_of(notification(4)).getvalue()) == [notification(4)]
+
+
+def test_backoff_grows_up_to_the_limit():
+    connection = KomorebiConnection(initial_delay=1.0, max_delay=10.0, factor=2.0)
+    delays = []
+    for _ in range(6):
+        connection.connecting()
+        delays.append(connection.disconnected())
+    assert delays == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+    assert connection.state is ConnectionState.BACKOFF
+
+
+def test_backoff_resets_after_a_connection():
+    connection = KomorebiConnection(initial_delay=0.5, max_delay=30.0, factor=3.0)
+    assert [connection.disconnected() for _ in range(3)] == [0.5, 1.5, 4.5]
+    connection.connecting()
+    connection.connected()
+    assert connection.state is ConnectionState.CONNECTED
+    assert connection.disconnected() == 0.5
+
+
+def test_stop_ends_the_reconnect_cycle():
+    connection = KomorebiConnection()
+    connection.stop()
+    assert not connection.running
+    assert connection.disconnected() is None
+    connection.connecting()
+    connection.connected()
+    assert connection.state is ConnectionState.STOPPED
@@ -0,0 +1,175 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.widgets.services.komorebi.state_diff import (
+    KomorebiStateDiffer,
+    StateChangeKind,
+    StateChangeSet,
+    diff_states,
+    summarize_state,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PRIMARY = 65537
+SECONDARY = 131073
+
+
+def load_state(name: str) -> dict:
+    return json.loads((FIXTURES / f"{name}.json").read_text(encoding="utf-8"))
+
+
+def diff(old: str, new: str) -> StateChangeSet:
+    return diff_states(summarize_state(load_state(old)), summarize_state(load_state(new)))
+
+
+def kinds(changes: StateChangeSet) -> list[StateChangeKind]:
+    return [change.kind for change in changes.changes]
+
+
+def test_identical_states_have_no_changes():
+    assert not diff("connected", "connected")
+
+
+def test_title_change_is_not_structural():
+    # Title updates are handled by the TitleUpdate event, not by the differ
+    assert not diff("connected", "title_changed")
+
+
+def test_summary_counts_tiled_windows_per_workspace():
+    summary = summarize_state(load_state("connected"))
+    assert [monitor.monitor_id for monitor in summary.monitors] == [PRIMARY, SECONDARY]
+    assert [len(ws.windows) for ws in summary.monitors[0].workspaces] == [2, 1, 0]
+    assert summary.monitors[0].focused_workspace == 0
+
+
+def test_workspace_added():
+    changes = diff("connected", "workspace_added")
+    assert kinds(changes) == [StateChangeKind.WORKSPACE_ADDED]
+    (change,) = changes.changes
+    assert (change.monitor_id, change.workspace_index, change.new) == (PRIMARY, 3, "notes")
+
+
+def test_workspace_removed():
+    changes = diff("connected", "workspace_removed")
+    assert kinds(changes) == [StateChangeKind.WORKSPACE_REMOVED]
+    (change,) = changes.changes
+    assert (change.monitor_id, change.workspace_index, change.old) == (PRIMARY, 2, "chat")
+
+
+def test_workspace_renamed():
+    changes = diff("connected", "workspace_renamed")
+    assert kinds(changes) == [StateChangeKind.WORKSPACE_RENAMED]
+    (change,) = changes.changes
+    assert (change.workspace_index, change.old, change.new) == (1, "web", "browser")
+
+
+def test_workspace_focus_changed():
+    changes = diff("connected", "workspace_focused")
+    assert kinds(changes) == [StateChangeKind.WORKSPACE_FOCUS_CHANGED]
+    assert changes.workspace_indexes(StateChangeKind.WORKSPACE_FOCUS_CHANGED, monitor_id=PRIMARY) == {1}
+    assert not changes.has(StateChangeKind.WORKSPACE_FOCUS_CHANGED, monitor_id=SECONDARY)
+
+
+def test_monitor_focus_changed_is_global():
+    changes = diff("connected", "monitor_focused")
+    assert kinds(changes) == [StateChangeKind.MONITOR_FOCUS_CHANGED]
+    (change,) = changes.changes
+    assert change.monitor_id is None and (change.old, change.new) == (0, 1)
+    assert changes.for_monitor(SECONDARY)
+
+
+def test_layout_changed():
+    changes = diff("connected", "layout_changed")
+    assert kinds(changes) == [StateChangeKind.LAYOUT_CHANGED]
+    (change,) = changes.changes
+    assert (change.workspace_index, change.old, change.new) == (0, {"Default": "BSP"}, {"Default": "Columns"})
+
+
+def test_window_count_changed():
+    changes = diff("connected", "window_opened")
+    assert kinds(changes) == [StateChangeKind.WINDOW_COUNT_CHANGED, StateChangeKind.WINDOWS_CHANGED]
+    count = changes.of(StateChangeKind.WINDOW_COUNT_CHANGED)[0]
+    assert (count.workspace_index, count.old, count.new) == (1, 1, 2)
+    closed = diff("window_opened", "connected")
+    assert closed.of(StateChangeKind.WINDOW_COUNT_CHANGED)[0].new == 1
+
+
+def test_window_moved_between_containers_keeps_count():
+    state = load_state("connected")
+    containers = state["monitors"]["elements"][0]["workspaces"]["elements"][0]["containers"]["elements"]
+    containers.reverse()
+    changes = diff_states(summarize_state(load_state("connected")), summarize_state(state))
+    assert kinds(changes) == [StateChangeKind.WINDOWS_CHANGED]
+
+
+def test_changes_are_scoped_to_their_monitor():
+    changes = diff("connected", "workspace_added")
+    assert changes.for_monitor(PRIMARY)
+    assert not changes.for_monitor(SECONDARY)
+
+
+def test_float_override_and_pause():
+    state = load_state("connected")
+    state["float_override"] = True
+    state["is_paused"] = True
+    changes = diff_states(summarize_state(load_state("connected")), summarize_state(state))
+    assert kinds(changes) == [StateChangeKind.FLOAT_OVERRIDE_CHANGED, StateChangeKind.PAUSE_CHANGED]
+
+
+def test_disconnected_monitor_reports_its_workspaces_removed():
+    state = load_state("connected")
+    del state["monitors"]["elements"][1]
+    changes = diff_states(summarize_state(load_state("connected")), summarize_state(state))
+    removed = changes.of(StateChangeKind.WORKSPACE_REMOVED, monitor_id=SECONDARY)
+    assert [(change.workspace_index, change.old) for change in removed] == [(0, "music"), (1, "misc")]
+
+
+def test_first_update_reports_everything_added():
+    changes = KomorebiStateDiffer().update(load_state("connected"))
+    assert changes.has(StateChangeKind.MONITOR_FOCUS_CHANGED)
+    assert changes.workspace_indexes(StateChangeKind.WORKSPACE_ADDED, monitor_id=PRIMARY) == {0, 1, 2}
+    assert changes.workspace_indexes(StateChangeKind.WORKSPACE_ADDED, monitor_id=SECONDARY) == {0, 1}
+
+
+def test_differ_tracks_previous_state():
+    differ = KomorebiStateDiffer()
+    differ.reset(load_state("connected"))
+    assert kinds(differ.update(load_state("workspace_focused"))) == [StateChangeKind.WORKSPACE_FOCUS_CHANGED]
+    assert not differ.update(load_state("workspace_focused"))
+    assert kinds(differ.update(load_state("connected"))) == [StateChangeKind.WORKSPACE_FOCUS_CHANGED]
+
+
+def test_widget_created_after_connect_sees_no_changes_for_its_monitor():
+    # The differ was reset on connect, so a later event that only touches another monitor
+    # carries nothing for a widget that has never seen the state
+    differ = KomorebiStateDiffer()
+    differ.reset(load_state("connected"))
+    state = load_state("connected")
+    state["monitors"]["elements"][1]["workspaces"]["focused"] = 1
+    changes = differ.update(state)
+    assert changes
+    assert not changes.for_monitor(PRIMARY)
+
+
+def test_widget_created_after_connect_syncs_from_full_state():
+    pytest.importorskip("win32gui")
+    from core.widgets.komorebi.workspaces import WorkspaceWidget
+
+    widget = SimpleNamespace(
+        _screen_hwnd=None,
+        _workspace_focus_events=[],
+        _update_komorebi_state=MagicMock(return_value=True),
+        _sync_workspace_buttons=MagicMock(),
+        _update_float_override_label=MagicMock(),
+        _apply_state_changes=MagicMock(),
+        _event_service=MagicMock(),
+    )
+    state = load_state("connected")
+    WorkspaceWidget._on_komorebi_update_event(widget, {"type": "FocusChange"}, state, StateChangeSet())
+    widget._update_komorebi_state.assert_called_once_with(state)
+    widget._sync_workspace_buttons.assert_called_once_with()
+    widget._apply_state_changes.assert_not_called()
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from PyQt6.QtGui import QColor, QImage
+
+pytest.importorskip("win32gui")
+
+from core.utils.disk_cache import DiskCache  # noqa: E402
+from core.widgets.services.launchpad.icon_cache import ScaledIconCache  # noqa: E402
+from core.widgets.yasb import launchpad  # noqa: E402
+from core.widgets.yasb.launchpad import IconLoadWorker, LaunchpadWidget  # noqa: E402
+
+SIZE = 48
+
+
+@pytest.fixture
+def icons(tmp_path, monkeypatch, qapp):
+    monkeypatch.setattr(ScaledIconCache, "_shared", ScaledIconCache(DiskCache("icons", ".png", directory=tmp_path)))
+    monkeypatch.setattr(launchpad, "_FAILED_ICONS", set())
+    monkeypatch.setattr(launchpad, "_ICON_CACHE", {})
+    good = tmp_path / "good.png"
+    image = QImage(256, 256, QImage.Format.Format_ARGB32)
+    image.fill(QColor("red"))
+    image.save(str(good))
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not a png")
+    return str(good), str(broken)
+
+
+def run_worker(paths: list[str]) -> tuple[list[str], list[str]]:
+    worker = IconLoadWorker([(path, SIZE, 1.0) for path in paths])
+    loaded, failed = [], []
+    worker.icon_loaded.connect(lambda path, image: loaded.append(path))
+    worker.icon_failed.connect(failed.append)
+    # Run on this thread so the signals are delivered directly
+    worker.run()
+    return loaded, failed
+
+
+def tile(icon_path: str) -> SimpleNamespace:
+    return SimpleNamespace(app_data={"icon": icon_path}, _icon_loaded=False, icon_label=MagicMock())
+
+
+def host(tiles: list[SimpleNamespace]) -> SimpleNamespace:
+    return SimpleNamespace(
+        _launchpad_popup=object(),
+        _tile_height=0,
+        _app_icon_size=SIZE,
+        _dpr=1.0,
+        _app_tiles={str(index): tile for index, tile in enumerate(tiles)},
+        _start_background_loading=MagicMock(),
+    )
+
+
+def test_worker_reports_icons_that_cannot_be_loaded(icons):
+    good, broken = icons
+    assert run_worker([good, broken]) == ([good], [broken])
+
+
+def test_failed_icons_are_not_requested_again(icons):
+    good, broken = icons
+    tiles = [tile(good), tile(broken), tile(broken)]
+    widget = host(tiles)
+
+    LaunchpadWidget._request_tile_icons(widget, tiles)
+    widget._start_background_loading.assert_called_once_with([(good, SIZE, 1.0), (broken, SIZE, 1.0)])
+
+    LaunchpadWidget._on_background_icon_failed(widget, broken)
+    assert [t._icon_loaded for t in tiles] == [False, True, True]
+
+    widget._start_background_loading.reset_mock()
+    LaunchpadWidget._request_tile_icons(widget, tiles)
+    widget._start_background_loading.assert_called_once_with([(good, SIZE, 1.0)])
+
+
+def test_new_tiles_skip_failed_icons(icons):
+    _, broken = icons
+    widget = host([])
+    LaunchpadWidget._on_background_icon_failed(widget, broken)
+    new_tile = tile(broken)
+    LaunchpadWidget._load_app_icon(widget, new_tile)
+    assert new_tile._icon_loaded
+    new_tile.icon_label.setText.assert_called_once_with("")
@@ -0,0 +1,155 @@
+import functools
+import random
+
+import pytest
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap
+
+pytest.importorskip("win32gui")
+
+from core.widgets.services.control_center.api.screenshot import editor  # noqa: E402
+from core.widgets.services.control_center.api.screenshot.editor import (  # noqa: E402
+    ArrowOp,
+    BlurOp,
+    CircleOp,
+    ClearOp,
+    CropOp,
+    EditorCanvas,
+    FreehandOp,
+    RectOp,
+)
+
+WIDTH, HEIGHT = 64, 48
+
+
+@functools.cache
+def original_image() -> QImage:
+    image = QImage(WIDTH, HEIGHT, QImage.Format.Format_ARGB32_Premultiplied)
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            image.setPixelColor(x, y, QColor((x * 4) % 256, (y * 5) % 256, (x * y) % 256))
+    return image
+
+
+def original() -> QPixmap:
+    return QPixmap.fromImage(original_image())
+
+
+def random_op(rnd: random.Random):
+    def point():
+        return rnd.randrange(WIDTH), rnd.randrange(HEIGHT)
+
+    color = rnd.choice(["#ff453a", "#30d158", "#ffd60a"])
+    kind = rnd.random()
+    if kind < 0.35:
+        points = tuple(point() for _ in range(rnd.randrange(1, 5)))
+        return FreehandOp(rnd.choice(["pen", "highlight"]), points, color, rnd.randrange(1, 6))
+    if kind < 0.55:
+        return rnd.choice([ArrowOp, RectOp, CircleOp])(point(), point(), color, rnd.randrange(1, 4))
+    if kind < 0.75:
+        return BlurOp(*point(), rnd.randrange(4, 20), rnd.randrange(4, 20), rnd.randrange(1, 8))
+    if kind < 0.9:
+        return CropOp(rnd.randrange(4), rnd.randrange(4), WIDTH - rnd.randrange(8), HEIGHT - rnd.randrange(8))
+    return ClearOp()
+
+
+def image_of(base: QPixmap, layer: QPixmap) -> QImage:
+    out = QImage(base.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    out.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(out)
+    painter.drawPixmap(0, 0, base)
+    painter.drawPixmap(0, 0, layer)
+    painter.end()
+    return out
+
+
+class Model:
+    """The history as a plain list of ops, rendered by replaying all of them on a fresh canvas."""
+
+    def __init__(self, history_max: int):
+        self.history_max = history_max
+        self.folded = []
+        self.ops = []
+        self.redo = []
+        self.canvas = EditorCanvas()
+        self.renders: dict[tuple, QImage] = {}
+
+    def commit(self, op):
+        self.ops.append(op)
+        self.redo.clear()
+        self._fold()
+
+    def undo(self):
+        if self.ops:
+            self.redo.append(self.ops.pop())
+            if len(self.redo) > self.history_max:
+                self.redo.pop(0)
+
+    def redo_op(self):
+        if self.redo:
+            self.ops.append(self.redo.pop())
+            self._fold()
+
+    def _fold(self):
+        if len(self.ops) > self.history_max:
+            self.folded.append(self.ops.pop(0))
+
+    def render(self, ops: list) -> QImage:
+        key = tuple(ops)
+        if key not in self.renders:
+            self.canvas.set_image(original())
+            for op in ops:
+                self.canvas._apply_op(op)
+            self.renders[key] = image_of(self.canvas._base, self.canvas._layer)
+        return self.renders[key]
+
+
+@pytest.mark.parametrize(
+    ("memory_max", "seed"),
+    [(editor._CHECKPOINT_MEMORY_MAX, 1), (3 * WIDTH * HEIGHT * 4, 2)],
+    ids=["unbounded", "tight-budget"],
+)
+def test_history_matches_a_full_replay(qapp, monkeypatch, memory_max, seed):
+    monkeypatch.setattr(editor, "_HISTORY_MAX", 12)
+    monkeypatch.setattr(editor, "_CHECKPOINT_INTERVAL", 3)
+    monkeypatch.setattr(editor, "_CHECKPOINT_MEMORY_MAX", memory_max)
+    rnd = random.Random(seed)
+    model = Model(12)
+    canvas = EditorCanvas()
+    canvas.set_image(original())
+
+    for step in range(150):
+        action = rnd.random()
+        if action < 0.5:
+            op = random_op(rnd)
+            canvas._commit_op(op, apply=True)
+            model.commit(op)
+        elif action < 0.8:
+            canvas.undo()
+            model.undo()
+        else:
+            canvas.redo()
+            model.redo_op()
+
+        assert canvas._ops == model.ops and canvas._redo_ops == model.redo, step
+        assert canvas.composite().toImage() == model.render(model.folded + model.ops), step
+        assert 0 in canvas._checkpoints
+        assert sum(cp.nbytes for cp in canvas._checkpoints.values()) <= max(memory_max, canvas._checkpoints[0].nbytes)
+        reachable = model.ops + model.redo[::-1]
+        for k, checkpoint in canvas._checkpoints.items():
+            expected = model.render(model.folded + reachable[:k])
+            assert image_of(checkpoint.base, checkpoint.layer) == expected, (step, k)
+    canvas.deleteLater()
+    model.canvas.deleteLater()
+
+
+def test_full_history_keeps_the_checkpoint_interval(qapp, monkeypatch):
+    monkeypatch.setattr(editor, "_HISTORY_MAX", 12)
+    monkeypatch.setattr(editor, "_CHECKPOINT_INTERVAL", 3)
+    canvas = EditorCanvas()
+    canvas.set_image(original())
+    for index in range(60):
+        canvas._commit_op(FreehandOp("pen", ((index % WIDTH, 4), (index % WIDTH, 20)), "#ff453a", 2), apply=True)
+    # Folding the oldest op into the start of the history must not turn every new op into a checkpoint
+    assert sorted(canvas._checkpoints) == [0, 3, 6, 9, 12]
+    canvas.deleteLater()
@@ -0,0 +1,109 @@
+import pytest
+from PyQt6.QtCore import QPoint, QPointF, QRect, Qt
+from PyQt6.QtGui import QColor, QImage, QLinearGradient, QMouseEvent, QPainter, QPixmap, QRegion
+from PyQt6.QtWidgets import QWidget
+
+pytest.importorskip("win32gui")
+
+from core.widgets.services.control_center.api.screenshot.editor import EditorCanvas  # noqa: E402
+
+WIDTH, HEIGHT = 240, 160
+
+
+def capture() -> QPixmap:
+    pixmap = QPixmap(WIDTH, HEIGHT)
+    gradient = QLinearGradient(0, 0, WIDTH, HEIGHT)
+    gradient.setColorAt(0, QColor("#1e1e2e"))
+    gradient.setColorAt(1, QColor("#89b4fa"))
+    painter = QPainter(pixmap)
+    painter.fillRect(pixmap.rect(), gradient)
+    painter.end()
+    return pixmap
+
+
+class Screen:
+    """What the canvas shows when only the rects it asks to update are repainted."""
+
+    def __init__(self, canvas: EditorCanvas):
+        self.canvas = canvas
+        self.dirty: list[QRect] = []
+        self.image = self.full()
+        canvas.update = self._update
+
+    def _update(self, *args):
+        self.dirty.append(QRect(*args) if args else self.canvas.rect())
+
+    def full(self) -> QImage:
+        image = QImage(self.canvas.size(), QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        self.canvas.render(image, QPoint(), QRegion(), QWidget.RenderFlag(0))
+        return image
+
+    def repaint(self):
+        if self.image.size() != self.canvas.size():
+            # A resized widget is repainted as a whole
+            self.image = self.full()
+            self.dirty.clear()
+        for rect in self.dirty:
+            self.canvas.render(self.image, rect.topLeft(), QRegion(rect), QWidget.RenderFlag(0))
+        self.dirty.clear()
+
+
+def difference(a: QImage, b: QImage) -> int:
+    """Largest difference of a color channel between two images of the same size."""
+    if a == b:
+        return 0
+    pixels_a = a.convertToFormat(QImage.Format.Format_ARGB32).constBits().asstring(a.sizeInBytes())
+    pixels_b = b.convertToFormat(QImage.Format.Format_ARGB32).constBits().asstring(b.sizeInBytes())
+    return max(abs(x - y) for x, y in zip(pixels_a, pixels_b))
+
+
+def mouse(kind: QMouseEvent.Type, pos: QPoint, buttons=Qt.MouseButton.LeftButton) -> QMouseEvent:
+    button = Qt.MouseButton.LeftButton if kind != QMouseEvent.Type.MouseMove else Qt.MouseButton.NoButton
+    point = QPointF(pos)
+    return QMouseEvent(kind, point, point, button, buttons, Qt.KeyboardModifier.NoModifier)
+
+
+@pytest.fixture
+def canvas(qapp):
+    canvas = EditorCanvas()
+    canvas.set_image(capture())
+    canvas.stroke_width = 6
+    canvas.color = QColor("#ff453a")
+    yield canvas
+    canvas.deleteLater()
+
+
+DRAG = [QPoint(20 + step * 11, 30 + (step * 37) % 90) for step in range(16)]
+
+
+@pytest.mark.parametrize("tool", ["pen", "highlight", "arrow", "rect", "circle", "crop", "blur"])
+@pytest.mark.parametrize("zoom", [1.0, 1.5, 1.33, 0.75])
+def test_dirty_rect_repaint_matches_full_repaint(canvas, tool, zoom):
+    canvas.tool = tool
+    canvas.set_zoom(zoom)
+    screen = Screen(canvas)
+    # Smooth scaling under a clip rounds some pixels one step differently at fractional zoom
+    tolerance = 0 if zoom == 1.0 else 1
+
+    canvas.mousePressEvent(mouse(QMouseEvent.Type.MouseButtonPress, DRAG[0]))
+    screen.repaint()
+    for step, pos in enumerate(DRAG[1:], 1):
+        canvas.mouseMoveEvent(mouse(QMouseEvent.Type.MouseMove, pos))
+        screen.repaint()
+        assert difference(screen.image, screen.full()) <= tolerance, step
+
+    canvas.mouseReleaseEvent(mouse(QMouseEvent.Type.MouseButtonRelease, DRAG[-1], Qt.MouseButton.NoButton))
+    screen.repaint()
+    assert difference(screen.image, screen.full()) <= tolerance
+    assert canvas._ops
+
+
+def test_moves_only_repaint_around_the_stroke(canvas):
+    screen = Screen(canvas)
+    canvas.mousePressEvent(mouse(QMouseEvent.Type.MouseButtonPress, QPoint(50, 50)))
+    screen.repaint()
+    canvas.mouseMoveEvent(mouse(QMouseEvent.Type.MouseMove, QPoint(60, 55)))
+    (dirty,) = screen.dirty
+    assert dirty.contains(QRect(50, 50, 11, 6))
+    assert dirty.width() * dirty.height() < WIDTH * HEIGHT / 10
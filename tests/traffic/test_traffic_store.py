@@ -0,0 +1,153 @@
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from core.widgets.services.traffic import traffic_store
+from core.widgets.services.traffic.traffic_store import DAILY_HISTORY_DAYS, TrafficStore, roll_up
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def record(sent: int, recv: int, daily: dict | None = None) -> dict:
+    return {"session": [sent, recv], "daily": daily or {}, "monthly": {}}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return TrafficStore(tmp_path / "traffic", flush_interval=60, clock=clock)
+
+
+def fail(*args, **kwargs):
+    raise OSError("disk full")
+
+
+def test_write_and_load_round_trip(store):
+    assert store.load("Ethernet") == {}
+    assert store.write("Ethernet", record(1, 2))
+    assert store.load("Ethernet") == record(1, 2)
+    assert store.path("Ethernet").name == "yasb_traffic_ethernet.json"
+    assert store.path("auto").name == "yasb_traffic_system_auto.json"
+
+
+@pytest.mark.parametrize("target", ["replace", "fsync"])
+def test_failed_write_keeps_the_previous_file(store, monkeypatch, target):
+    store.write("Wi-Fi", record(1, 1))
+    monkeypatch.setattr(traffic_store.os, target, fail)
+    assert not store.write("Wi-Fi", record(2, 2))
+    monkeypatch.undo()
+    assert store.load("Wi-Fi") == record(1, 1)
+    # The next write replaces the leftover temporary file
+    assert store.write("Wi-Fi", record(3, 3))
+    assert store.load("Wi-Fi") == record(3, 3)
+    assert list(store.path("Wi-Fi").parent.iterdir()) == [store.path("Wi-Fi")]
+
+
+@pytest.mark.parametrize("target", ["replace", "fsync"])
+def test_failed_flush_requeues_the_record(store, clock, monkeypatch, target):
+    store.write("Wi-Fi", record(1, 1))
+    store.stage("Wi-Fi", record(2, 2))
+    monkeypatch.setattr(traffic_store.os, target, fail)
+    store.flush()
+    assert store.load("Wi-Fi") == record(1, 1)
+
+    monkeypatch.undo()
+    clock.now += 60
+    store.flush_if_due()
+    assert store.load("Wi-Fi") == record(2, 2)
+
+
+def test_requeue_does_not_override_a_newer_record(store, monkeypatch):
+    store.stage("Wi-Fi", record(1, 1))
+    staged = []
+
+    def write_and_stage(interface, data):
+        staged.append(data)
+        store.stage(interface, record(5, 5))
+        return False
+
+    monkeypatch.setattr(store, "write", write_and_stage)
+    store.flush()
+    monkeypatch.undo()
+    assert staged == [record(1, 1)]
+    store.flush()
+    assert store.load("Wi-Fi") == record(5, 5)
+
+
+def test_flush_waits_for_the_interval(store, clock):
+    store.stage("Ethernet", record(1, 1))
+    clock.now += 59
+    store.flush_if_due()
+    assert store.load("Ethernet") == {}
+    clock.now += 1
+    store.flush_if_due()
+    assert store.load("Ethernet") == record(1, 1)
+
+
+def test_flush_writes_every_pending_interface(store):
+    store.stage("Ethernet", record(1, 1))
+    store.stage("Wi-Fi", record(2, 2))
+    store.flush()
+    assert store.load("Ethernet") == record(1, 1)
+    assert store.load("Wi-Fi") == record(2, 2)
+
+
+def test_load_ignores_malformed_files(store):
+    path = store.path("Ethernet")
+    path.parent.mkdir(parents=True)
+    path.write_text("[1, 2]", encoding="utf-8")
+    assert store.load("Ethernet") == {}
+    path.write_text('{"daily"', encoding="utf-8")
+    assert store.load("Ethernet") == {}
+
+
+def test_roll_up_cutoff():
+    today = date(2026, 3, 15)
+    cutoff = today - timedelta(days=DAILY_HISTORY_DAYS)
+    daily = {
+        (cutoff - timedelta(days=2)).isoformat(): [1, 10],
+        (cutoff - timedelta(days=1)).isoformat(): [2, 20],
+        cutoff.isoformat(): [4, 40],
+        today.isoformat(): [8, 80],
+    }
+    monthly = {"2026-01": [100, 1000]}
+    roll_up(daily, monthly, today)
+    # The cutoff day itself is still kept as a daily total
+    assert daily == {cutoff.isoformat(): [4, 40], today.isoformat(): [8, 80]}
+    assert cutoff.isoformat() == "2026-01-12"
+    assert monthly == {"2026-01": [103, 1030]}
+
+
+def test_roll_up_across_months():
+    today = date(2026, 5, 1)
+    daily = {"2026-01-31": [1, 1], "2026-02-01": [2, 2], "2026-02-27": [3, 3], "2026-04-30": [4, 4]}
+    monthly = {}
+    roll_up(daily, monthly, today)
+    assert monthly == {"2026-01": [1, 1], "2026-02": [5, 5]}
+    assert daily == {"2026-04-30": [4, 4]}
+
+
+def test_write_rolls_up_old_days(store):
+    old = (date.today() - timedelta(days=DAILY_HISTORY_DAYS + 1)).isoformat()
+    recent = date.today().isoformat()
+    store.write("Ethernet", record(0, 0, {old: [5, 6], recent: [1, 2]}))
+    saved = json.loads(store.path("Ethernet").read_text(encoding="utf-8"))
+    assert saved["daily"] == {recent: [1, 2]}
+    assert saved["monthly"] == {old[:7]: [5, 6]}
+
+
+def test_write_is_compact(store):
+    store.write("Ethernet", record(1, 2))
+    assert os.path.getsize(store.path("Ethernet")) == len('{"session":[1,2],"daily":{},"monthly":{}}')
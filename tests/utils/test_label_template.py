@@ -0,0 +1,141 @@
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+import yaml
+
+from core.utils.label_template import DatetimeTemplate, compile_datetime_template, parse_label
+
+ROOT = Path(__file__).resolve().parents[2]
+LABEL_LINE = re.compile(r"^\s*label(?:_alt)?:\s*(([\"']).*\2)\s*$", re.MULTILINE)
+PLACEHOLDERS = ("icon", "alarm")
+NOW = datetime(2026, 3, 7, 9, 5, 4, tzinfo=timezone(timedelta(hours=2)))
+
+
+def documented_labels() -> list[str]:
+    labels = set()
+    for path in [ROOT / "README.md", *(ROOT / "docs").rglob("*.md")]:
+        for match in LABEL_LINE.finditer(path.read_text(encoding="utf-8")):
+            try:
+                labels.add(yaml.safe_load(f"label: {match.group(1)}")["label"])
+            except yaml.YAMLError:
+                continue
+    return sorted(labels)
+
+
+DOCUMENTED_LABELS = documented_labels()
+
+LABELS = [
+    *DOCUMENTED_LABELS,
+    "",
+    "   ",
+    "plain text",
+    "<span>\uf017</span>",
+    "<span class='icon-alt'>\uf017</span> {%H:%M}",
+    '<span class="a">x</span><span class="b">y</span>text<span>z</span>',
+    "  <span >  {icon}  </span>  {%H:%M}  <span>{alarm}</span>  ",
+    "<span>unclosed {%H:%M}",
+    "text </span> more",
+    '<span class="icon">a</span> <b>bold</b> <span>b</span>',
+]
+
+FORMATS = [
+    "{%H:%M}",
+    "\uf017 {%d-%m-%y %H:%M:%S}",
+    "{icon} {%H:%M}",
+    "{%H:%M} {alarm}",
+    "{alarm}{icon}",
+    "{icon}",
+    "plain",
+    "",
+    "{%H} and {%M}",
+    "{%a {icon} %b}",
+    "{{%H}}",
+    "{%Y}{alarm}{%m}",
+    "{%H:%M} {unknown}",
+    "{}",
+    "{",
+    "}",
+    "{%H:%M",
+    "%H:%M}",
+    "{%A, %B %d}",
+    "{%}",
+]
+
+VALUES = [
+    {"icon": "\uf185", "alarm": ""},
+    {"icon": "", "alarm": "\uf0f3"},
+    {"icon": "{", "alarm": "}"},
+    {"icon": "a\nb", "alarm": "{%M}"},
+    {"icon": "}", "alarm": "{%S"},
+    {},
+]
+
+
+def parse_label_reference(content: str) -> list[tuple[str, bool, str]]:
+    """How widgets split their label format before labels were compiled."""
+    label_parts = re.split(r"(<span.*?>.*?</span>)", content)
+    label_parts = [part for part in label_parts if part]
+    parts = []
+    for part in label_parts:
+        part = part.strip()
+        if not part:
+            continue
+        if "<span" in part and "</span>" in part:
+            class_name = re.search(r'class=(["\'])([^"\']+?)\1', part)
+            class_result = class_name.group(2) if class_name else "icon"
+            parts.append((re.sub(r"<span.*?>|</span>", "", part).strip(), True, class_result))
+        else:
+            parts.append((part, False, "label"))
+    return parts
+
+
+def render_reference(part: str, now: datetime, values: dict[str, str]) -> str:
+    """How the clock rendered a text part before its template was compiled."""
+    for name in PLACEHOLDERS:
+        if f"{{{name}}}" in part:
+            part = part.replace(f"{{{name}}}", values.get(name, ""))
+    try:
+        datetime_format_search = re.search(r"\{(.*)}", part)
+        datetime_format_str = datetime_format_search.group()
+        datetime_format = datetime_format_search.group(1)
+        return part.replace(datetime_format_str, now.strftime(datetime_format))
+    except Exception:
+        return part
+
+
+def test_docs_have_labels():
+    assert len(DOCUMENTED_LABELS) > 20
+
+
+@pytest.mark.parametrize("content", LABELS)
+def test_parse_label_matches_reference(content):
+    parsed = [(part.text, part.is_icon, part.class_name) for part in parse_label(content)]
+    assert parsed == parse_label_reference(content)
+
+
+@pytest.mark.parametrize("text", FORMATS)
+@pytest.mark.parametrize("values", VALUES, ids=lambda values: repr(values))
+def test_template_matches_reference(text, values):
+    template = DatetimeTemplate(text, PLACEHOLDERS)
+    assert template.render(NOW, values) == render_reference(text, NOW, values)
+
+
+@pytest.mark.parametrize("content", DOCUMENTED_LABELS)
+def test_documented_labels_render_like_reference(content):
+    values = {"icon": "\uf185", "alarm": "\uf0f3"}
+    for part in parse_label(content):
+        if part.is_icon:
+            continue
+        template = compile_datetime_template(part.text, PLACEHOLDERS)
+        for minute in range(0, 24 * 60, 97):
+            now = NOW + timedelta(minutes=minute)
+            assert template.render(now, values) == render_reference(part.text, now, values)
+
+
+def test_locale_is_only_needed_for_localized_fields():
+    assert not DatetimeTemplate("{%H:%M:%S}", PLACEHOLDERS).uses_locale
+    assert DatetimeTemplate("{%a %d %b}", PLACEHOLDERS).uses_locale
+    assert DatetimeTemplate("{%H {icon}}", PLACEHOLDERS).uses_locale
+    assert not DatetimeTemplate("{icon} plain", PLACEHOLDERS).uses_locale
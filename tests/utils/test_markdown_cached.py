@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+from core.utils.markdown import md_to_html, md_to_html_cached, preprocess_readme, split_markdown_blocks
+
+ROOT = Path(__file__).resolve().parents[2]
+DOCS = sorted([ROOT / "README.md", *(ROOT / "docs").glob("*.md"), *(ROOT / "docs" / "widgets").glob("*.md")])
+
+ALERT_STYLES = {
+    "note": ("#1f6feb", "Note"),
+    "warning": ("#d29922", "Warning"),
+}
+
+EDGE_CASES = {
+    "open_fence": "Intro\n\n```python\ndef f():\n\n    return 1\n",
+    "fence_with_blank_lines": "```\na\n\n\nb\n```\n\nafter",
+    "unclosed_then_closed_fence": "```js\nlet a = 1\n\n```\n\n```\nstill open\n\ntext",
+    "nested_lists": "- one\n  - one.a\n    - one.a.i\n  - one.b\n- two\n\n1. first\n   1. nested\n2. second\n",
+    "list_split_by_blank_line": "- a\n\n- b\n\n  continued\n- c",
+    "raw_html_block": "<details>\n<summary>More</summary>\n\nHidden **text**\n\n</details>\n\nafter",
+    "nested_raw_html": "<table>\n<tr><td>\n\n<table>\n<tr><td>inner</td></tr>\n</table>\n\n</td></tr>\n</table>\n",
+    "unclosed_raw_html": "<details>\n\nnever closed\n\n# heading",
+    "html_inside_fence": "```html\n<table>\n\n<tr>\n```\n\n</table>",
+    "table": "| a | b |\n|---|:-:|\n| `x` | **y** |\n\n| c |\n|---|\n| d |",
+    "blockquote_alert": "> [!NOTE]\n> Useful\n\n> [!WARNING]\n> Careful\n>\n> twice",
+    "headings_and_rules": "# Title #\n\ntext\n***\n## Sub\n---\n",
+    "inline_code_with_fence_chars": "Use `` ` `` and `a```b`\n\n```\ncode\n```",
+    "crlf": "# Title\r\n\r\nline one\r\nline two\r\n\r\n- item\r\n",
+    "blank_runs": "\n\n\na\n \t\n\n\nb\n\n\n",
+    "empty": "",
+}
+
+
+@pytest.mark.parametrize("path", DOCS, ids=lambda path: path.name)
+def test_docs_match_md_to_html(path):
+    text = path.read_text(encoding="utf-8")
+    assert md_to_html_cached(text) == md_to_html(text)
+    readme = preprocess_readme(text)
+    assert md_to_html_cached(readme, alert_styles=ALERT_STYLES) == md_to_html(readme, alert_styles=ALERT_STYLES)
+
+
+@pytest.mark.parametrize("text", EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_edge_cases_match_md_to_html(text):
+    assert md_to_html_cached(text) == md_to_html(text)
+    assert md_to_html_cached(text, alert_styles=ALERT_STYLES) == md_to_html(text, alert_styles=ALERT_STYLES)
+
+
+@pytest.mark.parametrize("text", EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_blocks_cover_the_source(text):
+    assert "".join(split_markdown_blocks(text)) == text
+
+
+def test_edited_document_matches_md_to_html():
+    text = (ROOT / "README.md").read_text(encoding="utf-8")
+    md_to_html_cached(text)
+    edited = text.replace("\n\n", "\n\nEdited *paragraph*\n\n", 1)
+    assert md_to_html_cached(edited) == md_to_html(edited)
+    # Prefixes of the document leave fences and HTML blocks half-open
+    for cut in range(0, len(text), len(text) // 25 or 1):
+        assert md_to_html_cached(text[:cut]) == md_to_html(text[:cut])
+
+
+def test_alert_styles_are_part_of_the_cache_key():
+    text = "> [!NOTE]\n> Styled"
+    plain = md_to_html_cached(text)
+    styled = md_to_html_cached(text, alert_styles=ALERT_STYLES)
+    assert plain == md_to_html(text)
+    assert styled == md_to_html(text, alert_styles=ALERT_STYLES)
@@ -0,0 +1,212 @@
+import pytest
+from PyQt6.QtCore import QEvent
+from PyQt6.QtWidgets import QApplication, QWidget
+
+from core.utils.tick_scheduler import TICK_SLACK_MS, TickScheduler
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def delete(obj) -> None:
+    obj.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(qapp, clock):
+    scheduler = TickScheduler(clock=clock, cost_clock=clock)
+    yield scheduler
+    delete(scheduler)
+
+
+@pytest.fixture
+def bar(qapp):
+    bar = QWidget()
+    bar.setGeometry(0, 0, 400, 30)
+    bar.show()
+    yield bar
+    delete(bar)
+
+
+def widget_on(bar: QWidget) -> QWidget:
+    widget = QWidget(bar)
+    widget.show()
+    return widget
+
+
+def test_delay_lands_just_after_the_interval_boundary(scheduler, clock):
+    clock.now = 1_000_000.250
+    assert scheduler.next_delay_ms(1000) == 750 + TICK_SLACK_MS
+    assert scheduler.next_delay_ms(200) == 150 + TICK_SLACK_MS
+    clock.now = 1_000_001.000
+    assert scheduler.next_delay_ms(1000) == 1000 + TICK_SLACK_MS
+
+
+def test_subscriptions_with_the_same_interval_share_a_bucket(scheduler, clock):
+    calls = []
+    clock.now = 1_000_000.400
+    scheduler.subscribe(1000, lambda: calls.append("a"))
+    clock.now = 1_000_000.900
+    scheduler.subscribe(1000, lambda: calls.append("b"))
+    scheduler.subscribe(500, lambda: calls.append("c"))
+    assert sorted(scheduler._buckets) == [500, 1000]
+    # Both one-second callbacks run on the same aligned tick, whenever they subscribed
+    bucket = scheduler._buckets[1000]
+    assert bucket.timer.isActive()
+    assert bucket.timer.remainingTime() <= 600 + TICK_SLACK_MS
+    scheduler.tick(1000)
+    assert calls == ["a", "b"]
+
+
+def test_tick_rearms_for_the_next_boundary(scheduler, clock):
+    scheduler.subscribe(1000, lambda: None)
+    clock.now = 1_000_000.003
+    scheduler.tick(1000)
+    assert scheduler._buckets[1000].timer.remainingTime() > 990
+
+
+def test_invalid_interval_is_rejected(scheduler):
+    with pytest.raises(ValueError):
+        scheduler.subscribe(0, lambda: None)
+
+
+def test_ticks_pause_while_the_bar_is_hidden(scheduler, bar):
+    widget = widget_on(bar)
+    calls = []
+    subscription = scheduler.subscribe(1000, lambda: calls.append(1), owner=widget)
+    scheduler.tick(1000)
+    bar.hide()
+    scheduler.tick(1000)
+    scheduler.tick(1000)
+    assert calls == [1]
+    assert subscription.missed
+    assert (subscription.stats.calls, subscription.stats.skipped) == (1, 2)
+
+
+def test_widget_that_hid_itself_keeps_ticking(scheduler, bar):
+    widget = widget_on(bar)
+    calls = []
+    scheduler.subscribe(1000, lambda: calls.append(1), owner=widget)
+    widget.hide()
+    scheduler.tick(1000)
+    assert calls == [1]
+
+
+def test_bar_moved_off_screen_pauses(scheduler, bar):
+    widget = widget_on(bar)
+    calls = []
+    scheduler.subscribe(1000, lambda: calls.append(1), owner=widget)
+    screen = bar.screen().geometry()
+    bar.move(screen.right() + 1000, screen.bottom() + 1000)
+    scheduler.tick(1000)
+    assert calls == []
+
+
+def test_missed_tick_runs_once_when_the_bar_is_shown(scheduler, bar):
+    widget = widget_on(bar)
+    calls = []
+    subscription = scheduler.subscribe(1000, lambda: calls.append(1), owner=widget)
+    bar.hide()
+    scheduler.tick(1000)
+    scheduler.tick(1000)
+    bar.show()
+    QApplication.sendPostedEvents()
+    QApplication.processEvents()
+    assert calls == [1]
+    assert not subscription.missed
+    # A show without missed ticks does not run the callback again
+    scheduler.eventFilter(widget, QEvent(QEvent.Type.Show))
+    QApplication.processEvents()
+    assert calls == [1]
+
+
+def test_unsubscribe_removes_the_empty_bucket(scheduler):
+    subscription = scheduler.subscribe(1000, lambda: None)
+    scheduler.unsubscribe(subscription)
+    assert 1000 not in scheduler._buckets
+    # Unsubscribing twice is harmless
+    scheduler.unsubscribe(subscription)
+    scheduler.unsubscribe(None)
+
+
+def test_resubscribing_creates_a_new_bucket(scheduler, bar):
+    widget = widget_on(bar)
+    calls = []
+    first = scheduler.subscribe(1000, lambda: calls.append("first"), owner=widget)
+    old_bucket = scheduler._buckets[1000]
+    scheduler.unsubscribe(first)
+    assert first.owner is None
+    assert id(widget) not in scheduler._owners
+    second = scheduler.subscribe(1000, lambda: calls.append("second"), owner=widget)
+    assert scheduler._buckets[1000] is not old_bucket
+    assert scheduler._buckets[1000].timer.isActive()
+    assert scheduler._owners[id(widget)] == [second]
+    scheduler.tick(1000)
+    assert calls == ["second"]
+    # The owner's event filter was installed again, so it still catches up after a hidden bar
+    bar.hide()
+    scheduler.tick(1000)
+    bar.show()
+    QApplication.processEvents()
+    assert calls == ["second", "second"]
+
+
+def test_unsubscribe_during_tick(scheduler):
+    calls = []
+    subscriptions = []
+    subscriptions.append(scheduler.subscribe(1000, lambda: scheduler.unsubscribe(subscriptions[1])))
+    subscriptions.append(scheduler.subscribe(1000, lambda: calls.append(1)))
+    scheduler.tick(1000)
+    assert calls == []
+    assert scheduler._buckets[1000].subscriptions == [subscriptions[0]]
+
+
+def test_destroyed_owner_is_unsubscribed(scheduler, bar):
+    widget = widget_on(bar)
+    scheduler.subscribe(1000, lambda: None, owner=widget)
+    scheduler.subscribe(500, lambda: None, owner=widget)
+    delete(widget)
+    assert scheduler._buckets == {}
+    assert scheduler._owners == {}
+
+
+def test_costs_are_recorded_per_callback(scheduler, clock):
+    def slow():
+        clock.now += 0.030
+
+    def fast():
+        clock.now += 0.001
+
+    scheduler.subscribe(1000, slow, name="slow")
+    scheduler.subscribe(1000, slow, name="slow")
+    scheduler.subscribe(1000, fast, name="fast")
+    scheduler.tick(1000)
+    slow_stats, fast_stats = scheduler.worst_offenders(2)
+    assert (slow_stats.name, slow_stats.calls) == ("slow", 2)
+    assert slow_stats.total_ms == pytest.approx(60)
+    assert slow_stats.max_ms == pytest.approx(30)
+    assert (fast_stats.name, fast_stats.mean_ms) == ("fast", pytest.approx(1))
+
+
+def test_failing_callback_does_not_stop_the_bucket(scheduler):
+    calls = []
+
+    def fail():
+        raise ValueError("boom")
+
+    scheduler.subscribe(1000, fail)
+    scheduler.subscribe(1000, lambda: calls.append(1))
+    scheduler.tick(1000)
+    assert calls == [1]
+    assert scheduler._buckets[1000].timer.isActive()
@@ -0,0 +1,130 @@
+import pytest
+
+pytest.importorskip("win32gui")
+
+from PIL import Image  # noqa: E402
+
+from core.utils.singleton import Singleton  # noqa: E402
+from core.utils.win32 import icon_cache  # noqa: E402
+from core.utils.win32.icon_cache import IconCache  # noqa: E402
+
+CODE = {"name": "Code.exe", "pid": 100, "path": r"C:\Apps\Code.exe"}
+EXPLORER = {"name": "explorer.exe", "pid": 200, "path": r"C:\Windows\explorer.exe"}
+
+
+class FakeWindows:
+    """Stands in for the Win32 lookups of the cache and counts how often each one runs."""
+
+    def __init__(self, monkeypatch):
+        self.processes = {1: CODE, 2: CODE, 3: EXPLORER}
+        self.process_lookups = 0
+        self.pid_lookups = 0
+        self.extractions = 0
+        monkeypatch.setattr(icon_cache, "get_process_info", self.get_process_info)
+        monkeypatch.setattr(icon_cache, "_window_pid", self.window_pid)
+        monkeypatch.setattr(icon_cache, "get_window_icon", self.get_window_icon)
+        monkeypatch.setattr(icon_cache, "get_aumid_for_window", lambda hwnd: None)
+
+    def get_process_info(self, hwnd):
+        self.process_lookups += 1
+        return self.processes[hwnd]
+
+    def window_pid(self, hwnd):
+        self.pid_lookups += 1
+        return self.processes[hwnd]["pid"]
+
+    def get_window_icon(self, hwnd):
+        self.extractions += 1
+        return Image.new("RGBA", (32, 32), (hwnd, 0, 0, 255))
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    return FakeWindows(monkeypatch)
+
+
+@pytest.fixture
+def cache(qapp, monkeypatch):
+    # A fresh instance instead of the process-wide one
+    monkeypatch.delitem(Singleton._instances, IconCache, raising=False)
+    return IconCache(max_entries=8)
+
+
+def test_windows_of_one_application_share_an_icon(cache, windows):
+    first = cache.window_icon(1, 16, 1.5)
+    assert cache.window_icon(2, 16, 1.5) is first
+    assert windows.extractions == 1
+    assert cache.window_icon(1, 16, 2.0) is not first
+    assert first.devicePixelRatio() == 1.5
+    assert first.width() == 24
+
+
+def test_known_windows_skip_the_process_lookup(cache, windows):
+    for _ in range(5):
+        cache.window_icon(1, 16, 1.0)
+    assert windows.process_lookups == 1
+    assert windows.pid_lookups == 4
+    assert cache.stats()["hits"] == 4
+
+
+def test_passed_process_skips_every_lookup(cache, windows):
+    for _ in range(3):
+        cache.window_icon(1, 16, 1.0, process=CODE)
+    assert (windows.process_lookups, windows.pid_lookups) == (0, 0)
+
+
+def test_reused_handle_is_resolved_again(cache, windows):
+    cache.window_icon(1, 16, 1.0)
+    windows.processes[1] = EXPLORER
+    cache.window_icon(1, 16, 1.0)
+    assert windows.process_lookups == 2
+    assert windows.extractions == 2
+
+
+def test_title_change_refreshes_an_application_icon(cache, windows):
+    first = cache.window_icon(1, 16, 1.0, title="Inbox - Mail")
+    assert cache.window_icon(1, 16, 1.0, title="Inbox - Mail") is first
+    badged = cache.window_icon(1, 16, 1.0, title="(3) Inbox - Mail")
+    assert badged is not first
+    assert windows.extractions == 2
+
+
+def test_titles_of_other_windows_do_not_refresh(cache, windows):
+    cache.window_icon(1, 16, 1.0, title="a.py")
+    cache.window_icon(2, 16, 1.0, title="b.py")
+    for _ in range(3):
+        cache.window_icon(1, 16, 1.0, title="a.py")
+        cache.window_icon(2, 16, 1.0, title="b.py")
+    assert windows.extractions == 1
+
+
+def test_missing_title_leaves_it_untracked(cache, windows):
+    cache.window_icon(1, 16, 1.0, title="a.py")
+    cache.window_icon(1, 16, 1.0, title="")
+    cache.window_icon(1, 16, 1.0)
+    cache.window_icon(1, 16, 1.0, title="a.py")
+    assert windows.extractions == 1
+
+
+def test_host_windows_are_cached_per_window(cache, windows):
+    windows.processes[4] = EXPLORER
+    assert cache.window_icon(3, 16, 1.0) is not cache.window_icon(4, 16, 1.0)
+    assert windows.extractions == 2
+
+
+def test_forget_window_drops_only_per_window_icons(cache, windows):
+    cache.window_icon(1, 16, 1.0)
+    cache.window_icon(3, 16, 1.0)
+    cache.forget_window(1)
+    cache.forget_window(3)
+    cache.forget_window(99)
+    assert cache.stats()["entries"] == 1
+    cache.window_icon(2, 16, 1.0)
+    assert windows.extractions == 2
+
+
+def test_lru_eviction(cache, windows):
+    for size in range(10):
+        cache.window_icon(1, 16 + size, 1.0)
+    assert cache.stats()["entries"] == 8
+    assert cache.stats()["evictions"] == 2